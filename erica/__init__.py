@@ -5,12 +5,16 @@ from fastapi_sqlalchemy import DBSessionMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from erica.api.exception_handling import generate_exception_handlers
+from erica.api.inline_eric import start_inline_eric_runner, shutdown_inline_eric_runner
+from erica.api.tax_offices import get_tax_office_list
 from erica.api.v2.api_v2 import api_router_02
 from erica.config import get_settings
 from erica.domain.sqlalchemy.database import engine_args
+from erica.job_service.job_status_notifications import stop_job_status_listener
 
 # Import this here to make it available for the huey TaskRegistry https://huey.readthedocs.io/en/latest/imports.html#imports
 from erica.worker.jobs.list_permission_jobs import get_idnr_status_list_with_huey
+from erica.worker.jobs.tax_office_jobs import refresh_tax_office_directory_periodically
 
 
 app = FastAPI(
@@ -25,6 +29,13 @@ app.exception_handlers = generate_exception_handlers(app)
 
 app.include_router(api_router_02)
 
+# Load the tax office list before the first request instead of while answering it
+app.add_event_handler("startup", get_tax_office_list)
+# Initialise ERiC for the inline tax number checks before the first check instead of within its deadline
+app.add_event_handler("startup", start_inline_eric_runner)
+app.add_event_handler("shutdown", shutdown_inline_eric_runner)
+app.add_event_handler("shutdown", stop_job_status_listener)
+
 app.add_middleware(DBSessionMiddleware, db_url=get_settings().database_url, engine_args=engine_args)
 
 
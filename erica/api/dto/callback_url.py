@@ -0,0 +1,19 @@
+from pydantic import AnyHttpUrl
+
+from erica.config import get_settings
+
+
+class CallbackUrl(AnyHttpUrl):
+    """URL the result of a request is posted to once it is finished. Only hosts that are allowed in the settings can
+    be called back."""
+
+    @classmethod
+    def __get_validators__(cls):
+        yield from super().__get_validators__()
+        yield cls.validate_allowed_host
+
+    @classmethod
+    def validate_allowed_host(cls, callback_url: AnyHttpUrl) -> AnyHttpUrl:
+        if callback_url.host not in get_settings().webhook_allowed_hosts:
+            raise ValueError(f'callback host {callback_url.host} is not allowed')
+        return callback_url
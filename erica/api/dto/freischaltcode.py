@@ -4,6 +4,7 @@ from typing import Optional
 
 from erica.api.dto.response_dto import ResponseBaseDto
 from erica.api.dto.base_dto import BaseDto
+from erica.api.dto.callback_url import CallbackUrl
 
 
 # Input
@@ -25,11 +26,13 @@ class FreischaltCodeActivatePayloadDto(BaseDto):
 class FreischaltCodeRequestDto(BaseDto):
     payload: FreischaltCodeRequestPayloadDto
     client_identifier: str
+    callback_url: Optional[CallbackUrl]
 
 
 class FreischaltCodeActivateDto(BaseDto):
     payload: FreischaltCodeActivatePayloadDto
     client_identifier: str
+    callback_url: Optional[CallbackUrl]
 
 
 class FreischaltCodeRevocatePayloadDto(BaseDto):
@@ -40,6 +43,7 @@ class FreischaltCodeRevocatePayloadDto(BaseDto):
 class FreischaltCodeRevocateDto(BaseDto):
     payload: FreischaltCodeRevocatePayloadDto
     client_identifier: str
+    callback_url: Optional[CallbackUrl]
 
 
 # Output
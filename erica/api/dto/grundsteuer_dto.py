@@ -5,6 +5,7 @@ from erica.api.dto.response_dto import ResponseBaseDto, ResultTransferPdfRespons
 from erica.api.dto.grundsteuer_input_eigentuemer import Eigentuemer
 
 from erica.api.dto.base_dto import CamelCaseModel
+from erica.api.dto.callback_url import CallbackUrl
 from erica.api.dto.grundsteuer_input_gebaeude import Gebaeude
 from erica.api.dto.grundsteuer_input_grundstueck import Grundstueck
 
@@ -24,6 +25,7 @@ class GrundsteuerPayload(BasePayload, ABC, CamelCaseModel):
 class GrundsteuerDto(CamelCaseModel):
     payload: GrundsteuerPayload
     client_identifier: str
+    callback_url: Optional[CallbackUrl]
 
 
 # Output
@@ -24,7 +24,10 @@ class ResponseErrorDto(BaseDto):
 
 class ResultTransferPdfResponseDto(BaseDto):
     transferticket: str
-    pdf: str
+    # Only set for requests that were finished before PDFs were stored on their own
+    pdf: Optional[str]
+    # The path of the endpoint that returns the stored PDF
+    pdf_url: Optional[str]
 
 
 class ResultValidationErrorResponseDto(BaseDto):
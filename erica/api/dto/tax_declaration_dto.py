@@ -3,6 +3,7 @@ from typing import Optional, Union
 from erica.api.dto.response_dto import ResponseBaseDto, ResultTransferPdfResponseDto, \
     ResultValidationErrorResponseDto
 from erica.api.dto.base_dto import BaseDto
+from erica.api.dto.callback_url import CallbackUrl
 from erica.worker.request_processing.erica_input.v1.erica_input import FormDataEst, MetaDataEst
 
 
@@ -24,6 +25,7 @@ class TaxDeclarationPayloadDto(BaseDto):
 class TaxDeclarationDto(BaseDto):
     payload: TaxDeclarationPayloadDto
     client_identifier: str
+    callback_url: Optional[CallbackUrl]
 
 
 # Output
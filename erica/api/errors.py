@@ -8,3 +8,10 @@ class RequestTypeDoesNotMatchEndpointError(Exception):
     def __init__(self, actual_type: RequestType, requested_type: RequestType):
         self.actual_type = actual_type
         self.requested_type = requested_type
+
+
+class RangeNotSatisfiableError(Exception):
+    """ Raised in case a range of a PDF was requested that does not overlap with the PDF. """
+
+    def __init__(self, size: int):
+        self.size = size
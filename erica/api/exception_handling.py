@@ -4,9 +4,9 @@ from fastapi import Request
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response
 
-from erica.api.errors import RequestTypeDoesNotMatchEndpointError
+from erica.api.errors import RequestTypeDoesNotMatchEndpointError, RangeNotSatisfiableError
 from erica.domain.model.erica_request import RequestType
 from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
 
@@ -42,6 +42,9 @@ def generate_exception_handlers(app):
             status_code=404,
         )
 
+    async def range_not_satisfiable_error(request: Request, exc: RangeNotSatisfiableError):
+        return Response(status_code=416, headers={'Content-Range': f'bytes */{exc.size}'})
+
     async def internal_server_error(request: Request, exc: Exception):
         request_id = request.path_params.get('request_id')
         logging.getLogger().error(f"Request for entity {request_id} produced unexpected error: {str(exc)}")
@@ -78,6 +81,7 @@ def generate_exception_handlers(app):
         HTTPException: request_http_error,
         EntityNotFoundError: entity_not_found_error,
         RequestTypeDoesNotMatchEndpointError: jop_type_mismatch_error,
+        RangeNotSatisfiableError: range_not_satisfiable_error,
         Exception: internal_server_error,
     }
 
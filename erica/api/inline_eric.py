@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from erica.config import get_settings
+from erica.worker.pyeric.eric import use_eric_wrapper_checkout
+from erica.worker.pyeric.eric_pool import EricInstancePool
+
+
+class InlineEricTimeoutError(Exception):
+    """ Exception raised in case an inline ERiC operation did not finish within its deadline"""
+    pass
+
+
+class InlineEricRunner:
+    """
+    Runs short ERiC operations that do not need a certificate, like the tax number check, within the API process
+    instead of on the queue. The API holds its own small ERiC instance pool for this, with one thread per instance.
+
+    Every operation has a hard deadline. If it is not finished by then, the caller gets an InlineEricTimeoutError and
+    can fall back to the queue. The operation itself cannot be interrupted, but it only blocks its instance.
+    """
+
+    def __init__(self, pool_size, timeout):
+        self.timeout = timeout
+        self._eric_pool = EricInstancePool(pool_size, checkout_timeout=timeout)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='inline_eric')
+
+    async def start(self):
+        """Creates the ERiC instances upfront, so that the first operations do not pay for the ERiC initialisation
+        within their deadline."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._eric_pool.start)
+
+    async def run(self, function, *args):
+        """Returns the result of function(*args), in which get_eric_wrapper() uses the instances of the runner."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(self._executor, self._run_with_pool, function, *args),
+                                          self.timeout)
+        except asyncio.TimeoutError:
+            raise InlineEricTimeoutError(f"Inline ERiC operation did not finish within {self.timeout} seconds.")
+
+    def _run_with_pool(self, function, *args):
+        with use_eric_wrapper_checkout(self._eric_pool.checkout):
+            return function(*args)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._eric_pool.shutdown()
+
+
+_inline_eric_runner = None
+_inline_eric_runner_lock = threading.Lock()
+
+
+def get_inline_eric_runner() -> Optional[InlineEricRunner]:
+    """Returns the inline runner of the API, or None if inline ERiC operations are not enabled by a pool size."""
+    global _inline_eric_runner
+    if not get_settings().inline_eric_pool_size:
+        return None
+    with _inline_eric_runner_lock:
+        if _inline_eric_runner is None:
+            _inline_eric_runner = InlineEricRunner(get_settings().inline_eric_pool_size,
+                                                   get_settings().inline_eric_timeout_in_sec)
+        return _inline_eric_runner
+
+
+async def start_inline_eric_runner():
+    """Starts the inline runner with the API if inline ERiC operations are enabled. If that fails, the API starts
+    anyway and the instances are created on first use."""
+    inline_eric_runner = get_inline_eric_runner()
+    if inline_eric_runner is None:
+        return
+    try:
+        await inline_eric_runner.start()
+    except Exception as e:
+        logging.getLogger().warning("Could not start the inline ERiC instances.", exc_info=e)
+
+
+def shutdown_inline_eric_runner():
+    global _inline_eric_runner
+    with _inline_eric_runner_lock:
+        inline_eric_runner, _inline_eric_runner = _inline_eric_runner, None
+    if inline_eric_runner is not None:
+        inline_eric_runner.shutdown()
+
+
+async def try_run_inline(function, *args):
+    """Returns the result of running function(*args) inline, or None if it has to go through the queue instead because
+    inline operations are disabled, the deadline passed or the operation failed."""
+    inline_eric_runner = get_inline_eric_runner()
+    if inline_eric_runner is None:
+        return None
+    try:
+        return await inline_eric_runner.run(function, *args)
+    except InlineEricTimeoutError as e:
+        logging.getLogger().warning(f"{e} Falling back to the queue.")
+    except Exception as e:
+        logging.getLogger().warning("Inline ERiC operation failed. Falling back to the queue.", exc_info=e)
+    return None
@@ -5,6 +5,7 @@ from uuid import UUID
 from opyoid import Injector, Module
 from erica.domain.infrastructure_module import InfrastructureModule
 from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
+from erica.job_service.job_status_cache import get_cached_job_status, store_job_status
 
 injector = Injector([InfrastructureModule()])
 
@@ -29,7 +30,12 @@ class EricaRequestService(EricaRequestServiceInterface):
         self.erica_request_repository = repository
 
     def get_request_by_request_id(self, request_id: UUID):
-        return self.erica_request_repository.get_by_job_request_id(request_id)
+        """Reads through the status cache. A cached request only has the payload fields that are part of a response."""
+        erica_request = get_cached_job_status(request_id)
+        if erica_request is None:
+            erica_request = self.erica_request_repository.get_by_job_request_id(request_id)
+            store_job_status(erica_request, only_if_missing=True)
+        return erica_request
 
     def get_all_by_skip_and_limit(self, skip: int, limit: int):
         return self.erica_request_repository.get(skip, limit)
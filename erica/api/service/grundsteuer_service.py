@@ -7,7 +7,7 @@ from erica.api.service.base_service import BaseService
 from erica.api.dto.response_dto import JobState, ResultTransferPdfResponseDto
 from erica.api.service.response_state_mapper import map_status
 from erica.api.dto.grundsteuer_dto import GrundsteuerResponseDto
-from erica.domain.model.erica_request import RequestType
+from erica.domain.model.erica_request import RequestType, PDF_STORED_RESULT_KEY
 
 
 class GrundsteuerServiceInterface(BaseService):
@@ -26,7 +26,8 @@ class GrundsteuerService(GrundsteuerServiceInterface):
         if process_status == JobState.SUCCESS:
             result = ResultTransferPdfResponseDto(
                 transferticket=erica_request.result["transferticket"],
-                pdf=erica_request.result["pdf"])
+                pdf=erica_request.result.get("pdf"),
+                pdf_url=f"/v2/grundsteuer/{request_id}/pdf" if erica_request.result.get(PDF_STORED_RESULT_KEY) else None)
             return GrundsteuerResponseDto(
                 process_status=map_status(erica_request.status), result=result)
         elif process_status == JobState.FAILURE:
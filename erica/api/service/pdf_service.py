@@ -0,0 +1,79 @@
+from abc import ABCMeta, abstractmethod
+from collections import namedtuple
+from typing import Optional, Tuple
+from uuid import UUID
+
+from opyoid import Module
+
+from erica.api.errors import RangeNotSatisfiableError
+from erica.api.service.base_service import BaseService
+from erica.api.service.erica_request_service import EricaRequestService
+from erica.domain.model.erica_request import RequestType
+from erica.domain.repositories.erica_request_pdf_repository_interface import EricaRequestPdfRepositoryInterface
+
+PdfContent = namedtuple('PdfContent', ['content', 'start', 'end', 'size', 'partial'])
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single byte range of a Range header into the first and last requested byte.
+            Parameters:
+                    range_header (str): the value of the Range header, e.g. "bytes=0-1023" or "bytes=-500".
+                    size (int): the size of the requested content.
+            Returns:
+                    (tuple): the first and last byte, or None if the whole content should be returned.
+    """
+    if not range_header:
+        return None
+    unit, _, byte_range = range_header.partition('=')
+    # Invalid ranges and multiple ranges are answered with the whole content
+    if unit.strip().lower() != 'bytes' or ',' in byte_range:
+        return None
+    first, separator, last = byte_range.strip().partition('-')
+    if not separator:
+        return None
+    try:
+        if not first:
+            suffix_length = int(last)
+            if suffix_length <= 0 or size == 0:
+                raise RangeNotSatisfiableError(size)
+            return max(size - suffix_length, 0), size - 1
+        start = int(first)
+        end = int(last) if last else None
+    except ValueError:
+        return None
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(size)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+class PdfServiceInterface(BaseService):
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def get_pdf(self, request_id: UUID, request_type: RequestType, range_header: Optional[str] = None) -> PdfContent:
+        pass
+
+
+class PdfService(PdfServiceInterface):
+
+    def __init__(self, service: EricaRequestService, pdf_repository: EricaRequestPdfRepositoryInterface) -> None:
+        super().__init__(service)
+        self.pdf_repository = pdf_repository
+
+    def get_pdf(self, request_id: UUID, request_type: RequestType, range_header: Optional[str] = None):
+        erica_request = self.get_erica_request(request_id, request_type)
+        size = self.pdf_repository.get_size(erica_request.id)
+        byte_range = parse_byte_range(range_header, size)
+        if byte_range is None:
+            return PdfContent(self.pdf_repository.get_content(erica_request.id), 0, size - 1, size, False)
+        start, end = byte_range
+        content = self.pdf_repository.get_content(erica_request.id, start, end - start + 1)
+        return PdfContent(content, start, end, size, True)
+
+
+class PdfServiceModule(Module):
+    def configure(self) -> None:
+        self.bind(PdfServiceInterface, to_class=PdfService)
@@ -15,6 +15,8 @@ def map_status(status: Status):
         Status.scheduled: JobState.PROCESSING,
         Status.processing: JobState.PROCESSING,
         Status.failed: JobState.FAILURE,
-        Status.success: JobState.SUCCESS
+        Status.success: JobState.SUCCESS,
+        # The response is only complete with the PDF
+        Status.pdf_pending: JobState.PROCESSING
     }
     return switcher.get(status)
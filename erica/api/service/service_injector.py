@@ -4,6 +4,7 @@ from erica.job_service.application_module import ApplicationModule
 from erica.api.service.freischaltcode_service import FreischaltCodeServiceInterface
 from erica.api.service.base_service import BaseService
 from erica.api.service.grundsteuer_service import GrundsteuerServiceInterface
+from erica.api.service.pdf_service import PdfServiceInterface
 from erica.api.service.tax_declaration_service import TaxDeclarationServiceInterface
 from erica.api.service.tax_number_validition_service import TaxNumberValidityServiceInterface
 from erica.domain.model.erica_request import RequestType
@@ -24,3 +25,10 @@ def get_service(request_type: RequestType) -> BaseService:
         RequestType.grundsteuer: injector.inject(GrundsteuerServiceInterface)
     }
     return switcher.get(request_type)
+
+
+def get_pdf_service() -> PdfServiceInterface:
+    injector = Injector([
+        ApplicationModule(),
+    ])
+    return injector.inject(PdfServiceInterface)
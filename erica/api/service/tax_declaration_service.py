@@ -7,7 +7,7 @@ from erica.api.service.base_service import BaseService
 from erica.api.dto.response_dto import JobState, ResultTransferPdfResponseDto
 from erica.api.service.response_state_mapper import map_status
 from erica.api.dto.tax_declaration_dto import EstResponseDto
-from erica.domain.model.erica_request import RequestType
+from erica.domain.model.erica_request import RequestType, PDF_STORED_RESULT_KEY
 
 
 class TaxDeclarationServiceInterface(BaseService):
@@ -26,7 +26,8 @@ class TaxDeclarationService(TaxDeclarationServiceInterface):
         if process_status == JobState.SUCCESS:
             result = ResultTransferPdfResponseDto(
                 transferticket=erica_request.result["transferticket"],
-                pdf=erica_request.result["pdf"])
+                pdf=erica_request.result.get("pdf"),
+                pdf_url=f"/v2/ests/{request_id}/pdf" if erica_request.result.get(PDF_STORED_RESULT_KEY) else None)
             return EstResponseDto(
                 process_status=map_status(erica_request.status), result=result)
         elif process_status == JobState.FAILURE:
@@ -0,0 +1,155 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from starlette.responses import Response
+
+from erica.config import get_settings
+from erica.worker.tax_office_directory import get_stored_tax_office_directory
+
+try:
+    import brotli
+except ImportError:
+    # Without brotli the tax office list is only offered compressed with gzip.
+    brotli = None
+
+_STATIC_TAX_OFFICES_FILE = "erica/api/static/tax_offices.json"
+_IDENTITY = 'identity'
+# The encodings in the order in which we prefer them if the client accepts several.
+_PREFERRED_ENCODINGS = ('br', 'gzip', _IDENTITY)
+
+
+class TaxOfficeListContent:
+    """One version of the tax office list as JSON document together with its compressed encodings and ETags. It is
+    computed once when the list changes and never modified afterwards, so it can be handed to concurrent requests."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.encodings = {_IDENTITY: body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encodings['br'] = brotli.compress(body)
+
+        # Every encoding is its own representation and needs its own strong ETag.
+        digest = hashlib.sha256(body).hexdigest()
+        self.etags = {encoding: f'"{digest}"' if encoding == _IDENTITY else f'"{digest}-{encoding}"'
+                      for encoding in self.encodings}
+
+    def choose_encoding(self, accept_encoding):
+        accepted_encodings = _parse_accept_encoding(accept_encoding)
+        for encoding in _PREFERRED_ENCODINGS:
+            if encoding in self.encodings and accepted_encodings.get(encoding, accepted_encodings.get('*', 0)) > 0:
+                return encoding
+        return _IDENTITY
+
+    def matches(self, if_none_match):
+        """Whether the client already has this version of the list in any encoding."""
+        if if_none_match is None:
+            return False
+        etags = [etag.strip().removeprefix('W/') for etag in if_none_match.split(',')]
+        return '*' in etags or any(etag in etags for etag in self.etags.values())
+
+
+def _parse_accept_encoding(accept_encoding):
+    """Returns the quality value of every encoding in the Accept-Encoding header. Identity is acceptable unless it
+    is explicitly excluded."""
+    accepted_encodings = {_IDENTITY: 1.0}
+    if not accept_encoding:
+        return accepted_encodings
+    for accepted in accept_encoding.split(','):
+        encoding, _, parameters = accepted.partition(';')
+        quality = 1.0
+        parameter_name, _, parameter_value = parameters.partition('=')
+        if parameter_name.strip() == 'q':
+            try:
+                quality = float(parameter_value)
+            except ValueError:
+                quality = 0
+        accepted_encodings[encoding.strip().lower()] = quality
+    if '*' in accepted_encodings and _IDENTITY not in accept_encoding:
+        accepted_encodings[_IDENTITY] = accepted_encodings['*']
+    return accepted_encodings
+
+
+class TaxOfficeList:
+    """
+    The tax office list served by the API, held in memory with precomputed encodings.
+
+    It starts with the list that is built into the image. Every reload interval it is checked whether that file
+    changed or the refresh job stored a directory for another ERiC version, which then replaces the current list
+    without a restart. Once a stored directory is served, it takes precedence over a changed file. Readers always get a
+    complete version because it is only swapped as a whole.
+    """
+
+    def __init__(self, static_file=_STATIC_TAX_OFFICES_FILE, reload_interval=None):
+        self.static_file = static_file
+        self.reload_interval = reload_interval if reload_interval is not None \
+            else get_settings().tax_offices_reload_interval_in_sec
+        self.eric_version = None
+        self._static_file_modification_time = None
+        self._reload_static_file()
+        self._reload_lock = threading.Lock()
+        self._next_reload = 0
+
+    def get_content(self) -> TaxOfficeListContent:
+        if time.monotonic() >= self._next_reload:
+            self.reload()
+        return self.content
+
+    def reload(self):
+        # Only one request checks for a new list, the others keep serving the current one in the meantime.
+        if not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_reload = time.monotonic() + self.reload_interval
+            self._reload_static_file()
+            directory = get_stored_tax_office_directory()
+            if directory is not None and directory.eric_version != self.eric_version:
+                self.content = TaxOfficeListContent(json.dumps(directory.tax_offices, ensure_ascii=False).encode())
+                self.eric_version = directory.eric_version
+                logging.getLogger().info(f"Serving tax office list for ERiC {directory.eric_version}")
+        except Exception as e:
+            logging.getLogger().warning(f"Could not reload the tax office list: {e}")
+        finally:
+            self._reload_lock.release()
+
+    def _reload_static_file(self):
+        modification_time = os.stat(self.static_file).st_mtime_ns
+        if modification_time == self._static_file_modification_time:
+            return
+        if self.eric_version is None:
+            with open(self.static_file, 'rb') as tax_offices_file:
+                self.content = TaxOfficeListContent(tax_offices_file.read())
+        self._static_file_modification_time = modification_time
+
+
+_tax_office_list = None
+_tax_office_list_lock = threading.Lock()
+
+
+def get_tax_office_list() -> TaxOfficeList:
+    global _tax_office_list
+    with _tax_office_list_lock:
+        if _tax_office_list is None:
+            _tax_office_list = TaxOfficeList()
+        return _tax_office_list
+
+
+def create_tax_offices_response(request_headers):
+    """Returns the tax office list in the best encoding the client accepts, or 304 if the client has it already."""
+    content = get_tax_office_list().get_content()
+    encoding = content.choose_encoding(request_headers.get('accept-encoding'))
+    headers = {
+        'ETag': content.etags[encoding],
+        'Cache-Control': f'public, max-age={get_settings().tax_offices_max_age_in_sec}',
+        'Vary': 'Accept-Encoding',
+    }
+    if content.matches(request_headers.get('if-none-match')):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != _IDENTITY:
+        headers['Content-Encoding'] = encoding
+    return Response(content.encodings[encoding], media_type="application/json", headers=headers)
@@ -1,11 +1,17 @@
+import asyncio
+from typing import Callable
 from uuid import UUID
 
 from opyoid import Injector
+from starlette.responses import Response
 
 from erica.api.api_module import ApiModule
-from erica.api.dto.response_dto import JobState
+from erica.api.dto.response_dto import JobState, ResponseBaseDto
 from erica.api.service.erica_request_service import EricaRequestServiceInterface
+from erica.api.service.pdf_service import PdfContent
+from erica.config import get_settings
 from erica.domain.model.erica_request import Status
+from erica.job_service.job_status_notifications import get_job_status_listener
 
 
 def map_status(status: Status):
@@ -21,7 +27,9 @@ def map_status(status: Status):
         Status.scheduled: JobState.PROCESSING,
         Status.processing: JobState.PROCESSING,
         Status.failed: JobState.FAILURE,
-        Status.success: JobState.SUCCESS
+        Status.success: JobState.SUCCESS,
+        # The response is only complete with the PDF
+        Status.pdf_pending: JobState.PROCESSING
     }
     return switcher.get(status)
 
@@ -41,6 +49,51 @@ def generate_error_response(errorcode=-1, errormessage="API resource not yet imp
     return error_response
 
 
+def create_pdf_response(pdf: PdfContent, request_id: UUID) -> Response:
+    """
+    Generator of the response for a (partially) requested PDF.
+            Parameters:
+                    pdf (PdfContent): the requested content of the PDF.
+                    request_id (UUID): the id of the job the PDF belongs to.
+            Returns:
+                    (Response): response with the PDF content, partial if a range was requested.
+    """
+    headers = {'Accept-Ranges': 'bytes',
+               'Content-Disposition': f'inline; filename="{request_id}.pdf"'}
+    if pdf.partial:
+        headers['Content-Range'] = f'bytes {pdf.start}-{pdf.end}/{pdf.size}'
+        return Response(pdf.content, status_code=206, media_type='application/pdf', headers=headers)
+    return Response(pdf.content, media_type='application/pdf', headers=headers)
+
+
+async def wait_for_job_response(get_response: Callable[[UUID], ResponseBaseDto], request_id: UUID, wait: float):
+    """
+    Long polling for the status of a job. Waits until the job is finished, but at most for the given seconds, and
+    only reads the job again once it is finished or the wait expired.
+            Parameters:
+                    get_response (Callable): returns the current response for the job.
+                    request_id (UUID): the id of the job.
+                    wait (float): the seconds to wait for the job to finish, capped by the settings.
+            Returns:
+                    (ResponseBaseDto): the response for the job once it is finished or the wait expired.
+    """
+    wait = min(max(wait, 0), get_settings().job_status_max_wait_in_sec)
+    job_status_listener = get_job_status_listener() if wait else None
+    if job_status_listener is None or not await job_status_listener.listen():
+        return get_response(request_id)
+
+    # Watch before reading the job, so that it cannot finish unnoticed in between.
+    with job_status_listener.watch(request_id) as job_finished:
+        response = get_response(request_id)
+        if response.process_status != JobState.PROCESSING:
+            return response
+        try:
+            await asyncio.wait_for(job_finished.wait(), wait)
+        except asyncio.TimeoutError:
+            return response
+    return get_response(request_id)
+
+
 injector = Injector([
     ApiModule(),
 ])
@@ -1,13 +1,16 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import status, APIRouter
+from fastapi import status, APIRouter, Header
 from starlette.requests import Request
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response
 
 from erica.api.dto.tax_declaration_dto import TaxDeclarationDto
-from erica.api.service.service_injector import get_service
+from erica.api.service.service_injector import get_service, get_pdf_service
+from erica.api.utils import create_pdf_response, wait_for_job_response
 from erica.api.service.tax_declaration_service import TaxDeclarationServiceInterface
-from erica.api.v2.responses.model import response_model_get_send_est_from_queue, response_model_post_to_queue
+from erica.api.v2.responses.model import response_model_get_send_est_from_queue, response_model_post_to_queue, \
+    response_model_get_pdf_from_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
 
@@ -23,17 +26,30 @@ async def send_est(est_data_client_identifier: TaxDeclarationDto, request: Reque
     """
     result = get_job_service(RequestType.send_est).add_to_queue(
         est_data_client_identifier.payload, est_data_client_identifier.client_identifier,
-        RequestType.send_est)
+        RequestType.send_est, est_data_client_identifier.callback_url)
     return RedirectResponse(
         str(request.url_for("get_send_est_job", request_id=str(result.request_id))).removeprefix(str(request.base_url)),
         status_code=201)
 
 
 @router.get('/ests/{request_id}', status_code=status.HTTP_200_OK, responses=response_model_get_send_est_from_queue)
-async def get_send_est_job(request_id: UUID):
+async def get_send_est_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status of a sent tax declaration from the queue.
     :param request_id: the id of the job.
+    :param wait: optional seconds to wait for the job to finish before answering.
     """
     tax_declaration_service: TaxDeclarationServiceInterface = get_service(RequestType.send_est)
-    return tax_declaration_service.get_response_send_est(request_id)
+    return await wait_for_job_response(tax_declaration_service.get_response_send_est, request_id, wait)
+
+
+@router.get('/ests/{request_id}/pdf', status_code=status.HTTP_200_OK, response_class=Response,
+            responses=response_model_get_pdf_from_queue)
+async def get_send_est_pdf(request_id: UUID, range_header: Optional[str] = Header(default=None, alias='Range')):
+    """
+    Route for retrieving the PDF of a sent tax declaration. Supports single byte range requests.
+    :param request_id: the id of the job.
+    :param range_header: optional Range header, e.g. "bytes=0-1023".
+    """
+    pdf = get_pdf_service().get_pdf(request_id, RequestType.send_est, range_header)
+    return create_pdf_response(pdf, request_id)
@@ -8,6 +8,7 @@ from erica.api.dto.freischaltcode import FreischaltCodeRequestDto, FreischaltCod
     FreischaltCodeRevocateDto
 from erica.api.service.freischaltcode_service import FreischaltCodeService, FreischaltCodeServiceInterface
 from erica.api.service.service_injector import get_service
+from erica.api.utils import wait_for_job_response
 from erica.api.v2.responses.model import response_model_get_unlock_code_request_from_queue, \
     response_model_get_unlock_code_activation_from_queue, response_model_get_unlock_code_revocation_from_queue, \
     response_model_post_to_queue
@@ -26,7 +27,7 @@ async def request_fsc(request_fsc_client_identifier: FreischaltCodeRequestDto, r
     """
     result = get_job_service(RequestType.freischalt_code_request).add_to_queue(
         request_fsc_client_identifier.payload, request_fsc_client_identifier.client_identifier,
-        RequestType.freischalt_code_request)
+        RequestType.freischalt_code_request, request_fsc_client_identifier.callback_url)
     return RedirectResponse(
         str(request.url_for("get_fsc_request_job", request_id=str(result.request_id))).removeprefix(str(request.base_url)),
         status_code=201)
@@ -34,13 +35,14 @@ async def request_fsc(request_fsc_client_identifier: FreischaltCodeRequestDto, r
 
 @router.get('/request/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_unlock_code_request_from_queue)
-async def get_fsc_request_job(request_id: UUID):
+async def get_fsc_request_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status from an fsc request from the queue.
     :param request_id: the id of the job.
+    :param wait: optional seconds to wait for the job to finish before answering.
     """
     freischaltcode_service: FreischaltCodeServiceInterface = get_service(RequestType.freischalt_code_request)
-    return freischaltcode_service.get_response_freischaltcode_request(request_id)
+    return await wait_for_job_response(freischaltcode_service.get_response_freischaltcode_request, request_id, wait)
 
 
 @router.post('/activation', status_code=status.HTTP_201_CREATED, responses=response_model_post_to_queue)
@@ -52,7 +54,7 @@ async def activate_fsc(activation_fsc_client_identifier: FreischaltCodeActivateD
     """
     result = get_job_service(RequestType.freischalt_code_activate).add_to_queue(
         activation_fsc_client_identifier.payload, activation_fsc_client_identifier.client_identifier,
-        RequestType.freischalt_code_activate)
+        RequestType.freischalt_code_activate, activation_fsc_client_identifier.callback_url)
     return RedirectResponse(
         str(request.url_for("get_fsc_activation_job", request_id=str(result.request_id))).removeprefix(
             str(request.base_url)),
@@ -61,13 +63,14 @@ async def activate_fsc(activation_fsc_client_identifier: FreischaltCodeActivateD
 
 @router.get('/activation/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_unlock_code_activation_from_queue)
-async def get_fsc_activation_job(request_id: UUID):
+async def get_fsc_activation_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status from an fsc activation from the queue.
     :param request_id: the id of the job.
+    :param wait: optional seconds to wait for the job to finish before answering.
     """
     freischaltcode_service: FreischaltCodeService = get_service(RequestType.freischalt_code_activate)
-    return freischaltcode_service.get_response_freischaltcode_activation(request_id)
+    return await wait_for_job_response(freischaltcode_service.get_response_freischaltcode_activation, request_id, wait)
 
 
 @router.post('/revocation', status_code=status.HTTP_201_CREATED, responses=response_model_post_to_queue)
@@ -79,7 +82,7 @@ async def revocate_fsc(revocation_fsc_client_identifier: FreischaltCodeRevocateD
     """
     result = get_job_service(RequestType.freischalt_code_revocate).add_to_queue(
         revocation_fsc_client_identifier.payload, revocation_fsc_client_identifier.client_identifier,
-        RequestType.freischalt_code_revocate)
+        RequestType.freischalt_code_revocate, revocation_fsc_client_identifier.callback_url)
     return RedirectResponse(
         str(request.url_for("get_fsc_revocation_job", request_id=str(result.request_id))).removeprefix(
             str(request.base_url)),
@@ -88,10 +91,11 @@ async def revocate_fsc(revocation_fsc_client_identifier: FreischaltCodeRevocateD
 
 @router.get('/revocation/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_unlock_code_revocation_from_queue)
-async def get_fsc_revocation_job(request_id: UUID):
+async def get_fsc_revocation_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status from an fsc revocation from the queue.
     :param request_id: the id of the job.
+    :param wait: optional seconds to wait for the job to finish before answering.
     """
     freischaltcode_service: FreischaltCodeService = get_service(RequestType.freischalt_code_revocate)
-    return freischaltcode_service.get_response_freischaltcode_revocation(request_id)
+    return await wait_for_job_response(freischaltcode_service.get_response_freischaltcode_revocation, request_id, wait)
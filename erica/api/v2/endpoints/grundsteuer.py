@@ -1,14 +1,17 @@
 import uuid
+from typing import Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header
 from starlette import status
 from starlette.requests import Request
-from starlette.responses import RedirectResponse
+from starlette.responses import RedirectResponse, Response
 
 from erica.api.dto.grundsteuer_dto import GrundsteuerDto
 from erica.api.service.grundsteuer_service import GrundsteuerServiceInterface
-from erica.api.service.service_injector import get_service
-from erica.api.v2.responses.model import response_model_post_to_queue, response_model_get_send_grundsteuer_from_queue
+from erica.api.service.service_injector import get_service, get_pdf_service
+from erica.api.utils import create_pdf_response, wait_for_job_response
+from erica.api.v2.responses.model import response_model_post_to_queue, response_model_get_send_grundsteuer_from_queue, \
+    response_model_get_pdf_from_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
 
@@ -23,7 +26,8 @@ async def send_grundsteuer(grundsteuer: GrundsteuerDto, request: Request):
     :param grundsteuer: payload with TTL, JSON input data for the grundsteuer declaration.
     """
     result = get_job_service(RequestType.grundsteuer).add_to_queue(
-        grundsteuer.payload, grundsteuer.client_identifier, RequestType.grundsteuer)
+        grundsteuer.payload, grundsteuer.client_identifier, RequestType.grundsteuer,
+        grundsteuer.callback_url)
     return RedirectResponse(
         str(request.url_for("get_grundsteuer_job", request_id=str(result.request_id))).removeprefix(str(request.base_url)),
         status_code=201)
@@ -31,10 +35,23 @@ async def send_grundsteuer(grundsteuer: GrundsteuerDto, request: Request):
 
 @router.get('/grundsteuer/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_send_grundsteuer_from_queue)
-async def get_grundsteuer_job(request_id: uuid.UUID):
+async def get_grundsteuer_job(request_id: uuid.UUID, wait: float = 0):
     """
     Route for retrieving job status of a grundsteuer tax declaration validation from the queue.
     :param request_id: the id of the job.
+    :param wait: optional seconds to wait for the job to finish before answering.
     """
     grundsteuer_service: GrundsteuerServiceInterface = get_service(RequestType.grundsteuer)
-    return grundsteuer_service.get_response_grundsteuer(request_id)
+    return await wait_for_job_response(grundsteuer_service.get_response_grundsteuer, request_id, wait)
+
+
+@router.get('/grundsteuer/{request_id}/pdf', status_code=status.HTTP_200_OK, response_class=Response,
+            responses=response_model_get_pdf_from_queue)
+async def get_grundsteuer_pdf(request_id: uuid.UUID, range_header: Optional[str] = Header(default=None, alias='Range')):
+    """
+    Route for retrieving the PDF of a grundsteuer tax declaration. Supports single byte range requests.
+    :param request_id: the id of the job.
+    :param range_header: optional Range header, e.g. "bytes=0-1023".
+    """
+    pdf = get_pdf_service().get_pdf(request_id, RequestType.grundsteuer, range_header)
+    return create_pdf_response(pdf, request_id)
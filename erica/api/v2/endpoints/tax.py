@@ -1,27 +1,45 @@
 from uuid import UUID
 
 from fastapi import status, APIRouter
+from fastapi.encoders import jsonable_encoder
 from starlette.requests import Request
-from starlette.responses import FileResponse, RedirectResponse
+from starlette.responses import JSONResponse, RedirectResponse
 
-from erica.api.dto.tax_number_validation_dto import CheckTaxNumberDto
+from erica.api.dto.response_dto import JobState
+from erica.api.dto.tax_number_validation_dto import CheckTaxNumberDto, TaxResponseDto, ResultTaxResponseDto
+from erica.api.inline_eric import try_run_inline
 from erica.api.service.service_injector import get_service
 from erica.api.service.tax_number_validition_service import TaxNumberValidityServiceInterface
-from erica.api.v2.responses.model import response_model_get_tax_number_validity_from_queue, response_model_post_to_queue
+from erica.api.tax_offices import create_tax_offices_response
+from erica.api.utils import wait_for_job_response
+from erica.api.v2.responses.model import response_model_get_tax_number_validity_from_queue, \
+    response_model_post_tax_number_validity_to_queue
 from erica.domain.model.erica_request import RequestType
 from erica.job_service.job_service_factory import get_job_service
 
 router = APIRouter()
 
 
-@router.post('/tax_number_validity', status_code=status.HTTP_201_CREATED, responses=response_model_post_to_queue)
-async def is_valid_tax_number(tax_validity_client_identifier: CheckTaxNumberDto, request: Request):
+@router.post('/tax_number_validity', status_code=status.HTTP_201_CREATED,
+             responses=response_model_post_tax_number_validity_to_queue)
+async def is_valid_tax_number(tax_validity_client_identifier: CheckTaxNumberDto, request: Request,
+                              inline: bool = False):
     """
     Route for validation of a tax number using the job queue.
     :param request: API request object.
     :param tax_validity_client_identifier: payload with client identifier and the JSON input data for the tax number validity check.
+    :param inline: whether the tax number should be checked right away and the result returned directly. If that is
+    not enabled or does not finish in time, the job queue is used as usual.
     """
-    result = get_job_service(RequestType.check_tax_number).add_to_queue(
+    job_service = get_job_service(RequestType.check_tax_number)
+    if inline:
+        payload = job_service.payload_type.parse_obj(tax_validity_client_identifier.payload)
+        inline_result = await try_run_inline(job_service.apply_to_elster, payload)
+        if inline_result is not None:
+            return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(TaxResponseDto(
+                process_status=JobState.SUCCESS, result=ResultTaxResponseDto(is_valid=inline_result["is_valid"]))))
+
+    result = job_service.add_to_queue(
         tax_validity_client_identifier.payload, tax_validity_client_identifier.client_identifier,
         RequestType.check_tax_number)
     return RedirectResponse(
@@ -32,18 +50,20 @@ async def is_valid_tax_number(tax_validity_client_identifier: CheckTaxNumberDto,
 
 @router.get('/tax_number_validity/{request_id}', status_code=status.HTTP_200_OK,
             responses=response_model_get_tax_number_validity_from_queue)
-async def get_valid_tax_number_job(request_id: UUID):
+async def get_valid_tax_number_job(request_id: UUID, wait: float = 0):
     """
     Route for retrieving job status of a tax number validity from the queue.
     :param request_id: the id of the job.
+    :param wait: optional seconds to wait for the job to finish before answering.
     """
     tax_number_validity_service: TaxNumberValidityServiceInterface = get_service(RequestType.check_tax_number)
-    return tax_number_validity_service.get_response_tax_number_validity(request_id)
+    return await wait_for_job_response(tax_number_validity_service.get_response_tax_number_validity, request_id, wait)
 
 
 @router.get('/tax_offices/', status_code=status.HTTP_200_OK)
-def get_tax_offices():
+def get_tax_offices(request: Request):
     """
-    The list of tax offices for all states is requested and returned.
+    The list of tax offices for all states is returned from memory, compressed if the client accepts it.
+    :param request: API request object, whose If-None-Match header is answered with 304 if the list did not change.
     """
-    return FileResponse("erica/api/static/tax_offices.json")
+    return create_tax_offices_response(request.headers)
@@ -25,6 +25,11 @@ response_model_post_to_queue = {
     422: model_422_error_queue,
     500: model_500_error_get_from_queue}
 
+response_model_post_tax_number_validity_to_queue = {
+    200: {"model": TaxResponseDto,
+          "description": "The tax number was checked inline and the result was returned directly."},
+    **response_model_post_to_queue}
+
 response_model_get_send_est_from_queue = {
     200: {"model": EstResponseDto,
           "description": "Job status of a sent est was successfully retrieved from the queue."},
@@ -54,3 +59,11 @@ response_model_get_unlock_code_revocation_from_queue = {
     200: {"model": FreischaltcodeRevocationResponseDto,
           "description": "Job status of an unlock code revocation was successfully retrieved from the queue."},
     **base_response_get_from_queue}
+
+response_model_get_pdf_from_queue = {
+    200: {"content": {"application/pdf": {}},
+          "description": "The PDF of a successfully sent declaration was retrieved."},
+    206: {"content": {"application/pdf": {}},
+          "description": "The requested range of the PDF of a successfully sent declaration was retrieved."},
+    416: {"description": "The requested range does not overlap with the PDF."},
+    **base_response_get_from_queue}
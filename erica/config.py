@@ -32,10 +32,35 @@ class Settings(BaseSettings):
     ttl_job_expires_in_sec: int = 540
     ttl_processing_request_entities_in_min: int = 10
     ttl_finished_request_entities_in_min: int = 20
+    # Longer than the PDF rendering job can be queued and retried
+    ttl_pdf_pending_request_entities_in_min: int = 70
     use_immediate_worker: bool = False
     sentry_dsn_api: str = None
     sentry_dsn_worker: str = None
     run_with_huey: bool = False
+    eric_pool_size: int = 2
+    eric_pool_checkout_timeout_in_sec: int = 120
+    worker_metrics_port: int = None
+    pdf_capture_mode: str = 'memfd'
+    eric_backend: str = 'native'
+    simulated_eric_profile: str = 'realistic'
+    eric_warm_up: bool = False
+    worker_readiness_file: str = None
+    defer_pdf_rendering: bool = False  # renders every PDF in the background, not on its first download
+    create_transfer_header_with_eric: bool = False
+    tax_offices_reload_interval_in_sec: int = 300
+    tax_offices_max_age_in_sec: int = 86400
+    inline_eric_pool_size: int = 0
+    inline_eric_timeout_in_sec: float = 2.0
+    job_status_max_wait_in_sec: int = 30
+    cache_job_status: bool = True
+    webhook_secret: str = Field(None, env='WEBHOOK_SECRET')
+    webhook_callback_urls: dict = {}
+    webhook_allowed_hosts: list = []
+    webhook_outbox_size: int = 10000
+    webhook_timeout_in_sec: float = 5.0
+    webhook_max_attempts: int = 8
+    webhook_retry_delay_in_sec: int = 10
 
     class Config:
         dir = os.path.dirname(__file__)
@@ -66,6 +91,7 @@ class ProductionSettings(Settings):
     sentry_dsn_api: str = "https://e8cbb2aaeed742c19965960951c7835c@o1248831.ingest.sentry.io/6466521"
     sentry_dsn_worker: str = "https://fe49771e429c48be8deb9074556c5463@o1248831.ingest.sentry.io/6466074"
     run_with_huey: bool = True
+    eric_warm_up: bool = True
 
 
 class StagingSettings(Settings):
@@ -75,6 +101,7 @@ class StagingSettings(Settings):
     sentry_dsn_api: str = "https://e8cbb2aaeed742c19965960951c7835c@o1248831.ingest.sentry.io/6466521"
     sentry_dsn_worker: str = "https://fe49771e429c48be8deb9074556c5463@o1248831.ingest.sentry.io/6466074"
     run_with_huey: bool = True
+    eric_warm_up: bool = True
 
 
 class DevelopmentSettings(Settings):
@@ -91,6 +118,7 @@ class TestingSettings(Settings):
     debug: bool = True
     accept_test_bufa: bool = True
     use_immediate_worker: bool = True
+    cache_job_status: bool = False
 
 
 @lru_cache()
@@ -20,6 +20,12 @@ class Status(int, Enum):
     processing = 2
     failed = 3
     success = 4
+    # Sent successfully, but the deferred PDF is not rendered yet
+    pdf_pending = 5
+
+
+# Set in the result once the PDF of the request is stored and can be downloaded from its PDF endpoint
+PDF_STORED_RESULT_KEY = 'pdf_stored'
 
 
 class EricaRequest(BaseDomainModel[UUID]):
@@ -30,6 +36,7 @@ class EricaRequest(BaseDomainModel[UUID]):
     result: Optional[object]
     error_code: Optional[str]
     error_message: Optional[str]
+    callback_url: Optional[str]
 
     class Config:
         orm_mode = True
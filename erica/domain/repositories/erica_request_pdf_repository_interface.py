@@ -0,0 +1,18 @@
+from abc import ABCMeta, abstractmethod
+from typing import Optional
+
+
+class EricaRequestPdfRepositoryInterface:
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def save(self, erica_request_id: int, content: bytes):
+        pass
+
+    @abstractmethod
+    def get_size(self, erica_request_id: int) -> int:
+        pass
+
+    @abstractmethod
+    def get_content(self, erica_request_id: int, start: int = 0, length: Optional[int] = None) -> bytes:
+        pass
@@ -0,0 +1,29 @@
+"""Added Erica_Request_Pdf_Table
+
+Revision ID: 4b9e2c7a1f03
+Revises: d57d4d27a115
+Create Date: 2026-10-18 10:12:41.218390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b9e2c7a1f03'
+down_revision = 'd57d4d27a115'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('erica_request_pdf',
+                    sa.Column('erica_request_id', sa.Integer(), nullable=False),
+                    sa.Column('content', sa.LargeBinary(), nullable=False),
+                    sa.ForeignKeyConstraint(['erica_request_id'], ['erica_request.id'], ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('erica_request_id')
+                    )
+
+
+def downgrade():
+    op.drop_table('erica_request_pdf')
@@ -0,0 +1,24 @@
+"""Added callback_url to Erica_Request_Table
+
+Revision ID: 7c2a9e5d0b14
+Revises: 4b9e2c7a1f03
+Create Date: 2026-10-18 14:37:05.512934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2a9e5d0b14'
+down_revision = '4b9e2c7a1f03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('erica_request', sa.Column('callback_url', sa.String(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('erica_request', 'callback_url')
@@ -0,0 +1,25 @@
+"""Added status pdf_pending
+
+Revision ID: 9e4f1b6c2d37
+Revises: 7c2a9e5d0b14
+Create Date: 2026-10-18 16:02:11.804512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4f1b6c2d37'
+down_revision = '7c2a9e5d0b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE status ADD VALUE 'pdf_pending'")
+
+
+def downgrade():
+    pass
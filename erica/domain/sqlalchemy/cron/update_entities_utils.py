@@ -9,6 +9,7 @@ from erica.config import get_settings
 from erica.domain.infrastructure_module import InfrastructureModule
 from erica.domain.sqlalchemy.database import session_scope
 from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
+from erica.worker.jobs.job import finish_old_pdf_pending_entities
 
 
 @click.group()
@@ -39,6 +40,18 @@ def set_not_processed_entities_to_failed():
         logging.getLogger().info(f"No entities set to failed at {datetime.now().strftime('%H:%M:%S')}")
 
 
+@cli.command()
+def set_pdf_pending_entities_to_success():
+    injector = Injector([InfrastructureModule()])
+    erica_request_repo = injector.inject(EricaRequestRepository)
+    entities_updated = finish_old_pdf_pending_entities(erica_request_repo,
+                                                       get_settings().ttl_pdf_pending_request_entities_in_min)
+    if entities_updated > 0:
+        logging.getLogger().warning(
+            f"{entities_updated} pdf_pending entities set to success without PDF at "
+            f"{datetime.now().strftime('%H:%M:%S')}")
+
+
 dictConfig({
     "version": 1,
     "formatters": {
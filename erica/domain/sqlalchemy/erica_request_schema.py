@@ -1,4 +1,4 @@
-from sqlalchemy import MetaData, Column, String, Enum, Integer
+from sqlalchemy import MetaData, Column, String, Enum, Integer, ForeignKey, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -20,3 +20,13 @@ class EricaRequestSchema(AuditedSchemaMixin, BaseDbSchema):
     status = Column(Enum(Status))
     error_code = Column(String, nullable=True)
     error_message = Column(String, nullable=True)
+    callback_url = Column(String, nullable=True)
+
+
+class EricaRequestPdfSchema(BaseDbSchema):
+    """The PDF of an erica request, stored as raw bytes outside of its result. It is deleted with the request."""
+    __tablename__ = 'erica_request_pdf'
+    erica_request_id = Column(Integer,
+                              ForeignKey('erica_request.id', ondelete='CASCADE'),
+                              primary_key=True)
+    content = Column(LargeBinary, nullable=False)
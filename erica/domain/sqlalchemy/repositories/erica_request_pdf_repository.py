@@ -0,0 +1,43 @@
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from erica.domain.repositories.erica_request_pdf_repository_interface import EricaRequestPdfRepositoryInterface
+from erica.domain.sqlalchemy.erica_request_schema import EricaRequestPdfSchema
+from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
+
+
+class EricaRequestPdfRepository(EricaRequestPdfRepositoryInterface):
+    """Stores the PDFs of erica requests as raw bytes. Sizes and ranges are computed by the database, so that only the
+    requested bytes are transferred."""
+
+    def __init__(self, db_connection: Session):
+        self.db_connection = db_connection
+        self.DatabaseEntity = EricaRequestPdfSchema
+
+    def save(self, erica_request_id: int, content: bytes):
+        stmt = insert(self.DatabaseEntity).values(erica_request_id=erica_request_id, content=content)
+        stmt = stmt.on_conflict_do_update(index_elements=[self.DatabaseEntity.erica_request_id],
+                                          set_={'content': stmt.excluded.content})
+        self.db_connection.execute(stmt)
+        self.db_connection.commit()
+
+    def get_size(self, erica_request_id: int) -> int:
+        size = self.db_connection.execute(
+            select(func.octet_length(self.DatabaseEntity.content))
+            .where(self.DatabaseEntity.erica_request_id == erica_request_id)).scalar()
+        if size is None:
+            raise EntityNotFoundError
+        return size
+
+    def get_content(self, erica_request_id: int, start: int = 0, length: Optional[int] = None) -> bytes:
+        # substr counts from 1
+        content = func.substr(self.DatabaseEntity.content, start + 1, length) if length is not None \
+            else func.substr(self.DatabaseEntity.content, start + 1)
+        result = self.db_connection.execute(
+            select(content).where(self.DatabaseEntity.erica_request_id == erica_request_id)).scalar()
+        if result is None:
+            raise EntityNotFoundError
+        return bytes(result)
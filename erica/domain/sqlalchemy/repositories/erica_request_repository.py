@@ -1,4 +1,5 @@
 from abc import ABC
+from typing import List
 from uuid import UUID
 import datetime as dt
 
@@ -72,3 +73,10 @@ class EricaRequestRepository(
         updated = self.db_connection.execute(stmt)
         self.db_connection.commit()
         return updated.rowcount
+
+    def get_old_pdf_pending_entities(self, ttl) -> List[EricaRequest]:
+        """Returns the sent entities whose PDF has not been rendered within the ttl."""
+        entities = self.db_connection.query(self.DatabaseEntity) \
+            .filter(self.DatabaseEntity.status == Status.pdf_pending,
+                    self.DatabaseEntity.updated_at < dt.datetime.now() - dt.timedelta(minutes=ttl))
+        return [self.DomainModel.from_orm(entity) for entity in entities]
@@ -3,6 +3,7 @@ from opyoid import Module
 from erica.api.service.freischaltcode_service import FreischaltCodeServiceInterface, FreischaltCodeService
 from erica.api.service.erica_request_service import EricaRequestServiceInterface, EricaRequestService
 from erica.api.service.grundsteuer_service import GrundsteuerServiceInterface, GrundsteuerService
+from erica.api.service.pdf_service import PdfServiceInterface, PdfService
 from erica.api.service.tax_declaration_service import TaxDeclarationServiceInterface, \
     TaxDeclarationService
 from erica.api.service.tax_number_validition_service import TaxNumberValidityServiceInterface, \
@@ -17,4 +18,5 @@ class ApplicationModule(Module):
         self.bind(TaxDeclarationServiceInterface, to_class=TaxDeclarationService)
         self.bind(TaxNumberValidityServiceInterface, to_class=TaxNumberValidityService)
         self.bind(GrundsteuerServiceInterface, to_class=GrundsteuerService)
+        self.bind(PdfServiceInterface, to_class=PdfService)
         self.install(InfrastructureModule())
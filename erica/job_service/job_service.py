@@ -1,12 +1,14 @@
 import logging
 from abc import abstractmethod, ABCMeta
-from typing import Type, Callable
+from typing import Type, Callable, Optional
 from uuid import uuid4
 from erica.api.dto.base_dto import BaseDto
 from erica.api.dto.erica_request_dto import EricaRequestDto
 from erica.domain.model.base_domain_model import BasePayload
-from erica.domain.model.erica_request import EricaRequest, RequestType
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.repositories.erica_request_pdf_repository_interface import EricaRequestPdfRepositoryInterface
 from erica.domain.repositories.erica_request_repository_interface import EricaRequestRepositoryInterface
+from erica.job_service.job_status_cache import store_job_status
 from erica.worker.request_processing.requests_controller import EricaRequestController
 
 
@@ -16,13 +18,22 @@ class JobServiceInterface:
     repository: EricaRequestRepositoryInterface
 
     @abstractmethod
-    def add_to_queue(self, payload_dto: BasePayload, client_identifier: str, job_type: RequestType) -> EricaRequestDto:
+    def add_to_queue(self, payload_dto: BasePayload, client_identifier: str, job_type: RequestType,
+                     callback_url: Optional[str] = None) -> EricaRequestDto:
         pass
 
     @abstractmethod
     def apply_to_elster(self, payload_data: BasePayload, include_elster_responses: bool):
         pass
 
+    @abstractmethod
+    def render_pdf(self, payload_data: BasePayload):
+        pass
+
+    @abstractmethod
+    def store_pdf(self, erica_request_id: int, pdf: bytes):
+        pass
+
 
 class JobService(JobServiceInterface):
 
@@ -30,23 +41,38 @@ class JobService(JobServiceInterface):
                  job_repository: EricaRequestRepositoryInterface,
                  payload_type: Type[BasePayload],
                  request_controller: Type[EricaRequestController],
-                 job_method: Callable) -> None:
+                 job_method: Callable,
+                 pdf_repository: EricaRequestPdfRepositoryInterface = None) -> None:
         super().__init__()
 
         self.repository = job_repository
         self.payload_type = payload_type
         self.request_controller = request_controller
         self.job_method = job_method
+        self.pdf_repository = pdf_repository
 
-    def add_to_queue(self, payload_dto: BaseDto, client_identifier: str, job_type: RequestType) -> EricaRequestDto:
+    def add_to_queue(self, payload_dto: BaseDto, client_identifier: str, job_type: RequestType,
+                     callback_url: Optional[str] = None) -> EricaRequestDto:
+        payload = self.payload_type.parse_obj(payload_dto)
         request_entity = EricaRequest(request_id=uuid4(),
-                                      payload=self.payload_type.parse_obj(payload_dto),
+                                      payload=payload,
                                       creator_id=client_identifier,
-                                      type=job_type
+                                      type=job_type,
+                                      callback_url=callback_url
                                       )
 
+        # Requests whose result is known without ERiC are stored as finished and do not need a job
+        local_result = self.request_controller.get_local_result(payload)
+        if local_result is not None:
+            request_entity.status = Status.success
+            request_entity.result = local_result
+
         created = self.repository.create(request_entity)
+        store_job_status(created)
         logging.getLogger().info(f"EricaRequest created with id: {created.request_id}")
+        if local_result is not None:
+            logging.getLogger().info(f"EricaRequest with id {created.request_id} finished without job")
+            return EricaRequestDto.parse_obj(created)
 
         self.job_method(created.request_id)
         logging.getLogger().info(f"Job created with id for EricaRequest with id {created.request_id}")
@@ -57,3 +83,10 @@ class JobService(JobServiceInterface):
         controller = self.request_controller(payload_data,
                                              include_elster_responses)
         return controller.process()
+
+    def render_pdf(self, payload_data):
+        controller = self.request_controller(payload_data)
+        return controller.render_pdf()
+
+    def store_pdf(self, erica_request_id: int, pdf: bytes):
+        self.pdf_repository.save(erica_request_id, pdf)
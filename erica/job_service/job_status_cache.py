@@ -0,0 +1,83 @@
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from uuid import UUID
+
+import redis
+from pydantic import BaseModel
+
+from erica.config import get_settings
+from erica.domain.model.erica_request import EricaRequest, Status
+
+_JOB_STATUS_KEY_PREFIX = 'erica-job-status:'
+# The fields of an entity that the status and PDF endpoints need. The timestamps are left out and the payload is reduced
+# to the _CACHED_PAYLOAD_FIELDS.
+_CACHED_FIELDS = {'id', 'type', 'status', 'request_id', 'creator_id', 'result', 'error_code', 'error_message',
+                  'payload'}
+# The only payload field that is part of a response.
+_CACHED_PAYLOAD_FIELDS = ('tax_id_number',)
+
+
+@lru_cache()
+def _get_redis_client():
+    return redis.Redis.from_url(get_settings().queue_url)
+
+
+def _get_key(request_id: UUID):
+    return f'{_JOB_STATUS_KEY_PREFIX}{request_id}'
+
+
+def _get_time_to_live(entity: EricaRequest) -> int:
+    """The cached status must not outlive the state of the entity, which is changed by the cleanup jobs once the entity
+    has not been updated for the configured time."""
+    if entity.status in (Status.success, Status.failed):
+        time_to_live = get_settings().ttl_finished_request_entities_in_min * 60
+    elif entity.status == Status.pdf_pending:
+        time_to_live = get_settings().ttl_pdf_pending_request_entities_in_min * 60
+    else:
+        time_to_live = get_settings().ttl_processing_request_entities_in_min * 60
+    if entity.updated_at is not None:
+        time_to_live -= (datetime.now(entity.updated_at.tzinfo) - entity.updated_at).total_seconds()
+    return int(time_to_live)
+
+
+def store_job_status(entity: EricaRequest, only_if_missing=False):
+    """
+    Writes a compact record of the entity to Redis, so that the status endpoints can be answered without the database.
+    It has to be called after every change of the entity. If that fails, the record is removed, so that reads fall back
+    to the database instead of returning an outdated status.
+
+    Reads that fill the cache after a miss only write if there is no record yet, because the job might have written a
+    newer status since the entity was read.
+    """
+    if not get_settings().cache_job_status:
+        return
+    payload = entity.payload.dict() if isinstance(entity.payload, BaseModel) else entity.payload or {}
+    record = entity.copy(update={'payload': {field: payload[field] for field in _CACHED_PAYLOAD_FIELDS
+                                             if field in payload}})
+    key = _get_key(entity.request_id)
+    time_to_live = _get_time_to_live(entity)
+    try:
+        if time_to_live > 0:
+            _get_redis_client().set(key, record.json(include=_CACHED_FIELDS), ex=time_to_live, nx=only_if_missing)
+        elif not only_if_missing:
+            _get_redis_client().delete(key)
+    except Exception as e:
+        logging.getLogger().warning(f"Could not cache the status of {entity}: {e}")
+        try:
+            _get_redis_client().delete(key)
+        except Exception:
+            logging.getLogger().error(f"Could not remove the cached status of {entity}", exc_info=True)
+
+
+def get_cached_job_status(request_id: UUID) -> Optional[EricaRequest]:
+    """Returns the cached record of the entity with only the fields the responses need, or None if it is not cached."""
+    if not get_settings().cache_job_status:
+        return None
+    try:
+        record = _get_redis_client().get(_get_key(request_id))
+    except Exception as e:
+        logging.getLogger().warning(f"Could not read the cached status of {request_id}: {e}")
+        return None
+    return EricaRequest.parse_raw(record) if record is not None else None
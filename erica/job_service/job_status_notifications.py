@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
+from uuid import UUID
+
+import redis
+import redis.asyncio
+
+from erica.config import get_settings
+
+_JOB_STATUS_CHANNEL = 'erica-job-status'
+# After the connection to Redis failed, clients are answered without waiting until it is tried again.
+_RECONNECT_INTERVAL_IN_SEC = 5
+
+
+def is_job_status_notification_enabled():
+    # With the immediate worker, jobs are finished before the request that created them returns.
+    return not get_settings().use_immediate_worker
+
+
+@lru_cache()
+def _get_redis_client():
+    return redis.Redis.from_url(get_settings().queue_url)
+
+
+def publish_job_finished(request_id: UUID):
+    """
+    Tells the API processes that the job with the request_id has finished, so that they can answer requests that wait
+    for it. Waiting is only a shortcut for polling, so a failed notification is logged but does not fail the job.
+    """
+    if not is_job_status_notification_enabled():
+        return
+    try:
+        _get_redis_client().publish(_JOB_STATUS_CHANNEL, str(request_id))
+    except Exception as e:
+        logging.getLogger().warning(f"Could not publish the end of job {request_id}: {e}")
+
+
+class JobStatusListener:
+    """
+    Listens to the notifications of finished jobs with a single Redis subscription per API process and wakes up the
+    requests that wait for one of these jobs.
+    """
+
+    def __init__(self, redis_client: redis.asyncio.Redis, connect_timeout=1):
+        self.redis_client = redis_client
+        self.connect_timeout = connect_timeout
+        self._waiters = {}
+        self._task = None
+        self._subscribed = None
+        self._retry_after = 0
+
+    async def listen(self) -> bool:
+        """Starts the subscription if it is not running yet and returns whether notifications are received."""
+        if self._task is None or self._task.done():
+            if time.monotonic() < self._retry_after:
+                return False
+            self._subscribed = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._subscribed.wait()), self.connect_timeout)
+        except asyncio.TimeoutError:
+            logging.getLogger().warning("Could not subscribe to job status notifications in time.")
+            return False
+        return not self._task.done()
+
+    async def _listen(self):
+        pubsub = self.redis_client.pubsub()
+        try:
+            await pubsub.subscribe(_JOB_STATUS_CHANNEL)
+            self._subscribed.set()
+            async for message in pubsub.listen():
+                if message['type'] == 'message':
+                    self._notify(message['data'].decode())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.getLogger().warning(f"Lost job status notifications: {e}")
+            self._retry_after = time.monotonic() + _RECONNECT_INTERVAL_IN_SEC
+        finally:
+            # Waiting requests cannot be notified anymore, so they should answer with the current status right away.
+            self._subscribed.set()
+            for request_id in list(self._waiters):
+                self._notify(request_id)
+            await pubsub.aclose()
+
+    def _notify(self, request_id: str):
+        for job_finished in self._waiters.get(request_id, ()):
+            job_finished.set()
+
+    @contextmanager
+    def watch(self, request_id: UUID):
+        """Returns an event that is set as soon as the job with the request_id is finished while in the context."""
+        job_finished = asyncio.Event()
+        waiters = self._waiters.setdefault(str(request_id), set())
+        waiters.add(job_finished)
+        try:
+            yield job_finished
+        finally:
+            waiters.discard(job_finished)
+            if not waiters:
+                self._waiters.pop(str(request_id), None)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+_job_status_listener = None
+
+
+def get_job_status_listener() -> Optional[JobStatusListener]:
+    """Returns the listener of the API process, or None if jobs do not notify when they are finished."""
+    global _job_status_listener
+    if not is_job_status_notification_enabled():
+        return None
+    if _job_status_listener is None:
+        _job_status_listener = JobStatusListener(redis.asyncio.Redis.from_url(get_settings().queue_url))
+    return _job_status_listener
+
+
+async def stop_job_status_listener():
+    global _job_status_listener
+    job_status_listener, _job_status_listener = _job_status_listener, None
+    if job_status_listener is not None:
+        await job_status_listener.stop()
@@ -66,3 +66,94 @@ def generate_electronic_steuernummer(steuernummer, bundesland, use_testmerker=Fa
         raise InvalidBufaNumberError(bufa_nr=bufa_nr)
     electronic_steuernummer = bufa_nr + '0' + bundesschema_steuernummer[4:]
     return electronic_steuernummer
+
+
+def _get_weighted_sum(digits, weights):
+    """The weights are aligned to the last digit."""
+    return sum(int(digit) * weight for digit, weight in zip(reversed(digits), reversed(weights)))
+
+
+def _get_eleven_check_digit(digits, weights):
+    """11er-Verfahren: the weighted sum of the digits is subtracted from the next multiple of 11."""
+    check_digit = 11 - _get_weighted_sum(digits, weights) % 11
+    # A difference of 11 stands for 0. A difference of 10 does not give a digit, which is left to ERiC.
+    return {10: None, 11: 0}.get(check_digit, check_digit)
+
+
+def _get_modified_eleven_check_digit(digits):
+    """Modifiziertes 11er-Verfahren"""
+    return _get_eleven_check_digit(digits, (5, 4, 3, 2, 7, 6, 5, 4, 3, 2))
+
+
+def _get_lower_saxony_check_digit(digits):
+    """11er-Verfahren of Niedersachsen"""
+    return _get_eleven_check_digit(digits, (2, 9, 8, 7, 6, 5, 4, 3, 2))
+
+
+def _get_north_rhine_westphalia_check_digit(digits):
+    """11er-Verfahren of Nordrhein-Westfalen: the check digit is the remainder of the weighted sum."""
+    check_digit = _get_weighted_sum(digits, (3, 2, 1, 7, 6, 5, 4, 3, 2, 1)) % 11
+    return check_digit if check_digit != 10 else None
+
+
+def _get_two_check_digit(digits):
+    """2er-Verfahren"""
+    total = 0
+    for position, digit in enumerate(reversed(digits), start=1):
+        summand = (int(digit) + position) % 10
+        if summand:
+            total += (summand * 2 ** position) % 9 or 9
+    return (10 - total % 10) % 10
+
+
+def _get_rhineland_palatinate_check_digit(digits):
+    """Rheinland-Pfalz: the digits are weighted with 1 and 2 alternately and the digit sums of the products added."""
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        product = int(digit) * (2 if position % 2 else 1)
+        total += product // 10 + product % 10
+    return (10 - total % 10) % 10
+
+
+# The check digit procedure of each state and the number of digits of the tax office in the state-specific format.
+# Berlin uses different procedures depending on the district, so its tax numbers are left to ERiC.
+_CHECK_DIGIT_PROCEDURES = {
+    'BW': (2, _get_two_check_digit), 'BY': (3, _get_modified_eleven_check_digit),
+    'BB': (3, _get_modified_eleven_check_digit), 'HB': (2, _get_modified_eleven_check_digit),
+    'HH': (2, _get_modified_eleven_check_digit), 'HE': (2, _get_two_check_digit),
+    'MV': (3, _get_modified_eleven_check_digit), 'ND': (2, _get_lower_saxony_check_digit),
+    'NW': (3, _get_north_rhine_westphalia_check_digit), 'RP': (2, _get_rhineland_palatinate_check_digit),
+    'SL': (3, _get_modified_eleven_check_digit), 'SN': (3, _get_modified_eleven_check_digit),
+    'ST': (3, _get_modified_eleven_check_digit), 'SH': (2, _get_two_check_digit),
+    'TH': (3, _get_modified_eleven_check_digit),
+}
+
+
+def _has_wrong_check_digit(electronic_steuernummer, bundesland):
+    if bundesland not in _CHECK_DIGIT_PROCEDURES:
+        return False
+    number_of_tax_office_digits, get_check_digit = _CHECK_DIGIT_PROCEDURES[bundesland]
+    # The check digit is computed from the tax office, district and distinctive number, without the filler 0
+    digits = electronic_steuernummer[4 - number_of_tax_office_digits:4] + electronic_steuernummer[5:12]
+    check_digit = get_check_digit(digits)
+    return check_digit is not None and check_digit != int(electronic_steuernummer[12])
+
+
+def is_known_invalid_steuernummer(steuernummer, bundesland, use_testmerker=False):
+    """
+    Checks locally whether the steuernummer is rejected in any case: because it does not belong to a valid bufa,
+    because its electronic representation does not consist of exactly 13 digits or because its check digit does not
+    match the check digit procedure (Pruefziffernverfahren) of the state. Cases the procedures cannot decide are left
+    to ERiC, so a steuernummer that is not known to be invalid may still be invalid.
+
+    :param steuernummer: Steuernummer that is specific to one state (10-11 numbers)
+    :param bundesland: The federal state the steuernummer comes from as abbreviation, such as 'BE'
+    """
+    try:
+        electronic_steuernummer = generate_electronic_steuernummer(steuernummer, bundesland, use_testmerker)
+    except InvalidBufaNumberError:
+        return True
+    if not (len(electronic_steuernummer) == 13 and electronic_steuernummer.isascii()
+            and electronic_steuernummer.isdigit()):
+        return True
+    return _has_wrong_check_digit(electronic_steuernummer, bundesland)
@@ -0,0 +1,53 @@
+from xml.sax.saxutils import escape
+
+_INDENT = ' ' * 4
+_ATTRIBUTE_ENTITIES = {'"': '&quot;'}
+
+
+def iter_pretty_xml(element, xml_declaration=None):
+    """ Streams the indented xml for an element tree in one pass, as chunks of text.
+
+    Elements with only text are written on one line, elements without children and text are self-closing and
+    whitespace between elements is dropped. Attributes keep their order. Unqualified elements inherit the default
+    namespace of their parent, like ElementTree writes them after ET.register_namespace('', ...).
+
+    :param element: the root of the ElementTree to write
+    :param xml_declaration: an optional declaration to put in the first line
+    """
+    if xml_declaration:
+        yield xml_declaration + '\n'
+    yield from _iter_element(element, '', None)
+
+
+def to_pretty_xml(element, xml_declaration=None):
+    """ Returns the indented xml for an element tree, see iter_pretty_xml. """
+    return ''.join(iter_pretty_xml(element, xml_declaration))
+
+
+def _iter_element(element, indent, default_namespace):
+    tag = element.tag
+    start_tag = '<'
+    if tag[0] == '{':
+        namespace, tag = tag[1:].split('}', 1)
+        if namespace != default_namespace:
+            default_namespace = namespace
+            start_tag = f'<{tag} xmlns="{escape(namespace, _ATTRIBUTE_ENTITIES)}"'
+        else:
+            start_tag += tag
+    else:
+        start_tag += tag
+    for name, value in element.attrib.items():
+        start_tag += f' {name}="{escape(value, _ATTRIBUTE_ENTITIES)}"'
+
+    if len(element):
+        if element.text and not element.text.isspace():
+            raise ValueError(f"Mixed content in <{tag}> is not supported")
+        yield f'{indent}{start_tag}>\n'
+        child_indent = indent + _INDENT
+        for child in element:
+            yield from _iter_element(child, child_indent, default_namespace)
+        yield f'{indent}</{tag}>\n'
+    elif element.text is None or (element.text and element.text.isspace()):
+        yield f'{indent}{start_tag}/>\n'
+    else:
+        yield f'{indent}{start_tag}>{escape(element.text)}</{tag}>\n'
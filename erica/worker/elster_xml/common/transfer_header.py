@@ -1,8 +1,27 @@
+from xml.etree.ElementTree import Element, SubElement
+from xml.parsers import expat
+
+from erica.config import get_settings
+from erica.worker.elster_xml.common.pretty_xml import to_pretty_xml
 from erica.worker.elster_xml.transfer_header_fields import TransferHeaderFields
 from erica.worker.pyeric.eric import get_eric_wrapper
 
+_ELSTER_NAMESPACE = 'http://www.elster.de/elsterxml/schema/v11'
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+
 
 def add_transfer_header(base_xml: str, th_fields: TransferHeaderFields):
+    """ Adds a <TransferHeader> field with the according th_fields to base_xml.
+
+    :param base_xml: the xml to add the transfer header to
+    :param th_fields: the transfer header fields to include
+    """
+    if get_settings().create_transfer_header_with_eric:
+        return add_transfer_header_with_eric(base_xml, th_fields)
+    return create_xml_with_transfer_header(base_xml, th_fields)
+
+
+def add_transfer_header_with_eric(base_xml: str, th_fields: TransferHeaderFields):
     """ Lets ERiC add a <TransferHeader> field with the according th_fields for xml_top.
 
     :param base_xml: the xml to add the transfer header to
@@ -16,3 +35,97 @@ def add_transfer_header(base_xml: str, th_fields: TransferHeaderFields):
             daten_lieferant=th_fields.datenLieferant)
 
         return xml_string_with_th.decode()
+
+
+def create_xml_with_transfer_header(base_xml: str, th_fields: TransferHeaderFields, vorgang='send-Auth',
+                                    version_client='1'):
+    """ Adds a <TransferHeader> field with the according th_fields to base_xml the same way EricMtCreateTH does,
+    but without a round trip through ERiC. The result is formatted exactly like the one of ERiC.
+
+    :param base_xml: the xml to add the transfer header to, either an <Elster> or a <DatenTeil> element
+    :param th_fields: the transfer header fields to include
+    :param vorgang: the Vorgang of the transfer header
+    :param version_client: the VersionClient of the transfer header
+    """
+    return create_xml_with_transfer_header_from_element(_parse(base_xml), th_fields, vorgang, version_client)
+
+
+def create_xml_with_transfer_header_from_element(xml_top: Element, th_fields: TransferHeaderFields,
+                                                 vorgang='send-Auth', version_client='1'):
+    """ Like create_xml_with_transfer_header, but writes the xml directly from an element tree without serialising
+    and parsing it first. xml_top is left unchanged. """
+    if _local_name(xml_top.tag) == 'DatenTeil':
+        elster_xml = Element('Elster', xmlns=_ELSTER_NAMESPACE)
+        children = [xml_top]
+    elif _local_name(xml_top.tag) == 'Elster':
+        elster_xml = Element(xml_top.tag, xml_top.attrib)
+        children = list(xml_top)
+    else:
+        raise ValueError(f"Cannot add a transfer header to <{xml_top.tag}>, expected <Elster> or <DatenTeil>")
+    if any(_local_name(child.tag) == 'TransferHeader' for child in children):
+        raise ValueError("The xml already contains a transfer header")
+
+    elster_xml.append(_create_transfer_header_element(th_fields, vorgang, version_client))
+    elster_xml.extend(children)
+
+    return to_pretty_xml(elster_xml, _XML_DECLARATION)
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _create_transfer_header_element(th_fields, vorgang, version_client):
+    th_xml = Element('TransferHeader', version='11')
+    SubElement(th_xml, 'Verfahren').text = th_fields.verfahren
+    SubElement(th_xml, 'DatenArt').text = th_fields.datenart
+    SubElement(th_xml, 'Vorgang').text = vorgang
+    # Without a Testmerker the element is left out completely, as ERiC does.
+    if th_fields.testmerker:
+        SubElement(th_xml, 'Testmerker').text = th_fields.testmerker
+    SubElement(SubElement(th_xml, 'SigUser'), 'Sig')
+    SubElement(SubElement(th_xml, 'Empfaenger', id='L'), 'Ziel').text = 'CS'
+    SubElement(th_xml, 'HerstellerID').text = th_fields.herstellerId
+    SubElement(th_xml, 'DatenLieferant').text = th_fields.datenLieferant
+    datei_xml = SubElement(th_xml, 'Datei')
+    SubElement(datei_xml, 'Verschluesselung').text = 'CMSEncryptedData'
+    SubElement(datei_xml, 'Kompression').text = 'GZIP'
+    # ERiC fills in its version only when sending, until then the element is written as an empty pair.
+    SubElement(SubElement(SubElement(datei_xml, 'Erstellung'), 'Eric'), 'Version').text = ''
+    SubElement(th_xml, 'VersionClient').text = version_client
+    return th_xml
+
+
+def _parse(xml):
+    """ Parses xml without namespace processing, so that xmlns attributes keep their position among the others. """
+    parser = expat.ParserCreate()
+    parser.ordered_attributes = True
+    parser.buffer_text = True
+    stack = []
+    roots = []
+
+    def start_element(tag, attributes):
+        element = Element(tag, dict(zip(attributes[::2], attributes[1::2])))
+        (stack[-1] if stack else roots).append(element)
+        stack.append(element)
+
+    def end_element(_tag):
+        stack.pop()
+
+    def character_data(data):
+        element = stack[-1]
+        if len(element):
+            # Text after a child element, only whitespace in the xml we generate
+            element[-1].tail = (element[-1].tail or '') + data
+        else:
+            element.text = (element.text or '') + data
+
+    parser.StartElementHandler = start_element
+    parser.EndElementHandler = end_element
+    parser.CharacterDataHandler = character_data
+    try:
+        parser.Parse(xml, True)
+    except expat.ExpatError as e:
+        raise ValueError(f"Cannot add a transfer header to invalid xml: {e}") from e
+
+    return roots[0]
@@ -1,33 +1,136 @@
-import copy
-from dataclasses import asdict
-
-import xmltodict as xmltodict
+from dataclasses import fields
+from functools import lru_cache
+from xml.sax.saxutils import escape, quoteattr
 
 from erica.worker.elster_xml.common.basic_xml_data_representation import EXml
 
+_XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+_ATTRIBUTE_PREFIX = 'xml_attr_'
+_TEXT_PREFIX = 'xml_text'
 
-class CustomDictParser(dict):
-    """
-    Parse the given object to a dict structure that xmltodict will interpret correctly.
-    Attributes starting with "xml_attr_" will be interpreted as XML attributes.
-    Attributes starting with "xml_text" will be treated as single text children of the XML element.
-    If an attribute has the value "None" it will be not included in the resulting dict.
-    The naming of the special parameters (e.g. #text) is derived form the package xmltodict.
-    """
-    def __init__(self, data):
-        new_data = copy.deepcopy(data)
-        for index, item in enumerate(data):
-            if item[1] is None or item[1] == {}:
-                new_data.remove(item)
-            elif item[0].startswith('xml_attr_'):
-                new_data[index] = (item[0].replace('xml_attr_', '@'), item[1])
-            elif item[0].startswith('xml_text'):
-                new_data[index] = ('#text', item[1])
 
-        super().__init__(new_data)
+class _DataclassLayout:
+    """ Which fields of a dataclass become attributes, text or child elements of its XML element. """
+
+    def __init__(self, dataclass_type):
+        self.attributes = []
+        self.text = None
+        self.elements = []
+        for field in fields(dataclass_type):
+            if field.name.startswith(_ATTRIBUTE_PREFIX):
+                self.attributes.append((field.name, field.name[len(_ATTRIBUTE_PREFIX):]))
+            elif field.name.startswith(_TEXT_PREFIX):
+                self.text = field.name
+            else:
+                self.elements.append(field.name)
+
+
+@lru_cache(maxsize=None)
+def _get_layout(dataclass_type):
+    return _DataclassLayout(dataclass_type)
+
+
+def _is_dataclass_instance(value):
+    return hasattr(type(value), '__dataclass_fields__')
+
+
+def _is_removed(value):
+    return value is None or (isinstance(value, dict) and not value)
+
+
+def _to_text(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def _write_dataclass(tag, data_object, parts, keep_if_empty):
+    """ Writes the element for a dataclass. Returns False and writes nothing if none of its fields are set, unless
+    keep_if_empty is given. """
+    layout = _get_layout(type(data_object))
+    start_tag_index = len(parts)
+    parts.append(None)
+    is_empty = True
+
+    attributes = ''
+    for field_name, attribute_name in layout.attributes:
+        value = getattr(data_object, field_name)
+        if not _is_removed(value):
+            attributes += f' {attribute_name}={quoteattr(str(value))}'
+            is_empty = False
+    for field_name in layout.elements:
+        value = getattr(data_object, field_name)
+        if not _is_removed(value) and _write_field(field_name, value, parts):
+            is_empty = False
+    if layout.text:
+        text = getattr(data_object, layout.text)
+        if not _is_removed(text):
+            parts.append(escape(str(text)))
+            is_empty = False
+
+    if is_empty and not keep_if_empty:
+        del parts[start_tag_index:]
+        return False
+    parts[start_tag_index] = f'<{tag}{attributes}>'
+    parts.append(f'</{tag}>')
+    return True
+
+
+def _write_field(tag, value, parts):
+    """ Writes the elements for a set dataclass field. Returns False if it is left out, like an empty object. """
+    if _is_dataclass_instance(value):
+        return _write_dataclass(tag, value, parts, keep_if_empty=False)
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            _write_item(tag, item, parts)
+    else:
+        _write_item(tag, value, parts)
+    return True
+
+
+def _write_item(tag, value, parts):
+    if _is_dataclass_instance(value):
+        _write_dataclass(tag, value, parts, keep_if_empty=True)
+    elif value is None:
+        parts.append(f'<{tag}></{tag}>')
+    elif isinstance(value, dict):
+        _write_dict(tag, value, parts)
+    else:
+        parts.append(f'<{tag}>{escape(_to_text(value))}</{tag}>')
+
+
+def _write_dict(tag, dict_value, parts):
+    # Plain dicts are written like xmltodict does: '@' keys are attributes and '#text' is the text.
+    attributes = ''.join(f' {key[1:]}={quoteattr(str(value))}' for key, value in dict_value.items()
+                         if key.startswith('@'))
+    parts.append(f'<{tag}{attributes}>')
+    for key, value in dict_value.items():
+        if key.startswith('@') or key == '#text':
+            continue
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            _write_item(key, item, parts)
+    if dict_value.get('#text') is not None:
+        parts.append(escape(str(dict_value['#text'])))
+    parts.append(f'</{tag}>')
 
 
 def convert_object_to_xml(grundsteuer_object: EXml):
-    """ Parses the given object to its XML representation. """
-    grundsteuer_dict = asdict(grundsteuer_object, dict_factory=CustomDictParser)
-    return xmltodict.unparse(grundsteuer_dict)
+    """ Parses the given object to its XML representation.
+
+    The element, attribute and text fields of every dataclass are looked up once and cached, so that large objects
+    are written in one pass without building intermediate dicts. Fields starting with "xml_attr_" become attributes,
+    fields starting with "xml_text" the text of the element, and fields that are None or empty objects are left out.
+    """
+    layout = _get_layout(type(grundsteuer_object))
+    if layout.attributes or layout.text:
+        raise ValueError('The root object can only contain elements')
+
+    parts = [_XML_DECLARATION]
+    number_of_roots = 0
+    for field_name in layout.elements:
+        value = getattr(grundsteuer_object, field_name)
+        if not _is_removed(value) and _write_field(field_name, value, parts):
+            number_of_roots += len(value) if isinstance(value, (list, tuple)) else 1
+    if number_of_roots > 1:
+        raise ValueError('document with multiple roots')
+    return ''.join(parts)
@@ -1,14 +1,16 @@
 import datetime as dt
+import re
 from collections import namedtuple
-from xml.etree.ElementTree import Element, SubElement, tostring, XML
-from xml.dom import minidom
+from xml.etree.ElementTree import Element, SubElement, XML, ParseError
+from xml.parsers import expat
 
 import xml.etree.ElementTree as ET
 
 from erica.config import get_settings
+from erica.worker.elster_xml.common.pretty_xml import to_pretty_xml
+from erica.worker.elster_xml.common.transfer_header import create_xml_with_transfer_header_from_element
 from erica.worker.elster_xml.elster_xml_tree import TOP_ELEMENT_ESTA1A, TOP_ELEMENT_SA, TOP_ELEMENT_AGB, TOP_ELEMENT_HA35A, \
-    TOP_ELEMENT_VOR, ElsterXmlTreeNode
-from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
+    TOP_ELEMENT_VOR, ElsterXmlEmissionPlan
 from erica.worker.elster_xml.transfer_header_fields import get_vast_request_th_fields, get_vast_activation_th_fields, \
     get_vast_list_th_fields, get_vast_beleg_ids_request_th_fields, get_abrufcode_th_fields, \
     get_vast_beleg_request_th_fields, get_est_th_fields, get_vast_revocation_th_fields
@@ -68,9 +70,8 @@ def generate_vorsatz_without_tax_number(year, person_a_idnr, person_b_idnr, firs
 
 
 _ELSTER_NAMESPACE = "http://www.elster.de/elsterxml/schema/v11"
+_XML_DECLARATION_PATTERN = re.compile(r'^\s*<\?xml[^>]*\?>\s*')
 _E10_NAMESPACE = "http://finkonsens.de/elster/elstererklaerung/est/e10/v2021"
-_VAST_RBM_NAMESPACE = "http://finkonsens.de/elster/elstervast/vastrbm/v202001"
-_VAST_BELEGE_NAMESPACE = "http://www.elster.de/2002/XMLSchema"
 _BASE_XML = """<Elster xmlns="{}"></Elster>
 """.format(_ELSTER_NAMESPACE)
 
@@ -84,24 +85,39 @@ _SUPPORTED_STERKL = [
     TOP_ELEMENT_VOR
 ]
 
+_EST_EMISSION_PLAN = ElsterXmlEmissionPlan(_SUPPORTED_STERKL, PERSONS)
+
 
 ##### General Generation Methods #####
 
 def get_belege_xml(belege):
-    belege_xml = Element('Belege')
+    """ Returns the decrypted belege combined in one <Belege> element, see iter_belege_xml. """
+    return ''.join(iter_belege_xml(belege))
+
+
+def iter_belege_xml(belege):
+    """ Streams the decrypted belege combined in one <Belege> element, writing each beleg as soon as it is given.
 
+    The belege are checked to be well-formed and then written as they are, without their XML declaration. So every
+    beleg keeps its own namespace declaration and no namespace has to be registered with ElementTree.
+    """
+    is_empty = True
     for beleg in belege:
-        # Register namespaces to avoid 'ns:0' prefixes in returned XMLs
-        # There are two different namespaces for the data gathering permissions (RBM) and the data gathering itself
-        if _VAST_RBM_NAMESPACE in beleg:
-            ET.register_namespace('', _VAST_RBM_NAMESPACE)
-        elif _VAST_BELEGE_NAMESPACE in beleg:
-            ET.register_namespace('', _VAST_BELEGE_NAMESPACE)
+        if is_empty:
+            is_empty = False
+            yield '<Belege>'
+        yield _get_beleg_without_declaration(beleg)
+    yield '<Belege />' if is_empty else '</Belege>'
 
-        decrypted_data_xml = XML(beleg)
-        belege_xml.append(decrypted_data_xml)
 
-    return ET.tostring(belege_xml).decode()
+def _get_beleg_without_declaration(beleg):
+    try:
+        expat.ParserCreate().Parse(beleg, True)
+    except expat.ExpatError as e:
+        error = ParseError(str(e))
+        error.code, error.position = e.code, (e.lineno, e.offset)
+        raise error from e
+    return _XML_DECLARATION_PATTERN.sub('', beleg, count=1)
 
 
 ##### Full Generation Methods #####
@@ -123,17 +139,13 @@ def generate_full_xml(th_fields, nutzdaten_header_generator, nutzdaten_generator
     else:
         nutzdaten_generator(nutzdaten_block_xml)
 
-    with get_eric_wrapper() as eric_wrapper:
-        xml_string_with_th = _generate_transfer_header(daten_teil_xml, th_fields, eric_wrapper)
-
-    return xml_string_with_th
+    return _add_transfer_header(daten_teil_xml, th_fields)
 
 
 def generate_full_est_xml(form_data, vorsatz, year, empfaenger, nutzdaten_ticket="1", th_fields=None,
                           use_testmerker=False):
     """Generates the full XML for the given `vorsatz` and `fields`. In a first step the
-    <Nutzdaten> part is generated before the ERiC library is called for generating the
-    proper <TransferHeader>.
+    <Nutzdaten> part is generated before the proper <TransferHeader> is added.
     """
 
     ET.register_namespace('', "http://www.elster.de/elsterxml/schema/v11")
@@ -147,10 +159,7 @@ def generate_full_est_xml(form_data, vorsatz, year, empfaenger, nutzdaten_ticket
 
     if not th_fields:
         th_fields = get_est_th_fields(use_testmerker)
-    with get_eric_wrapper() as eric_wrapper:
-        xml_string_with_th = _generate_transfer_header(base_xml, th_fields, eric_wrapper)
-
-    return xml_string_with_th
+    return _add_transfer_header(base_xml, th_fields)
 
 
 def generate_full_vast_request_xml(form_data, th_fields=None, use_testmerker=False):
@@ -229,10 +238,7 @@ def generate_full_vast_beleg_request_xml(form_data, beleg_ids, th_fields=None, u
     if not th_fields:
         th_fields = get_vast_beleg_request_th_fields(use_testmerker)
 
-    with get_eric_wrapper() as eric_wrapper:
-        xml_string_with_th = _generate_transfer_header(daten_teil_xml, th_fields, eric_wrapper=eric_wrapper)
-
-    return xml_string_with_th
+    return _add_transfer_header(daten_teil_xml, th_fields)
 
 
 ##### Nutzdaten Header Methods #####
@@ -357,6 +363,18 @@ def _add_vast_beleg_request_xml_nutzdaten(xml_top, user_data, beleg_id, year='20
 
 
 ##### Methods accessing EricApi #####
+def _add_transfer_header(xml_top, th_fields):
+    """ Adds a <TransferHeader> field with the according th_fields to xml_top. Only lets ERiC create it if configured.
+
+    :param xml_top: the xml to add the transfer header to
+    :param th_fields: the transfer header fields to include
+    """
+    if get_settings().create_transfer_header_with_eric:
+        with get_eric_wrapper() as eric_wrapper:
+            return _generate_transfer_header(xml_top, th_fields, eric_wrapper)
+    return create_xml_with_transfer_header_from_element(xml_top, th_fields)
+
+
 def _generate_transfer_header(xml_top, th_fields, eric_wrapper=None):
     """ Lets ERiC add a <TransferHeader> field with the according th_fields for xml_top.
 
@@ -379,10 +397,7 @@ def _generate_transfer_header(xml_top, th_fields, eric_wrapper=None):
 
 def _pretty(xml, remove_decl=True):
     """Pretty prints a etree xml object."""
-    xml = minidom.parseString(tostring(xml))
-    if remove_decl:
-        xml = xml.childNodes[0]
-    return xml.toprettyxml(indent=" " * 4)
+    return to_pretty_xml(xml, None if remove_decl else '<?xml version="1.0" ?>')
 
 
 ##### Specific Helper Methods #####
@@ -410,78 +425,7 @@ def _add_xml_vorsatz(xml_top, vorsatz, bescheid=2):
 
 
 def _add_xml_fields(xml_top, fields):
-    for sterkl in _SUPPORTED_STERKL:
-        _add_sterkl_fields(xml_top, fields, sterkl)
-
-
-def _add_sterkl_fields(xml_parent, fields, sterkl):
-    """
-        Recursive function to add all xml elements of a given StErkl(sub)Element to the given result xml.
-
-        :param xml_parent: the xml to add the sub-elements to
-        :param fields: data given by the user in all forms that has been elsterified
-        :param sterkl: current StErklSubElement/list with StErkl data
-    """
-    if isinstance(sterkl, ElsterXmlTreeNode):
-        for repetition in range(sterkl.repetitions):
-            sterkl_xml = Element(sterkl.name)
-            if sterkl.is_person_specific:
-                person = PERSONS[repetition]
-                SubElement(sterkl_xml, 'Person').text = person
-                for sub_element in sterkl.sub_elements:
-                    _add_person_specific_sterkl_fields(sterkl_xml, fields, sub_element, person)
-            elif sterkl.is_repeatable and \
-                    any([isinstance(fields[sub_element], list) and len(fields[sub_element]) > 1
-                         if sub_element in fields.keys() else False for sub_element in sterkl.sub_elements]):
-                for sub_element in sterkl.sub_elements:
-                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
-                _add_sterkl_fields(xml_parent, fields, sterkl)
-            else:
-                for sub_element in sterkl.sub_elements:
-                    _add_sterkl_fields(sterkl_xml, fields, sub_element)
-            _add_if_not_empty(xml_parent, sterkl_xml)
-    elif isinstance(sterkl, str):  # Reached a leaf node of the tree
-        if sterkl in fields.keys():
-            if isinstance(fields[sterkl], list):
-                SubElement(xml_parent, sterkl).text = fields[sterkl].pop()
-            else:
-                SubElement(xml_parent, sterkl).text = fields[sterkl]
-
-
-def _add_person_specific_sterkl_fields(xml_parent, input_fields, sterkl, person):
-    """
-        Recursive function to handle StErklSubElements that are person-specific.
-        In that case we need to find the correct input field that matches the current sterkl field AND the person.
-        Just as _add_sterkl_fields() the method adds all filled input_fields that match to xml_parent.
-
-        :param xml_parent: the xml to add the sub-element to
-        :param input_fields: data given by the user in all forms that has been elsterified
-        :param sterkl: the current StErklSubElement to be added to xml_parent
-        :param person: the person for which the fields shall be added
-    """
-    if isinstance(sterkl, ElsterXmlTreeNode):
-        sterkl_xml = Element(sterkl.name)
-        for sub_element in sterkl.sub_elements:
-            _add_person_specific_sterkl_fields(sterkl_xml, input_fields, sub_element, person)
-        _add_if_not_empty(xml_parent, sterkl_xml)
-    elif isinstance(sterkl, str):  # Reached a leaf node of the tree
-        for input_field_id in input_fields.keys():
-            if isinstance(input_field_id, PersonSpecificFieldId) \
-                    and input_field_id.identifier == sterkl \
-                    and input_field_id.person == person:
-                SubElement(xml_parent, sterkl).text = input_fields[PersonSpecificFieldId(sterkl, person)]
-
-
-def _add_if_not_empty(xml_parent, sterkl_xml):
-    """
-        This method adds the given sterkl_xml to the xml_parent only if sterkl_xml is non-empty.
-        Having only a 'Person' tag is considered empty.
-
-        :param xml_parent: the xml to add the sub-element to
-        :param sterkl_xml: sub_element to be added to xml_parent
-    """
-    if [elem.tag for elem in sterkl_xml.iter() if elem is not sterkl_xml and elem.tag != 'Person']:
-        xml_parent.append(sterkl_xml)
+    _EST_EMISSION_PLAN.add_fields(xml_top, fields)
 
 
 def _compute_valid_until_date():
@@ -1,4 +1,8 @@
-# TODO: Use a real tree structure
+from xml.etree.ElementTree import SubElement
+
+from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
+
+
 class ElsterXmlTreeNode(object):
     """
         Our representation of the Elster XML data structure.
@@ -84,3 +88,115 @@ TOP_ELEMENT_SA = ElsterXmlTreeNode(name='SA', sub_elements=[_VOR_KIST, _SA_ZUW])
 TOP_ELEMENT_AGB = ElsterXmlTreeNode(name='AgB', sub_elements=[_AGB_BEH, _BEH_FK_PAUSCH, _AGB_AND_AUFW])
 TOP_ELEMENT_HA35A = ElsterXmlTreeNode(name='HA_35a', sub_elements=[_ST_ERM])
 TOP_ELEMENT_VOR = ElsterXmlTreeNode(name='VOR', sub_elements=[_VOR_WEIT])
+
+
+class _PlanElement(object):
+    """ An element on the path to a field. Compared by identity, as different elements can share a name. """
+    __slots__ = ('name', 'person')
+
+    def __init__(self, name, person=None):
+        self.name = name
+        self.person = person
+
+
+class _FieldEntry(object):
+    __slots__ = ('path', 'name', 'key')
+
+    def __init__(self, path, name, key):
+        self.path = path
+        self.name = name
+        self.key = key
+
+    def add_to(self, xml_parent, fields):
+        value = fields[self.key]
+        SubElement(xml_parent, self.name).text = value[-1] if isinstance(value, list) else value
+
+
+class _RepeatableEntry(object):
+    __slots__ = ('path', 'name', 'fields')
+
+    def __init__(self, path, name, fields):
+        self.path = path
+        self.name = name
+        self.fields = fields
+
+    def add_to(self, xml_parent, fields):
+        """ Adds one element per list item, the n-th one containing the n-th item of every field with a list. """
+        values = [(name, fields[name]) for name in self.fields if name in fields]
+        repetitions = max(len(value) if isinstance(value, list) else 1 for _, value in values)
+        for repetition in range(repetitions):
+            repeated_xml = SubElement(xml_parent, self.name)
+            for name, value in values:
+                if not isinstance(value, list):
+                    SubElement(repeated_xml, name).text = value
+                elif repetition < len(value):
+                    SubElement(repeated_xml, name).text = value[repetition]
+
+
+class ElsterXmlEmissionPlan(object):
+    """
+        The ElsterXmlTreeNode trees compiled into a flat list of fields in document order, indexed by field id and,
+        for person-specific fields, person. Adding the fields of a declaration is then one pass over only the fields
+        that are present, instead of a walk over every tree node.
+
+        Elements are only created for the fields given, so elements without fields (or with only a 'Person') are left
+        out, and repeatable elements are repeated for every item of their list fields.
+    """
+
+    def __init__(self, top_elements, persons):
+        self._entries = []
+        self._positions = {}
+        for top_element in top_elements:
+            self._compile(top_element, (), None, persons)
+
+    def _compile(self, node, path, person, persons):
+        if isinstance(node, str):
+            key = PersonSpecificFieldId(node, person) if person else node
+            self._add_entry(_FieldEntry(path, node, key), [key])
+        elif node.is_person_specific and not person:
+            for person in persons[:node.repetitions]:
+                element_path = path + (_PlanElement(node.name, person),)
+                for sub_element in node.sub_elements:
+                    self._compile(sub_element, element_path, person, persons)
+        elif node.is_repeatable and not person:
+            if not all(isinstance(sub_element, str) for sub_element in node.sub_elements):
+                raise ValueError(f"Repeatable element {node.name} can only contain fields")
+            self._add_entry(_RepeatableEntry(path, node.name, node.sub_elements), node.sub_elements)
+        else:
+            if node.repetitions != 1 and not person:
+                raise ValueError(f"Only person-specific elements can be repeated, not {node.name}")
+            element_path = path + (_PlanElement(node.name),)
+            for sub_element in node.sub_elements:
+                self._compile(sub_element, element_path, person, persons)
+
+    def _add_entry(self, entry, keys):
+        for key in keys:
+            self._positions.setdefault(key, []).append(len(self._entries))
+        self._entries.append(entry)
+
+    def add_fields(self, xml_parent, fields):
+        """
+            Adds all fields that are part of the plan to xml_parent, together with the elements on their paths.
+
+            :param xml_parent: the xml to add the elements to
+            :param fields: data given by the user in all forms that has been elsterified
+        """
+        positions = sorted({position for key in fields for position in self._positions.get(key, ())})
+        open_path = []
+        open_elements = []
+        for position in positions:
+            entry = self._entries[position]
+            common_length = 0
+            for open_element, element in zip(open_path, entry.path):
+                if open_element is not element:
+                    break
+                common_length += 1
+            del open_path[common_length:]
+            del open_elements[common_length:]
+            for element in entry.path[common_length:]:
+                element_xml = SubElement(open_elements[-1] if open_elements else xml_parent, element.name)
+                if element.person:
+                    SubElement(element_xml, 'Person').text = element.person
+                open_path.append(element)
+                open_elements.append(element_xml)
+            entry.add_to(open_elements[-1] if open_elements else xml_parent, fields)
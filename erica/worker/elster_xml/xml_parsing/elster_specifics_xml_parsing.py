@@ -1,4 +1,4 @@
-from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_from_xml, get_elements_text_from_xml_element, _get_element_from_xml, remove_declaration_and_namespace
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_from_xml, get_elements_text_from_xml, get_elements_text_from_xml_element, _get_element_from_xml, remove_declaration_and_namespace
 
 
 def get_state_ids(xml_string):
@@ -25,6 +25,11 @@ def get_tax_offices(xml_string):
     return tax_offices
 
 
+def get_eric_library_version(xml_string):
+    """ Returns the versions of the ERiC libraries. They are released together, so usually there is only one. """
+    return ','.join(sorted(set(get_elements_text_from_xml(xml_string, 'Version'))))
+
+
 def get_antrag_id_from_xml(xml_string):
     return _get_element_from_xml(xml_string, 'AntragsID')
 
@@ -1,10 +1,60 @@
 import re
 import xml.etree.ElementTree as ET
+from io import BytesIO, StringIO
+
+
+class NamespaceFreeXml:
+    """
+    An XML document that is parsed only once, with the namespaces removed from all tags. Several values can be
+    extracted from it without parsing the document again.
+    """
+
+    def __init__(self, xml):
+        """
+        :param xml: the XML document as str or bytes. Raises a ParseError if it is not well-formed.
+        """
+        source = StringIO(xml) if isinstance(xml, str) else BytesIO(xml)
+        events = ET.iterparse(source, events=('start',))
+        for _, element in events:
+            if element.tag[0] == '{':
+                element.tag = element.tag.split('}', 1)[1]
+        self.root = events.root
+
+    def find(self, element_xpath):
+        """ Returns the first element below the root that matches the xpath, or None. """
+        return self.root.find('.//' + element_xpath)
+
+    def findall(self, element_xpath):
+        """ Returns all elements below the root that match the xpath. """
+        return self.root.findall('.//' + element_xpath)
+
+    def extract(self, element_xpaths: dict, required=False):
+        """
+        Returns the value of the first matching element for every given xpath, keyed like element_xpaths.
+        Elements with children are returned as XML, other elements as their text and missing elements as None.
+
+        :param element_xpaths: a dict of the result keys and the xpaths of the elements to extract
+        :param required: if True, a missing element raises a ValueError instead
+        """
+        result = {}
+        for key, element_xpath in element_xpaths.items():
+            element = self.find(element_xpath)
+            if element is None and required:
+                raise ValueError(f"Required element {element_xpath} not found")
+            result[key] = _get_element_value(element)
+        return result
+
+
+def _get_element_value(element):
+    if element is None:
+        return None
+    if list(element):  # element has children
+        return ET.tostring(element, encoding='utf-8', method='xml')
+    return element.text
 
 
 def _get_element_from_xml(xml_string: str, element_xpath: str):
-    xml_tree = remove_declaration_and_namespace(xml_string)
-    element = xml_tree.find('.//' + element_xpath)
+    element = NamespaceFreeXml(xml_string).find(element_xpath)
     if list(element):  # element has children
         return ET.tostring(element, encoding='utf-8', method='xml')
     return element.text
@@ -39,6 +89,17 @@ def get_elements_text_from_xml(xml_string, element):
     return [el.text for el in get_elements_from_xml(xml_string, element)]
 
 
+def iter_elements_text_from_xml(xml_string, tag_name):
+    """
+    Yields the text of every element with the given tag, ignoring namespaces, as soon as it has been parsed. Parsed
+    elements are cleared, so that large documents are not kept in memory.
+    """
+    for _, element in ET.iterparse(StringIO(xml_string), events=('end',)):
+        if element.tag == tag_name or element.tag.endswith('}' + tag_name):
+            yield element.text
+            element.clear()
+
+
 def get_elements_key_value_from_xml(input_xml, element, key):
     xml_string = ET.tostring(input_xml).decode()
     xml_tree = remove_declaration_and_namespace(xml_string)
@@ -1,23 +1,37 @@
 import logging
-import tempfile
-from threading import local
+import os
 
 import sentry_sdk
 
 from erica.config import get_settings
+from erica.worker.pyeric.eric_metrics import start_worker_metrics_server, WORKER_READY
+from erica.worker.pyeric.eric_pool import get_eric_pool, shutdown_eric_pool
 from huey import RedisHuey
 
 huey = RedisHuey('erica-huey-queue', url=get_settings().queue_url, immediate=get_settings().use_immediate_worker)
-eric_wrapper = local()
+# The PDFs are rendered on their own queue, so that they can be processed by workers without a certificate.
+pdf_huey = RedisHuey('erica-huey-pdf-queue', url=get_settings().queue_url,
+                     immediate=get_settings().use_immediate_worker)
+# Webhooks are delivered on their own queue, so that slow receivers never hold up the workers.
+webhook_huey = RedisHuey('erica-huey-webhook-queue', url=get_settings().queue_url,
+                         immediate=get_settings().use_immediate_worker)
 
 
 @huey.on_startup()
+@pdf_huey.on_startup()
 def huey_init():
     init_sentry()
+    start_worker_metrics_server()
     eric_wrapper_init()
     init_db_session()
 
 
+@webhook_huey.on_startup()
+def webhook_huey_init():
+    init_sentry()
+    init_db_session()
+
+
 # Starlette >0.24.0 only creates the middleware once before the first request to the api.
 # Therefore, we need to create the middle ware manually for huey because no api is called
 def init_db_session():
@@ -39,30 +53,55 @@ def init_sentry():
         pass
 
 
+# The startup hook runs once per worker thread. The ERiC instances are shared between the threads via the pool, which
+# is only filled up on the first call.
 def eric_wrapper_init():
-    global eric_wrapper
-    from erica.worker.pyeric.eric import EricWrapper
-    eric_wrapper.wrapper_instance = EricWrapper()
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        eric_wrapper.wrapper_instance.initialise(log_path=tmp_dir)
+    eric_pool = get_eric_pool()
+    eric_pool.start()
+    if eric_pool.is_ready:
+        report_worker_ready()
+
+
+def report_worker_ready():
+    """Reports the worker as ready via its metrics and, if configured, a readiness file that can be used by an exec
+    readiness probe."""
+    WORKER_READY.set(1)
+    readiness_file = get_settings().worker_readiness_file
+    if readiness_file:
+        with open(readiness_file, 'w'):
+            pass
+
+
+def report_worker_not_ready():
+    WORKER_READY.set(0)
+    readiness_file = get_settings().worker_readiness_file
+    if readiness_file and os.path.exists(readiness_file):
+        os.remove(readiness_file)
 
 
 def get_initialised_eric_wrapper():
-    return eric_wrapper.wrapper_instance
+    """Returns a context manager that checks out an initialised ERiC wrapper from the pool."""
+    return get_eric_pool().checkout()
 
 
 @huey.on_shutdown()
+@pdf_huey.on_shutdown()
 def shutdown_eric_wrapper():
-    get_initialised_eric_wrapper().shutdown()
+    report_worker_not_ready()
+    shutdown_eric_pool()
 
 
 @huey.pre_execute()
+@pdf_huey.pre_execute()
+@webhook_huey.pre_execute()
 def start_sentry_transaction(task):
     task.sentry_txn = sentry_sdk.start_transaction(op="huey task", name=task.name)
     sentry_sdk.set_tag("huey.task_id", task.id)
 
 
 @huey.post_execute()
+@pdf_huey.post_execute()
+@webhook_huey.post_execute()
 def finish_sentry_transaction(task, task_value, exc):
     if exc:
         task.sentry_txn.set_status("internal_error")
@@ -1,7 +1,8 @@
 import logging
 
-from erica.worker.jobs.job import perform_job
-from erica.worker.huey import huey
+from erica.config import get_settings
+from erica.worker.jobs.job import perform_job, perform_pdf_job
+from erica.worker.huey import huey, pdf_huey
 from erica.domain.model.erica_request import RequestType
 from erica.domain.sqlalchemy.database import session_scope
 
@@ -15,4 +16,18 @@ def send_grundsteuer(request_id):
                     repository=service.repository,
                     service=service,
                     payload_type=service.payload_type,
-                    logger=logging.getLogger())
+                    logger=logging.getLogger(),
+                    pdf_job=render_grundsteuer_pdf if get_settings().defer_pdf_rendering else None)
+
+
+@pdf_huey.task(expires=3600, retries=2, retry_delay=30, context=True)
+def render_grundsteuer_pdf(request_id, task=None):
+    from erica.job_service.job_service_factory import get_job_service
+    with session_scope():
+        service = get_job_service(RequestType.grundsteuer)
+        perform_pdf_job(request_id=request_id,
+                        repository=service.repository,
+                        service=service,
+                        payload_type=service.payload_type,
+                        logger=logging.getLogger(),
+                        last_attempt=task is None or not task.retries)
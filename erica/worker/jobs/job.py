@@ -1,26 +1,33 @@
 from datetime import datetime
 from logging import Logger
-from typing import Type
+from typing import Type, Callable, Optional
 from uuid import UUID
 
 from pydantic import ValidationError
 
 from erica.job_service.job_service import JobServiceInterface
+from erica.job_service.job_status_cache import store_job_status
+from erica.job_service.job_status_notifications import publish_job_finished
+from erica.worker.jobs.webhook_jobs import enqueue_webhook
 from erica.domain.repositories import base_repository_interface
-from erica.domain.model.erica_request import EricaRequest, Status
+from erica.domain.model.erica_request import EricaRequest, Status, PDF_STORED_RESULT_KEY
 from erica.domain.model.base_domain_model import BasePayload
-from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, get_error_codes_from_server_err_msg, \
-    EricTransferError
+from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, EricTransferError
 from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
 
 
 def perform_job(request_id: UUID, repository: base_repository_interface, service: JobServiceInterface,
-                payload_type: Type[BasePayload], logger: Logger):
+                payload_type: Type[BasePayload], logger: Logger, pdf_job: Optional[Callable] = None):
     """
     The basic implementation for a job that is put on the Erica queue. It will get an entity, interact with the ERiC
     library using the service and then update the entity according to the result from the service.
 
-    It also measures the elapsed time during job execution.
+    If a pdf_job is given, the PDF has not been created by the service. Instead, the pdf_job is enqueued to create it
+    and the entity stays in pdf_pending until it is done. Unlike processing entities, those are never set to failed
+    because their data has already been sent.
+
+    It also measures the elapsed time during job execution and notifies the API and, if it gave a callback URL, the
+    client once the entity is finished.
     """
     try:
         entity: EricaRequest = repository.get_by_job_request_id(request_id)
@@ -34,7 +41,8 @@ def perform_job(request_id: UUID, repository: base_repository_interface, service
         entity.error_code = "ParsingError"
         entity.error_message = "Failed to parse payload"
         entity.status = Status.failed
-        repository.update(entity.id, entity)
+        _update_entity(repository, entity)
+        _notify_job_finished(request_id, entity)
         raise
 
     try:
@@ -46,18 +54,23 @@ def perform_job(request_id: UUID, repository: base_repository_interface, service
             # We do not want to send the server_response or eric_response to the clients in the success case
             response.pop('server_response', None)
             response.pop('eric_response', None)
+            # The PDF is stored on its own, so that it is not loaded with every status request
+            pdf = response.pop('pdf', None)
             entity.result = response
-            entity.status = Status.success
-            repository.update(entity.id, entity)
+            if pdf is not None:
+                _store_pdf(service, entity, pdf, logger)
+            entity.status = Status.pdf_pending if pdf_job else Status.success
+            _update_entity(repository, entity)
+            if pdf_job:
+                _enqueue_pdf_job(pdf_job, entity, repository, logger)
         except EricProcessNotSuccessful as e:
             error_response = e.generate_error_response(True)
-            transfer_errors_xml = error_response.get('server_err_msg').get('NDH_ERR_XML') if error_response.get('server_err_msg') else None
 
             # We only want to log the transfer codes for general EricTransferErrors
-            if transfer_errors_xml and e.__class__ is EricTransferError:
+            if e.__class__ is EricTransferError and e.server_error_codes:
                 logger.warning(
                     f"Job failed: {entity}. Got error: {error_response.get('code')}. "
-                    f"TransferErrors: {get_error_codes_from_server_err_msg(transfer_errors_xml)}",
+                    f"TransferErrors: {e.server_error_codes}",
                     exc_info=True
                 )
             else:
@@ -70,7 +83,7 @@ def perform_job(request_id: UUID, repository: base_repository_interface, service
             validation_problems = error_response.get('validation_problems')
             entity.result = {"validation_errors": validation_problems} if validation_problems else None
             entity.status = Status.failed
-            repository.update(entity.id, entity)
+            _update_entity(repository, entity)
 
         # TODO: NF 2022-07-06: this should be logged at info level, but huey doesn't yet log properly.
         # setting the level to warning is the quickest way to get this into our production logs.
@@ -80,9 +93,86 @@ def perform_job(request_id: UUID, repository: base_repository_interface, service
         entity.error_code = "UnkownException"
         entity.error_message = "An unknown error occurred"
         entity.status = Status.failed
-        repository.update(entity.id, entity)
+        _update_entity(repository, entity)
         raise
     finally:
         end_time = datetime.now()
         elapsed_time = end_time - start_time
         logger.info(f"Job running time for {entity}: {elapsed_time}")
+        if entity.status in (Status.success, Status.failed):
+            _notify_job_finished(request_id, entity)
+
+
+def _update_entity(repository: base_repository_interface, entity: EricaRequest):
+    """Stores the changed entity and its status for the status endpoints."""
+    store_job_status(repository.update(entity.id, entity))
+
+
+def _store_pdf(service: JobServiceInterface, entity: EricaRequest, pdf: bytes, logger: Logger):
+    """Stores the PDF and marks it as stored in the result. As the data has already been sent, a failure is only
+    logged and the entity stays successful without a PDF."""
+    try:
+        service.store_pdf(entity.id, pdf)
+        entity.result[PDF_STORED_RESULT_KEY] = True
+    except Exception:
+        logger.error(f"Could not store the PDF for {entity}", exc_info=True)
+
+
+def _notify_job_finished(request_id: UUID, entity: EricaRequest):
+    publish_job_finished(request_id)
+    enqueue_webhook(entity)
+
+
+def _enqueue_pdf_job(pdf_job: Callable, entity: EricaRequest, repository: base_repository_interface, logger: Logger):
+    try:
+        pdf_job(entity.request_id)
+    except Exception:
+        # The data has already been sent, so the entity must not be marked as failed.
+        logger.error(f"Could not enqueue PDF rendering for {entity}", exc_info=True)
+        entity.status = Status.success
+        _update_entity(repository, entity)
+
+
+def perform_pdf_job(request_id: UUID, repository: base_repository_interface, service: JobServiceInterface,
+                    payload_type: Type[BasePayload], logger: Logger, last_attempt: bool = True):
+    """
+    Renders and stores the PDF for an entity that has already been sent by perform_job and marks the entity as
+    successful.
+
+    As the data has already been sent, a failed rendering must not mark the entity as failed. Instead, the error is
+    raised to retry the job. On the last attempt, the entity is marked as successful without a PDF.
+    """
+    try:
+        entity: EricaRequest = repository.get_by_job_request_id(request_id)
+    except EntityNotFoundError:
+        logger.warning(f"Entity not found for request_id {request_id}", exc_info=True)
+        raise
+
+    start_time = datetime.now()
+    try:
+        service.store_pdf(entity.id, service.render_pdf(payload_type.parse_obj(entity.payload)))
+        entity.result = {**(entity.result or {}), PDF_STORED_RESULT_KEY: True}
+    except Exception:
+        if not last_attempt:
+            logger.warning(f"PDF rendering failed for {entity}, retrying", exc_info=True)
+            raise
+        logger.error(f"PDF rendering failed for {entity}", exc_info=True)
+    finally:
+        logger.info(f"PDF rendering time for {entity}: {datetime.now() - start_time}")
+
+    entity.status = Status.success
+    _update_entity(repository, entity)
+    _notify_job_finished(request_id, entity)
+
+
+def finish_old_pdf_pending_entities(repository: base_repository_interface, ttl: int) -> int:
+    """
+    Marks the entities whose PDF has not been rendered within the ttl as successful without a PDF, just like
+    perform_pdf_job after its last attempt, and notifies the API and the clients. Returns the number of entities.
+    """
+    entities = repository.get_old_pdf_pending_entities(ttl)
+    for entity in entities:
+        entity.status = Status.success
+        _update_entity(repository, entity)
+        _notify_job_finished(entity.request_id, entity)
+    return len(entities)
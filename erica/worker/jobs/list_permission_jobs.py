@@ -1,5 +1,4 @@
 from erica.worker.elster_xml import elster_xml_generator
-from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import remove_declaration_and_namespace
 from erica.worker.huey import huey
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful
 from erica.worker.pyeric.pyeric_controller import PermitListingPyericProcessController
@@ -32,5 +31,4 @@ def _get_eric_response_datenteil(xml):
         print(e.generate_error_response(True))
         return
 
-    xml = remove_declaration_and_namespace(result.server_response)
-    return xml.find('.//DatenTeil')
\ No newline at end of file
+    return result.get_parsed_server_response().find('DatenTeil')
\ No newline at end of file
@@ -0,0 +1,12 @@
+from huey import crontab
+
+from erica.worker.huey import huey
+from erica.worker.tax_office_directory import refresh_tax_office_directory
+
+
+# Every worker runs the periodic task, but only one refreshes at a time. As long as the ERiC version does not change,
+# a refresh only asks ERiC for its version.
+@huey.periodic_task(crontab(minute='0'), expires=3600)
+@huey.lock_task('refresh-tax-office-directory')
+def refresh_tax_office_directory_periodically():
+    refresh_tax_office_directory()
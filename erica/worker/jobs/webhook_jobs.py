@@ -0,0 +1,49 @@
+import logging
+from uuid import UUID
+
+from erica.config import get_settings
+from erica.domain.model.erica_request import EricaRequest, RequestType
+from erica.domain.sqlalchemy.database import session_scope
+from erica.worker.huey import webhook_huey
+from erica.worker.webhooks import get_callback_url, get_webhook_response, post_webhook, get_retry_delay
+
+
+def enqueue_webhook(entity: EricaRequest):
+    """
+    Puts the delivery of the result of a finished entity on the webhook queue if a callback URL is given for it.
+
+    The queue works as a bounded outbox. If it is full because receivers are slow or down, the webhook is dropped
+    instead of growing the queue further. The client can still get the result from the status endpoint.
+    """
+    callback_url = get_callback_url(entity)
+    if callback_url is None:
+        return
+    if not get_settings().webhook_secret:
+        logging.getLogger().warning(f"No webhook secret set, not posting the result of {entity} to its callback URL")
+        return
+    try:
+        if webhook_huey.pending_count() + webhook_huey.scheduled_count() >= get_settings().webhook_outbox_size:
+            logging.getLogger().warning(
+                f"Webhook outbox is full, not posting the result of {entity} to its callback URL")
+            return
+        deliver_webhook(entity.request_id, entity.type, callback_url)
+    except Exception:
+        # The entity is finished anyway, so it must not be marked as failed, and an error of the job must not be hidden.
+        logging.getLogger().error(f"Could not enqueue webhook for {entity}", exc_info=True)
+
+
+@webhook_huey.task()
+def deliver_webhook(request_id: UUID, request_type: RequestType, callback_url: str, attempt: int = 1):
+    try:
+        with session_scope():
+            response = get_webhook_response(request_type, request_id)
+        post_webhook(callback_url, request_id, response)
+    except Exception:
+        if attempt >= get_settings().webhook_max_attempts:
+            logging.getLogger().error(f"Giving up on webhook for {request_id} after {attempt} attempts",
+                                      exc_info=True)
+            return
+        retry_delay = get_retry_delay(attempt)
+        logging.getLogger().warning(f"Webhook for {request_id} failed, retrying in {retry_delay} seconds",
+                                    exc_info=True)
+        deliver_webhook.schedule((request_id, request_type, callback_url, attempt + 1), delay=retry_delay)
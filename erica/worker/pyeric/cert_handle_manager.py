@@ -0,0 +1,76 @@
+import logging
+from contextlib import contextmanager
+
+from erica.worker.pyeric.eric_errors import EricCryptError, EricGlobalValidationError, EricProcessNotSuccessful, \
+    EricTransferError
+
+logger = logging.getLogger('eric')
+
+# Errors that are caused by the request data or the answer of the ELSTER servers, not by the certificate.
+_ERRORS_UNRELATED_TO_CERTIFICATE = (EricGlobalValidationError, EricTransferError)
+
+
+class CertHandleManager:
+    """Keeps the certificate handle of one ERiC instance open for the lifetime of that instance.
+
+    Opening a handle to the dongle is a round trip to the smart card, so we only do it once. After a crypt error the
+    handle is closed and reopened on its next use. After other failures it is revalidated by reading the certificate
+    properties before it is used again.
+    """
+
+    def __init__(self, eric_wrapper):
+        self._eric_wrapper = eric_wrapper
+        self._cert_handle = None
+        self._cert_properties = None
+        self._needs_revalidation = False
+
+    @property
+    def is_open(self):
+        return self._cert_handle is not None
+
+    @contextmanager
+    def cert_handle(self):
+        cert_handle = self._get_valid_cert_handle()
+        try:
+            yield cert_handle
+        except EricCryptError:
+            logger.warning("Crypt error while using the certificate handle. Reopening it on next use.")
+            self.close()
+            raise
+        except _ERRORS_UNRELATED_TO_CERTIFICATE:
+            raise
+        except EricProcessNotSuccessful:
+            self._needs_revalidation = True
+            raise
+
+    def get_cert_properties(self):
+        if self._cert_properties is None:
+            with self.cert_handle() as cert_handle:
+                self._cert_properties = self._eric_wrapper.read_cert_properties(cert_handle)
+        return self._cert_properties
+
+    def close(self):
+        cert_handle, self._cert_handle = self._cert_handle, None
+        self._cert_properties = None
+        self._needs_revalidation = False
+        if cert_handle is None:
+            return
+        try:
+            self._eric_wrapper.close_cert_handle(cert_handle)
+        except EricProcessNotSuccessful as e:
+            logger.warning("Could not close certificate handle", exc_info=e)
+
+    def _get_valid_cert_handle(self):
+        if self._cert_handle is not None and self._needs_revalidation:
+            self._revalidate()
+        if self._cert_handle is None:
+            self._cert_handle = self._eric_wrapper.get_cert_handle()
+        return self._cert_handle
+
+    def _revalidate(self):
+        self._needs_revalidation = False
+        try:
+            self._cert_properties = self._eric_wrapper.read_cert_properties(self._cert_handle)
+        except EricProcessNotSuccessful as e:
+            logger.info("Certificate handle is no longer valid. Reopening it.", exc_info=e)
+            self.close()
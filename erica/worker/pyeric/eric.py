@@ -1,23 +1,47 @@
 import logging
 import os
-import tempfile
 from contextlib import contextmanager
-from ctypes import Structure, c_int, c_uint32, c_char_p, c_void_p, pointer, CDLL, RTLD_GLOBAL
-from dataclasses import dataclass
-from typing import ByteString
+from contextvars import ContextVar
+from ctypes import Structure, c_int, c_char_p, c_ubyte, pointer, CDLL, RTLD_GLOBAL
+from dataclasses import dataclass, field
+from typing import ByteString, Optional
 
 from erica.config import get_settings, Settings
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import NamespaceFreeXml
+from erica.worker.pyeric.cert_handle_manager import CertHandleManager
+from erica.worker.pyeric.eric_bindings import EricBindings
+from erica.worker.pyeric.eric_buffer_pool import EricBufferPool
 from erica.worker.pyeric.eric_errors import check_result, check_handle, check_xml, EricWrongTaxNumberError
+from erica.worker.pyeric.eric_metrics import ERIC_BUFFERS_ALLOCATED, ERIC_CERT_HANDLES_OPEN
+from erica.worker.pyeric.eric_pool import get_shared_eric_instance
+from erica.worker.pyeric.pdf_capture import capture_pdf
+from erica.worker.pyeric.simulated_eric import ERIC_BACKEND_SIMULATED, SimulatedEricLibrary
 from erica.worker.huey import huey, get_initialised_eric_wrapper
 
 logger = logging.getLogger('eric')
 
+
+class EricBufferContent(bytes):
+    """The content of an ERiC return buffer. The same content is decoded in several places (logging, error handling,
+    controllers), so the decoded string is computed once and cached."""
+
+    def decode(self, encoding='utf-8', errors='strict'):
+        if encoding != 'utf-8' or errors != 'strict':
+            return super().decode(encoding, errors)
+        try:
+            return self._decoded
+        except AttributeError:
+            self._decoded = super().decode()
+            return self._decoded
+
+
 @dataclass
 class EricResponse:
     result_code: int
     eric_response: ByteString
     server_response: ByteString
     pdf: ByteString = None
+    parsed_server_response: Optional[NamespaceFreeXml] = field(default=None, repr=False, compare=False)
 
 
 # As explained in the original ERiC documentation
@@ -38,25 +62,44 @@ class EricVerschluesselungsParameterT(Structure):
                 ("abrufCode", c_char_p)]
 
 
+_eric_wrapper_checkout = ContextVar('eric_wrapper_checkout', default=None)
+
+
+@contextmanager
+def use_eric_wrapper_checkout(checkout):
+    """Within this context manager, get_eric_wrapper() checks out the ERiC wrappers with the given function, e.g. from
+    an instance pool of the API, instead of using the pool or the instance of the process."""
+    token = _eric_wrapper_checkout.set(checkout)
+    try:
+        yield
+    finally:
+        _eric_wrapper_checkout.reset(token)
+
+
 # TODO: Unify usage of EricWrapper; rethink having eric_wrapper as a parameter
 @contextmanager
 def get_eric_wrapper():
-    """This context manager returns an initialised eric wrapper; it will ensure that the ERiC API is shutdown after
-    use. """
-    if get_settings().run_with_huey:
-        yield get_initialised_eric_wrapper()
+    """This context manager returns an initialised eric wrapper. Within huey it is checked out from the instance pool,
+    otherwise the process-wide shared instance is used. Both are shut down when the worker or process stops. Within
+    use_eric_wrapper_checkout(), the wrapper is checked out as given there."""
+    checkout = _eric_wrapper_checkout.get()
+    if checkout is not None:
+        with checkout() as eric:
+            yield eric
+    elif get_settings().run_with_huey:
+        with get_initialised_eric_wrapper() as eric:
+            yield eric
     else:
-        eric = EricWrapper()
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            eric.initialise(log_path=tmp_dir)
+        with get_shared_eric_instance().acquire() as eric:
+            yield eric
+
 
-            try:
-                yield eric
-            finally:
-                eric.shutdown()
-                with open(os.path.join(tmp_dir, 'eric.log'), "r") as eric_log:
-                    eric_log_data = eric_log.read()
-                    logger.debug(eric_log_data)
+def load_eric_library():
+    """Loads the native ERiC library or, if configured, the simulated one that needs neither binaries nor a
+    certificate."""
+    if get_settings().eric_backend == ERIC_BACKEND_SIMULATED:
+        return SimulatedEricLibrary.from_settings()
+    return CDLL(Settings.get_eric_dll_path(), RTLD_GLOBAL)
 
 
 def verify_using_stick():
@@ -97,18 +140,28 @@ class EricWrapper(object):
     def __init__(self):
         """Creates a new instance of the pyeric wrapper.
         """
-        self.eric = CDLL(Settings.get_eric_dll_path(), RTLD_GLOBAL)
+        self.eric = load_eric_library()
         self.eric_instance = None
+        self.cert_handle_manager = CertHandleManager(self)
+        self.buffer_pool = EricBufferPool(self)
         logger.debug(f"eric: {self.eric}")
 
+    @property
+    def eric(self):
+        return self._eric
+
+    @eric.setter
+    def eric(self, library):
+        """Setting the library also replaces its bindings, whose functions are typed on their first use."""
+        self._eric = library
+        self.eric_functions = EricBindings(library)
+
     def initialise(self, log_path=None):
         """Initialises ERiC and a successful return from this method shall indicate
         that the .so file was found and loaded successfully. Where `initialise` is called,
         `shutdown` shall be called when done.
         """
-        fun_init = self.eric.EricMtInstanzErzeugen
-        fun_init.argtypes = [c_char_p, c_char_p]
-        fun_init.restype = c_void_p
+        fun_init = self.eric_functions.EricMtInstanzErzeugen
 
         curr_dir = os.path.dirname(os.path.realpath(__file__))
         plugin_path = c_char_p(os.path.join(curr_dir, "../lib/plugins2").encode())
@@ -120,55 +173,63 @@ class EricWrapper(object):
 
     def shutdown(self):
         """Shuts down ERiC and releases resources. One must not use the object afterwards."""
-        fun_shutdown = self.eric.EricMtInstanzFreigeben
-        fun_shutdown.argtypes = [c_void_p]
-        fun_shutdown.restype = c_int
+        self.cert_handle_manager.close()
+        self.buffer_pool.close()
+        fun_shutdown = self.eric_functions.EricMtInstanzFreigeben
         res = fun_shutdown(self.eric_instance)
         check_result(res)
         logger.info(f"fun_shutdown res: {res}")
 
     def get_version(self):
         """Get the currently used library versions."""
-        fun_get_version = self.eric.EricMtVersion
-        fun_get_version.argtypes = [c_void_p, c_void_p]
-        fun_get_version.restype = c_int
+        fun_get_version = self.eric_functions.EricMtVersion
 
-        eric_response_buffer = self.create_buffer()
-        res = fun_get_version(self.eric_instance, eric_response_buffer)
-        check_result(res)
+        with self.buffer_pool.buffer() as eric_response_buffer:
+            res = fun_get_version(self.eric_instance, eric_response_buffer)
+            check_result(res)
 
-        eric_response = self.read_buffer(eric_response_buffer)
+            eric_response = self.read_buffer(eric_response_buffer)
         return eric_response
 
     def validate(self, xml, data_type_version):
         """Validate the given XML using the built-in plausibility checks."""
         return self.process(xml, data_type_version, EricWrapper.ERIC_VALIDIERE)
 
-    def validate_and_send(self, xml, data_type_version):
+    def validate_and_send(self, xml, data_type_version, print_pdf=True):
         """Validate and (more importantly) send the given XML using the built-in
         plausibility checks. For this a test certificate and pin must be provided and the
-        `data_type_version` shall match the XML data. When a `print_path` is given, a PDF
-        will be created under that path."""
-
-        with tempfile.NamedTemporaryFile() as temporary_pdf_file:
-            print_params = self.alloc_eric_druck_parameter_t(temporary_pdf_file.name)
-
-            cert_handle = self.get_cert_handle()
-
-            try:
-                cert_params = self.alloc_eric_verschluesselungs_parameter_t(cert_handle)
-                flags = EricWrapper.ERIC_SENDE | EricWrapper.ERIC_DRUCKE
-
-                eric_result = self.process(
-                    xml, data_type_version,
-                    flags,
-                    cert_params=pointer(cert_params),
-                    print_params=pointer(print_params))
-                temporary_pdf_file.seek(0)
-                eric_result.pdf = temporary_pdf_file.read()
-                return eric_result
-            finally:
-                self.close_cert_handle(cert_handle)
+        `data_type_version` shall match the XML data. Unless `print_pdf` is False, a PDF
+        is created as well and returned with the response."""
+        if not print_pdf:
+            return self._send(xml, data_type_version, EricWrapper.ERIC_SENDE)
+
+        with capture_pdf() as pdf_capture:
+            print_params = self.alloc_eric_druck_parameter_t(pdf_capture.path)
+            eric_result = self._send(xml, data_type_version, EricWrapper.ERIC_SENDE | EricWrapper.ERIC_DRUCKE,
+                                     print_params=pointer(print_params))
+            eric_result.pdf = pdf_capture.read()
+            return eric_result
+
+    def _send(self, xml, data_type_version, flags, print_params=None):
+        with self.cert_handle_manager.cert_handle() as cert_handle:
+            cert_params = self.alloc_eric_verschluesselungs_parameter_t(cert_handle)
+            return self.process(
+                xml, data_type_version,
+                flags,
+                cert_params=pointer(cert_params),
+                print_params=print_params)
+
+    def validate_and_print(self, xml, data_type_version):
+        """Validate the given XML and create its PDF without sending it. As nothing is sent, no certificate is
+        needed for this."""
+        with capture_pdf() as pdf_capture:
+            print_params = self.alloc_eric_druck_parameter_t(pdf_capture.path)
+            eric_result = self.process(
+                xml, data_type_version,
+                EricWrapper.ERIC_VALIDIERE | EricWrapper.ERIC_DRUCKE,
+                print_params=pointer(print_params))
+            eric_result.pdf = pdf_capture.read()
+            return eric_result
 
     @staticmethod
     def alloc_eric_druck_parameter_t(print_path):
@@ -191,38 +252,32 @@ class EricWrapper(object):
         )
 
     def get_cert_handle(self):
-        fun_get_cert_handle = self.eric.EricMtGetHandleToCertificate
-        fun_get_cert_handle.argtypes = [c_void_p, c_void_p, c_void_p, c_char_p]
-        fun_get_cert_handle.restype = c_int
+        fun_get_cert_handle = self.eric_functions.EricMtGetHandleToCertificate
 
         cert_handle_out = c_int()
         res = fun_get_cert_handle(self.eric_instance, pointer(cert_handle_out), None, EricWrapper.cert_path)
         check_result(res)
+        ERIC_CERT_HANDLES_OPEN.inc()
         logger.debug(f"fun_get_cert_handle res: {res}")
         return cert_handle_out
 
     def close_cert_handle(self, cert_handle):
-        fun_close_cert_handle = self.eric.EricMtCloseHandleToCertificate
-        fun_close_cert_handle.argtypes = [c_void_p, c_int]
-        fun_close_cert_handle.restype = c_int
+        fun_close_cert_handle = self.eric_functions.EricMtCloseHandleToCertificate
 
         res = fun_close_cert_handle(self.eric_instance, cert_handle)
         check_result(res)
+        ERIC_CERT_HANDLES_OPEN.dec()
         logger.debug(f"fun_close_cert_handle res: {res}")
 
     def get_cert_properties(self):
-        fun_get_cert_properties = self.eric.EricMtHoleZertifikatEigenschaften
-        fun_get_cert_properties.argtypes = [c_void_p, c_int, c_char_p, c_void_p]
-        fun_get_cert_properties.restype = c_int
+        """Returns the properties of the certificate. They are cached as long as the certificate handle is open."""
+        return self.cert_handle_manager.get_cert_properties()
 
-        try:
-            cert_handle = self.get_cert_handle()
+    def read_cert_properties(self, cert_handle):
+        fun_get_cert_properties = self.eric_functions.EricMtHoleZertifikatEigenschaften
 
-            return self._call_and_return_buffer_contents_and_decode(fun_get_cert_properties, cert_handle,
-                                                         EricWrapper.cert_pin.encode())
-        finally:
-            if cert_handle:
-                self.close_cert_handle(cert_handle)
+        return self._call_and_return_buffer_contents_and_decode(fun_get_cert_properties, cert_handle,
+                                                                EricWrapper.cert_pin.encode())
 
     def process(self,
                 xml, data_type_version, flags,
@@ -231,15 +286,8 @@ class EricWrapper(object):
         xml = xml.encode('utf-8')
         data_type_version = data_type_version.encode('utf-8')
 
-        try:
-            eric_response_buffer = self.create_buffer()
-            server_response_buffer = self.create_buffer()
-
-            fun_process = self.eric.EricMtBearbeiteVorgang
-            fun_process.argtypes = [c_void_p, c_char_p, c_char_p, c_uint32,
-                                    c_void_p, c_void_p, c_void_p,
-                                    c_void_p, c_void_p]
-            fun_process.restype = c_int
+        with self.buffer_pool.buffers(2) as (eric_response_buffer, server_response_buffer):
+            fun_process = self.eric_functions.EricMtBearbeiteVorgang
 
             res = fun_process(self.eric_instance, xml, data_type_version, flags,
                               print_params, cert_params, transfer_handle,
@@ -249,9 +297,10 @@ class EricWrapper(object):
             eric_response = self.read_buffer(eric_response_buffer)
             check_xml(eric_response)
             server_response = self.read_buffer(server_response_buffer)
-            check_xml(server_response)
-            logger.debug(f"eric_response: {eric_response.decode()}")
-            logger.debug(f"server_response: {server_response.decode()}")
+            parsed_server_response = check_xml(server_response)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"eric_response: {eric_response.decode()}")
+                logger.debug(f"server_response: {server_response.decode()}")
 
             if server_response and res in [610101210, 610101292]:
                 # only for ERIC_TRANSFER_ERR_XML_NHEADER and ERIC_TRANSFE R_ERR_XML_THEADER is error in server response
@@ -265,36 +314,37 @@ class EricWrapper(object):
 
             check_result(res, eric_response, server_response, server_err_msg)
 
-            return EricResponse(res, eric_response, server_response)
-
-        finally:
-            self.close_buffer(eric_response_buffer)
-            self.close_buffer(server_response_buffer)
+            return EricResponse(res, eric_response, server_response, parsed_server_response=parsed_server_response)
 
     def create_buffer(self):
-        fun_create_buffer = self.eric.EricMtRueckgabepufferErzeugen
-        fun_create_buffer.argtypes = [c_void_p]
-        fun_create_buffer.restype = c_void_p
+        fun_create_buffer = self.eric_functions.EricMtRueckgabepufferErzeugen
 
         handle = fun_create_buffer(self.eric_instance)
         check_handle(handle)
+        ERIC_BUFFERS_ALLOCATED.inc()
         logger.debug(f"fun_create_buffer handle: {handle}")
         return handle
 
-    def read_buffer(self, buffer):
-        fun_read_buffer = self.eric.EricMtRueckgabepufferInhalt
-        fun_read_buffer.argtypes = [c_void_p, c_void_p]
-        fun_read_buffer.restype = c_char_p
+    def read_buffer(self, buffer) -> EricBufferContent:
+        """Copies the content of the buffer exactly once, using its length instead of searching for the terminating
+        null byte."""
+        fun_buffer_length = self.eric_functions.EricMtRueckgabepufferLaenge
+        fun_read_buffer = self.eric_functions.EricMtRueckgabepufferInhalt
 
-        return fun_read_buffer(self.eric_instance, buffer)
+        length = fun_buffer_length(self.eric_instance, buffer)
+        content = fun_read_buffer(self.eric_instance, buffer)
+        if not length or not content:
+            return EricBufferContent()
+
+        content_view = (c_ubyte * length).from_address(content)
+        return EricBufferContent(memoryview(content_view))
 
     def close_buffer(self, buffer):
-        fun_close_buffer = self.eric.EricMtRueckgabepufferFreigeben
-        fun_close_buffer.argtypes = [c_void_p, c_void_p]
-        fun_close_buffer.restype = int
+        fun_close_buffer = self.eric_functions.EricMtRueckgabepufferFreigeben
 
         res = fun_close_buffer(self.eric_instance, buffer)
         check_result(res)
+        ERIC_BUFFERS_ALLOCATED.dec()
         logger.debug(f"fun_close_buffer res: {res}")
 
     def create_th(self,
@@ -302,11 +352,7 @@ class EricWrapper(object):
                   testmerker='700000004', hersteller_id=get_settings().hersteller_id,
                   daten_lieferant='Softwaretester ERiC',
                   version_client='1'):
-        fun_create_th = self.eric.EricMtCreateTH
-        fun_create_th.argtypes = [c_void_p, c_char_p, c_char_p, c_char_p, c_char_p,
-                                  c_char_p, c_char_p, c_char_p, c_char_p,
-                                  c_char_p, c_void_p]
-        fun_create_th.restype = int
+        fun_create_th = self.eric_functions.EricMtCreateTH
 
         return self._call_and_return_buffer_contents(
             fun_create_th, xml.encode(), verfahren.encode(), datenart.encode(),
@@ -316,19 +362,13 @@ class EricWrapper(object):
     def process_verfahren(self, xml_string, verfahren, abruf_code=None, transfer_handle=None) \
             -> EricResponse:
         """ Send the xml_string to Elster with given verfahren and certificate parameters. """
-        cert_handle = self.get_cert_handle()
-        cert_params = self.alloc_eric_verschluesselungs_parameter_t(cert_handle, abruf_code=abruf_code)
-
-        try:
+        with self.cert_handle_manager.cert_handle() as cert_handle:
+            cert_params = self.alloc_eric_verschluesselungs_parameter_t(cert_handle, abruf_code=abruf_code)
             return self.process(xml_string, verfahren, EricWrapper.ERIC_SENDE | EricWrapper.ERIC_VALIDIERE,
                                 transfer_handle=transfer_handle, cert_params=pointer(cert_params))
-        finally:
-            self.close_cert_handle(cert_handle)
 
     def check_tax_number(self, tax_number):
-        fun_check_tax_number = self.eric.EricMtPruefeSteuernummer
-        fun_check_tax_number.argtypes = [c_void_p, c_char_p]
-        fun_check_tax_number.restype = c_int
+        fun_check_tax_number = self.eric_functions.EricMtPruefeSteuernummer
 
         try:
             res = fun_check_tax_number(self.eric_instance, tax_number.encode())
@@ -338,21 +378,14 @@ class EricWrapper(object):
             return False
 
     def decrypt_data(self, data):
-        fun_decrypt_data = self.eric.EricMtDekodiereDaten
-        fun_decrypt_data.argtypes = [c_void_p, c_int, c_char_p, c_char_p, c_void_p]
-        fun_decrypt_data.restype = int
-
-        try:
-            cert_handle = self.get_cert_handle()
+        fun_decrypt_data = self.eric_functions.EricMtDekodiereDaten
 
+        with self.cert_handle_manager.cert_handle() as cert_handle:
             return self._call_and_return_buffer_contents_and_decode(
                 fun_decrypt_data,
                 cert_handle,
                 EricWrapper.cert_pin.encode(),
                 data.encode())
-        finally:
-            if cert_handle:
-                self.close_cert_handle(cert_handle)
 
     def get_tax_offices(self, state_id):
         """
@@ -361,9 +394,7 @@ class EricWrapper(object):
         :param state_id: A valid state id for which the tax office list is provided
         """
 
-        fun_get_tax_offices = self.eric.EricMtHoleFinanzaemter
-        fun_get_tax_offices.argtypes = [c_void_p, c_char_p, c_void_p]
-        fun_get_tax_offices.restype = int
+        fun_get_tax_offices = self.eric_functions.EricMtHoleFinanzaemter
 
         return self._call_and_return_buffer_contents_and_decode(
             fun_get_tax_offices,
@@ -374,18 +405,14 @@ class EricWrapper(object):
         Get a list of all the state codes
         """
 
-        fun_get_tax_offices = self.eric.EricMtHoleFinanzamtLandNummern
-        fun_get_tax_offices.argtypes = [c_void_p, c_void_p]
-        fun_get_tax_offices.restype = int
+        fun_get_tax_offices = self.eric_functions.EricMtHoleFinanzamtLandNummern
 
         return self._call_and_return_buffer_contents_and_decode(
             fun_get_tax_offices)
 
     def get_electronic_aktenzeichen(self, aktenzeichen, bundesland):
         """ Make the elster format out of the given aktenzeichen """
-        fun_make_elster_ewaz = self.eric.EricMtMakeElsterEWAz
-        fun_make_elster_ewaz.argtypes = [c_void_p, c_char_p, c_char_p, c_void_p]
-        fun_make_elster_ewaz.restype = int
+        fun_make_elster_ewaz = self.eric_functions.EricMtMakeElsterEWAz
 
         return self._call_and_return_buffer_contents_no_xml(
             fun_make_elster_ewaz,
@@ -394,11 +421,10 @@ class EricWrapper(object):
 
     def _call_and_return_buffer_contents(self, function, *args):
         """
-        :param function: The ERIC function to be called. The argtypes and restype have to be set before.
+        :param function: The ERIC function to be called, taken from the eric_functions bindings.
         """
 
-        buf = self.create_buffer()
-        try:
+        with self.buffer_pool.buffer() as buf:
             res = function(self.eric_instance, *args, buf)
             check_result(res)
             logger.debug(f"function {function.__name__} from _call_and_return_buffer_contents res {res}")
@@ -406,44 +432,34 @@ class EricWrapper(object):
             returned_xml = self.read_buffer(buf)
             check_xml(returned_xml)
             return returned_xml
-        finally:
-            self.close_buffer(buf)
 
     def _call_and_return_buffer_contents_no_xml(self, function, *args):
         """
-        :param function: The ERIC function to be called. The argtypes and restype have to be set before.
+        :param function: The ERIC function to be called, taken from the eric_functions bindings.
         """
 
-        buf = self.create_buffer()
-        try:
+        with self.buffer_pool.buffer() as buf:
             res = function(self.eric_instance, *args, buf)
             check_result(res)
             logger.debug(f"function {function.__name__} from _call_and_return_buffer_contents res {res}")
 
             return self.read_buffer(buf)
-        finally:
-            self.close_buffer(buf)
 
     def _call_and_return_buffer_contents_and_decode(self, function, *args):
         """
         This calls the ERIC function, reads the buffer and decodes the returned_xml.
 
-        :param function: The ERIC function to be called. The argtypes and restype have to be set before.
+        :param function: The ERIC function to be called, taken from the eric_functions bindings.
         """
 
         return self._call_and_return_buffer_contents(function, *args).decode()
 
     def get_error_message_from_xml_response(self, xml_response):
         """Extract error message from server response"""
-        fun_get_error_message = self.eric.EricMtGetErrormessagesFromXMLAnswer
-        fun_get_error_message.argtypes = [c_void_p, c_void_p, c_void_p, c_void_p, c_void_p, c_void_p]
-        fun_get_error_message.restypes = int
-
-        transferticket_buffer = self.create_buffer()
-        th_res_code_buffer = self.create_buffer()
-        th_error_message_buffer = self.create_buffer()
-        ndh_err_xml_buffer = self.create_buffer()
-        try:
+        fun_get_error_message = self.eric_functions.EricMtGetErrormessagesFromXMLAnswer
+
+        with self.buffer_pool.buffers(4) as (transferticket_buffer, th_res_code_buffer, th_error_message_buffer,
+                                             ndh_err_xml_buffer):
             res_code = fun_get_error_message(self.eric_instance,
                                              xml_response,
                                              transferticket_buffer,
@@ -457,10 +473,4 @@ class EricWrapper(object):
             th_error_message = self.read_buffer(th_error_message_buffer).decode()
             ndh_err_xml = self.read_buffer(ndh_err_xml_buffer).decode()
 
-        finally:
-            self.close_buffer(ndh_err_xml_buffer)
-            self.close_buffer(th_error_message_buffer)
-            self.close_buffer(th_res_code_buffer)
-            self.close_buffer(transferticket_buffer)
-
         return transferticket, th_res_code, th_error_message, ndh_err_xml
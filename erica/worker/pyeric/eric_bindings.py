@@ -0,0 +1,83 @@
+import time
+from collections import namedtuple
+from ctypes import c_char_p, c_int, c_uint32, c_void_p
+
+from erica.worker.pyeric.eric_metrics import ERIC_CALL_DURATION_SECONDS, ERIC_RESULT_CODES
+
+EricFunctionSignature = namedtuple('EricFunctionSignature', ['argtypes', 'restype'])
+
+# The signatures of the native ERiC functions we use, as explained in the original ERiC documentation.
+ERIC_FUNCTION_SIGNATURES = {
+    'EricMtInstanzErzeugen': EricFunctionSignature([c_char_p, c_char_p], c_void_p),
+    'EricMtInstanzFreigeben': EricFunctionSignature([c_void_p], c_int),
+    'EricMtVersion': EricFunctionSignature([c_void_p, c_void_p], c_int),
+    'EricMtGetHandleToCertificate': EricFunctionSignature([c_void_p, c_void_p, c_void_p, c_char_p], c_int),
+    'EricMtCloseHandleToCertificate': EricFunctionSignature([c_void_p, c_int], c_int),
+    'EricMtHoleZertifikatEigenschaften': EricFunctionSignature([c_void_p, c_int, c_char_p, c_void_p], c_int),
+    'EricMtBearbeiteVorgang': EricFunctionSignature([c_void_p, c_char_p, c_char_p, c_uint32,
+                                                     c_void_p, c_void_p, c_void_p,
+                                                     c_void_p, c_void_p], c_int),
+    'EricMtRueckgabepufferErzeugen': EricFunctionSignature([c_void_p], c_void_p),
+    'EricMtRueckgabepufferInhalt': EricFunctionSignature([c_void_p, c_void_p], c_void_p),
+    'EricMtRueckgabepufferLaenge': EricFunctionSignature([c_void_p, c_void_p], c_uint32),
+    'EricMtRueckgabepufferFreigeben': EricFunctionSignature([c_void_p, c_void_p], c_int),
+    'EricMtCreateTH': EricFunctionSignature([c_void_p, c_char_p, c_char_p, c_char_p, c_char_p,
+                                             c_char_p, c_char_p, c_char_p, c_char_p,
+                                             c_char_p, c_void_p], c_int),
+    'EricMtPruefeSteuernummer': EricFunctionSignature([c_void_p, c_char_p], c_int),
+    'EricMtDekodiereDaten': EricFunctionSignature([c_void_p, c_int, c_char_p, c_char_p, c_void_p], c_int),
+    'EricMtHoleFinanzaemter': EricFunctionSignature([c_void_p, c_char_p, c_void_p], c_int),
+    'EricMtHoleFinanzamtLandNummern': EricFunctionSignature([c_void_p, c_void_p], c_int),
+    'EricMtMakeElsterEWAz': EricFunctionSignature([c_void_p, c_char_p, c_char_p, c_void_p], c_int),
+    'EricMtGetErrormessagesFromXMLAnswer': EricFunctionSignature([c_void_p, c_void_p, c_void_p, c_void_p,
+                                                                  c_void_p, c_void_p], c_int),
+}
+
+
+class EricFunction:
+    """A typed native ERiC function. Every call is timed, and the result code is counted for functions that
+    return one."""
+
+    def __init__(self, name, function, signature: EricFunctionSignature):
+        function.argtypes = signature.argtypes
+        function.restype = signature.restype
+        self.__name__ = name
+        self._function = function
+        self._returns_result_code = signature.restype is c_int
+        self._duration = ERIC_CALL_DURATION_SECONDS.labels(function=name)
+        self._result_code_counters = {}
+
+    def __call__(self, *args):
+        start = time.perf_counter()
+        try:
+            result = self._function(*args)
+        finally:
+            self._duration.observe(time.perf_counter() - start)
+        if self._returns_result_code and isinstance(result, int):
+            self._count_result_code(result)
+        return result
+
+    def _count_result_code(self, result_code):
+        counter = self._result_code_counters.get(result_code)
+        if counter is None:
+            counter = ERIC_RESULT_CODES.labels(function=self.__name__, result_code=str(result_code))
+            self._result_code_counters[result_code] = counter
+        counter.inc()
+
+
+class EricBindings:
+    """The native functions of one loaded ERiC library. Each function is resolved and typed on its first use and then
+    reused for all further calls."""
+
+    def __init__(self, library):
+        self.library = library
+
+    def __getattr__(self, name):
+        try:
+            signature = ERIC_FUNCTION_SIGNATURES[name]
+        except KeyError:
+            raise AttributeError(f"No signature known for ERiC function {name}")
+        eric_function = EricFunction(name, getattr(self.library, name), signature)
+        # Set as instance attribute, so that __getattr__ is not called for this function again.
+        setattr(self, name, eric_function)
+        return eric_function
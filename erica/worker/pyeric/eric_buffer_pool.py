@@ -0,0 +1,73 @@
+import logging
+from contextlib import contextmanager
+
+from erica.worker.pyeric.eric_metrics import ERIC_BUFFERS_IN_USE
+
+logger = logging.getLogger('eric')
+
+_MAX_IDLE_BUFFERS = 8
+
+
+class EricBufferPool:
+    """Reuses the return buffers of one ERiC instance instead of allocating and freeing them for every call.
+
+    ERiC replaces the content of a return buffer on every call that writes to it, so returned buffers are kept as they
+    are. Only buffers beyond the maximum number of idle buffers are freed.
+    """
+
+    def __init__(self, eric_wrapper, max_idle_buffers=_MAX_IDLE_BUFFERS):
+        self._eric_wrapper = eric_wrapper
+        self._max_idle_buffers = max_idle_buffers
+        self._idle_buffers = []
+        self.number_in_use = 0
+
+    @property
+    def number_idle(self):
+        return len(self._idle_buffers)
+
+    @contextmanager
+    def buffers(self, count):
+        acquired_buffers = []
+        try:
+            for _ in range(count):
+                acquired_buffers.append(self._acquire())
+            yield acquired_buffers
+        finally:
+            for buffer in reversed(acquired_buffers):
+                self._release(buffer)
+
+    @contextmanager
+    def buffer(self):
+        with self.buffers(1) as (buffer,):
+            yield buffer
+
+    def close(self):
+        """Frees all idle buffers. Must be called before the ERiC instance is shut down."""
+        if self.number_in_use:
+            logger.warning(f"{self.number_in_use} ERiC buffers have not been returned to the pool.")
+        idle_buffers, self._idle_buffers = self._idle_buffers, []
+        for buffer in idle_buffers:
+            self._free(buffer)
+
+    def _acquire(self):
+        if self._idle_buffers:
+            buffer = self._idle_buffers.pop()
+        else:
+            buffer = self._eric_wrapper.create_buffer()
+        self.number_in_use += 1
+        ERIC_BUFFERS_IN_USE.inc()
+        return buffer
+
+    def _release(self, buffer):
+        self.number_in_use -= 1
+        ERIC_BUFFERS_IN_USE.dec()
+        if len(self._idle_buffers) < self._max_idle_buffers:
+            self._idle_buffers.append(buffer)
+        else:
+            self._free(buffer)
+
+    def _free(self, buffer):
+        try:
+            self._eric_wrapper.close_buffer(buffer)
+        except Exception as e:
+            logger.warning("Could not free ERiC buffer", exc_info=e)
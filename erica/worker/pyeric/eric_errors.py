@@ -1,7 +1,6 @@
 from xml.etree.ElementTree import ParseError
 
-from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_text_from_xml, \
-    remove_declaration_and_namespace
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_text_from_xml, NamespaceFreeXml
 
 _ERIC_SUCCESS_CODE = {
     0: "ERIC_OK"
@@ -343,13 +342,22 @@ class EricTransferError(EricProcessNotSuccessful):
     ERROR_CODE = 4
 
     # Overwrite initaliser to add special properties
-    def __init__(self, res_code=-1, eric_response=None, server_response=None, server_err_msg=None):
+    def __init__(self, res_code=-1, eric_response=None, server_response=None, server_err_msg=None,
+                 server_error_codes=None):
         self.eric_response = eric_response
         self.server_response = server_response
         self.work_dir = None
         self.server_err_msg = server_err_msg
+        self._server_error_codes = server_error_codes
         super().__init__(res_code)
 
+    @property
+    def server_error_codes(self):
+        """The error codes in the NDH_ERR_XML of the server_err_msg. They are only parsed once."""
+        if self._server_error_codes is None:
+            self._server_error_codes = _get_server_error_codes(self.server_err_msg)
+        return self._server_error_codes
+
     def __str__(self):
         if self.work_dir:
             return f"{self.res_code}: {self.get_eric_error_code_message(self.res_code)} in: {self.work_dir}"
@@ -399,18 +407,19 @@ class EricAlreadyRequestedError(EricTransferError):
     ERROR_CODE = 9
 
     # Overwrite initaliser to set custom res_code
-    def __init__(self, eric_response=None, server_response=None, server_err_msg=None):
+    def __init__(self, eric_response=None, server_response=None, server_err_msg=None, server_error_codes=None):
         # This error always has the res_code 3
-        super().__init__(3, eric_response, server_response, server_err_msg)
+        super().__init__(3, eric_response, server_response, server_err_msg, server_error_codes)
 
 
 class EricAntragNotFoundError(EricTransferError):
     """Exception raised in case an Antrag can not be found by Elster"""
     ERROR_CODE = 10
 
-    def __init__(self, eric_response=None, server_response=None, antrag_id=-1, server_err_msg=None):
+    def __init__(self, eric_response=None, server_response=None, antrag_id=-1, server_err_msg=None,
+                 server_error_codes=None):
         # This error always has the res_code 5
-        super().__init__(5, eric_response, server_response, server_err_msg)
+        super().__init__(5, eric_response, server_response, server_err_msg, server_error_codes)
         self.antrag_id = antrag_id
 
     def __str__(self):
@@ -422,8 +431,8 @@ class EricAlreadyRevokedError(EricTransferError):
     """
     ERROR_CODE = 11
 
-    def __init__(self, eric_response=None, server_response=None, server_err_msg=None):
-        super().__init__(4, eric_response, server_response, server_err_msg)
+    def __init__(self, eric_response=None, server_response=None, server_err_msg=None, server_error_codes=None):
+        super().__init__(4, eric_response, server_response, server_err_msg, server_error_codes)
 
     def __str__(self):
         return "The request for the request code has already been revoked"
@@ -462,9 +471,9 @@ class EricAlreadyActivatedError(EricTransferError):
     ERROR_CODE = 14
 
     # Overwrite initaliser to set custom res_code
-    def __init__(self, eric_response=None, server_response=None, server_err_msg=None):
+    def __init__(self, eric_response=None, server_response=None, server_err_msg=None, server_error_codes=None):
         # This error always has the res_code 8
-        super().__init__(8, eric_response, server_response, server_err_msg)
+        super().__init__(8, eric_response, server_response, server_err_msg, server_error_codes)
 
 
 class EricInvalidXmlReturnedError(EricProcessNotSuccessful):
@@ -514,25 +523,50 @@ def _create_validation_error(rescode, eric_response):
         raise EricGlobalValidationError(rescode, eric_response)
 
 
+# Transfer errors that are identified by a code in the NDH_ERR_XML of the server_err_msg, in order of precedence
+_SERVER_ERROR_CODE_TRANSFER_ERRORS = {
+    610101292: (('371015213', EricAlreadyRevokedError),
+                ('371015212', EricAlreadyActivatedError)),
+}
+
+# Transfer errors that are identified by one of the messages in the server response, in order of precedence
+_SERVER_RESPONSE_MESSAGE_TRANSFER_ERRORS = (
+    (_FSC_ALREADY_REQUESTED_ERRORS,
+     ("Es besteht bereits ein offener Antrag auf Erteilung einer Berechtigung zum Datenabruf",
+      "Es besteht bereits eine Berechtigung mit der gleichen Gültigkeitsdauer"),
+     EricAlreadyRequestedError),
+    (_NO_ANTRAG_FOUND_ERRORS,
+     ("Es ist kein Antrag auf Erteilung einer Berechtigung zum Datenabruf bzw. keine Berechtigung zum Widerruf "
+      "vorhanden.",),
+     EricAntragNotFoundError),
+)
+
+
 def _create_transfer_error(rescode, eric_response, server_response, server_err_msg=None):
-    if rescode == 610101292 and server_err_msg and is_error_in_server_err_msg(server_err_msg.get('NDH_ERR_XML'),
-                                                                              '371015213'):
-        raise EricAlreadyRevokedError(eric_response, server_response, server_err_msg)
-    if rescode == 610101292 and server_err_msg and is_error_in_server_err_msg(server_err_msg.get('NDH_ERR_XML'),
-                                                                              '371015212'):
-        raise EricAlreadyActivatedError(eric_response, server_response, server_err_msg)
-    elif server_response and rescode in _FSC_ALREADY_REQUESTED_ERRORS and \
-            ("Es besteht bereits ein offener Antrag auf Erteilung einer Berechtigung zum Datenabruf"
-             in server_response.decode() or
-             "Es besteht bereits eine Berechtigung mit der gleichen Gültigkeitsdauer"
-             in server_response.decode()):
-        raise EricAlreadyRequestedError(eric_response, server_response, server_err_msg)
-    elif server_response and rescode in _NO_ANTRAG_FOUND_ERRORS and \
-            "Es ist kein Antrag auf Erteilung einer Berechtigung zum Datenabruf bzw. keine Berechtigung zum Widerruf " \
-            "vorhanden." in server_response.decode():
-        raise EricAntragNotFoundError(eric_response, server_response, server_err_msg)
-    elif rescode in _ERIC_TRANSFER_ERRORS:
-        raise EricTransferError(rescode, eric_response, server_response, server_err_msg)
+    server_error_codes = _get_server_error_codes(server_err_msg)
+    for server_error_code, error_class in _SERVER_ERROR_CODE_TRANSFER_ERRORS.get(rescode, ()):
+        if server_error_code in server_error_codes:
+            return error_class(eric_response, server_response, server_err_msg=server_err_msg,
+                               server_error_codes=server_error_codes)
+
+    decoded_server_response = server_response.decode() if server_response else None
+    for rescodes, messages, error_class in _SERVER_RESPONSE_MESSAGE_TRANSFER_ERRORS:
+        if decoded_server_response and rescode in rescodes and \
+                any(message in decoded_server_response for message in messages):
+            return error_class(eric_response, server_response, server_err_msg=server_err_msg,
+                               server_error_codes=server_error_codes)
+
+    return EricTransferError(rescode, eric_response, server_response, server_err_msg, server_error_codes)
+
+
+def _get_server_error_codes(server_err_msg):
+    ndh_err_xml = server_err_msg.get('NDH_ERR_XML') if isinstance(server_err_msg, dict) else None
+    if not ndh_err_xml:
+        return []
+    try:
+        return get_error_codes_from_server_err_msg(ndh_err_xml)
+    except ParseError:
+        return []
 
 
 def check_handle(handle):
@@ -543,21 +577,20 @@ def check_handle(handle):
 
 def is_error_in_server_err_msg(error_xml_str, error):
     """Checks if a specific error occurs in the <Fehler> tag of the error xml"""
-    return any(
-        [elem.text == error for elem in remove_declaration_and_namespace(error_xml_str).findall('.//Fehler/Code')])
+    return error in get_error_codes_from_server_err_msg(error_xml_str)
 
 
 def get_error_codes_from_server_err_msg(error_xml_str):
     """Returns all error codes in the <Fehler> tag of the error xml"""
-    return [elem.text for elem in remove_declaration_and_namespace(error_xml_str).findall('.//Fehler/Code')]
+    return [elem.text for elem in NamespaceFreeXml(error_xml_str).findall('Fehler/Code')]
 
 
 def check_xml(xml):
-    """Checks if xml is a valid xml"""
+    """Checks if xml is a valid xml. Returns it parsed without namespaces, so that it does not need to be parsed again,
+    or None if it is empty."""
     if xml != '' and xml != b'':
-        import xml.etree.ElementTree as ET
         try:
-            ET.fromstring(xml)
+            return NamespaceFreeXml(xml)
         except ParseError:
             raise EricInvalidXmlReturnedError()
         except TypeError:
@@ -0,0 +1,53 @@
+from threading import Lock
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+from erica.config import get_settings
+
+ERIC_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    'erica_eric_pool_checkout_wait_seconds',
+    'Time a job waited for a free ERiC instance.',
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60))
+ERIC_POOL_INSTANCES = Gauge(
+    'erica_eric_pool_instances',
+    'Number of ERiC instances in the pool per state.',
+    ['state'])
+ERIC_POOL_WAITING_CHECKOUTS = Gauge(
+    'erica_eric_pool_waiting_checkouts',
+    'Number of jobs currently waiting for a free ERiC instance.')
+ERIC_BUFFERS_ALLOCATED = Gauge(
+    'erica_eric_buffers_allocated',
+    'Number of ERiC return buffers that are allocated and not yet freed.')
+ERIC_BUFFERS_IN_USE = Gauge(
+    'erica_eric_buffers_in_use',
+    'Number of ERiC return buffers that are handed out by the buffer pools and not yet returned.')
+ERIC_CERT_HANDLES_OPEN = Gauge(
+    'erica_eric_cert_handles_open',
+    'Number of open ERiC certificate handles.')
+ERIC_CALL_DURATION_SECONDS = Histogram(
+    'erica_eric_call_duration_seconds',
+    'Duration of calls into the native ERiC library per function.',
+    ['function'],
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+ERIC_RESULT_CODES = Counter(
+    'erica_eric_result_codes',
+    'Result codes returned by the native ERiC library per function.',
+    ['function', 'result_code'])
+WORKER_READY = Gauge(
+    'erica_worker_ready',
+    'Whether the worker has created and warmed up all its ERiC instances.')
+
+_metrics_server_started = False
+_metrics_server_lock = Lock()
+
+
+def start_worker_metrics_server():
+    """Exposes the metrics of the worker process if a port is configured. The API exposes its metrics via the
+    instrumentator, the worker has no HTTP server of its own."""
+    global _metrics_server_started
+    port = get_settings().worker_metrics_port
+    with _metrics_server_lock:
+        if port is None or _metrics_server_started:
+            return
+        start_http_server(port)
+        _metrics_server_started = True
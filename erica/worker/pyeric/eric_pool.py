@@ -0,0 +1,341 @@
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from erica.config import get_settings
+from erica.worker.pyeric.eric_errors import EricGlobalInitialisationError, EricNullReturnedError
+from erica.worker.pyeric.eric_metrics import ERIC_POOL_CHECKOUT_WAIT_SECONDS, ERIC_POOL_INSTANCES, \
+    ERIC_POOL_WAITING_CHECKOUTS
+
+logger = logging.getLogger('eric')
+
+# Errors after which we do not trust the ERiC instance anymore and replace it with a fresh one.
+_UNHEALTHY_ERRORS = (EricGlobalInitialisationError, EricNullReturnedError)
+
+
+class EricPoolExhaustedError(Exception):
+    """ Exception raised in case no ERiC instance became available within the checkout timeout"""
+    pass
+
+
+class EricPoolClosedError(Exception):
+    """ Exception raised in case an ERiC instance is checked out from a pool that has been shut down"""
+    pass
+
+
+def _create_initialised_eric_wrapper(log_path):
+    from erica.worker.pyeric.eric import EricWrapper
+    eric_wrapper = EricWrapper()
+    eric_wrapper.initialise(log_path=log_path)
+    return eric_wrapper
+
+
+class PooledEricInstance:
+    """An initialised EricWrapper together with the health state the pool keeps about it."""
+
+    def __init__(self, instance_id, eric_wrapper):
+        self.instance_id = instance_id
+        self.eric_wrapper = eric_wrapper
+        self.healthy = True
+        self.checkouts = 0
+        self.last_error = None
+
+    def mark_unhealthy(self, error):
+        self.healthy = False
+        self.last_error = error
+        logger.warning(f"ERiC instance {self.instance_id} marked as unhealthy: {error!r}")
+
+
+class EricInstancePool:
+    """A bounded pool of initialised ERiC instances.
+
+    The pool size is independent of the number of huey worker threads: Threads check out an instance only for the
+    duration of their ERiC calls and wait for a free one otherwise. Nested checkouts within the same thread return the
+    instance the thread already holds. If a warm-up is given, it is run for every new instance before it is used.
+    """
+
+    def __init__(self, size, checkout_timeout=None, factory=_create_initialised_eric_wrapper, warm_up=None):
+        if size < 1:
+            raise ValueError("The ERiC instance pool needs at least one instance.")
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._factory = factory
+        self._warm_up = warm_up
+        self._ready = threading.Event()
+        self._condition = threading.Condition()
+        self._instances = []
+        self._idle = deque()
+        self._pending_creations = 0
+        self._next_instance_id = 0
+        self._closed = False
+        self._held = threading.local()
+        self._log_dir = tempfile.mkdtemp(prefix='eric_pool_')
+
+    @property
+    def is_ready(self):
+        """Whether all instances have been created and warmed up by start()."""
+        return self._ready.is_set()
+
+    def start(self):
+        """Creates all missing instances upfront so that the first jobs do not pay for the ERiC initialisation."""
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                if not self._has_capacity():
+                    if not self._pending_creations:
+                        self._ready.set()
+                    return
+                self._pending_creations += 1
+            instance = self._create_instance()
+            self._release(instance)
+
+    @contextmanager
+    def checkout(self):
+        held_instance = getattr(self._held, 'instance', None)
+        if held_instance is not None:
+            yield held_instance.eric_wrapper
+            return
+
+        instance = self._acquire()
+        self._held.instance = instance
+        try:
+            yield instance.eric_wrapper
+        except _UNHEALTHY_ERRORS as e:
+            instance.mark_unhealthy(e)
+            raise
+        finally:
+            self._held.instance = None
+            self._release(instance)
+
+    def shutdown(self):
+        """Shuts down all idle instances. Instances that are checked out are shut down as soon as they are returned."""
+        with self._condition:
+            self._closed = True
+            idle_instances = list(self._idle)
+            self._idle.clear()
+            for instance in idle_instances:
+                self._instances.remove(instance)
+            self._condition.notify_all()
+
+        for instance in idle_instances:
+            self._shutdown_instance(instance)
+        self._remove_log_dir_if_unused()
+        self._update_gauges()
+
+    def _has_capacity(self):
+        return len(self._instances) + self._pending_creations < self.size
+
+    def _acquire(self):
+        start = time.monotonic()
+        deadline = None if self.checkout_timeout is None else start + self.checkout_timeout
+        ERIC_POOL_WAITING_CHECKOUTS.inc()
+        try:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise EricPoolClosedError()
+                    if self._idle:
+                        instance = self._idle.pop()
+                        break
+                    if self._has_capacity():
+                        self._pending_creations += 1
+                        instance = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise EricPoolExhaustedError(
+                            f"No ERiC instance became available within {self.checkout_timeout} seconds.")
+                    self._condition.wait(remaining)
+        finally:
+            ERIC_POOL_WAITING_CHECKOUTS.dec()
+        ERIC_POOL_CHECKOUT_WAIT_SECONDS.observe(time.monotonic() - start)
+
+        if instance is None:
+            instance = self._create_instance()
+        instance.checkouts += 1
+        self._update_gauges()
+        return instance
+
+    def _create_instance(self):
+        """Creates a new instance for a slot that has been reserved via _pending_creations."""
+        try:
+            with self._condition:
+                instance_id = self._next_instance_id
+                self._next_instance_id += 1
+            log_path = os.path.join(self._log_dir, f'instance_{instance_id}')
+            os.makedirs(log_path, exist_ok=True)
+            eric_wrapper = self._factory(log_path)
+            if self._warm_up is not None:
+                self._warm_up(eric_wrapper)
+        except Exception:
+            with self._condition:
+                self._pending_creations -= 1
+                self._condition.notify()
+            raise
+
+        instance = PooledEricInstance(instance_id, eric_wrapper)
+        with self._condition:
+            self._pending_creations -= 1
+            self._instances.append(instance)
+        logger.info(f"Created ERiC instance {instance_id}")
+        return instance
+
+    def _release(self, instance):
+        with self._condition:
+            keep_instance = instance.healthy and not self._closed
+            if keep_instance:
+                self._idle.append(instance)
+            else:
+                self._instances.remove(instance)
+            self._condition.notify()
+
+        if not keep_instance:
+            self._shutdown_instance(instance)
+            self._remove_log_dir_if_unused()
+        self._update_gauges()
+
+    def _shutdown_instance(self, instance):
+        try:
+            instance.eric_wrapper.shutdown()
+            logger.info(f"Shut down ERiC instance {instance.instance_id}")
+        except Exception as e:
+            logger.warning(f"Could not shut down ERiC instance {instance.instance_id}", exc_info=e)
+
+    def _remove_log_dir_if_unused(self):
+        with self._condition:
+            if not self._closed or self._instances or self._pending_creations:
+                return
+        shutil.rmtree(self._log_dir, ignore_errors=True)
+
+    def _update_gauges(self):
+        with self._condition:
+            number_idle = len(self._idle)
+            number_in_use = len(self._instances) - number_idle
+        ERIC_POOL_INSTANCES.labels(state='idle').set(number_idle)
+        ERIC_POOL_INSTANCES.labels(state='in_use').set(number_in_use)
+
+
+class SharedEricInstance:
+    """A single ERiC instance for the callers of a process that does not run huey, e.g. the API, scripts and tests.
+
+    The instance is created on first use and kept warm until it is shut down, at the latest when the process exits.
+    Calls are serialised because an ERiC instance must not be used by two threads at the same time. The reference
+    count tells how many (nested) users currently hold the instance.
+    """
+
+    def __init__(self, factory=_create_initialised_eric_wrapper):
+        self._factory = factory
+        self._lock = threading.RLock()
+        self._eric_wrapper = None
+        self._log_dir = None
+        self.reference_count = 0
+
+    @property
+    def is_initialised(self):
+        return self._eric_wrapper is not None
+
+    @contextmanager
+    def acquire(self):
+        with self._lock:
+            if self._eric_wrapper is None:
+                self._create()
+            eric_wrapper = self._eric_wrapper
+            self.reference_count += 1
+            try:
+                yield eric_wrapper
+            except _UNHEALTHY_ERRORS as e:
+                logger.warning(f"Shared ERiC instance is unhealthy and will be recreated: {e!r}")
+                if self._eric_wrapper is eric_wrapper and self.reference_count == 1:
+                    self._shutdown_locked()
+                raise
+            finally:
+                self.reference_count -= 1
+
+    def shutdown(self):
+        with self._lock:
+            if self.reference_count:
+                logger.warning(f"Shutting down shared ERiC instance with {self.reference_count} active users.")
+            self._shutdown_locked()
+
+    def _create(self):
+        self._log_dir = tempfile.mkdtemp(prefix='eric_')
+        try:
+            self._eric_wrapper = self._factory(self._log_dir)
+        except Exception:
+            shutil.rmtree(self._log_dir, ignore_errors=True)
+            self._log_dir = None
+            raise
+
+    def _shutdown_locked(self):
+        eric_wrapper, self._eric_wrapper = self._eric_wrapper, None
+        if eric_wrapper is None:
+            return
+        try:
+            eric_wrapper.shutdown()
+        except Exception as e:
+            logger.warning("Could not shut down shared ERiC instance", exc_info=e)
+        finally:
+            self._log_eric_log()
+            shutil.rmtree(self._log_dir, ignore_errors=True)
+            self._log_dir = None
+
+    def _log_eric_log(self):
+        eric_log_path = os.path.join(self._log_dir, 'eric.log')
+        if logger.isEnabledFor(logging.DEBUG) and os.path.exists(eric_log_path):
+            with open(eric_log_path, "r") as eric_log:
+                logger.debug(eric_log.read())
+
+
+_eric_pool = None
+_eric_pool_lock = threading.Lock()
+_shared_eric_instance = None
+_shared_eric_instance_lock = threading.Lock()
+
+
+def get_eric_pool() -> EricInstancePool:
+    """Returns the process-wide ERiC instance pool and creates it on first use."""
+    global _eric_pool
+    with _eric_pool_lock:
+        if _eric_pool is None:
+            warm_up = None
+            if get_settings().eric_warm_up:
+                from erica.worker.pyeric.eric_warm_up import warm_up_eric_wrapper
+                warm_up = warm_up_eric_wrapper
+            _eric_pool = EricInstancePool(get_settings().eric_pool_size,
+                                          checkout_timeout=get_settings().eric_pool_checkout_timeout_in_sec,
+                                          warm_up=warm_up)
+        return _eric_pool
+
+
+def shutdown_eric_pool():
+    global _eric_pool
+    with _eric_pool_lock:
+        eric_pool, _eric_pool = _eric_pool, None
+    if eric_pool is not None:
+        eric_pool.shutdown()
+
+
+def get_shared_eric_instance() -> SharedEricInstance:
+    """Returns the process-wide ERiC instance that is used outside of huey. It is shut down when the process exits."""
+    global _shared_eric_instance
+    with _shared_eric_instance_lock:
+        if _shared_eric_instance is None:
+            _shared_eric_instance = SharedEricInstance()
+            atexit.register(shutdown_shared_eric_instance)
+        return _shared_eric_instance
+
+
+def shutdown_shared_eric_instance():
+    global _shared_eric_instance
+    with _shared_eric_instance_lock:
+        shared_eric_instance, _shared_eric_instance = _shared_eric_instance, None
+    if shared_eric_instance is not None:
+        atexit.unregister(shutdown_shared_eric_instance)
+        shared_eric_instance.shutdown()
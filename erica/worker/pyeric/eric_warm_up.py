@@ -0,0 +1,58 @@
+import logging
+import os
+import time
+from collections import namedtuple
+
+from erica.worker.elster_xml.elster_xml_generator import VERANLAGUNGSJAHR
+from erica.worker.elster_xml.transfer_header_fields import get_est_th_fields, get_grundsteuer_th_fields, \
+    get_vast_request_th_fields, get_vast_activation_th_fields, get_vast_revocation_th_fields, \
+    get_vast_beleg_ids_request_th_fields
+from erica.worker.pyeric.eric_errors import EricGlobalValidationError
+
+logger = logging.getLogger('eric')
+
+_SAMPLES_FOLDER = os.path.join(os.path.dirname(__file__), 'warm_up_samples')
+
+WarmUpSample = namedtuple('WarmUpSample', ['data_type_version', 'file_name', 'th_fields'])
+
+
+def get_warm_up_samples():
+    """Returns a sample for every datenart version that the pyeric controllers process."""
+    return [
+        WarmUpSample('ESt_' + str(VERANLAGUNGSJAHR), 'est.xml', get_est_th_fields(use_testmerker=True)),
+        WarmUpSample('Grundsteuerwert_2', 'grundsteuer.xml', get_grundsteuer_th_fields(use_testmerker=True)),
+        WarmUpSample('SpezRechtAntrag', 'spez_recht_antrag.xml', get_vast_request_th_fields(use_testmerker=True)),
+        WarmUpSample('SpezRechtFreischaltung', 'spez_recht_freischaltung.xml',
+                     get_vast_activation_th_fields(use_testmerker=True)),
+        WarmUpSample('SpezRechtStorno', 'spez_recht_storno.xml', get_vast_revocation_th_fields(use_testmerker=True)),
+        WarmUpSample('ElsterVaStDaten', 'elster_vast_daten.xml',
+                     get_vast_beleg_ids_request_th_fields(use_testmerker=True)),
+    ]
+
+
+def _read_sample(file_name):
+    with open(os.path.join(_SAMPLES_FOLDER, file_name), 'r') as sample_xml:
+        return sample_xml.read()
+
+
+def warm_up_eric_wrapper(eric_wrapper):
+    """Validates a sample for every datenart version, so that ERiC loads the plugins and schemas it needs for them
+    before the first job does. A failing warm-up is logged but never keeps the instance from being used."""
+    start = time.perf_counter()
+    for sample in get_warm_up_samples():
+        sample_start = time.perf_counter()
+        try:
+            xml = eric_wrapper.create_th(
+                _read_sample(sample.file_name),
+                datenart=sample.th_fields.datenart, testmerker=sample.th_fields.testmerker,
+                hersteller_id=sample.th_fields.herstellerId, verfahren=sample.th_fields.verfahren,
+                daten_lieferant=sample.th_fields.datenLieferant).decode()
+            eric_wrapper.validate(xml, sample.data_type_version)
+        except EricGlobalValidationError as e:
+            # The plugins and schemas are loaded nevertheless.
+            logger.debug(f"Warm-up sample for {sample.data_type_version} is not valid: {e}")
+        except Exception as e:
+            logger.warning(f"Could not warm up ERiC for {sample.data_type_version}", exc_info=e)
+            continue
+        logger.info(f"Warmed up ERiC for {sample.data_type_version} in {time.perf_counter() - sample_start:.3f}s")
+    logger.info(f"Warmed up ERiC in {time.perf_counter() - start:.3f}s")
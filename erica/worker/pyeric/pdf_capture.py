@@ -0,0 +1,54 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+from erica.config import get_settings
+
+PDF_CAPTURE_MEMFD = 'memfd'
+PDF_CAPTURE_TMPFS = 'tmpfs'
+PDF_CAPTURE_DISK = 'disk'
+
+_TMPFS_DIR = '/dev/shm'
+
+
+class PdfCapture:
+    """A file that ERiC writes the PDF to, given by its path. The PDF is read back via the already open descriptor."""
+
+    def __init__(self, fd, path):
+        self._fd = fd
+        self.path = path
+
+    def read(self) -> bytes:
+        size = os.fstat(self._fd).st_size
+        return os.pread(self._fd, size, 0)
+
+
+def _memfd_available():
+    return hasattr(os, 'memfd_create') and os.path.isdir('/proc/self/fd')
+
+
+@contextmanager
+def capture_pdf(mode=None):
+    """Yields a PdfCapture. Depending on the mode, the PDF is kept in an anonymous in-memory file (memfd), on a tmpfs or
+    in a temporary file on disk. If a mode is not available on the platform we fall back to the next one."""
+    mode = mode or get_settings().pdf_capture_mode
+    is_memfd = False
+    if mode == PDF_CAPTURE_MEMFD and _memfd_available():
+        fd = os.memfd_create('erica_pdf', os.MFD_CLOEXEC)
+        path = f'/proc/self/fd/{fd}'
+        is_memfd = True
+    elif mode in (PDF_CAPTURE_MEMFD, PDF_CAPTURE_TMPFS) and os.path.isdir(_TMPFS_DIR):
+        fd, path = tempfile.mkstemp(suffix='.pdf', dir=_TMPFS_DIR)
+    else:
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+
+    try:
+        yield PdfCapture(fd, path)
+    finally:
+        os.close(fd)
+        if not is_memfd:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
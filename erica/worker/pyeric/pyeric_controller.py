@@ -1,8 +1,11 @@
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import pointer, c_int
 
 from erica.config import get_settings
-from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_state_ids, get_tax_offices
+from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_state_ids, get_tax_offices, \
+    get_eric_library_version
 from erica.worker.pyeric.eric import EricWrapper, EricResponse
 from erica.worker.pyeric.eric import get_eric_wrapper
 from erica.worker.pyeric.pyeric_response import PyericResponse
@@ -22,7 +25,8 @@ class PyericProcessController:
         with get_eric_wrapper() as eric_wrapper:
             response = self.run_eric(eric_wrapper)
 
-        return PyericResponse(response.eric_response.decode(), response.server_response.decode(), response.pdf)
+        return PyericResponse(response.eric_response.decode(), response.server_response.decode(), response.pdf,
+                              parsed_server_response=response.parsed_server_response)
 
     # TODO: Unify usage of EricWrapper; rethink having eric_wrapper as a parameter
     def run_eric(self, eric_wrapper: EricWrapper) -> EricResponse:
@@ -37,12 +41,19 @@ class EstPyericProcessController(PyericProcessController):
         self.year = year
 
     def run_eric(self, eric_wrapper):
-        return eric_wrapper.validate_and_send(self.xml, self._get_verfahren())
+        return eric_wrapper.validate_and_send(self.xml, self._get_verfahren(),
+                                              print_pdf=not get_settings().defer_pdf_rendering)
 
     def _get_verfahren(self):
         return self._VERFAHREN + str(self.year)
 
 
+class EstPrintPyericProcessController(EstPyericProcessController):
+
+    def run_eric(self, eric_wrapper):
+        return eric_wrapper.validate_and_print(self.xml, self._get_verfahren())
+
+
 class EstValidationPyericProcessController(EstPyericProcessController):
 
     def run_eric(self, eric_wrapper):
@@ -55,7 +66,14 @@ class GrundsteuerPyericProcessController(PyericProcessController):
     _VERFAHREN = "Grundsteuerwert_2"
 
     def run_eric(self, eric_wrapper):
-        return eric_wrapper.validate_and_send(self.xml, self._VERFAHREN)
+        return eric_wrapper.validate_and_send(self.xml, self._VERFAHREN,
+                                              print_pdf=not get_settings().defer_pdf_rendering)
+
+
+class GrundsteuerPrintPyericProcessController(GrundsteuerPyericProcessController):
+
+    def run_eric(self, eric_wrapper):
+        return eric_wrapper.validate_and_print(self.xml, self._VERFAHREN)
 
 
 class UnlockCodeRequestPyericProcessController(PyericProcessController):
@@ -108,18 +126,38 @@ class CheckTaxNumberPyericController:
 class DecryptBelegePyericController:
     """This does not inherit from PyericProcesscontroller as the needed Eric method does not take an XML as input."""
 
-    def run_eric(self, eric_wrapper, encrypted_belege):
-        decrypted_belege = []
-        for encrypted_beleg in encrypted_belege:
-            decrypted_data = eric_wrapper.decrypt_data(encrypted_beleg)
-            decrypted_belege.append(decrypted_data)
-        return decrypted_belege
-
     def get_decrypted_belege(self, encrypted_belege):
+        """
+        Yields the decrypted belege in the order of the encrypted belege. Every beleg is decrypted as soon as it is
+        given, in parallel on the ERiC instances of the worker. Must not be called while holding an ERiC instance.
+
+        :param encrypted_belege: an iterable of the encrypted belege, e.g. a generator that extracts them
+        """
+        with ThreadPoolExecutor(max_workers=_get_number_of_eric_threads(),
+                                thread_name_prefix='decrypt_belege') as executor:
+            pending_belege = deque()
+            try:
+                for encrypted_beleg in encrypted_belege:
+                    pending_belege.append(executor.submit(self._decrypt_beleg, encrypted_beleg))
+                    while pending_belege and pending_belege[0].done():
+                        yield pending_belege.popleft().result()
+                while pending_belege:
+                    yield pending_belege.popleft().result()
+            finally:
+                # Do not decrypt the remaining belege if one failed or the caller stopped early
+                for pending_beleg in pending_belege:
+                    pending_beleg.cancel()
+
+    @staticmethod
+    def _decrypt_beleg(encrypted_beleg):
         with get_eric_wrapper() as eric_wrapper:
-            response = self.run_eric(eric_wrapper, encrypted_belege)
+            return eric_wrapper.decrypt_data(encrypted_beleg)
 
-        return response
+
+def _get_number_of_eric_threads():
+    # Outside of huey there is only the shared ERiC instance, so more threads would just wait for it.
+    settings = get_settings()
+    return settings.eric_pool_size if settings.run_with_huey else 1
 
 
 class GetTaxOfficesPyericController:
@@ -144,24 +182,45 @@ class GetTaxOfficesPyericController:
                         "Thüringen": 'th'
     }
 
+    def __init__(self, checkout_eric_wrapper=None, number_of_threads=None):
+        """
+        :param checkout_eric_wrapper: a context manager factory for ERiC wrappers, get_eric_wrapper by default. Scripts
+        can pass the checkout of their own instance pool.
+        :param number_of_threads: how many tax office lists are requested at the same time, as many as there are ERiC
+        instances by default
+        """
+        self._checkout_eric_wrapper = checkout_eric_wrapper or get_eric_wrapper
+        self._number_of_threads = number_of_threads or _get_number_of_eric_threads()
+
     def get_eric_response(self):
         states = self._request_state_id_list()
-        state_tax_offices = []
 
-        for state_name, state_ids in states.items():
-            state_abbreviation = self._STATE_ABBREVIATIONS[state_name]
-            tax_offices = []
-            for state_id in state_ids:
-                tax_offices += self._request_tax_offices(state_id)
+        with ThreadPoolExecutor(max_workers=self._number_of_threads, thread_name_prefix='tax_offices') as executor:
+            requested_tax_offices = {
+                state_name: [executor.submit(self._request_tax_offices, state_id) for state_id in state_ids]
+                for state_name, state_ids in states.items()}
 
-            state_tax_offices.append({
-                'state_abbreviation': state_abbreviation,
-                'name': state_name,
-                'tax_offices': tax_offices
-                                      })
+            state_tax_offices = []
+            for state_name, requests in requested_tax_offices.items():
+                tax_offices = []
+                for request in requests:
+                    tax_offices += request.result()
+
+                state_tax_offices.append({
+                    'state_abbreviation': self._STATE_ABBREVIATIONS[state_name],
+                    'name': state_name,
+                    'tax_offices': tax_offices
+                })
 
         return self.generate_json(state_tax_offices)
 
+    def get_eric_version(self):
+        """ Returns the version of the ERiC library the tax office lists are requested from. """
+        with self._checkout_eric_wrapper() as eric_wrapper:
+            version_xml = eric_wrapper.get_version().decode()
+
+        return get_eric_library_version(version_xml)
+
     @staticmethod
     def standardise_state_id_list(states_id_list):
         states = {}
@@ -178,16 +237,14 @@ class GetTaxOfficesPyericController:
     def generate_json(state_tax_offices):
         return {'tax_offices': state_tax_offices}
 
-    @staticmethod
-    def _request_state_id_list():
-        with get_eric_wrapper() as eric_wrapper:
+    def _request_state_id_list(self):
+        with self._checkout_eric_wrapper() as eric_wrapper:
             pyeric_response = eric_wrapper.get_state_id_list()
 
-        return GetTaxOfficesPyericController.standardise_state_id_list(get_state_ids(pyeric_response))
+        return self.standardise_state_id_list(get_state_ids(pyeric_response))
 
-    @staticmethod
-    def _request_tax_offices(state_id):
-        with get_eric_wrapper() as eric_wrapper:
+    def _request_tax_offices(self, state_id):
+        with self._checkout_eric_wrapper() as eric_wrapper:
             pyeric_response = eric_wrapper.get_tax_offices(state_id)
 
         return get_tax_offices(pyeric_response)
@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from typing import ByteString
+from dataclasses import dataclass, field
+from typing import ByteString, Optional
+
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import NamespaceFreeXml
 
 
 @dataclass
@@ -7,3 +9,10 @@ class PyericResponse:
     eric_response: str
     server_response: str
     pdf: ByteString = None
+    parsed_server_response: Optional[NamespaceFreeXml] = field(default=None, repr=False, compare=False)
+
+    def get_parsed_server_response(self) -> NamespaceFreeXml:
+        """ Returns the server response without namespaces. It is parsed at most once per response. """
+        if self.parsed_server_response is None:
+            self.parsed_server_response = NamespaceFreeXml(self.server_response)
+        return self.parsed_server_response
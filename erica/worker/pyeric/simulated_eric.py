@@ -0,0 +1,433 @@
+import itertools
+import random
+import re
+import time
+import uuid
+from ctypes import addressof, create_string_buffer
+from dataclasses import dataclass
+from functools import lru_cache
+
+from erica.config import get_settings
+
+ERIC_BACKEND_NATIVE = 'native'
+ERIC_BACKEND_SIMULATED = 'simulated'
+
+_ERIC_OK = 0
+_ERIC_GLOBAL_PRUEF_FEHLER = 610001002
+_ERIC_GLOBAL_KEINE_DATEN_VORHANDEN = 610001008
+_ERIC_GLOBAL_STEUERNUMMER_UNGUELTIG = 610001034
+_ERIC_GLOBAL_EWAZ_LANDESKUERZEL_UNBEKANNT = 610001528
+_ERIC_GLOBAL_UNGUELTIGE_INSTANZ = 610001080
+_ERIC_GLOBAL_NULL_PARAMETER = 610001526
+_ERIC_CRYPT_E_INVALID_HANDLE = 610201101
+
+_ERIC_SENDE = 1 << 2
+_ERIC_DRUCKE = 1 << 5
+
+
+@dataclass(frozen=True)
+class SimulatedEricProfile:
+    """Describes how the simulated ERiC behaves. All durations are in milliseconds.
+
+    Sending to the ELSTER servers takes `send_latency_in_ms` plus a random share of `jitter_in_ms`, local calls like
+    validating or decrypting take `local_latency_in_ms`. A share of `error_rate` of all send calls fails with one of the
+    `error_codes`.
+    """
+    initialisation_latency_in_ms: float = 0
+    local_latency_in_ms: float = 0
+    send_latency_in_ms: float = 0
+    jitter_in_ms: float = 0
+    error_rate: float = 0.0
+    error_codes: tuple = (610101200,)  # ERIC_TRANSFER_COM_ERROR
+    pdf_size_in_kb: int = 4
+    seed: int = None
+
+
+SIMULATED_ERIC_PROFILES = {
+    'instant': SimulatedEricProfile(),
+    'realistic': SimulatedEricProfile(initialisation_latency_in_ms=1000, local_latency_in_ms=20,
+                                      send_latency_in_ms=800, jitter_in_ms=400, pdf_size_in_kb=150),
+    'flaky': SimulatedEricProfile(initialisation_latency_in_ms=1000, local_latency_in_ms=20,
+                                  send_latency_in_ms=800, jitter_in_ms=2000, pdf_size_in_kb=150, error_rate=0.05,
+                                  # ERIC_TRANSFER_COM_ERROR, ERIC_TRANSFER_ERR_NORESPONSE, ERIC_TRANSFER_ERR_TIMEOUT
+                                  error_codes=(610101200, 610101279, 610101283)),
+}
+
+
+def get_simulated_eric_profile(name) -> SimulatedEricProfile:
+    try:
+        return SIMULATED_ERIC_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown simulated ERiC profile '{name}'. "
+                         f"Choose one of {', '.join(SIMULATED_ERIC_PROFILES)}.")
+
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>'
+
+_ERIC_SUCCESS_RESPONSE = _XML_DECLARATION + \
+    '<EricBearbeiteVorgang xmlns="http://www.elster.de/EricXML/1.0/EricBearbeiteVorgang">' \
+    '<Erfolg><Telenummer>{transfer_ticket}</Telenummer><Ordnungsbegriff>{transfer_ticket}</Ordnungsbegriff></Erfolg>' \
+    '</EricBearbeiteVorgang>'
+
+_ERIC_VALIDATION_ERROR_RESPONSE = _XML_DECLARATION + \
+    '<EricBearbeiteVorgang xmlns="http://www.elster.de/EricXML/1.0/EricBearbeiteVorgang">' \
+    '<FehlerRegelpruefung><Nutzdatenticket>1</Nutzdatenticket>' \
+    '<Feldidentifikator>/ESt1A[1]/Allg[1]/A[1]/E0100401[1]</Feldidentifikator>' \
+    '<RegelName>/ESt1A/Allg/A/AngabenSteuerpflichtigePerson_4</RegelName><FachlicheFehlerId>21</FachlicheFehlerId>' \
+    '<Text>Das Geburtsjahr liegt nach dem Veranlagungszeitraum (steuerpflichtige Person / Ehemann / Person A).</Text>' \
+    '</FehlerRegelpruefung></EricBearbeiteVorgang>'
+
+_SERVER_RESPONSE = _XML_DECLARATION + \
+    '<Elster xmlns="http://www.elster.de/elsterxml/schema/v11"><TransferHeader version="11">' \
+    '<Verfahren>{verfahren}</Verfahren><DatenArt>{datenart}</DatenArt><Vorgang>send-Auth</Vorgang>' \
+    '<TransferTicket>{transfer_ticket}</TransferTicket><Testmerker>700000004</Testmerker>' \
+    '<Empfaenger id="L"><Ziel>CS</Ziel></Empfaenger><HerstellerID>74931</HerstellerID>' \
+    '<DatenLieferant>Simulated ERiC</DatenLieferant><EingangsDatum>{eingangsdatum}</EingangsDatum>' \
+    '<Datei><Verschluesselung>CMSEncryptedData</Verschluesselung><Kompression>GZIP</Kompression>' \
+    '<TransportSchluessel/></Datei>' \
+    '<RC><Rueckgabe><Code>0</Code><Text>Daten wurden erfolgreich angenommen.</Text></Rueckgabe>' \
+    '<Stack><Code>0</Code><Text/></Stack></RC><VersionClient>1</VersionClient></TransferHeader>' \
+    '<DatenTeil><Nutzdatenblock><NutzdatenHeader version="11"><NutzdatenTicket>1</NutzdatenTicket>' \
+    '<Empfaenger id="L">CS</Empfaenger>' \
+    '<RC><Rueckgabe><Code>0</Code><Text>OK</Text></Rueckgabe><Stack><Code>0</Code><Text/></Stack></RC>' \
+    '</NutzdatenHeader><Nutzdaten>{nutzdaten}</Nutzdaten></Nutzdatenblock></DatenTeil></Elster>'
+
+_ANTRAG_NUTZDATEN = \
+    '<{datenart} version="3"><AntragAntwort><AntragsID>{antrag_id}</AntragsID>' \
+    '<AntragsDatum>2021-05-07T21:25:21.543</AntragsDatum><GenehmigenBis>2021-08-05</GenehmigenBis>' \
+    '<AntragsStatus>offen</AntragsStatus></AntragAntwort></{datenart}>'
+
+_BELEG_IDS_NUTZDATEN = \
+    '<Datenabholung version="10"><Anfrage einschraenkung="alle" veranlagungsjahr="2020" idnr="04452397687">' \
+    '<Id groesse="1600" belegart="VaSt_RBM" hashwert="11299a8a3e1c107cd96c0d5b3e91b397" schemaversion="202001">' \
+    '{rbm_beleg_id}</Id>' \
+    '<Id groesse="1000" belegart="VaSt_Pers1" hashwert="7f551695560356fc619797b66b00e863" schemaversion="4">' \
+    '{pers1_beleg_id}</Id></Anfrage></Datenabholung>'
+
+_ENCRYPTED_BELEGE_NUTZDATEN = '<Datenabholung version="10">{abholungen}</Datenabholung>'
+
+_ABHOLUNG = '<Abholung id="{beleg_id}" uebertragungsweg="direkt" idnr="04452397687" veranlagungsjahr="2020">' \
+            '<Datenpaket>{datenpaket}</Datenpaket></Abholung>'
+
+_DECRYPTED_BELEG = _XML_DECLARATION + \
+    '<VaSt_Pers1 xmlns="http://www.elster.de/2002/XMLSchema" version="4"><Inhaber><NatPers>' \
+    '<QuellHinweis>01</QuellHinweis><Vorname>MYRNA</Vorname><Name>COLAVITO</Name><GebDat>19850101</GebDat>' \
+    '<SteuerIDs><PersIdNr>04452397687</PersIdNr></SteuerIDs>' \
+    '<AdrKette><StrAdr><Str>Musterstraße</Str><HausNr>1101</HausNr><Plz>34125</Plz><Ort>Kassel</Ort></StrAdr>' \
+    '</AdrKette></NatPers></Inhaber></VaSt_Pers1>'
+
+_CERT_PROPERTIES = _XML_DECLARATION + \
+    '<EricHoleZertifikatEigenschaften xmlns="http://www.elster.de/EricXML/1.0/EricHoleZertifikatEigenschaften">' \
+    '<Signaturzertifikateigenschaften><AusgestelltAm>2021-01-01</AusgestelltAm><GueltigBis>2030-12-31</GueltigBis>' \
+    '<Signaturalgorithmus>SHA-256 with RSA</Signaturalgorithmus></Signaturzertifikateigenschaften>' \
+    '<TokenTyp>Stick</TokenTyp></EricHoleZertifikatEigenschaften>'
+
+_TRANSFER_HEADER = \
+    '<TransferHeader version="11"><Verfahren>{verfahren}</Verfahren><DatenArt>{datenart}</DatenArt>' \
+    '<Vorgang>{vorgang}</Vorgang><Testmerker>{testmerker}</Testmerker><HerstellerID>{hersteller_id}</HerstellerID>' \
+    '<DatenLieferant>{daten_lieferant}</DatenLieferant><Datei><Verschluesselung>CMSEncryptedData</Verschluesselung>' \
+    '<Kompression>GZIP</Kompression><TransportSchluessel/></Datei><VersionClient>{version_client}</VersionClient>' \
+    '</TransferHeader>'
+
+# The Finanzamt land numbers as returned by ERiC. Bavaria is the only state with two of them.
+_FINANZAMT_LAENDER = {
+    '28': 'Baden-Württemberg', '91': 'Bayern (Zuständigkeit LfSt - München)',
+    '92': 'Bayern (Zuständigkeit LfSt - Nürnberg)', '11': 'Berlin', '30': 'Brandenburg', '24': 'Bremen',
+    '22': 'Hamburg', '26': 'Hessen', '40': 'Mecklenburg-Vorpommern', '23': 'Niedersachsen',
+    '51': 'Nordrhein-Westfalen', '27': 'Rheinland-Pfalz', '10': 'Saarland', '32': 'Sachsen', '31': 'Sachsen-Anhalt',
+    '21': 'Schleswig-Holstein', '41': 'Thüringen',
+}
+_TAX_OFFICES_PER_STATE = 3
+
+_EWAZ_LAENDER_PREFIXES = {
+    'BW': '28', 'BY': '9', 'BE': '11', 'BB': '30', 'HB': '24', 'HH': '22', 'HE': '26', 'MV': '40', 'NI': '23',
+    'ND': '23', 'NW': '5', 'RP': '27', 'SL': '10', 'SN': '32', 'ST': '31', 'SH': '21', 'TH': '41',
+}
+
+_DATENART_PATTERN = re.compile(r'<DatenArt>\s*([^<\s]+)\s*</DatenArt>')
+_VERFAHREN_PATTERN = re.compile(r'<Verfahren>\s*([^<\s]+)\s*</Verfahren>')
+_ELSTER_START_TAG_PATTERN = re.compile(r'<Elster(\s[^>]*)?>')
+_TRANSFER_TICKET_PATTERN = re.compile(r'<TransferTicket>\s*([^<\s]*)\s*</TransferTicket>')
+_RC_PATTERN = re.compile(r'<Rueckgabe>\s*<Code>\s*([^<\s]*)\s*</Code>\s*<Text>([^<]*)</Text>')
+
+
+@lru_cache()
+def create_simulated_pdf(size_in_kb) -> bytes:
+    """Returns a valid one-page PDF that is padded with an incompressible stream to about the given size."""
+    text = b"BT /F1 24 Tf 72 720 Td (Simulated ERiC) Tj ET"
+    padding = random.Random(size_in_kb).randbytes(max(0, size_in_kb * 1024 - 1024))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(padding), padding),
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, content in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, content)
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(pdf)
+
+
+def _value(argument):
+    """Returns the plain value of an argument that might have been passed as a ctypes object."""
+    return getattr(argument, 'value', argument)
+
+
+class _SimulatedEricFunction:
+    """A callable that stands in for a native ERiC function. Like a ctypes function, its argtypes and restype can be
+    set, but they are not used because no conversion takes place."""
+
+    def __init__(self, name, implementation):
+        self.__name__ = name
+        self._implementation = implementation
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        return self._implementation(*args)
+
+
+class SimulatedEricLibrary:
+    """A drop-in replacement for the native ERiC library that needs neither the ERiC binaries nor a certificate.
+
+    It offers the `EricMt*` functions that the EricWrapper uses and answers with canned but realistic XML and PDFs.
+    Return buffers are real memory, so that they are read exactly like the buffers of the native library. Latency,
+    jitter and errors are taken from a SimulatedEricProfile. Each EricWrapper loads its own library, so a library is
+    never used by two threads at the same time.
+    """
+
+    _FUNCTION_NAMES = (
+        'EricMtInstanzErzeugen', 'EricMtInstanzFreigeben', 'EricMtVersion', 'EricMtGetHandleToCertificate',
+        'EricMtCloseHandleToCertificate', 'EricMtHoleZertifikatEigenschaften', 'EricMtBearbeiteVorgang',
+        'EricMtRueckgabepufferErzeugen', 'EricMtRueckgabepufferInhalt', 'EricMtRueckgabepufferLaenge',
+        'EricMtRueckgabepufferFreigeben', 'EricMtCreateTH', 'EricMtPruefeSteuernummer', 'EricMtDekodiereDaten',
+        'EricMtHoleFinanzaemter', 'EricMtHoleFinanzamtLandNummern', 'EricMtMakeElsterEWAz',
+        'EricMtGetErrormessagesFromXMLAnswer',
+    )
+
+    def __init__(self, profile: SimulatedEricProfile = SimulatedEricProfile()):
+        self.profile = profile
+        self._random = random.Random(profile.seed)
+        self._handles = itertools.count(1)
+        self._instances = set()
+        self._buffers = {}
+        self._cert_handles = set()
+        for name in self._FUNCTION_NAMES:
+            setattr(self, name, _SimulatedEricFunction(name, getattr(self, '_' + name)))
+
+    @classmethod
+    def from_settings(cls):
+        return cls(get_simulated_eric_profile(get_settings().simulated_eric_profile))
+
+    def _wait(self, latency_in_ms, jitter_in_ms=0):
+        delay = latency_in_ms + self._random.uniform(0, jitter_in_ms) if jitter_in_ms else latency_in_ms
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _injected_error_code(self):
+        if self.profile.error_rate and self._random.random() < self.profile.error_rate:
+            return self._random.choice(self.profile.error_codes)
+        return None
+
+    def _write(self, buffer, content):
+        if isinstance(content, str):
+            content = content.encode()
+        self._buffers[buffer] = (create_string_buffer(content), len(content))
+
+    @staticmethod
+    def _transfer_ticket():
+        return uuid.uuid4().hex
+
+    # Instances
+
+    def _EricMtInstanzErzeugen(self, plugin_path, log_path):
+        self._wait(self.profile.initialisation_latency_in_ms)
+        instance = next(self._handles)
+        self._instances.add(instance)
+        return instance
+
+    def _EricMtInstanzFreigeben(self, instance):
+        if instance not in self._instances:
+            return _ERIC_GLOBAL_UNGUELTIGE_INSTANZ
+        self._instances.remove(instance)
+        return _ERIC_OK
+
+    def _EricMtVersion(self, instance, buffer):
+        self._write(buffer, _XML_DECLARATION + '<EricVersion><Bibliothek><Name>simulated</Name>'
+                                               '<Version>0.0.0.0</Version></Bibliothek></EricVersion>')
+        return _ERIC_OK
+
+    # Return buffers
+
+    def _EricMtRueckgabepufferErzeugen(self, instance):
+        if instance not in self._instances:
+            return None
+        buffer = next(self._handles)
+        self._buffers[buffer] = (create_string_buffer(1), 0)
+        return buffer
+
+    def _EricMtRueckgabepufferInhalt(self, instance, buffer):
+        if buffer not in self._buffers:
+            return None
+        return addressof(self._buffers[buffer][0])
+
+    def _EricMtRueckgabepufferLaenge(self, instance, buffer):
+        if buffer not in self._buffers:
+            return 0
+        return self._buffers[buffer][1]
+
+    def _EricMtRueckgabepufferFreigeben(self, instance, buffer):
+        if self._buffers.pop(buffer, None) is None:
+            return _ERIC_GLOBAL_NULL_PARAMETER
+        return _ERIC_OK
+
+    # Certificates
+
+    def _EricMtGetHandleToCertificate(self, instance, cert_handle_out, pin_support, cert_path):
+        self._wait(self.profile.local_latency_in_ms)
+        cert_handle = next(self._handles)
+        self._cert_handles.add(cert_handle)
+        cert_handle_out.contents.value = cert_handle
+        return _ERIC_OK
+
+    def _EricMtCloseHandleToCertificate(self, instance, cert_handle):
+        if _value(cert_handle) not in self._cert_handles:
+            return _ERIC_CRYPT_E_INVALID_HANDLE
+        self._cert_handles.remove(_value(cert_handle))
+        return _ERIC_OK
+
+    def _EricMtHoleZertifikatEigenschaften(self, instance, cert_handle, pin, buffer):
+        self._wait(self.profile.local_latency_in_ms)
+        if _value(cert_handle) not in self._cert_handles:
+            return _ERIC_CRYPT_E_INVALID_HANDLE
+        self._write(buffer, _CERT_PROPERTIES)
+        return _ERIC_OK
+
+    # Processing
+
+    def _EricMtBearbeiteVorgang(self, instance, xml, data_type_version, flags, print_params, cert_params,
+                                transfer_handle, eric_response_buffer, server_response_buffer):
+        if instance not in self._instances:
+            return _ERIC_GLOBAL_UNGUELTIGE_INSTANZ
+        self._wait(self.profile.local_latency_in_ms)
+        if flags & _ERIC_DRUCKE and print_params:
+            with open(print_params.contents.pdfName, 'wb') as pdf_file:
+                pdf_file.write(create_simulated_pdf(self.profile.pdf_size_in_kb))
+        if not flags & _ERIC_SENDE:
+            return _ERIC_OK
+
+        self._wait(self.profile.send_latency_in_ms, self.profile.jitter_in_ms)
+        error_code = self._injected_error_code()
+        if error_code == _ERIC_GLOBAL_PRUEF_FEHLER:
+            self._write(eric_response_buffer, _ERIC_VALIDATION_ERROR_RESPONSE)
+        if error_code is not None:
+            return error_code
+
+        xml = xml.decode()
+        transfer_ticket = self._transfer_ticket()
+        datenart_match = _DATENART_PATTERN.search(xml)
+        verfahren_match = _VERFAHREN_PATTERN.search(xml)
+        datenart = datenart_match.group(1) if datenart_match else data_type_version.decode()
+        self._write(eric_response_buffer, _ERIC_SUCCESS_RESPONSE.format(transfer_ticket=transfer_ticket))
+        self._write(server_response_buffer, _SERVER_RESPONSE.format(
+            verfahren=verfahren_match.group(1) if verfahren_match else 'ElsterErklaerung',
+            datenart=datenart,
+            transfer_ticket=transfer_ticket,
+            eingangsdatum=time.strftime('%Y%m%d%H%M%S'),
+            nutzdaten=self._nutzdaten(xml, datenart)))
+        return _ERIC_OK
+
+    def _nutzdaten(self, xml, datenart):
+        if datenart.startswith('SpezRecht'):
+            return _ANTRAG_NUTZDATEN.format(datenart=datenart, antrag_id=self._transfer_ticket())
+        if datenart == 'ElsterVaStDaten' and '<Abholung' in xml:
+            abholungen = ''.join(_ABHOLUNG.format(beleg_id=self._transfer_ticket(), datenpaket=uuid.uuid4().hex * 8)
+                                 for _ in range(xml.count('<Abholung')))
+            return _ENCRYPTED_BELEGE_NUTZDATEN.format(abholungen=abholungen)
+        if datenart == 'ElsterVaStDaten':
+            return _BELEG_IDS_NUTZDATEN.format(rbm_beleg_id=self._transfer_ticket(),
+                                               pers1_beleg_id=self._transfer_ticket())
+        return ''
+
+    def _EricMtCreateTH(self, instance, xml, verfahren, datenart, vorgang, testmerker, hersteller_id,
+                        daten_lieferant, version_client, public_key, buffer):
+        self._wait(self.profile.local_latency_in_ms)
+        transfer_header = _TRANSFER_HEADER.format(
+            verfahren=verfahren.decode(), datenart=datenart.decode(), vorgang=vorgang.decode(),
+            testmerker=testmerker.decode(), hersteller_id=hersteller_id.decode(),
+            daten_lieferant=daten_lieferant.decode(), version_client=version_client.decode())
+        xml = xml.decode()
+        elster_start_tag = _ELSTER_START_TAG_PATTERN.search(xml)
+        if elster_start_tag:
+            xml_with_th = xml[:elster_start_tag.end()] + transfer_header + xml[elster_start_tag.end():]
+        else:
+            xml_with_th = '<Elster xmlns="http://www.elster.de/elsterxml/schema/v11">' + transfer_header + xml + \
+                          '</Elster>'
+        self._write(buffer, xml_with_th)
+        return _ERIC_OK
+
+    def _EricMtDekodiereDaten(self, instance, cert_handle, pin, data, buffer):
+        self._wait(self.profile.local_latency_in_ms)
+        if _value(cert_handle) not in self._cert_handles:
+            return _ERIC_CRYPT_E_INVALID_HANDLE
+        self._write(buffer, _DECRYPTED_BELEG)
+        return _ERIC_OK
+
+    def _EricMtGetErrormessagesFromXMLAnswer(self, instance, xml_response, transferticket_buffer,
+                                             th_res_code_buffer, th_error_message_buffer, ndh_err_xml_buffer):
+        xml_response = xml_response.decode() if isinstance(xml_response, bytes) else xml_response
+        transfer_ticket = _TRANSFER_TICKET_PATTERN.search(xml_response)
+        rc = _RC_PATTERN.search(xml_response)
+        self._write(transferticket_buffer, transfer_ticket.group(1) if transfer_ticket else '')
+        self._write(th_res_code_buffer, rc.group(1) if rc else '')
+        self._write(th_error_message_buffer, rc.group(2) if rc else '')
+        self._write(ndh_err_xml_buffer, '')
+        return _ERIC_OK
+
+    # Tax numbers and tax offices
+
+    def _EricMtPruefeSteuernummer(self, instance, tax_number):
+        """Only checks the format of the tax number, the check digit is not simulated."""
+        self._wait(self.profile.local_latency_in_ms)
+        if len(tax_number) != 13 or not tax_number.isdigit():
+            return _ERIC_GLOBAL_STEUERNUMMER_UNGUELTIG
+        return _ERIC_OK
+
+    def _EricMtMakeElsterEWAz(self, instance, aktenzeichen, bundesland, buffer):
+        self._wait(self.profile.local_latency_in_ms)
+        prefix = _EWAZ_LAENDER_PREFIXES.get(bundesland.decode().upper())
+        if prefix is None:
+            return _ERIC_GLOBAL_EWAZ_LANDESKUERZEL_UNBEKANNT
+        digits = ''.join(character for character in aktenzeichen.decode() if character.isdigit())
+        self._write(buffer, (prefix + digits)[:13].ljust(13, '0'))
+        return _ERIC_OK
+
+    def _EricMtHoleFinanzamtLandNummern(self, instance, buffer):
+        self._wait(self.profile.local_latency_in_ms)
+        states = ''.join(f'<FinanzamtLand><FinanzamtLandNummer>{number}</FinanzamtLandNummer><Name>{name}</Name>'
+                         f'</FinanzamtLand>' for number, name in _FINANZAMT_LAENDER.items())
+        self._write(buffer, _XML_DECLARATION + '<EricHoleFinanzamtLandNummern xmlns="http://www.elster.de/EricXML/'
+                                               f'1.0/EricHoleFinanzamtLandNummern">{states}'
+                                               '</EricHoleFinanzamtLandNummern>')
+        return _ERIC_OK
+
+    def _EricMtHoleFinanzaemter(self, instance, state_id, buffer):
+        self._wait(self.profile.local_latency_in_ms)
+        state_id = state_id.decode()
+        if state_id not in _FINANZAMT_LAENDER:
+            return _ERIC_GLOBAL_KEINE_DATEN_VORHANDEN
+        tax_offices = ''.join(f'<Finanzamt><BuFaNummer>{(state_id + str(number).zfill(2))[:4]}</BuFaNummer>'
+                              f'<Name>Finanzamt {_FINANZAMT_LAENDER[state_id].split(" ")[0]} {number}</Name>'
+                              f'</Finanzamt>' for number in range(1, _TAX_OFFICES_PER_STATE + 1))
+        self._write(buffer, _XML_DECLARATION + '<EricHoleFinanzaemter xmlns="http://www.elster.de/EricXML/1.0/'
+                                               f'EricHoleFinanzaemter">{tax_offices}</EricHoleFinanzaemter>')
+        return _ERIC_OK
@@ -1,8 +1,7 @@
-import base64
-
 from erica.config import get_settings
 from erica.worker.pyeric.check_elster_request_id import tax_id_number_is_test_id_number
-from erica.worker.pyeric.pyeric_controller import GrundsteuerPyericProcessController
+from erica.worker.pyeric.pyeric_controller import GrundsteuerPyericProcessController, \
+    GrundsteuerPrintPyericProcessController
 from erica.worker.pyeric.pyeric_response import PyericResponse
 from erica.worker.elster_xml.common.transfer_header import add_transfer_header
 from erica.worker.elster_xml.common.xml_conversion import convert_object_to_xml
@@ -13,6 +12,7 @@ from erica.worker.request_processing.requests_controller import TransferticketRe
 
 class GrundsteuerRequestController(TransferticketRequestController):
     _PYERIC_CONTROLLER = GrundsteuerPyericProcessController
+    _PRINT_PYERIC_CONTROLLER = GrundsteuerPrintPyericProcessController
 
     def _is_testmerker_used(self):
         if len(self.input_data.eigentuemer.person) >= 1 and self.input_data.eigentuemer.person[0].steuer_id:
@@ -29,5 +29,12 @@ class GrundsteuerRequestController(TransferticketRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response['pdf'] = base64.b64encode(pyeric_response.pdf).decode('utf-8')
+        if pyeric_response.pdf is not None:
+            response['pdf'] = pyeric_response.pdf
         return response
+
+    def render_pdf(self):
+        """Creates the PDF for the grundsteuer declaration without sending it. Returns the raw PDF."""
+        xml = self.generate_full_xml(self._is_testmerker_used())
+        pyeric_controller = self._PRINT_PYERIC_CONTROLLER(xml)
+        return pyeric_controller.get_eric_response().pdf
@@ -1,19 +1,18 @@
-import base64
-
 from erica.config import get_settings
-from erica.worker.elster_xml.common.electronic_steuernummer import generate_electronic_steuernummer
+from erica.worker.elster_xml.common.electronic_steuernummer import generate_electronic_steuernummer, \
+    is_known_invalid_steuernummer
 from erica.worker.elster_xml.elster_xml_generator import get_belege_xml, generate_vorsatz_without_tax_number, \
     generate_vorsatz_with_tax_number
-from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_antrag_id_from_xml, \
-    get_transferticket_from_xml, get_address_from_xml, get_relevant_beleg_ids
+from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_address_from_xml, \
+    get_relevant_beleg_ids
 from erica.worker.pyeric.eric_errors import InvalidBufaNumberError
 from erica.worker.pyeric.pyeric_response import PyericResponse
 from erica.worker.elster_xml import est_mapping, elster_xml_generator
 
-from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_text_from_xml
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import iter_elements_text_from_xml
 
 from erica.worker.pyeric.pyeric_controller import EstPyericProcessController, \
-    EstValidationPyericProcessController, \
+    EstValidationPyericProcessController, EstPrintPyericProcessController, \
     UnlockCodeActivationPyericProcessController, UnlockCodeRequestPyericProcessController, \
     UnlockCodeRevocationPyericProcessController, \
     DecryptBelegePyericController, BelegIdRequestPyericProcessController, \
@@ -36,6 +35,14 @@ class EricaRequestController(object):
         self.input_data = input_data
         self.include_elster_responses: bool = include_elster_responses
 
+    @classmethod
+    def get_local_result(cls, input_data):
+        """
+        Returns the result of the request if it is known without calling ERiC, e.g. because the input data would be
+        rejected in any case. Then no job has to be run for the request. Returns None otherwise.
+        """
+        return None
+
     def process(self):
         """
         Processing the request_data will extract information from the data, perform necessary operations with the
@@ -63,11 +70,18 @@ class EricaRequestController(object):
 
 
 class TransferticketRequestController(EricaRequestController):
+    """
+    Adds the values of the _SERVER_RESPONSE_ELEMENTS to the response. They are all extracted from the same parsed
+    server response and are required, so a server response without one of them raises a ValueError.
+    """
+
+    _SERVER_RESPONSE_ELEMENTS = {'transferticket': 'TransferTicket'}
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
         if pyeric_response.server_response:
-            response['transferticket'] = get_transferticket_from_xml(pyeric_response.server_response)
+            server_response = pyeric_response.get_parsed_server_response()
+            response.update(server_response.extract(self._SERVER_RESPONSE_ELEMENTS, required=True))
         return response
 
 
@@ -81,6 +95,14 @@ class EstValidationRequestController(TransferticketRequestController):
         return tax_id_number_is_test_id_number(self.input_data.est_data.person_a_idnr)
 
     def process(self):
+        xml = self.generate_full_xml(self._is_testmerker_used())
+
+        pyeric_controller = self._PYERIC_CONTROLLER(xml, self.input_data.meta_data.year)
+        pyeric_response = pyeric_controller.get_eric_response()
+
+        return self.generate_json(pyeric_response)
+
+    def generate_full_xml(self, use_testmerker):
         # Translate our form data structure into the fields from
         # the Elster specification (see `Jahresdokumentation_10_2021.xml`)
         est_with_eric_mapping = EstEricMapping.parse_obj(self.input_data.est_data)
@@ -104,30 +126,34 @@ class EstValidationRequestController(TransferticketRequestController):
             electronic_steuernummer = generate_electronic_steuernummer(
                 self.input_data.est_data.steuernummer,
                 self.input_data.est_data.bundesland,
-                use_testmerker=self._is_testmerker_used())
+                use_testmerker=use_testmerker)
             vorsatz = generate_vorsatz_with_tax_number(electronic_steuernummer, *common_vorsatz_args)
             empfaenger = electronic_steuernummer[:4]
 
-        xml = elster_xml_generator.generate_full_est_xml(fields, vorsatz, self.input_data.meta_data.year, empfaenger,
-                                                         use_testmerker=self._is_testmerker_used())
-
-        pyeric_controller = self._PYERIC_CONTROLLER(xml, self.input_data.meta_data.year)
-        pyeric_response = pyeric_controller.get_eric_response()
-
-        return self.generate_json(pyeric_response)
+        return elster_xml_generator.generate_full_est_xml(fields, vorsatz, self.input_data.meta_data.year, empfaenger,
+                                                          use_testmerker=use_testmerker)
 
 
 class EstRequestController(EstValidationRequestController):
     _PYERIC_CONTROLLER = EstPyericProcessController
+    _PRINT_PYERIC_CONTROLLER = EstPrintPyericProcessController
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response['pdf'] = (base64.b64encode(pyeric_response.pdf)).decode('utf-8')
+        if pyeric_response.pdf is not None:
+            response['pdf'] = pyeric_response.pdf
         return response
 
+    def render_pdf(self):
+        """Creates the PDF for the declaration without sending it. Returns the raw PDF."""
+        xml = self.generate_full_xml(self._is_testmerker_used())
+        pyeric_controller = self._PRINT_PYERIC_CONTROLLER(xml, self.input_data.meta_data.year)
+        return pyeric_controller.get_eric_response().pdf
+
 
 class UnlockCodeRequestController(TransferticketRequestController):
     _PYERIC_CONTROLLER = UnlockCodeRequestPyericProcessController
+    _SERVER_RESPONSE_ELEMENTS = {'transferticket': 'TransferTicket', 'elster_request_id': 'AntragsID'}
 
     def __init__(self, input_data: UnlockCodeRequestData, include_elster_responses: bool = False):
         super().__init__(input_data, include_elster_responses)
@@ -144,15 +170,13 @@ class UnlockCodeRequestController(TransferticketRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-
-        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.server_response)
         response["idnr"] = self.input_data.tax_id_number
-
         return response
 
 
 class UnlockCodeActivationRequestController(TransferticketRequestController):
     _PYERIC_CONTROLLER = UnlockCodeActivationPyericProcessController
+    _SERVER_RESPONSE_ELEMENTS = {'transferticket': 'TransferTicket', 'elster_request_id': 'AntragsID'}
 
     def _is_testmerker_used(self):
         if self.input_data.tax_id_number:
@@ -166,13 +190,13 @@ class UnlockCodeActivationRequestController(TransferticketRequestController):
 
     def generate_json(self, pyeric_response: PyericResponse):
         response = super().generate_json(pyeric_response)
-        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.server_response)
         response["idnr"] = self.input_data.tax_id_number
         return response
 
 
 class UnlockCodeRevocationRequestController(TransferticketRequestController):
     _PYERIC_CONTROLLER = UnlockCodeRevocationPyericProcessController
+    _SERVER_RESPONSE_ELEMENTS = {'transferticket': 'TransferTicket', 'elster_request_id': 'AntragsID'}
 
     def _is_testmerker_used(self):
         if self.input_data.tax_id_number:
@@ -184,16 +208,21 @@ class UnlockCodeRevocationRequestController(TransferticketRequestController):
         return elster_xml_generator.generate_full_vast_revocation_xml(self.input_data.__dict__,
                                                                       use_testmerker=use_testmerker)
 
-    def generate_json(self, pyeric_response: PyericResponse):
-        response = super().generate_json(pyeric_response)
-        response["elster_request_id"] = get_antrag_id_from_xml(pyeric_response.server_response)
-        return response
-
 
 class CheckTaxNumberRequestController(EricaRequestController):
     """This handles any request that wants to check if a tax number is valid"""
 
+    @classmethod
+    def get_local_result(cls, input_data):
+        if is_known_invalid_steuernummer(input_data.tax_number, input_data.state_abbreviation.upper(),
+                                         use_testmerker=get_settings().use_testmerker):
+            return cls.generate_json(False)
+        return None
+
     def process(self):
+        local_result = self.get_local_result(self.input_data)
+        if local_result is not None:
+            return local_result
         try:
             full_tax_number = CheckTaxNumberRequestController._generate_tax_number(
                 self.input_data.state_abbreviation.upper(), self.input_data.tax_number)
@@ -245,7 +274,7 @@ class GetBelegeRequestController(EricaRequestController):
         pyeric_response = self._BELEG_REQUEST_PYERIC_CONTROLLER(get_beleg_xml).get_eric_response()
 
         encrypted_belege_xml = pyeric_response.server_response
-        return get_elements_text_from_xml(encrypted_belege_xml, 'Datenpaket')
+        return iter_elements_text_from_xml(encrypted_belege_xml, 'Datenpaket')
 
     def _request_decrypted_belege(self, encrypted_belege):
         decrypted_belege = DecryptBelegePyericController().get_decrypted_belege(encrypted_belege)
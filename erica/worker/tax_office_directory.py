@@ -0,0 +1,44 @@
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from erica.worker.huey import huey
+from erica.worker.pyeric.pyeric_controller import GetTaxOfficesPyericController
+
+logger = logging.getLogger('eric')
+
+_TAX_OFFICE_DIRECTORY_KEY = 'erica-tax-office-directory'
+
+
+@dataclass(frozen=True)
+class TaxOfficeDirectory:
+    """The tax offices of all states as returned by GetTaxOfficesPyericController, together with the version of the
+    ERiC library they were requested from. The list only changes with a new ERiC release."""
+    eric_version: str
+    tax_offices: dict
+
+
+def get_stored_tax_office_directory() -> Optional[TaxOfficeDirectory]:
+    """Returns the directory the refresh job stored in the huey storage, which is shared by the workers and the API."""
+    return huey.get(_TAX_OFFICE_DIRECTORY_KEY, peek=True)
+
+
+def store_tax_office_directory(directory: TaxOfficeDirectory):
+    huey.put(_TAX_OFFICE_DIRECTORY_KEY, directory)
+
+
+def refresh_tax_office_directory(force=False) -> TaxOfficeDirectory:
+    """Requests the tax office lists of all states and stores them, unless a directory for the current ERiC version
+    is already stored."""
+    controller = GetTaxOfficesPyericController()
+    eric_version = controller.get_eric_version()
+
+    stored_directory = get_stored_tax_office_directory()
+    if not force and stored_directory is not None and stored_directory.eric_version == eric_version:
+        logger.info(f"Tax office directory for ERiC {eric_version} is up to date")
+        return stored_directory
+
+    directory = TaxOfficeDirectory(eric_version, controller.get_eric_response())
+    store_tax_office_directory(directory)
+    logger.info(f"Stored tax office directory for ERiC {eric_version}")
+    return directory
@@ -0,0 +1,64 @@
+import hashlib
+import hmac
+import json
+import time
+from typing import Optional
+from uuid import UUID
+
+import requests
+from fastapi.encoders import jsonable_encoder
+
+from erica.api.dto.response_dto import ResponseBaseDto
+from erica.config import get_settings
+from erica.domain.model.erica_request import EricaRequest, RequestType
+
+# The requests whose result is posted to a callback URL, with the service method that creates their API response.
+_WEBHOOK_RESPONSE_METHODS = {
+    RequestType.send_est: 'get_response_send_est',
+    RequestType.grundsteuer: 'get_response_grundsteuer',
+    RequestType.freischalt_code_request: 'get_response_freischaltcode_request',
+    RequestType.freischalt_code_activate: 'get_response_freischaltcode_activation',
+    RequestType.freischalt_code_revocate: 'get_response_freischaltcode_revocation',
+}
+
+
+def get_callback_url(entity: EricaRequest) -> Optional[str]:
+    """Returns the callback URL given with the request or else the one registered for its client in the settings, or
+    None if the result is not posted anywhere."""
+    if entity.type not in _WEBHOOK_RESPONSE_METHODS:
+        return None
+    return entity.callback_url or get_settings().webhook_callback_urls.get(entity.creator_id)
+
+
+def get_webhook_response(request_type: RequestType, request_id: UUID) -> ResponseBaseDto:
+    """Returns the same response the client would get from the status endpoint of the request."""
+    from erica.api.service.service_injector import get_service
+    return getattr(get_service(request_type), _WEBHOOK_RESPONSE_METHODS[request_type])(request_id)
+
+
+def sign_webhook(body: bytes, timestamp: int, secret: str) -> str:
+    """
+    Returns the HMAC-SHA256 of the timestamp and the body. Receivers recompute it with the shared secret to check
+    that the webhook comes from erica and reject old timestamps to prevent replays.
+    """
+    return hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+
+
+def post_webhook(callback_url: str, request_id: UUID, response: ResponseBaseDto):
+    """Posts the signed response to the callback URL and raises if the receiver does not accept it."""
+    body = json.dumps(jsonable_encoder(response)).encode()
+    timestamp = int(time.time())
+    headers = {
+        'Content-Type': 'application/json',
+        'X-Erica-Request-Id': str(request_id),
+        'X-Erica-Timestamp': str(timestamp),
+        'X-Erica-Signature': f'sha256={sign_webhook(body, timestamp, get_settings().webhook_secret)}',
+    }
+    requests.post(callback_url, data=body, headers=headers, timeout=get_settings().webhook_timeout_in_sec,
+                  allow_redirects=False).raise_for_status()
+
+
+def get_retry_delay(attempt: int) -> int:
+    """Exponential backoff: the first retry is after the configured delay, every further one waits twice as long, but
+    at most an hour."""
+    return min(get_settings().webhook_retry_delay_in_sec * 2 ** (attempt - 1), 3600)
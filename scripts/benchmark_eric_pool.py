@@ -0,0 +1,55 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click as click
+
+from erica.worker.pyeric.eric_pool import EricInstancePool
+
+_TAX_NUMBER = "9198011310010"
+
+
+def _run_job(pool, io_delay):
+    # Simulates the database and queue work a job does without holding an ERiC instance.
+    time.sleep(io_delay)
+    with pool.checkout() as eric_wrapper:
+        eric_wrapper.check_tax_number(_TAX_NUMBER)
+
+
+def _measure_throughput(pool_size, number_of_threads, number_of_jobs, io_delay):
+    pool = EricInstancePool(pool_size)
+    pool.start()
+    try:
+        with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+            start = time.monotonic()
+            for job in [executor.submit(_run_job, pool, io_delay) for _ in range(number_of_jobs)]:
+                job.result()
+            duration = time.monotonic() - start
+    finally:
+        pool.shutdown()
+    return number_of_jobs / duration
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option('--pool-sizes', default='1,2,4', help='Comma separated list of ERiC pool sizes.')
+@click.option('--thread-counts', default='1,4,10', help='Comma separated list of worker thread counts.')
+@click.option('--jobs', 'number_of_jobs', default=200, help='Number of jobs per measurement.')
+@click.option('--io-delay', default=0.02, help='Seconds each job spends outside of ERiC.')
+def run(pool_sizes, thread_counts, number_of_jobs, io_delay):
+    """Measures the job throughput of the ERiC instance pool as a function of pool size and thread count."""
+    pool_sizes = [int(size) for size in pool_sizes.split(',')]
+    thread_counts = [int(count) for count in thread_counts.split(',')]
+
+    print("pool size | threads | jobs/s")
+    for pool_size in pool_sizes:
+        for number_of_threads in thread_counts:
+            throughput = _measure_throughput(pool_size, number_of_threads, number_of_jobs, io_delay)
+            print(f"{pool_size:>9} | {number_of_threads:>7} | {throughput:.1f}")
+
+
+if __name__ == "__main__":
+    cli()
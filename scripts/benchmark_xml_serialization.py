@@ -0,0 +1,65 @@
+import copy
+import os
+import re
+import timeit
+import xml.etree.ElementTree as ET
+from xml.dom import minidom
+from xml.etree.ElementTree import XML, tostring
+
+import click as click
+
+from erica.worker.elster_xml.common.pretty_xml import to_pretty_xml
+from erica.worker.elster_xml.common.transfer_header import create_xml_with_transfer_header, \
+    create_xml_with_transfer_header_from_element
+from erica.worker.elster_xml.transfer_header_fields import get_est_th_fields
+
+_SAMPLES_FOLDER = os.path.join(os.path.dirname(__file__), '../erica/worker/pyeric/warm_up_samples')
+
+
+def _create_est_xml(number_of_blocks):
+    """Returns an ESt element tree with the given number of copies of the sample Nutzdatenblock."""
+    with open(os.path.join(_SAMPLES_FOLDER, 'est.xml')) as sample_xml:
+        # Without the indentation of the sample, like the trees built by the generator.
+        elster_xml = XML(re.sub(r'>\s+<', '><', sample_xml.read()))
+    daten_teil_xml = elster_xml[0]
+    nutzdaten_block_xml = daten_teil_xml[0]
+    for _ in range(number_of_blocks - 1):
+        daten_teil_xml.append(copy.deepcopy(nutzdaten_block_xml))
+    return elster_xml
+
+
+def _minidom_pretty(xml):
+    # The serialisation used before: write, parse again and pretty print.
+    return minidom.parseString(tostring(xml)).childNodes[0].toprettyxml(indent=" " * 4)
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option('--blocks', default='1,10,100', help='Comma separated list of Nutzdatenblock counts per XML.')
+@click.option('--repetitions', default=50, help='Number of serialisations per measurement.')
+def run(blocks, repetitions):
+    """Compares the minidom based pretty printing with the streaming writer, with and without a TransferHeader."""
+    ET.register_namespace('', 'http://www.elster.de/elsterxml/schema/v11')
+    th_fields = get_est_th_fields(use_testmerker=True)
+    measurements = {
+        'minidom': lambda xml: _minidom_pretty(xml).encode(),
+        'streaming writer': lambda xml: to_pretty_xml(xml).encode(),
+        'minidom + TH': lambda xml: create_xml_with_transfer_header(_minidom_pretty(xml), th_fields).encode(),
+        'streaming writer + TH': lambda xml: create_xml_with_transfer_header_from_element(xml, th_fields).encode(),
+    }
+
+    print("blocks |                 method |  size in KB | ms per XML")
+    for number_of_blocks in [int(count) for count in blocks.split(',')]:
+        xml = _create_est_xml(number_of_blocks)
+        for name, serialise in measurements.items():
+            size = len(serialise(xml)) / 1024
+            duration = timeit.timeit(lambda: serialise(xml), number=repetitions) / repetitions
+            print(f"{number_of_blocks:>6} | {name:>22} | {size:>11.1f} | {duration * 1000:.2f}")
+
+
+if __name__ == "__main__":
+    cli()
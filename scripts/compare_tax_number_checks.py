@@ -0,0 +1,85 @@
+import random
+import sys
+
+import click as click
+
+from erica.config import get_settings
+from erica.worker.elster_xml.bufa_numbers import VALID_BUFA_NUMBERS
+from erica.worker.elster_xml.common.electronic_steuernummer import BUNDESLAND_BUFANR_MAPPING, \
+    BUNDESLAENDER_WITH_PREPENDED_NUMBER, generate_electronic_steuernummer, is_known_invalid_steuernummer
+from erica.worker.pyeric.eric_errors import InvalidBufaNumberError
+from erica.worker.pyeric.pyeric_controller import CheckTaxNumberPyericController
+from erica.worker.pyeric.simulated_eric import ERIC_BACKEND_SIMULATED
+
+
+def _generate_steuernummer(bundesland, rng):
+    """Generates a steuernummer in the state-specific format for a random bufa of the state."""
+    state_prefix = BUNDESLAND_BUFANR_MAPPING[bundesland]
+    bufa_nr = rng.choice([bufa for bufa in VALID_BUFA_NUMBERS if bufa.startswith(state_prefix)])
+    steuernummer = bufa_nr[len(state_prefix):] + ''.join(rng.choice('0123456789') for _ in range(8))
+    if bundesland in BUNDESLAENDER_WITH_PREPENDED_NUMBER:
+        steuernummer = rng.choice('0123456789') + steuernummer
+    return steuernummer
+
+
+def _mutate(steuernummer, rng):
+    """Returns variants of the steuernummer as clients might send them, most of them invalid."""
+    position = rng.randrange(len(steuernummer))
+    return [
+        steuernummer,
+        steuernummer[:position] + steuernummer[position + 1:],
+        steuernummer[:position] + rng.choice('0123456789') + steuernummer[position:],
+        steuernummer[:position] + rng.choice('/ -O') + steuernummer[position + 1:],
+        ''.join(rng.choice('0123456789') for _ in steuernummer),
+    ]
+
+
+def _is_valid_for_eric(steuernummer, bundesland, use_testmerker):
+    """The result of the tax number check without the local fast path."""
+    try:
+        electronic_steuernummer = generate_electronic_steuernummer(steuernummer, bundesland, use_testmerker)
+    except InvalidBufaNumberError:
+        return False
+    return CheckTaxNumberPyericController.get_eric_response(electronic_steuernummer)
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option('--per-state', default=2000, help='Number of generated tax numbers per state.')
+@click.option('--seed', default=0, help='Seed for generating the tax numbers.')
+def compare(per_state, seed):
+    """Checks generated tax numbers with the local check and with ERiC. The local check must never reject a tax
+    number that ERiC accepts. Exits with 1 if it does."""
+    if get_settings().eric_backend == ERIC_BACKEND_SIMULATED:
+        # The simulated backend does not check the check digit, so the comparison would not show anything
+        raise click.UsageError("The tax number checks can only be compared with the native ERiC library.")
+    rng = random.Random(seed)
+    use_testmerker = get_settings().use_testmerker
+    number_checked = number_invalid = number_rejected_locally = 0
+    wrongly_rejected = []
+
+    for bundesland in BUNDESLAND_BUFANR_MAPPING:
+        for _ in range(per_state):
+            for steuernummer in _mutate(_generate_steuernummer(bundesland, rng), rng):
+                is_valid = _is_valid_for_eric(steuernummer, bundesland, use_testmerker)
+                is_rejected_locally = is_known_invalid_steuernummer(steuernummer, bundesland, use_testmerker)
+                number_checked += 1
+                number_invalid += not is_valid
+                number_rejected_locally += is_rejected_locally
+                if is_valid and is_rejected_locally:
+                    wrongly_rejected.append((bundesland, steuernummer))
+
+    print(f"Checked {number_checked} tax numbers, {number_invalid} of them are invalid.")
+    print(f"{number_rejected_locally} invalid tax numbers are rejected without ERiC "
+          f"({number_rejected_locally / max(number_invalid, 1):.1%} of the invalid ones).")
+    if wrongly_rejected:
+        print(f"{len(wrongly_rejected)} valid tax numbers are rejected locally, e.g. {wrongly_rejected[:10]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
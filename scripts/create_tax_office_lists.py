@@ -1,7 +1,9 @@
 import json
 import click as click
 
+from erica.worker.pyeric.eric_pool import EricInstancePool
 from erica.worker.pyeric.pyeric_controller import GetTaxOfficesPyericController
+from erica.worker.tax_office_directory import refresh_tax_office_directory
 
 _STATIC_FOLDER = "erica/api/static"
 _TAX_OFFICES_JSON_FILE_NAME = _STATIC_FOLDER + "/tax_offices.json"
@@ -13,13 +15,26 @@ def cli():
 
 
 @cli.command()
-def create():
+@click.option('--number-of-instances', default=4, help='Number of ERiC instances requesting the lists at the same time.')
+def create(number_of_instances):
     print(f"Creating Json File under {_TAX_OFFICES_JSON_FILE_NAME}")
-    tax_office_list = GetTaxOfficesPyericController().get_eric_response()
+    eric_pool = EricInstancePool(number_of_instances)
+    try:
+        tax_office_list = GetTaxOfficesPyericController(eric_pool.checkout, number_of_instances).get_eric_response()
+    finally:
+        eric_pool.shutdown()
 
     with open(_TAX_OFFICES_JSON_FILE_NAME, 'w') as tax_offices_file:
         json.dump(tax_office_list, tax_offices_file, ensure_ascii=False)
 
 
+@cli.command()
+@click.option('--force', is_flag=True, help='Refresh even if the stored directory has the current ERiC version.')
+def refresh(force):
+    """Stores the tax office directory for the running API instances, which pick it up without a restart."""
+    directory = refresh_tax_office_directory(force=force)
+    print(f"Stored tax office directory for ERiC {directory.eric_version}")
+
+
 if __name__ == "__main__":
     cli()
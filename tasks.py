@@ -26,9 +26,21 @@ def database_migrations(c):
 def run_api(c):
     c.run("python -m erica")
 
+def _eric_pool_size_env(eric_pool_size):
+    # Without the option, the ERIC_POOL_SIZE of the environment or the configured default is used.
+    return f"env ERIC_POOL_SIZE={eric_pool_size} " if eric_pool_size is not None else ""
+
+@task
+def run_worker(c, number_of_workers=10, eric_pool_size=None):
+    c.run(f"{_eric_pool_size_env(eric_pool_size)}huey_consumer.py erica.worker.huey.huey -k thread -w {number_of_workers}")
+
+@task
+def run_pdf_worker(c, number_of_workers=4, eric_pool_size=None):
+    c.run(f"{_eric_pool_size_env(eric_pool_size)}huey_consumer.py erica.worker.huey.pdf_huey -k thread -w {number_of_workers}")
+
 @task
-def run_worker(c, number_of_workers=10):
-    c.run(f"huey_consumer.py erica.worker.huey.huey -k thread -w {number_of_workers}")
+def run_webhook_worker(c, number_of_workers=4):
+    c.run(f"huey_consumer.py erica.worker.huey.webhook_huey -k thread -w {number_of_workers}")
 
 @task
 def download_eric(c):
@@ -0,0 +1,40 @@
+from unittest.mock import patch, MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+from erica.api.dto.freischaltcode import FreischaltCodeRevocateDto
+
+
+def _revocate_dto(callback_url):
+    return FreischaltCodeRevocateDto.parse_obj({'payload': {'elsterRequestId': 'abc'},
+                                                'clientIdentifier': 'steuerlotse',
+                                                'callbackUrl': callback_url})
+
+
+class TestCallbackUrl:
+
+    def test_if_host_allowed_then_accept_callback_url(self):
+        with patch('erica.api.dto.callback_url.get_settings',
+                   return_value=MagicMock(webhook_allowed_hosts=['steuerlotse.example'])):
+            dto = _revocate_dto('https://steuerlotse.example/erica')
+
+        assert dto.callback_url == 'https://steuerlotse.example/erica'
+
+    def test_if_host_not_allowed_then_raise_validation_error(self):
+        with patch('erica.api.dto.callback_url.get_settings',
+                   return_value=MagicMock(webhook_allowed_hosts=['steuerlotse.example'])):
+            with pytest.raises(ValidationError):
+                _revocate_dto('https://169.254.169.254/latest')
+
+    def test_if_no_url_then_raise_validation_error(self):
+        with patch('erica.api.dto.callback_url.get_settings',
+                   return_value=MagicMock(webhook_allowed_hosts=['steuerlotse.example'])):
+            with pytest.raises(ValidationError):
+                _revocate_dto('steuerlotse.example')
+
+    def test_if_no_callback_url_given_then_it_is_none(self):
+        dto = FreischaltCodeRevocateDto.parse_obj({'payload': {'elsterRequestId': 'abc'},
+                                                   'clientIdentifier': 'steuerlotse'})
+
+        assert dto.callback_url is None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import Mock, MagicMock, call
+from unittest.mock import Mock, MagicMock, call, patch
 from uuid import UUID
 
 import pytest
@@ -8,7 +8,8 @@ from sqlalchemy.orm import Session
 
 from erica.job_service.job_service import JobService
 from erica.domain.model.base_domain_model import BasePayload
-from erica.domain.model.erica_request import EricaRequest, RequestType
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.payload.tax_number_validation import CheckTaxNumberPayload
 from erica.worker.request_processing.requests_controller import CheckTaxNumberRequestController
 from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
 
@@ -45,6 +46,10 @@ class MockEricaRequestRepository(EricaRequestRepository, list):
 class MockRequestController(CheckTaxNumberRequestController):
     call_list = []
 
+    @classmethod
+    def get_local_result(cls, input_data):
+        return None
+
     @classmethod
     def process(cls, *args, **kwargs):
         cls.call_list.append({'args': [*args], 'kwargs': {**kwargs}})
@@ -97,6 +102,56 @@ class TestJobServiceQueue:
         mock_call = mock_job.mock_calls[0]
         assert mock_call.args[0] == UUID('00000000-0000-0000-0000-000000000000')
 
+    def test_if_request_added_then_cache_its_status(self):
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=MockRequestController, payload_type=MockDto, job_method=PickableMock())
+        input_data = MockDto.parse_obj({'name': 'Batman', 'friend': 'Joker'})
+
+        with patch('erica.job_service.job_service.store_job_status') as store_job_status:
+            service.add_to_queue(input_data, "steuerlotse", job_type=RequestType.freischalt_code_activate)
+
+        store_job_status.assert_called_once_with(service.repository[0])
+
+    def test_if_callback_url_provided_then_store_it_with_request(self):
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=MockRequestController, payload_type=MockDto, job_method=PickableMock())
+        input_data = MockDto.parse_obj({'name': 'Batman', 'friend': 'Joker'})
+
+        service.add_to_queue(input_data, "steuerlotse", job_type=RequestType.freischalt_code_activate,
+                             callback_url='https://steuerlotse.example/erica')
+
+        assert service.repository[0].callback_url == 'https://steuerlotse.example/erica'
+
+
+class TestJobServiceQueueWithLocalResult:
+
+    def test_if_local_result_given_then_add_finished_request_without_job(self):
+        mock_job = PickableMock()
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=CheckTaxNumberRequestController, payload_type=CheckTaxNumberPayload,
+                             job_method=mock_job)
+        input_data = CheckTaxNumberPayload(state_abbreviation='by', tax_number='123')
+
+        result = service.add_to_queue(input_data, "steuerlotse", job_type=RequestType.check_tax_number)
+
+        assert service.repository[0].status == Status.success
+        assert service.repository[0].result == {'is_valid': False}
+        assert result.status == Status.success
+        mock_job.assert_not_called()
+
+    def test_if_no_local_result_given_then_add_new_request_with_job(self):
+        mock_job = PickableMock()
+        service = JobService(job_repository=MockEricaRequestRepository(),
+                             request_controller=CheckTaxNumberRequestController, payload_type=CheckTaxNumberPayload,
+                             job_method=mock_job)
+        input_data = CheckTaxNumberPayload(state_abbreviation='by', tax_number='19811310010')
+
+        service.add_to_queue(input_data, "steuerlotse", job_type=RequestType.check_tax_number)
+
+        assert service.repository[0].status == Status.new
+        assert service.repository[0].result is None
+        mock_job.assert_called_once()
+
 
 class TestJobServiceRun:
 
@@ -130,3 +185,15 @@ class TestJobServiceRun:
         service.apply_to_elster(request_entity)
 
         assert controller_instance.process.call_count == 1
+
+
+class TestJobServiceStorePdf:
+
+    def test_if_pdf_stored_then_save_pdf_in_pdf_repository(self):
+        pdf_repository = MagicMock()
+        service = JobService(job_repository=MockEricaRequestRepository(), request_controller=MagicMock(),
+                             payload_type=MockDto, job_method=MagicMock(), pdf_repository=pdf_repository)
+
+        service.store_pdf(1234, b'%PDF-1.4')
+
+        assert pdf_repository.save.mock_calls == [call(1234, b'%PDF-1.4')]
@@ -0,0 +1,131 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from erica.api.service.erica_request_service import EricaRequestService
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.job_service.job_status_cache import store_job_status, get_cached_job_status
+
+
+@pytest.fixture
+def redis_client():
+    redis_client = fakeredis.FakeRedis()
+    settings = MagicMock(cache_job_status=True, ttl_processing_request_entities_in_min=10,
+                         ttl_finished_request_entities_in_min=20, ttl_pdf_pending_request_entities_in_min=70)
+    with patch('erica.job_service.job_status_cache.get_settings', return_value=settings), \
+            patch('erica.job_service.job_status_cache._get_redis_client', return_value=redis_client):
+        yield redis_client
+
+
+def _entity(status=Status.processing, updated_at=None):
+    return EricaRequest(id=7, type=RequestType.freischalt_code_request, status=status, request_id=uuid.uuid4(),
+                        creator_id='steuerlotse', result={'transferticket': 'ticket', 'elster_request_id': 'id'},
+                        payload={'tax_id_number': '04452397687', 'date_of_birth': '1985-01-01'},
+                        updated_at=updated_at)
+
+
+def _key(entity):
+    return f'erica-job-status:{entity.request_id}'
+
+
+class TestJobStatusCache:
+
+    def test_if_status_stored_then_return_it_without_unused_payload_fields(self, redis_client):
+        entity = _entity(Status.success)
+
+        store_job_status(entity)
+        cached = get_cached_job_status(entity.request_id)
+
+        assert cached == entity.copy(update={'payload': {'tax_id_number': '04452397687'}})
+
+    def test_if_nothing_stored_then_return_none(self, redis_client):
+        assert get_cached_job_status(uuid.uuid4()) is None
+
+    def test_if_entity_finished_then_keep_status_as_long_as_finished_entities(self, redis_client):
+        entity = _entity(Status.failed)
+
+        store_job_status(entity)
+
+        assert redis_client.ttl(_key(entity)) == 20 * 60
+
+    def test_if_entity_not_finished_then_keep_status_as_long_as_unprocessed_entities(self, redis_client):
+        entity = _entity(Status.processing)
+
+        store_job_status(entity)
+
+        assert redis_client.ttl(_key(entity)) == 10 * 60
+
+    def test_if_entity_pdf_pending_then_keep_status_as_long_as_pdf_pending_entities(self, redis_client):
+        entity = _entity(Status.pdf_pending)
+
+        store_job_status(entity)
+
+        assert redis_client.ttl(_key(entity)) == 70 * 60
+
+    def test_if_entity_updated_earlier_then_shorten_time_to_live(self, redis_client):
+        entity = _entity(Status.processing, updated_at=datetime.now(timezone.utc) - timedelta(minutes=4))
+
+        store_job_status(entity)
+
+        assert 5 * 60 < redis_client.ttl(_key(entity)) <= 6 * 60
+
+    def test_if_time_to_live_over_then_remove_stored_status(self, redis_client):
+        entity = _entity(Status.processing)
+        store_job_status(entity)
+
+        store_job_status(entity.copy(update={'updated_at': datetime.now(timezone.utc) - timedelta(minutes=11)}))
+
+        assert get_cached_job_status(entity.request_id) is None
+
+    def test_if_only_if_missing_then_do_not_overwrite_stored_status(self, redis_client):
+        entity = _entity(Status.success)
+        store_job_status(entity)
+
+        store_job_status(entity.copy(update={'status': Status.processing}), only_if_missing=True)
+
+        assert get_cached_job_status(entity.request_id).status == Status.success
+
+    def test_if_storing_fails_then_remove_stored_status(self, redis_client):
+        entity = _entity(Status.processing)
+        store_job_status(entity)
+
+        with patch.object(redis_client, 'set', side_effect=ConnectionError()):
+            store_job_status(entity.copy(update={'status': Status.success}))
+
+        assert get_cached_job_status(entity.request_id) is None
+
+    def test_if_reading_fails_then_return_none(self, redis_client):
+        with patch.object(redis_client, 'get', side_effect=ConnectionError()):
+            assert get_cached_job_status(uuid.uuid4()) is None
+
+    def test_if_cache_disabled_then_do_not_use_redis(self):
+        with patch('erica.job_service.job_status_cache._get_redis_client') as get_redis_client:
+            store_job_status(_entity())
+            assert get_cached_job_status(uuid.uuid4()) is None
+
+        get_redis_client.assert_not_called()
+
+
+class TestEricaRequestServiceReadThrough:
+
+    def test_if_status_cached_then_do_not_read_repository(self, redis_client):
+        entity = _entity(Status.success)
+        store_job_status(entity)
+        repository = MagicMock()
+
+        erica_request = EricaRequestService(repository).get_request_by_request_id(entity.request_id)
+
+        assert erica_request.status == Status.success
+        repository.get_by_job_request_id.assert_not_called()
+
+    def test_if_status_not_cached_then_read_repository_and_cache_status(self, redis_client):
+        entity = _entity(Status.success)
+        repository = MagicMock(get_by_job_request_id=MagicMock(return_value=entity))
+
+        erica_request = EricaRequestService(repository).get_request_by_request_id(entity.request_id)
+
+        assert erica_request == entity
+        assert get_cached_job_status(entity.request_id).status == Status.success
@@ -0,0 +1,143 @@
+import asyncio
+import uuid
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+
+from erica.api.dto.response_dto import JobState
+from erica.api.utils import wait_for_job_response
+from erica.job_service.job_status_notifications import JobStatusListener, publish_job_finished
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(redis_server):
+    with patch('erica.job_service.job_status_notifications.is_job_status_notification_enabled', return_value=True), \
+            patch('erica.job_service.job_status_notifications._get_redis_client',
+                  return_value=fakeredis.FakeRedis(server=redis_server)):
+        yield
+
+
+@pytest.fixture
+async def job_status_listener(redis_server):
+    job_status_listener = JobStatusListener(fakeredis.aioredis.FakeRedis(server=redis_server))
+    yield job_status_listener
+    await job_status_listener.stop()
+
+
+def _response(job_state):
+    return MagicMock(process_status=job_state)
+
+
+class TestJobStatusListener:
+
+    async def test_if_job_finished_published_then_set_event_of_job(self, redis_client, job_status_listener):
+        request_id = uuid.uuid4()
+        assert await job_status_listener.listen()
+
+        with job_status_listener.watch(request_id) as job_finished:
+            publish_job_finished(request_id)
+            await asyncio.wait_for(job_finished.wait(), 1)
+
+    async def test_if_other_job_finished_then_do_not_set_event(self, redis_client, job_status_listener):
+        assert await job_status_listener.listen()
+
+        with job_status_listener.watch(uuid.uuid4()) as job_finished:
+            publish_job_finished(uuid.uuid4())
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(job_finished.wait(), 0.1)
+
+    async def test_if_watch_left_then_remove_waiter(self, job_status_listener):
+        with job_status_listener.watch(uuid.uuid4()):
+            pass
+
+        assert job_status_listener._waiters == {}
+
+    async def test_if_redis_not_reachable_then_do_not_listen(self):
+        redis_client = MagicMock()
+        redis_client.pubsub.return_value.subscribe.side_effect = ConnectionError()
+        redis_client.pubsub.return_value.aclose.side_effect = lambda: asyncio.sleep(0)
+        job_status_listener = JobStatusListener(redis_client)
+
+        assert not await job_status_listener.listen()
+        redis_client.pubsub.reset_mock()
+        assert not await job_status_listener.listen()
+        redis_client.pubsub.assert_not_called()
+
+
+class TestPublishJobFinished:
+
+    def test_if_redis_not_reachable_then_do_not_raise(self):
+        redis_client = MagicMock(publish=MagicMock(side_effect=ConnectionError()))
+        with patch('erica.job_service.job_status_notifications.is_job_status_notification_enabled',
+                   return_value=True), \
+                patch('erica.job_service.job_status_notifications._get_redis_client', return_value=redis_client):
+            publish_job_finished(uuid.uuid4())
+
+    def test_if_immediate_worker_then_do_not_publish(self):
+        with patch('erica.job_service.job_status_notifications._get_redis_client') as get_redis_client:
+            publish_job_finished(uuid.uuid4())
+
+        get_redis_client.assert_not_called()
+
+
+class TestWaitForJobResponse:
+
+    async def test_if_no_wait_then_return_response_without_listening(self):
+        get_response = MagicMock(return_value=_response(JobState.PROCESSING))
+        with patch('erica.api.utils.get_job_status_listener') as get_job_status_listener:
+            response = await wait_for_job_response(get_response, uuid.uuid4(), 0)
+
+        assert response == get_response.return_value
+        get_job_status_listener.assert_not_called()
+
+    async def test_if_job_already_finished_then_return_response_right_away(self, job_status_listener):
+        get_response = MagicMock(return_value=_response(JobState.SUCCESS))
+        with patch('erica.api.utils.get_job_status_listener', return_value=job_status_listener):
+            response = await asyncio.wait_for(wait_for_job_response(get_response, uuid.uuid4(), 10), 1)
+
+        assert response.process_status == JobState.SUCCESS
+        get_response.assert_called_once()
+
+    async def test_if_job_finishes_while_waiting_then_return_finished_response(self, redis_client,
+                                                                               job_status_listener):
+        request_id = uuid.uuid4()
+        get_response = MagicMock(side_effect=[_response(JobState.PROCESSING), _response(JobState.SUCCESS)])
+        with patch('erica.api.utils.get_job_status_listener', return_value=job_status_listener):
+            waiting = asyncio.create_task(wait_for_job_response(get_response, request_id, 10))
+            while not job_status_listener._waiters:
+                await asyncio.sleep(0.01)
+            publish_job_finished(request_id)
+            response = await asyncio.wait_for(waiting, 1)
+
+        assert response.process_status == JobState.SUCCESS
+        assert get_response.call_count == 2
+
+    async def test_if_job_does_not_finish_in_time_then_return_processing_response(self, job_status_listener):
+        get_response = MagicMock(return_value=_response(JobState.PROCESSING))
+        with patch('erica.api.utils.get_job_status_listener', return_value=job_status_listener):
+            response = await wait_for_job_response(get_response, uuid.uuid4(), 0.1)
+
+        assert response.process_status == JobState.PROCESSING
+        get_response.assert_called_once()
+
+    async def test_if_wait_longer_than_maximum_then_cap_it(self, job_status_listener):
+        get_response = MagicMock(return_value=_response(JobState.PROCESSING))
+        with patch('erica.api.utils.get_job_status_listener', return_value=job_status_listener), \
+                patch('erica.api.utils.get_settings', return_value=MagicMock(job_status_max_wait_in_sec=0.1)):
+            response = await asyncio.wait_for(wait_for_job_response(get_response, uuid.uuid4(), 3600), 1)
+
+        assert response.process_status == JobState.PROCESSING
+
+    async def test_if_listener_not_available_then_return_response_without_waiting(self):
+        get_response = MagicMock(return_value=_response(JobState.PROCESSING))
+        with patch('erica.api.utils.get_job_status_listener', return_value=None):
+            response = await wait_for_job_response(get_response, uuid.uuid4(), 10)
+
+        assert response.process_status == JobState.PROCESSING
@@ -0,0 +1,65 @@
+import uuid
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from erica.api.errors import RangeNotSatisfiableError, RequestTypeDoesNotMatchEndpointError
+from erica.api.service.pdf_service import PdfService, parse_byte_range
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+
+_PDF = b'%PDF-1.4 0123456789'
+
+
+class TestParseByteRange:
+
+    @pytest.mark.parametrize("range_header", [None, "", "items=0-10", "bytes=0-1,4-5", "bytes=a-b", "bytes=5-2",
+                                              "bytes=5"])
+    def test_if_no_or_unsupported_range_then_return_none(self, range_header):
+        assert parse_byte_range(range_header, 100) is None
+
+    @pytest.mark.parametrize("range_header, expected_range", [("bytes=0-9", (0, 9)),
+                                                              ("bytes=90-", (90, 99)),
+                                                              ("bytes=90-200", (90, 99)),
+                                                              ("bytes=-10", (90, 99)),
+                                                              ("bytes=-200", (0, 99))])
+    def test_if_range_given_then_return_first_and_last_byte(self, range_header, expected_range):
+        assert parse_byte_range(range_header, 100) == expected_range
+
+    @pytest.mark.parametrize("range_header", ["bytes=100-", "bytes=100-200", "bytes=-0"])
+    def test_if_range_not_overlapping_then_raise_error(self, range_header):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_byte_range(range_header, 100)
+
+
+class TestPdfService:
+
+    @pytest.fixture
+    def pdf_repository(self):
+        return MagicMock(get_size=MagicMock(return_value=len(_PDF)),
+                         get_content=MagicMock(side_effect=lambda erica_request_id, start=0, length=None:
+                                               _PDF[start:start + length] if length else _PDF[start:]))
+
+    @staticmethod
+    def _create_service(pdf_repository, request_type=RequestType.grundsteuer):
+        erica_request = EricaRequest(id=42, type=request_type, status=Status.success, payload={},
+                                     request_id=uuid.uuid4(), creator_id="test")
+        erica_request_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        return PdfService(service=erica_request_service, pdf_repository=pdf_repository)
+
+    def test_if_no_range_requested_then_return_whole_pdf(self, pdf_repository):
+        pdf = self._create_service(pdf_repository).get_pdf("test", RequestType.grundsteuer)
+
+        assert pdf.content == _PDF
+        assert not pdf.partial
+        assert pdf_repository.get_content.mock_calls == [call(42)]
+
+    def test_if_range_requested_then_only_read_that_range(self, pdf_repository):
+        pdf = self._create_service(pdf_repository).get_pdf("test", RequestType.grundsteuer, "bytes=0-3")
+
+        assert pdf.content == b'%PDF'
+        assert (pdf.start, pdf.end, pdf.size, pdf.partial) == (0, 3, len(_PDF), True)
+        assert pdf_repository.get_content.mock_calls == [call(42, 0, 4)]
+
+    def test_if_request_type_does_not_match_then_raise_error(self, pdf_repository):
+        with pytest.raises(RequestTypeDoesNotMatchEndpointError):
+            self._create_service(pdf_repository, RequestType.send_est).get_pdf("test", RequestType.grundsteuer)
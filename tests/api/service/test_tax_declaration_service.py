@@ -57,3 +57,25 @@ class TestTaxDeclarationService:
         assert response.result.transferticket == transferticket
         assert response.error_code is None
         assert response.error_message is None
+
+    def test_if_pdf_stored_then_return_pdf_url_instead_of_pdf(self):
+        request_id = uuid.uuid4()
+        erica_request = EricaRequest(type=RequestType.send_est, status=Status.success,
+                                     payload={},
+                                     result={"transferticket": "test_transferticket", "pdf_stored": True},
+                                     request_id=request_id,
+                                     creator_id="test")
+        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        response = TaxDeclarationService(service=mock_service).get_response_send_est(request_id)
+        assert response.result.pdf_url == f"/v2/ests/{request_id}/pdf"
+        assert response.result.pdf is None
+
+    def test_if_pdf_not_stored_then_return_no_pdf_url(self):
+        erica_request = EricaRequest(type=RequestType.send_est, status=Status.success,
+                                     payload={},
+                                     result={"transferticket": "test_transferticket"},
+                                     request_id=uuid.uuid4(),
+                                     creator_id="test")
+        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        response = TaxDeclarationService(service=mock_service).get_response_send_est("test")
+        assert response.result.pdf_url is None
@@ -4,16 +4,17 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 
 from erica import app
-from erica.api.v2.endpoints.est import send_est, get_send_est_job
+from erica.api.v2.endpoints.est import send_est, get_send_est_job, get_send_est_pdf
 from erica.api.v2.endpoints.fsc import request_fsc, get_fsc_request_job, activate_fsc, get_fsc_activation_job, \
     revocate_fsc, get_fsc_revocation_job
-from erica.api.v2.endpoints.grundsteuer import send_grundsteuer, get_grundsteuer_job
+from erica.api.v2.endpoints.grundsteuer import send_grundsteuer, get_grundsteuer_job, get_grundsteuer_pdf
 from erica.api.v2.endpoints.tax import is_valid_tax_number, get_valid_tax_number_job
 from erica.api.service.freischaltcode_service import FreischaltCodeService
 from erica.job_service.job_service import JobService
 from erica.api.dto.response_dto import JobState
 from erica.api.dto.erica_request_dto import EricaRequestDto
 from erica.api.service.grundsteuer_service import GrundsteuerService
+from erica.api.service.pdf_service import PdfService
 from erica.api.service.tax_declaration_service import TaxDeclarationService
 from erica.api.service.tax_number_validition_service import TaxNumberValidityService
 from erica.domain.model.erica_request import EricaRequest, RequestType, Status
@@ -293,3 +294,38 @@ async def test_if_get_est_job_returns_processing_status(mock_job_state, api_meth
         assert response.result is None
         assert response.error_code is None
         assert response.error_message is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("api_method, request_type, endpoint_to_patch",
+                         [(get_send_est_pdf, RequestType.send_est, "est"),
+                          (get_grundsteuer_pdf, RequestType.grundsteuer, "grundsteuer")],
+                         ids=["send_est", "grundsteuer"])
+async def test_if_get_pdf_then_return_pdf(api_method, request_type, endpoint_to_patch):
+    request_id = uuid.uuid4()
+    erica_request = EricaRequest(id=1, type=request_type, status=Status.success, payload={}, request_id=request_id,
+                                 creator_id="test")
+    pdf_repository = MagicMock(get_size=MagicMock(return_value=8), get_content=MagicMock(return_value=b'%PDF-1.4'))
+    with patch(f"erica.api.v2.endpoints.{endpoint_to_patch}.get_pdf_service", MagicMock()) as get_pdf_service_mock:
+        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        get_pdf_service_mock.return_value = PdfService(service=mock_service, pdf_repository=pdf_repository)
+        response = await api_method(request_id, None)
+        assert response.status_code == 200
+        assert response.media_type == 'application/pdf'
+        assert response.body == b'%PDF-1.4'
+        assert response.headers['accept-ranges'] == 'bytes'
+
+
+@pytest.mark.asyncio
+async def test_if_get_pdf_with_range_then_return_partial_pdf():
+    request_id = uuid.uuid4()
+    erica_request = EricaRequest(id=1, type=RequestType.grundsteuer, status=Status.success, payload={},
+                                 request_id=request_id, creator_id="test")
+    pdf_repository = MagicMock(get_size=MagicMock(return_value=8), get_content=MagicMock(return_value=b'%PDF'))
+    with patch("erica.api.v2.endpoints.grundsteuer.get_pdf_service", MagicMock()) as get_pdf_service_mock:
+        mock_service = MagicMock(get_request_by_request_id=MagicMock(return_value=erica_request))
+        get_pdf_service_mock.return_value = PdfService(service=mock_service, pdf_repository=pdf_repository)
+        response = await get_grundsteuer_pdf(request_id, "bytes=0-3")
+        assert response.status_code == 206
+        assert response.body == b'%PDF'
+        assert response.headers['content-range'] == 'bytes 0-3/8'
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from erica.api.dto.erica_request_dto import EricaRequestDto
+from erica.api.inline_eric import InlineEricRunner, InlineEricTimeoutError, try_run_inline, \
+    start_inline_eric_runner
+from erica.api.v2.endpoints.tax import is_valid_tax_number
+from erica.domain.model.erica_request import RequestType, Status
+from erica.worker.pyeric.eric import get_eric_wrapper
+from utils import create_tax_number_validity
+
+
+@pytest.fixture
+def eric_wrapper():
+    with patch('erica.api.inline_eric.EricInstancePool') as eric_instance_pool:
+        eric_wrapper = MagicMock()
+        eric_instance_pool.return_value.checkout.return_value.__enter__.return_value = eric_wrapper
+        yield eric_wrapper
+
+
+def _check_tax_number(tax_number):
+    with get_eric_wrapper() as eric_wrapper:
+        return eric_wrapper.check_tax_number(tax_number)
+
+
+class TestInlineEricRunner:
+
+    @pytest.mark.asyncio
+    async def test_if_function_run_then_return_result_with_eric_wrapper_of_runner(self, eric_wrapper):
+        eric_wrapper.check_tax_number.return_value = True
+        inline_eric_runner = InlineEricRunner(1, timeout=5)
+
+        try:
+            result = await inline_eric_runner.run(_check_tax_number, '9198011310010')
+        finally:
+            inline_eric_runner.shutdown()
+
+        assert result is True
+        eric_wrapper.check_tax_number.assert_called_once_with('9198011310010')
+
+    @pytest.mark.asyncio
+    async def test_if_function_takes_longer_than_timeout_then_raise_timeout_error(self, eric_wrapper):
+        inline_eric_runner = InlineEricRunner(1, timeout=0.01)
+
+        try:
+            with pytest.raises(InlineEricTimeoutError):
+                await inline_eric_runner.run(time.sleep, 0.5)
+        finally:
+            inline_eric_runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_if_function_raises_error_then_raise_it(self, eric_wrapper):
+        eric_wrapper.check_tax_number.side_effect = ValueError()
+        inline_eric_runner = InlineEricRunner(1, timeout=5)
+
+        try:
+            with pytest.raises(ValueError):
+                await inline_eric_runner.run(_check_tax_number, '9198011310010')
+        finally:
+            inline_eric_runner.shutdown()
+
+
+class TestStartInlineEricRunner:
+
+    @pytest.mark.asyncio
+    async def test_if_started_then_create_instances_of_pool(self):
+        with patch('erica.api.inline_eric.EricInstancePool') as eric_instance_pool:
+            inline_eric_runner = InlineEricRunner(1, timeout=5)
+            try:
+                with patch('erica.api.inline_eric.get_inline_eric_runner', return_value=inline_eric_runner):
+                    await start_inline_eric_runner()
+            finally:
+                inline_eric_runner.shutdown()
+
+        eric_instance_pool.return_value.start.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_if_instances_cannot_be_created_then_do_not_raise(self):
+        with patch('erica.api.inline_eric.EricInstancePool') as eric_instance_pool:
+            eric_instance_pool.return_value.start.side_effect = OSError()
+            inline_eric_runner = InlineEricRunner(1, timeout=5)
+            try:
+                with patch('erica.api.inline_eric.get_inline_eric_runner', return_value=inline_eric_runner):
+                    await start_inline_eric_runner()
+            finally:
+                inline_eric_runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_if_inline_not_enabled_then_do_not_start(self):
+        with patch('erica.api.inline_eric.get_inline_eric_runner', return_value=None), \
+                patch('erica.api.inline_eric.EricInstancePool') as eric_instance_pool:
+            await start_inline_eric_runner()
+
+        eric_instance_pool.assert_not_called()
+
+
+class TestTryRunInline:
+
+    @pytest.mark.asyncio
+    async def test_if_inline_not_enabled_then_return_none_without_calling_function(self):
+        function = MagicMock()
+        with patch('erica.api.inline_eric.get_inline_eric_runner', return_value=None):
+            assert await try_run_inline(function) is None
+
+        function.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_if_runner_times_out_then_return_none(self):
+        inline_eric_runner = MagicMock(run=MagicMock(side_effect=InlineEricTimeoutError()))
+        with patch('erica.api.inline_eric.get_inline_eric_runner', return_value=inline_eric_runner):
+            assert await try_run_inline(MagicMock()) is None
+
+    @pytest.mark.asyncio
+    async def test_if_function_fails_then_return_none(self):
+        inline_eric_runner = MagicMock(run=MagicMock(side_effect=ValueError()))
+        with patch('erica.api.inline_eric.get_inline_eric_runner', return_value=inline_eric_runner):
+            assert await try_run_inline(MagicMock()) is None
+
+    @pytest.mark.asyncio
+    async def test_if_runner_returns_result_then_return_it(self):
+        async def run(function, *args):
+            return function(*args)
+
+        with patch('erica.api.inline_eric.get_inline_eric_runner', return_value=MagicMock(run=run)):
+            assert await try_run_inline(lambda value: value * 2, 21) == 42
+
+
+class TestIsValidTaxNumberInline:
+
+    @pytest.mark.asyncio
+    async def test_if_inline_result_returned_then_respond_with_result(self):
+        job_service = MagicMock()
+        with patch('erica.api.v2.endpoints.tax.get_job_service', return_value=job_service), \
+                patch('erica.api.v2.endpoints.tax.try_run_inline', return_value={'is_valid': True}):
+            response = await is_valid_tax_number(create_tax_number_validity(), MagicMock(), inline=True)
+
+        assert response.status_code == 200
+        assert json.loads(response.body) == {'processStatus': 'Success', 'result': {'isValid': True},
+                                             'errorCode': None, 'errorMessage': None}
+        job_service.add_to_queue.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_if_no_inline_result_returned_then_add_job_to_queue(self):
+        job_service = MagicMock()
+        job_service.add_to_queue.return_value = EricaRequestDto(type=RequestType.check_tax_number,
+                                                                status=Status.new, payload="{}",
+                                                                request_id=uuid.uuid4())
+        request = MagicMock(url_for=MagicMock(return_value='/v2/tax_number_validity/1'), base_url='lorem')
+        with patch('erica.api.v2.endpoints.tax.get_job_service', return_value=job_service), \
+                patch('erica.api.v2.endpoints.tax.try_run_inline', return_value=None):
+            response = await is_valid_tax_number(create_tax_number_validity(), request, inline=True)
+
+        assert response.status_code == 201
+        job_service.add_to_queue.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_if_inline_not_requested_then_do_not_try_inline(self):
+        job_service = MagicMock()
+        job_service.add_to_queue.return_value = EricaRequestDto(type=RequestType.check_tax_number,
+                                                                status=Status.new, payload="{}",
+                                                                request_id=uuid.uuid4())
+        request = MagicMock(url_for=MagicMock(return_value='/v2/tax_number_validity/1'), base_url='lorem')
+        with patch('erica.api.v2.endpoints.tax.get_job_service', return_value=job_service), \
+                patch('erica.api.v2.endpoints.tax.try_run_inline') as try_run_inline_mock:
+            await is_valid_tax_number(create_tax_number_validity(), request)
+
+        try_run_inline_mock.assert_not_called()
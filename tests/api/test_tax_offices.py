@@ -0,0 +1,164 @@
+import gzip
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from erica.api.tax_offices import TaxOfficeList, TaxOfficeListContent, create_tax_offices_response
+from erica.worker.tax_office_directory import TaxOfficeDirectory
+
+_TAX_OFFICES = {'tax_offices': [{'state_abbreviation': 'be', 'name': 'Berlin',
+                                 'tax_offices': [{'name': 'Finanzamt Berlin', 'bufa_nr': '1101'}]}]}
+
+
+class TestTaxOfficeList:
+
+    def test_if_no_directory_stored_then_return_static_file(self):
+        with patch('erica.api.tax_offices.get_stored_tax_office_directory', return_value=None):
+            content = TaxOfficeList(reload_interval=0).get_content()
+
+        with open('erica/api/static/tax_offices.json', 'rb') as static_file:
+            assert content.body == static_file.read()
+
+    def test_if_directory_stored_then_return_its_tax_offices(self):
+        with patch('erica.api.tax_offices.get_stored_tax_office_directory',
+                   return_value=TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES)):
+            content = TaxOfficeList(reload_interval=0).get_content()
+
+        assert json.loads(content.body) == _TAX_OFFICES
+
+    def test_if_directory_for_new_eric_version_stored_then_swap_content(self):
+        tax_office_list = TaxOfficeList(reload_interval=0)
+        new_tax_offices = {'tax_offices': []}
+        with patch('erica.api.tax_offices.get_stored_tax_office_directory') as get_stored_directory:
+            get_stored_directory.return_value = TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES)
+            tax_office_list.get_content()
+            get_stored_directory.return_value = TaxOfficeDirectory('37.0.0.0', new_tax_offices)
+
+            content = tax_office_list.get_content()
+
+        assert json.loads(content.body) == new_tax_offices
+        assert tax_office_list.eric_version == '37.0.0.0'
+
+    def test_if_static_file_changed_then_swap_content(self, tmp_path):
+        static_file = tmp_path / 'tax_offices.json'
+        static_file.write_text(json.dumps({'tax_offices': []}))
+        tax_office_list = TaxOfficeList(static_file=str(static_file), reload_interval=0)
+        static_file.write_text(json.dumps(_TAX_OFFICES))
+        os.utime(static_file, ns=(0, 1))
+
+        with patch('erica.api.tax_offices.get_stored_tax_office_directory', return_value=None):
+            content = tax_office_list.get_content()
+
+        assert json.loads(content.body) == _TAX_OFFICES
+
+    def test_if_static_file_changed_after_directory_stored_then_keep_directory(self, tmp_path):
+        static_file = tmp_path / 'tax_offices.json'
+        static_file.write_text(json.dumps({'tax_offices': []}))
+        tax_office_list = TaxOfficeList(static_file=str(static_file), reload_interval=0)
+        with patch('erica.api.tax_offices.get_stored_tax_office_directory',
+                   return_value=TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES)):
+            tax_office_list.get_content()
+            os.utime(static_file, ns=(0, 1))
+
+            content = tax_office_list.get_content()
+
+        assert json.loads(content.body) == _TAX_OFFICES
+
+    def test_if_reload_interval_not_passed_then_do_not_look_up_directory_again(self):
+        tax_office_list = TaxOfficeList(reload_interval=3600)
+        with patch('erica.api.tax_offices.get_stored_tax_office_directory', return_value=None) as get_stored_directory:
+            tax_office_list.get_content()
+            tax_office_list.get_content()
+
+        get_stored_directory.assert_called_once()
+
+    def test_if_directory_cannot_be_loaded_then_keep_content(self):
+        tax_office_list = TaxOfficeList(reload_interval=0)
+        content = tax_office_list.get_content()
+        with patch('erica.api.tax_offices.get_stored_tax_office_directory', side_effect=ConnectionError()):
+            assert tax_office_list.get_content() is content
+
+
+class TestTaxOfficeListContent:
+
+    def test_if_created_then_gzip_encoding_decompresses_to_body(self):
+        content = TaxOfficeListContent(b'{"tax_offices": []}')
+
+        assert gzip.decompress(content.encodings['gzip']) == content.body
+
+    def test_if_same_body_then_same_etags(self):
+        assert TaxOfficeListContent(b'{"tax_offices": []}').etags == TaxOfficeListContent(b'{"tax_offices": []}').etags
+
+    def test_if_different_body_then_different_etag(self):
+        assert TaxOfficeListContent(b'{"tax_offices": []}').etags['identity'] != \
+               TaxOfficeListContent(b'{"tax_offices": [1]}').etags['identity']
+
+    def test_if_encodings_differ_then_etags_differ(self):
+        etags = TaxOfficeListContent(b'{"tax_offices": []}').etags
+
+        assert len(set(etags.values())) == len(etags)
+
+    @pytest.mark.parametrize('accept_encoding, expected_encoding', [
+        (None, 'identity'),
+        ('gzip', 'gzip'),
+        ('gzip;q=0, deflate', 'identity'),
+        ('*', 'gzip'),
+        ('deflate, GZIP;q=0.5', 'gzip'),
+    ])
+    def test_if_accept_encoding_given_then_choose_best_available_encoding(self, accept_encoding, expected_encoding):
+        content = TaxOfficeListContent(b'{"tax_offices": []}')
+        content.encodings.pop('br', None)
+
+        assert content.choose_encoding(accept_encoding) == expected_encoding
+
+    @pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+    def test_if_etag_of_any_encoding_given_then_match(self, encoding):
+        content = TaxOfficeListContent(b'{"tax_offices": []}')
+
+        assert content.matches('"other", ' + content.etags[encoding])
+        assert content.matches('W/' + content.etags[encoding])
+
+    def test_if_other_etag_given_then_do_not_match(self):
+        content = TaxOfficeListContent(b'{"tax_offices": []}')
+
+        assert not content.matches('"other"')
+        assert not content.matches(None)
+
+
+class TestCreateTaxOfficesResponse:
+
+    @pytest.fixture(autouse=True)
+    def tax_office_list(self):
+        tax_office_list = TaxOfficeList(reload_interval=3600)
+        tax_office_list.content = TaxOfficeListContent(json.dumps(_TAX_OFFICES).encode())
+        with patch('erica.api.tax_offices.get_tax_office_list', return_value=tax_office_list):
+            yield tax_office_list
+
+    def test_if_gzip_accepted_then_return_gzip_encoded_list(self, tax_office_list):
+        response = create_tax_offices_response({'accept-encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers['content-encoding'] == 'gzip'
+        assert response.headers['etag'] == tax_office_list.content.etags['gzip']
+        assert json.loads(gzip.decompress(response.body)) == _TAX_OFFICES
+
+    def test_if_no_encoding_accepted_then_return_uncompressed_list(self):
+        response = create_tax_offices_response({})
+
+        assert 'content-encoding' not in response.headers
+        assert json.loads(response.body) == _TAX_OFFICES
+
+    def test_if_etag_matches_then_return_not_modified(self, tax_office_list):
+        response = create_tax_offices_response({'if-none-match': tax_office_list.content.etags['identity']})
+
+        assert response.status_code == 304
+        assert response.body == b''
+        assert response.headers['etag'] == tax_office_list.content.etags['identity']
+
+    def test_if_returned_then_set_cache_headers(self):
+        response = create_tax_offices_response({})
+
+        assert response.headers['cache-control'] == 'public, max-age=86400'
+        assert response.headers['vary'] == 'Accept-Encoding'
@@ -0,0 +1,54 @@
+from uuid import uuid4
+
+import pytest
+
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.domain.sqlalchemy.erica_request_schema import EricaRequestSchema
+from erica.domain.sqlalchemy.repositories.base_repository import EntityNotFoundError
+from erica.domain.sqlalchemy.repositories.erica_request_pdf_repository import EricaRequestPdfRepository
+from erica.domain.sqlalchemy.repositories.erica_request_repository import EricaRequestRepository
+
+_PDF = b'%PDF-1.4 0123456789'
+
+
+def _create_erica_request(db_connection):
+    return EricaRequestRepository(db_connection=db_connection).create(
+        EricaRequest(request_id=uuid4(), payload={}, creator_id="api", type=RequestType.grundsteuer,
+                     status=Status.success))
+
+
+class TestEricaRequestPdfRepository:
+
+    def test_if_pdf_saved_then_return_its_size_and_content(self, setup_database):
+        erica_request = _create_erica_request(setup_database)
+        repository = EricaRequestPdfRepository(db_connection=setup_database)
+
+        repository.save(erica_request.id, _PDF)
+
+        assert repository.get_size(erica_request.id) == len(_PDF)
+        assert repository.get_content(erica_request.id) == _PDF
+        assert repository.get_content(erica_request.id, 9, 4) == b'0123'
+
+    def test_if_pdf_saved_twice_then_keep_last_pdf(self, setup_database):
+        erica_request = _create_erica_request(setup_database)
+        repository = EricaRequestPdfRepository(db_connection=setup_database)
+
+        repository.save(erica_request.id, b'first')
+        repository.save(erica_request.id, _PDF)
+
+        assert repository.get_content(erica_request.id) == _PDF
+
+    def test_if_erica_request_deleted_then_delete_pdf(self, setup_database):
+        erica_request = _create_erica_request(setup_database)
+        repository = EricaRequestPdfRepository(db_connection=setup_database)
+        repository.save(erica_request.id, _PDF)
+
+        setup_database.execute(EricaRequestSchema.__table__.delete().where(EricaRequestSchema.id == erica_request.id))
+        setup_database.commit()
+
+        with pytest.raises(EntityNotFoundError):
+            repository.get_size(erica_request.id)
+
+    def test_if_no_pdf_saved_then_raise_error(self, setup_database):
+        with pytest.raises(EntityNotFoundError):
+            EricaRequestPdfRepository(db_connection=setup_database).get_content(-1)
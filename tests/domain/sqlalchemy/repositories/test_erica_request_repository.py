@@ -301,3 +301,51 @@ class TestEricaRepositoryUpdateProcessing:
             EricaRequestSchema.request_id == request_id).first()
         assert entity_found is not None
         assert entity_found.status == status
+
+    def test_if_pdf_pending_entity_older_than_ttl_in_database_then_not_update_to_failed(self, setup_database):
+        request_id = uuid.uuid4()
+        mock_object = EricaRequest(request_id=request_id,
+                                   payload={'endboss': 'Melkor'},
+                                   creator_id="api",
+                                   type=RequestType.send_est,
+                                   status=Status.pdf_pending,
+                                   updated_at=datetime.datetime.now() - datetime.timedelta(minutes=2))
+        EricaRequestRepository(db_connection=setup_database).create(mock_object)
+
+        EricaRequestRepository(db_connection=setup_database).set_not_processed_entities_to_failed(1)
+
+        entity_found = setup_database.query(EricaRequestSchema).filter(
+            EricaRequestSchema.request_id == request_id).first()
+        assert entity_found.status == Status.pdf_pending
+
+
+class TestEricaRepositoryGetOldPdfPending:
+
+    def test_if_pdf_pending_entity_older_than_ttl_in_database_then_return_it(self, setup_database):
+        setup_database.query(EricaRequestSchema).delete()
+        request_id = uuid.uuid4()
+        mock_object = EricaRequest(request_id=request_id,
+                                   payload={'endboss': 'Melkor'},
+                                   creator_id="api",
+                                   type=RequestType.send_est,
+                                   status=Status.pdf_pending,
+                                   updated_at=datetime.datetime.now() - datetime.timedelta(minutes=2))
+        EricaRequestRepository(db_connection=setup_database).create(mock_object)
+
+        entities = EricaRequestRepository(db_connection=setup_database).get_old_pdf_pending_entities(1)
+
+        assert [entity.request_id for entity in entities] == [request_id]
+
+    def test_if_pdf_pending_entity_not_older_than_ttl_in_database_then_do_not_return_it(self, setup_database):
+        request_id = uuid.uuid4()
+        mock_object = EricaRequest(request_id=request_id,
+                                   payload={'endboss': 'Melkor'},
+                                   creator_id="api",
+                                   type=RequestType.send_est,
+                                   status=Status.pdf_pending,
+                                   updated_at=datetime.datetime.now())
+        EricaRequestRepository(db_connection=setup_database).create(mock_object)
+
+        entities = EricaRequestRepository(db_connection=setup_database).get_old_pdf_pending_entities(1)
+
+        assert request_id not in [entity.request_id for entity in entities]
@@ -4,7 +4,8 @@ import pytest
 
 from erica.worker.elster_xml.common.electronic_steuernummer import generate_electronic_aktenzeichen, \
     get_bufa_nr_from_steuernummer, \
-    generate_electronic_steuernummer, get_bufa_nr_from_aktenzeichen
+    generate_electronic_steuernummer, get_bufa_nr_from_aktenzeichen, \
+    is_known_invalid_steuernummer
 from erica.worker.pyeric.eric_errors import InvalidBufaNumberError
 from worker.utils import missing_pyeric_lib
 
@@ -117,3 +118,44 @@ class TestGenerateElectronicSteuernummer:
         steuernummer = '01999999999'
 
         generate_electronic_steuernummer(steuernummer, bundesland)
+
+
+class TestIsKnownInvalidSteuernummer:
+
+    # The sample tax numbers of the states published by ELSTER, with an existing tax office where the sample one is not
+    @pytest.mark.parametrize('bundesland, steuernummer', [
+        ('BW', '9381508152'), ('BY', '18181508155'), ('BE', '2181508150'), ('BB', '04881508155'),
+        ('HB', '7581508152'), ('HH', '1081508158'), ('HE', '01381508153'), ('MV', '07981508151'),
+        ('ND', '2481508151'), ('NW', '13381508159'), ('RP', '2281508154'), ('SL', '01081508182'),
+        ('SN', '20281508157'), ('ST', '10281508151'), ('SH', '2981508158'), ('TH', '15181508156'),
+        ('BY', '19811310010')])
+    def test_if_steuernummer_has_format_valid_bufa_and_check_digit_then_return_false(self, bundesland, steuernummer):
+        assert not is_known_invalid_steuernummer(steuernummer, bundesland)
+
+    @pytest.mark.parametrize('bundesland, steuernummer', [
+        ('BW', '9381508153'), ('BY', '18181508156'), ('BB', '04881508150'), ('HB', '7581508151'),
+        ('HH', '1081508150'), ('HE', '01381508154'), ('MV', '07981508152'), ('ND', '2481508152'),
+        ('NW', '13381508150'), ('RP', '2281508155'), ('SL', '01081508183'), ('SN', '20281508150'),
+        ('ST', '10281508150'), ('SH', '2981508159'), ('TH', '15181508157'), ('BY', '19811310011')])
+    def test_if_check_digit_wrong_then_return_true(self, bundesland, steuernummer):
+        assert is_known_invalid_steuernummer(steuernummer, bundesland)
+
+    def test_if_steuernummer_of_berlin_then_do_not_check_check_digit(self):
+        assert not is_known_invalid_steuernummer('2181508151', 'BE')
+
+    @pytest.mark.parametrize('bundesland, steuernummer', [
+        ('BY', '1818150815'), ('BY', '181815081555'), ('BE', '21815081500'), ('BE', '')])
+    def test_if_steuernummer_has_wrong_length_then_return_true(self, bundesland, steuernummer):
+        assert is_known_invalid_steuernummer(steuernummer, bundesland)
+
+    @pytest.mark.parametrize('steuernummer', ['181/815/0815', '181815O8155', '18181508١55', ' 1818150815'])
+    def test_if_steuernummer_has_other_characters_than_digits_then_return_true(self, steuernummer):
+        assert is_known_invalid_steuernummer(steuernummer, 'BY')
+
+    def test_if_prepended_number_is_not_a_digit_then_return_false(self):
+        # The prepended number is not part of the electronic steuernummer, so ERiC does not check it
+        assert not is_known_invalid_steuernummer('/1381508153', 'HE')
+
+    def test_if_bufa_invalid_then_return_true(self):
+        assert is_known_invalid_steuernummer('99999999999', 'HE')
+
@@ -0,0 +1,58 @@
+from xml.etree.ElementTree import Element, SubElement, XML
+
+import pytest
+
+from erica.worker.elster_xml.common.pretty_xml import to_pretty_xml, iter_pretty_xml
+
+
+class TestToPrettyXml:
+
+    def test_if_element_has_children_then_indent_them_with_four_spaces(self):
+        xml = XML('<a><b><c>text</c></b><d/></a>')
+
+        assert to_pretty_xml(xml) == '<a>\n    <b>\n        <c>text</c>\n    </b>\n    <d/>\n</a>\n'
+
+    def test_if_declaration_given_then_write_it_in_first_line(self):
+        assert to_pretty_xml(XML('<a/>'), '<?xml version="1.0" ?>') == '<?xml version="1.0" ?>\n<a/>\n'
+
+    def test_if_text_is_empty_string_then_write_empty_pair(self):
+        xml = Element('a')
+        xml.text = ''
+
+        assert to_pretty_xml(xml) == '<a></a>\n'
+
+    def test_if_whitespace_between_elements_then_drop_it(self):
+        xml = XML('<a>\n  <b> </b>\n</a>')
+
+        assert to_pretty_xml(xml) == '<a>\n    <b/>\n</a>\n'
+
+    def test_if_attributes_given_then_keep_order_and_escape_them(self):
+        xml = Element('a', {'version': '2', 'xmlns': 'urn:x', 'name': '"A" & <B>'})
+
+        assert to_pretty_xml(xml) == '<a version="2" xmlns="urn:x" name="&quot;A&quot; &amp; &lt;B&gt;"/>\n'
+
+    def test_if_text_needs_escaping_then_escape_it(self):
+        xml = Element('a')
+        xml.text = 'Müller & <Co>'
+
+        assert to_pretty_xml(xml) == '<a>Müller &amp; &lt;Co&gt;</a>\n'
+
+    def test_if_qualified_names_then_declare_namespace_only_where_it_changes(self):
+        xml = XML('<Elster xmlns="urn:elster"><E10 xmlns="urn:e10" version="2021"><A/></E10></Elster>')
+        SubElement(xml, 'DatenTeil')
+
+        assert to_pretty_xml(xml) == '<Elster xmlns="urn:elster">\n' \
+                                     '    <E10 xmlns="urn:e10" version="2021">\n' \
+                                     '        <A/>\n' \
+                                     '    </E10>\n' \
+                                     '    <DatenTeil/>\n' \
+                                     '</Elster>\n'
+
+    def test_if_mixed_content_then_raise_value_error(self):
+        with pytest.raises(ValueError):
+            to_pretty_xml(XML('<a>text<b/></a>'))
+
+    def test_if_iterated_then_return_one_chunk_per_line(self):
+        chunks = list(iter_pretty_xml(XML('<a><b/></a>')))
+
+        assert chunks == ['<a>\n', '    <b/>\n', '</a>\n']
@@ -1,9 +1,12 @@
 import copy
+import re
 from unittest.mock import patch, MagicMock
+from xml.etree.ElementTree import XML
 
 import pytest as pytest
 
-from erica.worker.elster_xml.common.transfer_header import add_transfer_header
+from erica.worker.elster_xml.common.transfer_header import add_transfer_header, add_transfer_header_with_eric, \
+    create_xml_with_transfer_header, create_xml_with_transfer_header_from_element
 from erica.worker.elster_xml.transfer_header_fields import TransferHeaderFields
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful
 from worker.utils import missing_cert, missing_pyeric_lib, remove_declaration_and_namespace
@@ -52,14 +55,14 @@ class TestGenerateTransferHeader:
 
     def test_if_incorrect_input_then_raise_not_successful_error(self, incorrect_input_xml, th_fields):
         with pytest.raises(EricProcessNotSuccessful):
-            add_transfer_header(incorrect_input_xml, th_fields)
+            add_transfer_header_with_eric(incorrect_input_xml, th_fields)
 
     def test_calls_run_pyeric_with_correct_arguments(self, th_fields):
         xml = "<xml/>"
         xml_with_th_binary = '<xml>This includes the transfer header.</xml>'.encode()
         with patch('erica.worker.pyeric.eric.EricWrapper.create_th',
                    MagicMock(return_value=xml_with_th_binary)) as fun_create_th:
-            add_transfer_header(xml, th_fields)
+            add_transfer_header_with_eric(xml, th_fields)
 
             fun_create_th.assert_called_with(xml,
                                              datenart=th_fields.datenart, testmerker=th_fields.testmerker,
@@ -73,6 +76,105 @@ class TestGenerateTransferHeader:
 
         with patch('erica.worker.pyeric.eric.EricWrapper.create_th',
                    MagicMock(return_value=xml_with_th_binary.encode())):
-            res = add_transfer_header(xml, th_fields)
+            res = add_transfer_header_with_eric(xml, th_fields)
 
             assert res == xml_with_th_binary
+
+
+class TestCreateXmlWithTransferHeader:
+
+    @pytest.fixture
+    def th_fields(self):
+        return TransferHeaderFields(
+            datenart='Grundsteuerwert',
+            testmerker='700000004',
+            herstellerId='74931',
+            verfahren='ElsterErklaerung',
+            datenLieferant='PLACEHOLDER_DATENLIEFERANT',
+        )
+
+    @staticmethod
+    def _remove_transfer_header(xml_with_th):
+        xml_without_th = re.sub(r'<TransferHeader.*</TransferHeader>', '', xml_with_th, flags=re.DOTALL)
+        return re.sub(r'>\s+<', '><', xml_without_th)
+
+    @pytest.mark.parametrize('sample_name', ['grundsteuer_sample_xml.xml',
+                                             'grundsteuer_sample_xml_bruchteilsgemeinschaft.xml'])
+    def test_if_elster_xml_given_then_return_same_bytes_as_eric(self, sample_name, th_fields):
+        xml_created_by_eric = read_text_from_sample(sample_name)
+
+        result = create_xml_with_transfer_header(self._remove_transfer_header(xml_created_by_eric), th_fields)
+
+        assert result.encode() == xml_created_by_eric.encode()
+
+    def test_if_daten_teil_given_then_wrap_it_in_elster_element(self, th_fields):
+        result = create_xml_with_transfer_header('<DatenTeil><Nutzdatenblock/></DatenTeil>', th_fields)
+
+        assert result.startswith('<?xml version="1.0" encoding="UTF-8"?>\n'
+                                 '<Elster xmlns="http://www.elster.de/elsterxml/schema/v11">\n'
+                                 '    <TransferHeader version="11">\n')
+        assert result.endswith('    </TransferHeader>\n'
+                               '    <DatenTeil>\n'
+                               '        <Nutzdatenblock/>\n'
+                               '    </DatenTeil>\n'
+                               '</Elster>\n')
+
+    def test_if_no_testmerker_then_leave_out_testmerker_element(self, th_fields):
+        result = create_xml_with_transfer_header('<DatenTeil/>', th_fields._replace(testmerker=''))
+
+        assert '<Testmerker>' not in result
+        assert '        <Vorgang>send-Auth</Vorgang>\n        <SigUser>\n' in result
+
+    def test_if_attributes_given_then_keep_their_order(self, th_fields):
+        xml = '<DatenTeil><E88 version="2" xmlns="http://finkonsens.de/elster/elstererklaerung/grundsteuerwert/e88/v2">' \
+              '<A a="&quot;&amp;"/></E88></DatenTeil>'
+
+        result = create_xml_with_transfer_header(xml, th_fields)
+
+        assert '<E88 version="2" xmlns="http://finkonsens.de/elster/elstererklaerung/grundsteuerwert/e88/v2">' \
+               in result
+        assert '<A a="&quot;&amp;"/>' in result
+
+    def test_if_text_needs_escaping_then_escape_it(self, th_fields):
+        result = create_xml_with_transfer_header('<DatenTeil/>', th_fields._replace(datenLieferant='Müller & Co <KG>'))
+
+        assert '<DatenLieferant>Müller &amp; Co &lt;KG&gt;</DatenLieferant>' in result
+
+    def test_if_element_given_then_return_same_xml_as_for_string_and_leave_element_unchanged(self, th_fields):
+        xml_top = XML('<Elster xmlns="http://www.elster.de/elsterxml/schema/v11"><DatenTeil/></Elster>')
+
+        result = create_xml_with_transfer_header_from_element(xml_top, th_fields)
+
+        assert result == create_xml_with_transfer_header(
+            '<Elster xmlns="http://www.elster.de/elsterxml/schema/v11"><DatenTeil/></Elster>', th_fields)
+        assert ['{http://www.elster.de/elsterxml/schema/v11}DatenTeil'] == [child.tag for child in xml_top]
+
+    @pytest.mark.parametrize('incorrect_input_xml', ['<xml/>', '<DatenTeil>', '<Elster><TransferHeader/></Elster>'])
+    def test_if_incorrect_input_then_raise_value_error(self, incorrect_input_xml, th_fields):
+        with pytest.raises(ValueError):
+            create_xml_with_transfer_header(incorrect_input_xml, th_fields)
+
+
+class TestAddTransferHeader:
+
+    def test_if_eric_not_configured_then_create_transfer_header_in_python(self):
+        th_fields = MagicMock()
+        with patch('erica.worker.elster_xml.common.transfer_header.get_settings') as get_settings, \
+                patch('erica.worker.elster_xml.common.transfer_header.create_xml_with_transfer_header') as create_xml, \
+                patch('erica.worker.elster_xml.common.transfer_header.add_transfer_header_with_eric') as add_with_eric:
+            get_settings.return_value.create_transfer_header_with_eric = False
+            add_transfer_header('<DatenTeil/>', th_fields)
+
+        create_xml.assert_called_once_with('<DatenTeil/>', th_fields)
+        add_with_eric.assert_not_called()
+
+    def test_if_eric_configured_then_let_eric_create_transfer_header(self):
+        th_fields = MagicMock()
+        with patch('erica.worker.elster_xml.common.transfer_header.get_settings') as get_settings, \
+                patch('erica.worker.elster_xml.common.transfer_header.create_xml_with_transfer_header') as create_xml, \
+                patch('erica.worker.elster_xml.common.transfer_header.add_transfer_header_with_eric') as add_with_eric:
+            get_settings.return_value.create_transfer_header_with_eric = True
+            add_transfer_header('<DatenTeil/>', th_fields)
+
+        add_with_eric.assert_called_once_with('<DatenTeil/>', th_fields)
+        create_xml.assert_not_called()
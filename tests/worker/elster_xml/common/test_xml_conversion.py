@@ -1,198 +1,92 @@
-from dataclasses import asdict, dataclass
-from typing import List
+import json
+from dataclasses import dataclass
+from typing import List, Optional
+from unittest.mock import patch
 
 import pytest
 
-from erica.worker.elster_xml.common.xml_conversion import CustomDictParser, convert_object_to_xml
+from erica.api.dto.grundsteuer_dto import GrundsteuerPayload
+from erica.worker.elster_xml.common.xml_conversion import convert_object_to_xml
+from erica.worker.elster_xml.grundsteuer.elster_data_representation import get_full_grundsteuer_data_representation
+from utils import read_text_from_sample
 
 
-class TestCustomDictParser:
-    def test_if_simple_object_then_leave_object_unchanged(self):
-        @dataclass
-        class SimpleObject:
-            attr1: str
-
-        input_object = SimpleObject("attrValue1")
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1"
-        }
-
-    def test_if_simple_nested_object_then_leave_object_unchanged(self):
-        @dataclass
-        class SimpleNestedObject:
-            attr1: str
-
-        @dataclass
-        class SimpleObject:
-            attr1: str
-            nested: SimpleNestedObject
-
-        input_object = SimpleObject("attrValue1", SimpleNestedObject("attrValue2"))
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1",
-            "nested": {
-                "attr1": "attrValue2"
-            }
-        }
+class TestConvertObjectToXml:
+    @pytest.fixture
+    def encoding_element(self):
+        return '<?xml version="1.0" encoding="utf-8"?>\n'
 
-    def test_if_special_attributes_set_then_prepend_at_symbol(self):
+    def test_prepends_correct_encoding_element(self, encoding_element):
         @dataclass
         class SimpleObject:
             attr1: str
-            xml_attr_attr2: str
 
-        input_object = SimpleObject("attrValue1", "attrValue2")
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1",
-            "@attr2": "attrValue2"
-        }
+        input_object = SimpleObject("attrValue1")
+        resulting_xml = convert_object_to_xml(input_object)
+        assert resulting_xml.startswith(encoding_element)
 
-    def test_if_special_attributes_set_then_set_attributes_to_hashtag_text(self):
+    def test_if_simple_object_then_returns_expected_xml(self, encoding_element):
         @dataclass
         class SimpleObject:
             attr1: str
-            xml_text: str
 
-        input_object = SimpleObject("attrValue1", "attrValue2")
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1",
-            "#text": "attrValue2"
-        }
+        input_object = SimpleObject("attrValue1")
+        resulting_xml = convert_object_to_xml(input_object)
+        assert resulting_xml.replace(encoding_element, "") == "<attr1>attrValue1</attr1>"
 
-    def test_attributes_set_to_none_then_leave_them_out_of_result(self):
+    def test_if_empty_object_attributes_then_not_included_in_result(self, encoding_element):
         @dataclass
         class SimpleObject:
             attr1: str
             attr2 = None
 
         input_object = SimpleObject("attrValue1")
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1"
-        }
+        resulting_xml = convert_object_to_xml(input_object)
+        assert resulting_xml.replace(encoding_element, "") == "<attr1>attrValue1</attr1>"
 
-    def test_attributes_set_to_empty_dict_then_leave_them_out_of_result(self):
+    def test_if_empty_dict_then_not_included_in_result(self, encoding_element):
         @dataclass
         class SimpleObject:
             attr1: str
             attr2: dict
 
-        input_object = SimpleObject("attrValue1", {})
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1"
-        }
-
-    def test_attributes_set_to_empty_string_then_include_them_in_result(self):
-        @dataclass
-        class SimpleObject:
-            attr1: str
-            attr2: str
-
-        input_object = SimpleObject("attrValue1", "")
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1",
-            "attr2": ""
-        }
-
-    def test_attributes_set_to_empty_array_then_include_them_in_result(self):
         @dataclass
-        class SimpleObject:
-            attr1: str
-            attr2: list
-
-        input_object = SimpleObject("attrValue1", [])
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1",
-            "attr2": []
-        }
-
-    def test_attributes_set_to_false_then_include_them_in_result(self):
-        @dataclass
-        class SimpleObject:
-            attr1: str
-            attr2: bool
-
-        input_object = SimpleObject("attrValue1", False)
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1",
-            "attr2": False
-        }
+        class RootObject:
+            root: SimpleObject
 
-    def test_if_nested_object_with_all_attributes_set_to_none_then_leave_out_in_result(self):
-        @dataclass
-        class SimpleNestedObject:
-            attr2 = None
+        input_object = RootObject(SimpleObject("attrValue1", {}))
+        resulting_xml = convert_object_to_xml(input_object)
+        assert resulting_xml.replace(encoding_element, "") == "<root><attr1>attrValue1</attr1></root>"
 
+    def test_if_empty_string_then_include_empty_element_in_result(self, encoding_element):
         @dataclass
         class SimpleObject:
             attr1: str
-            nested: SimpleNestedObject
-
-        input_object = SimpleObject("attrValue1", SimpleNestedObject())
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "attr1": "attrValue1"
-        }
-
-    def test_if_array_given_then_convert_correctly(self):
-        @dataclass
-        class SimpleNestedObject:
-            attr1: str
-
-        @dataclass
-        class SimpleObject:
-            nested: List[SimpleNestedObject]
-
-        input_object = SimpleObject([SimpleNestedObject("1"), SimpleNestedObject("2")])
-        resulting_dict = asdict(input_object, dict_factory=CustomDictParser)
-        assert resulting_dict == {
-            "nested": [
-                {"attr1": "1"},
-                {"attr1": "2"}
-            ]
-        }
-
-
-class TestConvertObjectToXml:
-    @pytest.fixture
-    def encoding_element(self):
-        return '<?xml version="1.0" encoding="utf-8"?>\n'
+            attr2: str
 
-    def test_prepends_correct_encoding_element(self, encoding_element):
         @dataclass
-        class SimpleObject:
-            attr1: str
+        class RootObject:
+            root: SimpleObject
 
-        input_object = SimpleObject("attrValue1")
+        input_object = RootObject(SimpleObject("attrValue1", ""))
         resulting_xml = convert_object_to_xml(input_object)
-        assert resulting_xml.startswith(encoding_element)
+        assert resulting_xml.replace(encoding_element, "") == \
+               "<root><attr1>attrValue1</attr1><attr2></attr2></root>"
 
-    def test_if_simple_object_then_returns_expected_xml(self, encoding_element):
+    def test_if_false_then_include_lowercase_value_in_result(self, encoding_element):
         @dataclass
         class SimpleObject:
             attr1: str
+            attr2: bool
 
-        input_object = SimpleObject("attrValue1")
-        resulting_xml = convert_object_to_xml(input_object)
-        assert resulting_xml.replace(encoding_element, "") == "<attr1>attrValue1</attr1>"
-
-    def test_if_empty_object_attributes_then_not_included_in_result(self, encoding_element):
         @dataclass
-        class SimpleObject:
-            attr1: str
-            attr2 = None
+        class RootObject:
+            root: SimpleObject
 
-        input_object = SimpleObject("attrValue1")
+        input_object = RootObject(SimpleObject("attrValue1", False))
         resulting_xml = convert_object_to_xml(input_object)
-        assert resulting_xml.replace(encoding_element, "") == "<attr1>attrValue1</attr1>"
+        assert resulting_xml.replace(encoding_element, "") == \
+               "<root><attr1>attrValue1</attr1><attr2>false</attr2></root>"
 
     def test_if_nested_object_then_returns_expected_xml(self, encoding_element):
         @dataclass
@@ -286,3 +180,61 @@ class TestConvertObjectToXml:
         input_object = RootObject(SimpleObject("TEXT"))
         resulting_xml = convert_object_to_xml(input_object)
         assert resulting_xml.replace(encoding_element, "") == '<root>TEXT</root>'
+
+    def test_if_multiple_roots_then_raise_value_error(self):
+        @dataclass
+        class SimpleObject:
+            attr1: str
+            attr2: str
+
+        with pytest.raises(ValueError):
+            convert_object_to_xml(SimpleObject("attrValue1", "attrValue2"))
+
+    def test_if_special_values_then_return_expected_xml(self):
+        @dataclass
+        class SimpleNestedObject:
+            attr1: Optional[str]
+            xml_attr_id: Optional[str] = None
+            xml_text: Optional[str] = None
+
+        @dataclass
+        class SimpleObject:
+            flag: bool
+            number: int
+            escaped: str
+            empty: str
+            items: List[Optional[str]]
+            nested: List[SimpleNestedObject]
+            xml_attr_escaped: str
+            empty_nested: SimpleNestedObject
+
+        @dataclass
+        class RootObject:
+            root: SimpleObject
+
+        input_object = RootObject(SimpleObject(False, 0, '<a & "b">', '', ['1', None],
+                                               [SimpleNestedObject('1', 'ID', 'TEXT'), SimpleNestedObject(None)],
+                                               '"quoted" \'value\'\n', SimpleNestedObject(None)))
+
+        assert convert_object_to_xml(input_object) == \
+               '<?xml version="1.0" encoding="utf-8"?>\n' \
+               '<root escaped="&quot;quoted&quot; \'value\'&#10;"><flag>false</flag><number>0</number>' \
+               '<escaped>&lt;a &amp; "b"&gt;</escaped><empty></empty><items>1</items><items></items>' \
+               '<nested id="ID"><attr1>1</attr1>TEXT</nested><nested></nested></root>'
+
+    @pytest.mark.parametrize("input_sample, expected_sample", [
+        ('grundsteuer_sample_input.json', 'grundsteuer_sample_nutzdaten_xml.xml'),
+        ('grundsteuer_sample_input_bruchteilsgemeinschaft.json',
+         'grundsteuer_sample_nutzdaten_xml_bruchteilsgemeinschaft.xml'),
+    ])
+    def test_if_grundsteuer_sample_then_return_xml_of_sample(self, input_sample, expected_sample):
+        input_data = GrundsteuerPayload.parse_obj(json.loads(read_text_from_sample(input_sample)))
+        with patch('erica.worker.elster_xml.grundsteuer.elster_data_representation.generate_electronic_aktenzeichen',
+                   return_value='520850353038893'), \
+                patch('erica.worker.elster_xml.common.electronic_steuernummer.generate_electronic_aktenzeichen',
+                      return_value='520850353038893'):
+            data_representation = get_full_grundsteuer_data_representation(input_data)
+
+        resulting_xml = convert_object_to_xml(data_representation)
+
+        assert resulting_xml == read_text_from_sample(expected_sample).strip()
@@ -0,0 +1,189 @@
+import unittest
+from xml.etree.ElementTree import Element, tostring
+
+import pytest
+
+from erica.worker.elster_xml.elster_xml_generator import _SUPPORTED_STERKL, PERSONS, _add_xml_fields, \
+    _add_est_xml_nutzdaten, generate_vorsatz_with_tax_number
+from erica.worker.elster_xml.elster_xml_tree import ElsterXmlTreeNode, ElsterXmlEmissionPlan
+from erica.worker.elster_xml.est_mapping import PersonSpecificFieldId
+from utils import read_text_from_sample
+
+
+def _add_with_plan(tree, fields):
+    xml_top = Element('top')
+    ElsterXmlEmissionPlan([tree], PERSONS).add_fields(xml_top, fields)
+    return xml_top
+
+
+class TestElsterXmlEmissionPlan(unittest.TestCase):
+
+    def test_if_fields_given_then_add_them_in_tree_order(self):
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1']),
+                                             ElsterXmlTreeNode('parent12', ['field2', 'field3'])])
+
+        xml_top = _add_with_plan(tree, {'field3': 'c', 'field1': 'a', 'field2': 'b'})
+
+        self.assertEqual(b'<top><parent1><parent11><field1>a</field1></parent11>'
+                         b'<parent12><field2>b</field2><field3>c</field3></parent12></parent1></top>',
+                         tostring(xml_top))
+
+    def test_if_field_is_top_element_then_add_it_to_xml_parent(self):
+        xml_top = _add_with_plan('field1', {'field1': 'a'})
+
+        self.assertEqual(b'<top><field1>a</field1></top>', tostring(xml_top))
+
+    def test_if_elements_contain_only_empty_elements_then_add_nothing(self):
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', []),
+                                             ElsterXmlTreeNode('parent12', [ElsterXmlTreeNode('parent121', [])])])
+
+        xml_top = _add_with_plan(tree, {'field1': 'a'})
+
+        self.assertEqual(b'<top />', tostring(xml_top))
+
+    def test_if_no_field_of_element_given_then_leave_element_out(self):
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1']),
+                                             ElsterXmlTreeNode('parent12', ['field2'])])
+
+        xml_top = _add_with_plan(tree, {'field2': 'b', 'unknown': 'x'})
+
+        self.assertEqual(b'<top><parent1><parent12><field2>b</field2></parent12></parent1></top>', tostring(xml_top))
+
+    def test_if_elements_share_a_name_then_keep_them_apart(self):
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('Sum', ['field1']),
+                                             ElsterXmlTreeNode('Sum', ['field2'])])
+
+        xml_top = _add_with_plan(tree, {'field1': 'a', 'field2': 'b'})
+
+        self.assertEqual(2, len(xml_top.findall('parent1/Sum')))
+
+    def test_if_field_is_part_of_two_elements_then_add_it_to_both(self):
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1']),
+                                             ElsterXmlTreeNode('parent12', ['field1'])])
+
+        xml_top = _add_with_plan(tree, {'field1': 'a'})
+
+        self.assertEqual(['a', 'a'], [field.text for field in xml_top.findall('parent1/*/field1')])
+
+    def test_if_person_specific_then_add_element_with_person_for_every_person_with_fields(self):
+        tree = ElsterXmlTreeNode('parent1', ['field1', 'field2'], is_person_specific=True, repetitions=2)
+
+        xml_top = _add_with_plan(tree, {PersonSpecificFieldId('field2', 'PersonB'): 'b', 'field1': 'not-specific'})
+
+        self.assertEqual(b'<top><parent1><Person>PersonB</Person><field2>b</field2></parent1></top>',
+                         tostring(xml_top))
+
+    def test_if_person_specific_element_contains_elements_then_add_person_only_to_top_element(self):
+        parent12 = ElsterXmlTreeNode('parent12', [ElsterXmlTreeNode('parent121', ['field2'])])
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1']), parent12],
+                                 is_person_specific=True, repetitions=2)
+
+        xml_top = _add_with_plan(tree, {PersonSpecificFieldId('field1', 'PersonA'): 'a',
+                                        PersonSpecificFieldId('field2', 'PersonA'): 'b',
+                                        PersonSpecificFieldId('field2', 'PersonB'): 'c'})
+
+        self.assertEqual(b'<top><parent1><Person>PersonA</Person><parent11><field1>a</field1></parent11>'
+                         b'<parent12><parent121><field2>b</field2></parent121></parent12></parent1>'
+                         b'<parent1><Person>PersonB</Person><parent12><parent121><field2>c</field2></parent121>'
+                         b'</parent12></parent1></top>', tostring(xml_top))
+
+    def test_if_fields_of_unknown_person_given_then_add_nothing(self):
+        tree = ElsterXmlTreeNode('parent1', ['field1'], is_person_specific=True, repetitions=2)
+
+        xml_top = _add_with_plan(tree, {PersonSpecificFieldId('field1', 'Dumbledore'): 'a'})
+
+        self.assertEqual(b'<top />', tostring(xml_top))
+
+    def test_if_repeatable_then_repeat_element_for_every_list_item(self):
+        tree = ElsterXmlTreeNode('parent1', ['field1', 'field2'], is_repeatable=True)
+
+        xml_top = _add_with_plan(tree, {'field1': ['a', 'b'], 'field2': 'c'})
+
+        self.assertEqual(b'<top><parent1><field1>a</field1><field2>c</field2></parent1>'
+                         b'<parent1><field1>b</field1><field2>c</field2></parent1></top>', tostring(xml_top))
+
+    def test_if_lists_of_repeatable_element_differ_in_length_then_add_items_to_first_repetitions(self):
+        tree = ElsterXmlTreeNode('parent1', ['field1', 'field2'], is_repeatable=True)
+
+        xml_top = _add_with_plan(tree, {'field1': ['a', 'b', 'c'], 'field2': ['d']})
+
+        self.assertEqual(b'<top><parent1><field1>a</field1><field2>d</field2></parent1>'
+                         b'<parent1><field1>b</field1></parent1>'
+                         b'<parent1><field1>c</field1></parent1></top>', tostring(xml_top))
+
+    def test_if_repeatable_elements_next_to_other_elements_then_repeat_only_repeatable_elements(self):
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field_repeat_1'], is_repeatable=True),
+                                             ElsterXmlTreeNode('parent12', ['field1']),
+                                             ElsterXmlTreeNode('parent13', ['field_repeat_2', 'field_repeat_3'],
+                                                               is_repeatable=True)])
+
+        xml_top = _add_with_plan(tree, {'field_repeat_1': ['a', 'b'], 'field1': 'a',
+                                        'field_repeat_2': ['c', 'd'], 'field_repeat_3': ['e', 'f']})
+
+        self.assertEqual(['a', 'b'], [field.text for field in xml_top.findall('parent1/parent11/field_repeat_1')])
+        self.assertEqual(['a'], [field.text for field in xml_top.findall('parent1/parent12/field1')])
+        self.assertEqual(2, len(xml_top.findall('parent1/parent13')))
+        self.assertEqual(['c', 'd'], [field.text for field in xml_top.findall('parent1/parent13/field_repeat_2')])
+        self.assertEqual(['e', 'f'], [field.text for field in xml_top.findall('parent1/parent13/field_repeat_3')])
+
+    def test_if_fields_added_then_leave_fields_unchanged(self):
+        fields = {'field1': ['a', 'b']}
+        tree = ElsterXmlTreeNode('parent1', ['field1'], is_repeatable=True)
+
+        _add_with_plan(tree, fields)
+
+        self.assertEqual({'field1': ['a', 'b']}, fields)
+
+    def test_if_repeatable_element_contains_elements_then_raise_value_error(self):
+        tree = ElsterXmlTreeNode('parent1', [ElsterXmlTreeNode('parent11', ['field1'])], is_repeatable=True)
+
+        with pytest.raises(ValueError):
+            ElsterXmlEmissionPlan([tree], PERSONS)
+
+
+class TestEstEmissionPlan(unittest.TestCase):
+
+    @staticmethod
+    def _create_all_fields(node, fields, person_specific=False, repeatable=False):
+        if isinstance(node, str):
+            if person_specific:
+                for person in PERSONS:
+                    fields[PersonSpecificFieldId(node, person)] = node + person
+            elif repeatable:
+                fields[node] = [node + '1', node + '2', node + '3']
+            else:
+                fields[node] = node
+            return fields
+        for sub_element in node.sub_elements:
+            TestEstEmissionPlan._create_all_fields(sub_element, fields, person_specific or node.is_person_specific,
+                                                   node.is_repeatable)
+        return fields
+
+    def test_if_all_fields_given_then_add_every_top_element_with_all_values(self):
+        fields = {}
+        for sterkl in _SUPPORTED_STERKL:
+            self._create_all_fields(sterkl, fields)
+        xml = Element('E10')
+
+        _add_xml_fields(xml, fields)
+
+        self.assertEqual([sterkl.name for sterkl in _SUPPORTED_STERKL], [element.tag for element in xml])
+        for key, value in fields.items():
+            name = key.identifier if isinstance(key, PersonSpecificFieldId) else key
+            texts = [element.text for element in xml.iter(name)]
+            for item in value if isinstance(value, list) else [value]:
+                self.assertIn(item, texts)
+
+    def test_if_all_fields_given_then_add_same_nutzdaten_as_sample(self):
+        # The sample was created with the recursive tree walk the emission plan replaced
+        fields = {}
+        for sterkl in _SUPPORTED_STERKL:
+            self._create_all_fields(sterkl, fields)
+        vorsatz = generate_vorsatz_with_tax_number('9198011310010', '2021', '04452397687', '02293417683', 'Manfred',
+                                                   'Mustername', 'Steuerweg', '42', '20354', 'Hamburg')
+        xml = Element('Nutzdatenblock')
+
+        _add_est_xml_nutzdaten(xml, fields, vorsatz, '2021')
+
+        self.assertEqual(read_text_from_sample('sample_est_nutzdaten_all_fields.xml').strip(),
+                         tostring(xml, encoding='unicode'))
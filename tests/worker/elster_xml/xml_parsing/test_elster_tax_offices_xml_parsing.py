@@ -2,7 +2,7 @@ import unittest
 
 from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_state_ids, get_tax_offices, \
     get_antrag_id_from_xml, get_idnr_from_xml, get_transferticket_from_xml, get_address_from_xml, \
-    get_relevant_beleg_ids
+    get_relevant_beleg_ids, get_eric_library_version
 from worker.utils import replace_text_in_xml
 from utils import read_text_from_sample
 
@@ -33,6 +33,21 @@ class TestGetTaxOffices(unittest.TestCase):
         self.assertEqual(expected_tax_offices, tax_offices)
 
 
+class TestGetEricLibraryVersion(unittest.TestCase):
+
+    def test_if_libraries_have_same_version_then_return_it_once(self):
+        version_xml = '<?xml version="1.0" encoding="UTF-8"?><EricVersion>' \
+                      '<Bibliothek><Name>libericapi.so</Name><Version>36.2.6.0</Version></Bibliothek>' \
+                      '<Bibliothek><Name>libericxerces.so</Name><Version>36.2.6.0</Version></Bibliothek>' \
+                      '</EricVersion>'
+        self.assertEqual('36.2.6.0', get_eric_library_version(version_xml))
+
+    def test_if_libraries_have_different_versions_then_return_all_of_them(self):
+        version_xml = '<EricVersion><Bibliothek><Name>libericapi.so</Name><Version>36.2.6.0</Version></Bibliothek>' \
+                      '<Bibliothek><Name>libcheckNW.so</Name><Version>36.1.0.0</Version></Bibliothek></EricVersion>'
+        self.assertEqual('36.1.0.0,36.2.6.0', get_eric_library_version(version_xml))
+
+
 class TestAntragIdFromXml(unittest.TestCase):
 
     def test_antrag_element_is_returned_correctly(self):
@@ -5,10 +5,48 @@ from xml.etree.ElementTree import tostring, ParseError, Element, SubElement
 
 from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import remove_declaration_and_namespace, \
     get_elements_from_xml_element, get_elements_from_xml, get_elements_text_from_xml, \
-    get_elements_text_from_xml_element, get_elements_key_value_from_xml
+    get_elements_text_from_xml_element, get_elements_key_value_from_xml, NamespaceFreeXml, \
+    iter_elements_text_from_xml
 from utils import read_text_from_sample
 
 
+class TestNamespaceFreeXml(unittest.TestCase):
+    def test_if_xml_has_namespaces_then_remove_them_from_all_tags(self):
+        parsed_xml = NamespaceFreeXml('<a xmlns="http://a"><b xmlns:c="http://c"><c:d>text</c:d></b></a>')
+
+        self.assertEqual(b'<a><b><d>text</d></b></a>', tostring(parsed_xml.root))
+
+    def test_if_bytes_given_then_use_declared_encoding(self):
+        parsed_xml = NamespaceFreeXml('<?xml version="1.0" encoding="ISO-8859-1"?><a>ä</a>'.encode('iso-8859-1'))
+
+        self.assertEqual('ä', parsed_xml.root.text)
+
+    def test_if_xml_is_invalid_then_raise_parse_error(self):
+        self.assertRaises(ParseError, NamespaceFreeXml, '<a>')
+
+    def test_if_elements_extracted_then_return_text_or_xml_per_key(self):
+        xml_string = read_text_from_sample('sample_vast_request_response.xml')
+
+        result = NamespaceFreeXml(xml_string).extract({'ticket': 'TransferTicket', 'antrag': 'AntragsID',
+                                                       'missing': 'Missing'})
+
+        self.assertEqual(['ticket', 'antrag', 'missing'], list(result))
+        self.assertEqual(remove_declaration_and_namespace(xml_string).find('.//TransferTicket').text, result['ticket'])
+        self.assertEqual(remove_declaration_and_namespace(xml_string).find('.//AntragsID').text, result['antrag'])
+        self.assertIsNone(result['missing'])
+
+    def test_if_required_element_missing_then_raise_value_error(self):
+        parsed_xml = NamespaceFreeXml(read_text_from_sample('sample_vast_request_response.xml'))
+
+        self.assertRaises(ValueError, parsed_xml.extract, {'ticket': 'TransferTicket', 'missing': 'Missing'},
+                          required=True)
+
+    def test_if_element_has_children_then_extract_it_as_xml(self):
+        result = NamespaceFreeXml('<a xmlns="http://a"><b><c>text</c></b></a>').extract({'b': 'b'})
+
+        self.assertEqual(tostring(ET.fromstring('<b><c>text</c></b>'), encoding='utf-8'), result['b'])
+
+
 class TestRemoveDeclarationAndNamespace(unittest.TestCase):
     def test_namespace_is_removed(self):
         xml_string = read_text_from_sample('sample_vast_request_response.xml')
@@ -155,6 +193,32 @@ class TestGetElementsTextFromXml(unittest.TestCase):
         self.assertRaises(ParseError, get_elements_text_from_xml, xml, 'non_existent_element')
 
 
+class TestIterElementsTextFromXml(unittest.TestCase):
+    def test_if_multiple_elements_then_yield_texts_in_document_order(self):
+        xml = '<parent><element>first</element><other>x</other><element>second</element></parent>'
+        returned_texts = iter_elements_text_from_xml(xml, 'element')
+        self.assertEqual(['first', 'second'], list(returned_texts))
+
+    def test_if_xml_has_namespace_then_element_text_is_yielded_correctly(self):
+        xml = '<parent xmlns="some-namespace"><element>Praline?</element></parent>'
+        returned_texts = iter_elements_text_from_xml(xml, 'element')
+        self.assertEqual(['Praline?'], list(returned_texts))
+
+    def test_if_element_not_existent_then_yield_nothing(self):
+        xml = '<parent><element>Praline?</element></parent>'
+        returned_texts = iter_elements_text_from_xml(xml, 'non_existent_element')
+        self.assertEqual([], list(returned_texts))
+
+    def test_if_first_element_requested_then_yield_it_before_reading_rest(self):
+        xml = '<parent><element>first</element><broken></parent>'
+        returned_texts = iter_elements_text_from_xml(xml, 'element')
+        self.assertEqual('first', next(returned_texts))
+        self.assertRaises(ParseError, next, returned_texts)
+
+    def test_if_xml_is_empty_raise_parse_error(self):
+        self.assertRaises(ParseError, list, iter_elements_text_from_xml('', 'element'))
+
+
 class TestGetElementsTextFromXmlElement(unittest.TestCase):
     def setUp(self):
         self.xml_text_1 = 'Praline?'
@@ -7,7 +7,7 @@ import pytest
 
 from erica.job_service.job_service import JobService
 from erica.job_service.job_service_factory import get_job_service
-from erica.worker.jobs.grundsteuer_jobs import send_grundsteuer
+from erica.worker.jobs.grundsteuer_jobs import send_grundsteuer, render_grundsteuer_pdf
 from erica.domain.model.erica_request import EricaRequest, RequestType
 from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_transferticket_from_xml
 from erica.worker.pyeric.pyeric_response import PyericResponse
@@ -29,7 +29,17 @@ class TestGrundsteuerJob:
                                                         repository=mock_get_service().repository,
                                                         service=mock_get_service(),
                                                         logger=logging.getLogger(),
-                                                        payload_type=mock_get_service().payload_type)]
+                                                        payload_type=mock_get_service().payload_type,
+                                                        pdf_job=None)]
+
+    def test_if_pdf_rendering_deferred_then_perform_job_called_with_pdf_job(self):
+        with patch("erica.job_service.job_service_factory.get_job_service", MagicMock()), \
+                patch("erica.worker.jobs.grundsteuer_jobs.get_settings") as get_settings, \
+                patch("erica.worker.jobs.grundsteuer_jobs.perform_job", AsyncMock()) as mock_perform_job:
+            get_settings.return_value.defer_pdf_rendering = True
+            send_grundsteuer("1234")
+
+            assert mock_perform_job.mock_calls[0].kwargs['pdf_job'] is render_grundsteuer_pdf
 
     def test_get_job_service_called_with_correct_param(self):
         request_id = "1234"
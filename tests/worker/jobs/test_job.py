@@ -5,7 +5,7 @@ from uuid import uuid4
 import pytest
 from freezegun import freeze_time
 
-from erica.worker.jobs.job import perform_job
+from erica.worker.jobs.job import perform_job, perform_pdf_job, finish_old_pdf_pending_entities
 from erica.domain.model.erica_request import Status
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, EricGlobalValidationError, \
     EricTransferError, EricAlreadyRequestedError
@@ -33,28 +33,28 @@ class TestJob:
 
     def test_if_service_raises_transfer_error_then_log_error_with_elster_error_code_in_warning_logger(self):
         mock_apply_to_elster = MagicMock(side_effect=EricTransferError(
-            610101210, b'<xml/>', b'<xml/>', {'TH_RES_CODE': "0", 'TH_ERR_MSG': "A message - do you copy?", 'NDH_ERR_XML': "<xml/>"}))
+            610101210, b'<xml/>', b'<xml/>', {'TH_RES_CODE': "0", 'TH_ERR_MSG': "A message - do you copy?",
+                                              'NDH_ERR_XML': "<xml><Fehler><Code>1234</Code></Fehler></xml>"}))
         mock_service = MagicMock(apply_to_elster=mock_apply_to_elster)
         warning_logger = MagicMock()
         logger = MagicMock(warning=warning_logger)
 
-        with patch("erica.worker.jobs.job.get_error_codes_from_server_err_msg", MagicMock(return_value="1234")):
-            perform_job(request_id=uuid4(), repository=MagicMock(), service=mock_service,
-                        payload_type=MagicMock(), logger=logger)
+        perform_job(request_id=uuid4(), repository=MagicMock(), service=mock_service,
+                    payload_type=MagicMock(), logger=logger)
 
         assert any("Job failed" in logged_msg[1][0] for logged_msg in warning_logger.mock_calls)
         assert any("1234" in logged_msg[1][0] for logged_msg in warning_logger.mock_calls)
 
     def test_if_service_raises_special_transfer_error_then_log_error_without_elster_error_code_in_warning_logger(self):
         mock_apply_to_elster = MagicMock(side_effect=EricAlreadyRequestedError(
-            b'<xml/>', b'<xml/>', {'TH_RES_CODE': "0", 'TH_ERR_MSG': "A message - do you copy?", 'NDH_ERR_XML': "<xml/>"}))
+            b'<xml/>', b'<xml/>', {'TH_RES_CODE': "0", 'TH_ERR_MSG': "A message - do you copy?",
+                                   'NDH_ERR_XML': "<xml><Fehler><Code>1234</Code></Fehler></xml>"}))
         mock_service = MagicMock(apply_to_elster=mock_apply_to_elster)
         warning_logger = MagicMock()
         logger = MagicMock(warning=warning_logger)
 
-        with patch("erica.worker.jobs.job.get_error_codes_from_server_err_msg", MagicMock(return_value="1234")):
-            perform_job(request_id=uuid4(), repository=MagicMock(), service=mock_service,
-                        payload_type=MagicMock(), logger=logger)
+        perform_job(request_id=uuid4(), repository=MagicMock(), service=mock_service,
+                    payload_type=MagicMock(), logger=logger)
 
         assert any("Job failed" in logged_msg[1][0] for logged_msg in warning_logger.mock_calls)
         assert any("1234" not in logged_msg[1][0] for logged_msg in warning_logger.mock_calls)
@@ -166,6 +166,34 @@ class TestJob:
         assert mock_entity.status == Status.success
         assert mock_update.mock_calls == [call(mock_entity.id, mock_entity)]
 
+    def test_if_job_ran_successful_with_pdf_then_store_pdf_and_remove_it_from_result(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+        service = MagicMock(apply_to_elster=MagicMock(return_value={'transferticket': 'ticket', 'pdf': b'pdf'}))
+
+        perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                    logger=MagicMock())
+
+        assert service.store_pdf.mock_calls == [call("R2-D2", b'pdf')]
+        assert mock_entity.result == {'transferticket': 'ticket', 'pdf_stored': True}
+        assert mock_entity.status == Status.success
+
+    def test_if_storing_pdf_fails_then_log_error_and_keep_entity_successful(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        mock_update = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity), update=mock_update)
+        service = MagicMock(apply_to_elster=MagicMock(return_value={'transferticket': 'ticket', 'pdf': b'pdf'}),
+                            store_pdf=MagicMock(side_effect=ConnectionError()))
+        error_logger = MagicMock()
+
+        perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                    logger=MagicMock(error=error_logger))
+
+        assert mock_entity.result == {'transferticket': 'ticket'}
+        assert mock_entity.status == Status.success
+        assert mock_update.mock_calls == [call(mock_entity.id, mock_entity)]
+        assert any("Could not store the PDF" in logged_msg[1][0] for logged_msg in error_logger.mock_calls)
+
     def test_if_job_ran_successful_then_ids_type_and_payload_of_entity_not_changed(self):
         original_id = "R2-D2"
         original_request_id = "C3P0"
@@ -203,3 +231,184 @@ class TestJob:
 
         assert any("Job running time" in logged_msg[1][0] for logged_msg in info_logger.mock_calls)
         assert any(f"{timedelta(seconds=15)}" in logged_msg[1][0] for logged_msg in info_logger.mock_calls)
+
+    def test_if_job_ran_successful_with_pdf_job_then_set_entity_pdf_pending_and_enqueue_pdf_job(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        mock_update = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity), update=mock_update)
+        mock_result = {'transferticket': "These are not the mocks you are looking for"}
+        service = MagicMock(apply_to_elster=MagicMock(return_value=mock_result))
+        pdf_job = MagicMock()
+
+        perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                    logger=MagicMock(), pdf_job=pdf_job)
+
+        assert mock_entity.result == {**mock_result}
+        assert mock_entity.status == Status.pdf_pending
+        assert mock_update.mock_calls == [call(mock_entity.id, mock_entity)]
+        pdf_job.assert_called_once_with("C3PO")
+
+    def test_if_pdf_job_cannot_be_enqueued_then_set_entity_successful(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO")
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+        service = MagicMock(apply_to_elster=MagicMock(return_value={}))
+
+        perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                    logger=MagicMock(), pdf_job=MagicMock(side_effect=ConnectionError()))
+
+        assert mock_entity.status == Status.success
+
+    def test_if_job_finished_then_publish_it(self):
+        request_id = uuid4()
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=MagicMock()))
+        service = MagicMock(apply_to_elster=MagicMock(return_value={}))
+
+        with patch('erica.worker.jobs.job.publish_job_finished') as publish_job_finished:
+            perform_job(request_id=request_id, repository=mock_repository, service=service, payload_type=MagicMock(),
+                        logger=MagicMock())
+
+        publish_job_finished.assert_called_once_with(request_id)
+
+    def test_if_job_failed_then_publish_it(self):
+        request_id = uuid4()
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=MagicMock()))
+        service = MagicMock(apply_to_elster=MagicMock(side_effect=EricProcessNotSuccessful()))
+
+        with patch('erica.worker.jobs.job.publish_job_finished') as publish_job_finished:
+            perform_job(request_id=request_id, repository=mock_repository, service=service, payload_type=MagicMock(),
+                        logger=MagicMock())
+
+        publish_job_finished.assert_called_once_with(request_id)
+
+    def test_if_job_finished_then_enqueue_webhook_for_entity(self):
+        mock_entity = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+        service = MagicMock(apply_to_elster=MagicMock(return_value={}))
+
+        with patch('erica.worker.jobs.job.enqueue_webhook') as enqueue_webhook:
+            perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                        logger=MagicMock())
+
+        enqueue_webhook.assert_called_once_with(mock_entity)
+
+    def test_if_job_raises_and_webhook_outbox_not_reachable_then_raise_error_of_job(self):
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=MagicMock()))
+        service = MagicMock(apply_to_elster=MagicMock(side_effect=ValueError()))
+
+        with patch('erica.worker.jobs.webhook_jobs.get_callback_url', return_value='https://example.com'), \
+                patch('erica.worker.jobs.webhook_jobs.get_settings', return_value=MagicMock(webhook_secret='secret')), \
+                patch('erica.worker.jobs.webhook_jobs.webhook_huey',
+                      MagicMock(pending_count=MagicMock(side_effect=ConnectionError()))), \
+                pytest.raises(ValueError):
+            perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                        logger=MagicMock())
+
+    def test_if_entity_updated_then_cache_updated_entity(self):
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=MagicMock()))
+        service = MagicMock(apply_to_elster=MagicMock(return_value={}))
+
+        with patch('erica.worker.jobs.job.store_job_status') as store_job_status:
+            perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                        logger=MagicMock())
+
+        store_job_status.assert_called_once_with(mock_repository.update.return_value)
+
+    def test_if_job_waits_for_pdf_job_then_do_not_publish_it(self):
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=MagicMock()))
+        service = MagicMock(apply_to_elster=MagicMock(return_value={}))
+
+        with patch('erica.worker.jobs.job.publish_job_finished') as publish_job_finished:
+            perform_job(request_id=uuid4(), repository=mock_repository, service=service, payload_type=MagicMock(),
+                        logger=MagicMock(), pdf_job=MagicMock())
+
+        publish_job_finished.assert_not_called()
+
+
+class TestPdfJob:
+
+    def test_if_pdf_rendered_then_store_it_and_set_entity_successful(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO", result={'transferticket': 'ticket'})
+        mock_update = MagicMock()
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity), update=mock_update)
+        payload_type_parse_obj = MagicMock()
+        service = MagicMock(render_pdf=MagicMock(return_value=b'pdf'))
+
+        perform_pdf_job(request_id=uuid4(), repository=mock_repository, service=service,
+                        payload_type=MagicMock(parse_obj=payload_type_parse_obj), logger=MagicMock())
+
+        assert service.render_pdf.mock_calls == [call(payload_type_parse_obj(mock_entity.payload))]
+        assert service.store_pdf.mock_calls == [call("R2-D2", b'pdf')]
+        assert mock_entity.result == {'transferticket': 'ticket', 'pdf_stored': True}
+        assert mock_entity.status == Status.success
+        assert mock_update.mock_calls == [call(mock_entity.id, mock_entity)]
+
+    def test_if_rendering_fails_and_retries_left_then_raise_and_do_not_update_entity(self):
+        mock_update = MagicMock()
+        mock_repository = MagicMock(update=mock_update)
+        service = MagicMock(render_pdf=MagicMock(side_effect=EricProcessNotSuccessful(3)))
+
+        with pytest.raises(EricProcessNotSuccessful):
+            perform_pdf_job(request_id=uuid4(), repository=mock_repository, service=service,
+                            payload_type=MagicMock(), logger=MagicMock(), last_attempt=False)
+
+        assert mock_update.mock_calls == []
+
+    def test_if_rendering_fails_on_last_attempt_then_set_entity_successful_without_pdf(self):
+        mock_entity = MagicMock(id="R2-D2", request_id="C3PO", result={'transferticket': 'ticket'})
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=mock_entity))
+        service = MagicMock(render_pdf=MagicMock(side_effect=EricProcessNotSuccessful(3)))
+        error_logger = MagicMock()
+
+        perform_pdf_job(request_id=uuid4(), repository=mock_repository, service=service,
+                        payload_type=MagicMock(), logger=MagicMock(error=error_logger))
+
+        assert service.store_pdf.mock_calls == []
+        assert mock_entity.status == Status.success
+        assert any("PDF rendering failed" in logged_msg[1][0] for logged_msg in error_logger.mock_calls)
+
+    def test_if_pdf_rendered_then_publish_end_of_job(self):
+        request_id = uuid4()
+        mock_repository = MagicMock(get_by_job_request_id=MagicMock(return_value=MagicMock()))
+
+        with patch('erica.worker.jobs.job.publish_job_finished') as publish_job_finished:
+            perform_pdf_job(request_id=request_id, repository=mock_repository, service=MagicMock(),
+                            payload_type=MagicMock(), logger=MagicMock())
+
+        publish_job_finished.assert_called_once_with(request_id)
+
+
+class TestFinishOldPdfPendingEntities:
+
+    def test_if_old_pdf_pending_entities_then_set_them_successful_and_cache_them(self):
+        mock_entities = [MagicMock(status=Status.pdf_pending), MagicMock(status=Status.pdf_pending)]
+        mock_repository = MagicMock(get_old_pdf_pending_entities=MagicMock(return_value=mock_entities))
+
+        with patch('erica.worker.jobs.job.store_job_status') as store_job_status, \
+                patch('erica.worker.jobs.job.enqueue_webhook'):
+            finished = finish_old_pdf_pending_entities(mock_repository, 30)
+
+        assert finished == 2
+        mock_repository.get_old_pdf_pending_entities.assert_called_once_with(30)
+        assert [entity.status for entity in mock_entities] == [Status.success, Status.success]
+        assert mock_repository.update.mock_calls == [call(entity.id, entity) for entity in mock_entities]
+        assert store_job_status.call_count == 2
+
+    def test_if_old_pdf_pending_entities_then_publish_them_and_enqueue_webhooks(self):
+        mock_entities = [MagicMock(request_id=uuid4()), MagicMock(request_id=uuid4())]
+        mock_repository = MagicMock(get_old_pdf_pending_entities=MagicMock(return_value=mock_entities))
+
+        with patch('erica.worker.jobs.job.publish_job_finished') as publish_job_finished, \
+                patch('erica.worker.jobs.job.enqueue_webhook') as enqueue_webhook:
+            finish_old_pdf_pending_entities(mock_repository, 30)
+
+        assert publish_job_finished.mock_calls == [call(entity.request_id) for entity in mock_entities]
+        assert enqueue_webhook.mock_calls == [call(entity) for entity in mock_entities]
+
+    def test_if_no_old_pdf_pending_entities_then_return_zero(self):
+        mock_repository = MagicMock(get_old_pdf_pending_entities=MagicMock(return_value=[]))
+
+        with patch('erica.worker.jobs.job.publish_job_finished') as publish_job_finished:
+            assert finish_old_pdf_pending_entities(mock_repository, 30) == 0
+
+        mock_repository.update.assert_not_called()
+        publish_job_finished.assert_not_called()
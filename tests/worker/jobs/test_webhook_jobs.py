@@ -0,0 +1,100 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.worker.jobs.webhook_jobs import enqueue_webhook, deliver_webhook
+
+
+@pytest.fixture
+def webhook_settings():
+    settings = MagicMock(webhook_secret='secret', webhook_outbox_size=10, webhook_max_attempts=3,
+                         webhook_retry_delay_in_sec=10)
+    with patch('erica.worker.jobs.webhook_jobs.get_settings', return_value=settings), \
+            patch('erica.worker.webhooks.get_settings', return_value=settings):
+        yield settings
+
+
+def _entity():
+    return EricaRequest(type=RequestType.grundsteuer, status=Status.success, payload={}, request_id=uuid.uuid4(),
+                        creator_id='steuerlotse', callback_url='https://steuerlotse.example/erica')
+
+
+class TestEnqueueWebhook:
+
+    def test_if_callback_url_given_then_deliver_webhook(self, webhook_settings):
+        entity = _entity()
+        with patch('erica.worker.jobs.webhook_jobs.deliver_webhook') as deliver_webhook_mock:
+            enqueue_webhook(entity)
+
+        deliver_webhook_mock.assert_called_once_with(entity.request_id, RequestType.grundsteuer,
+                                                     'https://steuerlotse.example/erica')
+
+    def test_if_no_callback_url_then_do_not_deliver_webhook(self, webhook_settings):
+        with patch('erica.worker.jobs.webhook_jobs.get_callback_url', return_value=None), \
+                patch('erica.worker.jobs.webhook_jobs.deliver_webhook') as deliver_webhook_mock:
+            enqueue_webhook(_entity())
+
+        deliver_webhook_mock.assert_not_called()
+
+    def test_if_no_secret_set_then_do_not_deliver_webhook(self, webhook_settings):
+        webhook_settings.webhook_secret = None
+        with patch('erica.worker.jobs.webhook_jobs.deliver_webhook') as deliver_webhook_mock:
+            enqueue_webhook(_entity())
+
+        deliver_webhook_mock.assert_not_called()
+
+    def test_if_outbox_full_then_do_not_deliver_webhook(self, webhook_settings):
+        with patch('erica.worker.jobs.webhook_jobs.webhook_huey',
+                   MagicMock(pending_count=MagicMock(return_value=6), scheduled_count=MagicMock(return_value=4))), \
+                patch('erica.worker.jobs.webhook_jobs.deliver_webhook') as deliver_webhook_mock:
+            enqueue_webhook(_entity())
+
+        deliver_webhook_mock.assert_not_called()
+
+    def test_if_webhook_cannot_be_enqueued_then_do_not_raise(self, webhook_settings):
+        with patch('erica.worker.jobs.webhook_jobs.deliver_webhook', side_effect=ConnectionError()):
+            enqueue_webhook(_entity())
+
+    def test_if_outbox_size_cannot_be_read_then_do_not_raise(self, webhook_settings):
+        with patch('erica.worker.jobs.webhook_jobs.webhook_huey',
+                   MagicMock(pending_count=MagicMock(side_effect=ConnectionError()))), \
+                patch('erica.worker.jobs.webhook_jobs.deliver_webhook') as deliver_webhook_mock:
+            enqueue_webhook(_entity())
+
+        deliver_webhook_mock.assert_not_called()
+
+
+class TestDeliverWebhook:
+
+    def test_if_delivered_then_post_response_of_request(self, webhook_settings):
+        request_id = uuid.uuid4()
+        with patch('erica.worker.jobs.webhook_jobs.get_webhook_response') as get_webhook_response, \
+                patch('erica.worker.jobs.webhook_jobs.post_webhook') as post_webhook, \
+                patch('erica.worker.jobs.webhook_jobs.session_scope'):
+            deliver_webhook.call_local(request_id, RequestType.grundsteuer, 'https://steuerlotse.example/erica')
+
+        get_webhook_response.assert_called_once_with(RequestType.grundsteuer, request_id)
+        post_webhook.assert_called_once_with('https://steuerlotse.example/erica', request_id,
+                                             get_webhook_response.return_value)
+
+    def test_if_delivery_fails_then_schedule_next_attempt_with_backoff(self, webhook_settings):
+        request_id = uuid.uuid4()
+        with patch('erica.worker.jobs.webhook_jobs.get_webhook_response'), \
+                patch('erica.worker.jobs.webhook_jobs.post_webhook', side_effect=ConnectionError()), \
+                patch('erica.worker.jobs.webhook_jobs.session_scope'), \
+                patch.object(deliver_webhook, 'schedule') as schedule:
+            deliver_webhook.call_local(request_id, RequestType.grundsteuer, 'https://steuerlotse.example/erica', 2)
+
+        schedule.assert_called_once_with((request_id, RequestType.grundsteuer, 'https://steuerlotse.example/erica', 3),
+                                         delay=20)
+
+    def test_if_last_attempt_fails_then_do_not_schedule_another_one(self, webhook_settings):
+        with patch('erica.worker.jobs.webhook_jobs.get_webhook_response'), \
+                patch('erica.worker.jobs.webhook_jobs.post_webhook', side_effect=ConnectionError()), \
+                patch('erica.worker.jobs.webhook_jobs.session_scope'), \
+                patch.object(deliver_webhook, 'schedule') as schedule:
+            deliver_webhook.call_local(uuid.uuid4(), RequestType.grundsteuer, 'https://steuerlotse.example/erica', 3)
+
+        schedule.assert_not_called()
@@ -0,0 +1,105 @@
+import unittest
+from unittest.mock import MagicMock
+
+import pytest
+
+from erica.worker.pyeric.cert_handle_manager import CertHandleManager
+from erica.worker.pyeric.eric_errors import EricCryptError, EricGlobalError, EricGlobalValidationError, \
+    EricTransferError
+
+
+class TestCertHandleManager(unittest.TestCase):
+
+    def setUp(self):
+        self.eric_wrapper = MagicMock()
+        self.eric_wrapper.get_cert_handle.side_effect = ['first_handle', 'second_handle']
+        self.eric_wrapper.read_cert_properties.return_value = '<TokenTyp>Stick</TokenTyp>'
+        self.manager = CertHandleManager(self.eric_wrapper)
+
+    def test_if_used_twice_then_open_cert_handle_only_once(self):
+        with self.manager.cert_handle() as first_handle:
+            pass
+        with self.manager.cert_handle() as second_handle:
+            pass
+
+        self.assertEqual('first_handle', first_handle)
+        self.assertEqual('first_handle', second_handle)
+        self.eric_wrapper.get_cert_handle.assert_called_once()
+        self.eric_wrapper.close_cert_handle.assert_not_called()
+
+    def test_if_crypt_error_then_close_handle_and_reopen_on_next_use(self):
+        with pytest.raises(EricCryptError):
+            with self.manager.cert_handle():
+                raise EricCryptError()
+
+        self.eric_wrapper.close_cert_handle.assert_called_once_with('first_handle')
+        self.assertFalse(self.manager.is_open)
+        with self.manager.cert_handle() as cert_handle:
+            self.assertEqual('second_handle', cert_handle)
+
+    def test_if_other_error_then_revalidate_handle_before_next_use(self):
+        with pytest.raises(EricGlobalError):
+            with self.manager.cert_handle():
+                raise EricGlobalError()
+
+        with self.manager.cert_handle() as cert_handle:
+            self.assertEqual('first_handle', cert_handle)
+        self.eric_wrapper.read_cert_properties.assert_called_once_with('first_handle')
+
+    def test_if_revalidation_fails_then_reopen_handle(self):
+        self.eric_wrapper.read_cert_properties.side_effect = EricGlobalError()
+        with pytest.raises(EricGlobalError):
+            with self.manager.cert_handle():
+                raise EricGlobalError()
+
+        with self.manager.cert_handle() as cert_handle:
+            self.assertEqual('second_handle', cert_handle)
+        self.eric_wrapper.close_cert_handle.assert_called_once_with('first_handle')
+
+    def test_if_validation_or_transfer_error_then_do_not_revalidate(self):
+        for error in [EricGlobalValidationError(), EricTransferError()]:
+            with pytest.raises(type(error)):
+                with self.manager.cert_handle():
+                    raise error
+
+        with self.manager.cert_handle():
+            pass
+        self.eric_wrapper.read_cert_properties.assert_not_called()
+
+    def test_if_cert_properties_requested_twice_then_read_them_only_once(self):
+        first_properties = self.manager.get_cert_properties()
+        second_properties = self.manager.get_cert_properties()
+
+        self.assertEqual('<TokenTyp>Stick</TokenTyp>', first_properties)
+        self.assertEqual(first_properties, second_properties)
+        self.eric_wrapper.read_cert_properties.assert_called_once_with('first_handle')
+
+    def test_if_closed_then_read_cert_properties_again(self):
+        self.manager.get_cert_properties()
+        self.manager.close()
+        self.manager.get_cert_properties()
+
+        self.assertEqual(2, self.eric_wrapper.read_cert_properties.call_count)
+
+    def test_if_closed_then_close_cert_handle(self):
+        with self.manager.cert_handle():
+            pass
+
+        self.manager.close()
+
+        self.eric_wrapper.close_cert_handle.assert_called_once_with('first_handle')
+        self.assertFalse(self.manager.is_open)
+
+    def test_if_closed_without_open_handle_then_do_not_call_eric(self):
+        self.manager.close()
+
+        self.eric_wrapper.close_cert_handle.assert_not_called()
+
+    def test_if_closing_fails_then_raise_no_error(self):
+        self.eric_wrapper.close_cert_handle.side_effect = EricGlobalError()
+        with self.manager.cert_handle():
+            pass
+
+        self.manager.close()
+
+        self.assertFalse(self.manager.is_open)
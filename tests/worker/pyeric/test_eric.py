@@ -1,5 +1,5 @@
 import unittest
-from ctypes import c_int
+from ctypes import c_int, create_string_buffer, addressof
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -7,7 +7,7 @@ import pytest
 from erica.config import get_settings
 from worker.utils import gen_random_key, missing_cert, missing_pyeric_lib
 from erica.worker.pyeric.eric import EricWrapper, EricDruckParameterT, EricVerschluesselungsParameterT, EricResponse, \
-    get_eric_wrapper
+    get_eric_wrapper, EricBufferContent, use_eric_wrapper_checkout
 from erica.worker.pyeric.eric_errors import EricProcessNotSuccessful, EricNullReturnedError, EricGlobalError
 from utils import read_text_from_sample
 
@@ -192,10 +192,11 @@ class TestValidateAndSend(unittest.TestCase):
         self.mock_fun_process_successful.reset_mock()
         self.eric_api_with_mocked_binaries.process = self.mock_fun_process_successful
         enter_object = MagicMock()
-        enter_object.name = self.print_path
-        temporary_file_object = MagicMock(__enter__=lambda _: enter_object)
+        enter_object.path = self.print_path
+        enter_object.read.return_value = self.eric_response.pdf
+        pdf_capture_object = MagicMock(__enter__=lambda _: enter_object)
         with patch('erica.worker.pyeric.eric.pointer') as pointer, \
-                patch('erica.worker.pyeric.eric.tempfile.NamedTemporaryFile', MagicMock(return_value=temporary_file_object)):
+                patch('erica.worker.pyeric.eric.capture_pdf', MagicMock(return_value=pdf_capture_object)):
             pointer.side_effect = self.mock_function
             self.eric_api_with_mocked_binaries.validate_and_send(self.xml, self.data_type_version)
 
@@ -211,10 +212,11 @@ class TestValidateAndSend(unittest.TestCase):
         self.mock_fun_process_successful.reset_mock()
         self.eric_api_with_mocked_binaries.process = self.mock_fun_process_successful
         enter_object = MagicMock()
-        enter_object.name = self.print_path
-        temporary_file_object = MagicMock(__enter__=lambda _: enter_object)
+        enter_object.path = self.print_path
+        enter_object.read.return_value = self.eric_response.pdf
+        pdf_capture_object = MagicMock(__enter__=lambda _: enter_object)
         with patch('erica.worker.pyeric.eric.pointer') as pointer, \
-                patch('erica.worker.pyeric.eric.tempfile.NamedTemporaryFile', MagicMock(return_value=temporary_file_object)):
+                patch('erica.worker.pyeric.eric.capture_pdf', MagicMock(return_value=pdf_capture_object)):
             pointer.side_effect = self.mock_function
             response = self.eric_api_with_mocked_binaries.validate_and_send(self.xml, self.data_type_version)
 
@@ -577,30 +579,72 @@ class TestReadBuffer(unittest.TestCase):
     def setUp(self):
         self.eric_api_with_mocked_binaries = EricWrapper()
         self.mock_eric = MagicMock()
-        self.mock_fun_read_buffer = MagicMock()
-        self.mock_fun_read_buffer.side_effect = lambda _, arg: arg
+        self.buffer_content = "You shall not pass!"
+        self.native_buffer = create_string_buffer(self.buffer_content.encode())
+        self.mock_fun_read_buffer = MagicMock(return_value=addressof(self.native_buffer))
+        self.mock_fun_buffer_length = MagicMock(return_value=len(self.buffer_content))
         self.mock_eric.EricMtRueckgabepufferInhalt = self.mock_fun_read_buffer
+        self.mock_eric.EricMtRueckgabepufferLaenge = self.mock_fun_buffer_length
         self.eric_api_with_mocked_binaries.eric = self.mock_eric
         self.eric_api_with_mocked_binaries.eric_instance = c_int()
 
-        self.buffer_content = "You shall not pass!"
+        self.buffer = "<buffer_handle/>"
 
     @pytest.mark.skipif(missing_cert(), reason="skipped because of missing cert.pfx; see pyeric/README.md")
     @pytest.mark.skipif(missing_pyeric_lib(), reason="skipped because of missing eric lib; see pyeric/README.md")
     def test_if_called_with_buffer_return_result_of_eric_rueckgabepuffer_inhalt_of_buffer(self):
-        result = self.eric_api_with_mocked_binaries.read_buffer(self.buffer_content)
+        result = self.eric_api_with_mocked_binaries.read_buffer(self.buffer)
 
-        self.assertEqual(self.buffer_content, result)
+        self.assertEqual(self.buffer_content.encode(), result)
+        self.assertEqual(self.buffer_content, result.decode())
 
     @pytest.mark.skipif(missing_cert(), reason="skipped because of missing cert.pfx; see pyeric/README.md")
     @pytest.mark.skipif(missing_pyeric_lib(), reason="skipped because of missing eric lib; see pyeric/README.md")
     def test_if_read_buffer_called_then_eric_rueckgabepuffer_inhalt_called_once_with_buffer(self):
         self.mock_fun_read_buffer.reset_mock()
 
-        self.eric_api_with_mocked_binaries.read_buffer(self.buffer_content)
+        self.eric_api_with_mocked_binaries.read_buffer(self.buffer)
 
         self.mock_fun_read_buffer.assert_called_once_with(self.eric_api_with_mocked_binaries.eric_instance,
-                                                          self.buffer_content)
+                                                          self.buffer)
+        self.mock_fun_buffer_length.assert_called_once_with(self.eric_api_with_mocked_binaries.eric_instance,
+                                                            self.buffer)
+
+    @pytest.mark.skipif(missing_cert(), reason="skipped because of missing cert.pfx; see pyeric/README.md")
+    @pytest.mark.skipif(missing_pyeric_lib(), reason="skipped because of missing eric lib; see pyeric/README.md")
+    def test_if_length_given_then_read_only_that_many_bytes(self):
+        self.mock_fun_buffer_length.return_value = 3
+
+        result = self.eric_api_with_mocked_binaries.read_buffer(self.buffer)
+
+        self.assertEqual(b"You", result)
+
+    @pytest.mark.skipif(missing_cert(), reason="skipped because of missing cert.pfx; see pyeric/README.md")
+    @pytest.mark.skipif(missing_pyeric_lib(), reason="skipped because of missing eric lib; see pyeric/README.md")
+    def test_if_buffer_empty_then_return_empty_content(self):
+        self.mock_fun_buffer_length.return_value = 0
+
+        result = self.eric_api_with_mocked_binaries.read_buffer(self.buffer)
+
+        self.assertEqual(b"", result)
+
+
+class TestEricBufferContent(unittest.TestCase):
+
+    def test_if_decoded_twice_then_return_same_string_object(self):
+        content = EricBufferContent("<Ergebnis>Straße</Ergebnis>".encode())
+
+        self.assertEqual("<Ergebnis>Straße</Ergebnis>", content.decode())
+        self.assertIs(content.decode(), content.decode())
+
+    def test_if_decoded_with_other_encoding_then_do_not_use_cache(self):
+        content = EricBufferContent("Straße".encode())
+        content.decode()
+
+        self.assertEqual("StraÃ\x9fe", content.decode('latin-1'))
+
+    def test_if_compared_to_bytes_then_equal(self):
+        self.assertEqual(b"<xml/>", EricBufferContent(b"<xml/>"))
 
 
 class TestCloseBuffer(unittest.TestCase):
@@ -1222,8 +1266,42 @@ class TestGetCertProperties(unittest.TestCase):
         with self.assertRaises(EricProcessNotSuccessful):
             self.eric_wrapper_with_mock_eric_binaries.get_cert_properties()
 
-    def test_should_close_resources(self):
+    def test_should_return_buffer_to_pool_and_keep_cert_handle_open(self):
+        self.eric_wrapper_with_mock_eric_binaries.get_cert_properties()
+
+        self.eric_wrapper_with_mock_eric_binaries.close_buffer.assert_not_called()
+        self.assertEqual(0, self.eric_wrapper_with_mock_eric_binaries.buffer_pool.number_in_use)
+        self.eric_wrapper_with_mock_eric_binaries.close_cert_handle.assert_not_called()
+
+    def test_should_return_cached_properties_on_second_call(self):
+        self.eric_wrapper_with_mock_eric_binaries.get_cert_properties()
         self.eric_wrapper_with_mock_eric_binaries.get_cert_properties()
 
-        self.eric_wrapper_with_mock_eric_binaries.close_buffer.assert_called()
-        self.eric_wrapper_with_mock_eric_binaries.close_cert_handle.assert_called()
+        self.eric_wrapper_with_mock_eric_binaries.eric.EricMtHoleZertifikatEigenschaften.assert_called_once()
+        self.eric_wrapper_with_mock_eric_binaries.get_cert_handle.assert_called_once()
+
+
+class TestUseEricWrapperCheckout:
+
+    def test_if_checkout_given_then_get_eric_wrapper_uses_it(self):
+        eric_wrapper = MagicMock()
+        checkout = MagicMock()
+        checkout.return_value.__enter__.return_value = eric_wrapper
+
+        with use_eric_wrapper_checkout(checkout), \
+                patch('erica.worker.pyeric.eric.get_shared_eric_instance') as get_shared_eric_instance:
+            with get_eric_wrapper() as used_eric_wrapper:
+                assert used_eric_wrapper is eric_wrapper
+
+        get_shared_eric_instance.assert_not_called()
+
+    def test_if_context_left_then_get_eric_wrapper_does_not_use_checkout_anymore(self):
+        checkout = MagicMock()
+
+        with use_eric_wrapper_checkout(checkout):
+            pass
+        with patch('erica.worker.pyeric.eric.get_shared_eric_instance'):
+            with get_eric_wrapper():
+                pass
+
+        checkout.assert_not_called()
@@ -0,0 +1,109 @@
+import unittest
+from ctypes import c_int, c_void_p
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from erica.worker.pyeric.eric_bindings import EricBindings, ERIC_FUNCTION_SIGNATURES
+
+
+class TestEricBindings(unittest.TestCase):
+
+    def setUp(self):
+        self.library = MagicMock()
+        self.bindings = EricBindings(self.library)
+
+    def test_if_function_used_then_set_argtypes_and_restype_from_signature(self):
+        self.bindings.EricMtRueckgabepufferErzeugen
+
+        self.assertEqual([c_void_p], self.library.EricMtRueckgabepufferErzeugen.argtypes)
+        self.assertEqual(c_void_p, self.library.EricMtRueckgabepufferErzeugen.restype)
+
+    def test_if_error_message_function_used_then_set_restype(self):
+        self.bindings.EricMtGetErrormessagesFromXMLAnswer
+
+        self.assertEqual(c_int, self.library.EricMtGetErrormessagesFromXMLAnswer.restype)
+
+    def test_if_function_used_twice_then_resolve_it_only_once(self):
+        resolved_names = []
+
+        class CountingLibrary:
+            def __getattr__(self, name):
+                resolved_names.append(name)
+                return MagicMock(return_value=0)
+
+        bindings = EricBindings(CountingLibrary())
+        bindings.EricMtPruefeSteuernummer(1, b'9198011310010')
+        bindings.EricMtPruefeSteuernummer(1, b'9198011310010')
+
+        self.assertEqual(['EricMtPruefeSteuernummer'], resolved_names)
+
+    def test_if_function_called_then_pass_arguments_and_return_result(self):
+        self.library.EricMtPruefeSteuernummer.return_value = 0
+
+        result = self.bindings.EricMtPruefeSteuernummer('instance', b'9198011310010')
+
+        self.assertEqual(0, result)
+        self.library.EricMtPruefeSteuernummer.assert_called_once_with('instance', b'9198011310010')
+
+    def test_if_function_has_no_signature_then_raise_attribute_error(self):
+        with pytest.raises(AttributeError):
+            self.bindings.EricMtUnknownFunction
+
+    def test_if_function_used_then_name_is_function_name(self):
+        self.assertEqual('EricMtCreateTH', self.bindings.EricMtCreateTH.__name__)
+
+    def test_all_signatures_use_ctypes_types(self):
+        for name, signature in ERIC_FUNCTION_SIGNATURES.items():
+            self.assertIsNotNone(signature.restype, name)
+            self.assertTrue(all(argtype is not None for argtype in signature.argtypes), name)
+
+
+class TestEricFunctionMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.library = MagicMock()
+        self.bindings = EricBindings(self.library)
+
+    @staticmethod
+    def _sample(name, labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_if_function_called_then_observe_duration(self):
+        labels = {'function': 'EricMtHoleFinanzaemter'}
+        count_before = self._sample('erica_eric_call_duration_seconds_count', labels)
+        self.library.EricMtHoleFinanzaemter.return_value = 0
+
+        self.bindings.EricMtHoleFinanzaemter('instance', b'28', 'buffer')
+
+        self.assertEqual(count_before + 1, self._sample('erica_eric_call_duration_seconds_count', labels))
+
+    def test_if_function_raises_then_observe_duration_anyway(self):
+        labels = {'function': 'EricMtMakeElsterEWAz'}
+        count_before = self._sample('erica_eric_call_duration_seconds_count', labels)
+        self.library.EricMtMakeElsterEWAz.side_effect = OSError()
+
+        with pytest.raises(OSError):
+            self.bindings.EricMtMakeElsterEWAz('instance', b'2181508150', b'BY', 'buffer')
+
+        self.assertEqual(count_before + 1, self._sample('erica_eric_call_duration_seconds_count', labels))
+
+    def test_if_function_returns_result_code_then_count_it(self):
+        labels = {'function': 'EricMtDekodiereDaten', 'result_code': '610201016'}
+        count_before = self._sample('erica_eric_result_codes_total', labels)
+        self.library.EricMtDekodiereDaten.return_value = 610201016
+
+        self.bindings.EricMtDekodiereDaten('instance', 1, b'pin', b'data', 'buffer')
+        self.bindings.EricMtDekodiereDaten('instance', 1, b'pin', b'data', 'buffer')
+
+        self.assertEqual(count_before + 2, self._sample('erica_eric_result_codes_total', labels))
+
+    def test_if_function_returns_no_result_code_then_do_not_count(self):
+        self.library.EricMtRueckgabepufferErzeugen.return_value = 12345
+
+        self.bindings.EricMtRueckgabepufferErzeugen('instance')
+
+        self.assertIsNone(REGISTRY.get_sample_value('erica_eric_result_codes_total',
+                                                    {'function': 'EricMtRueckgabepufferErzeugen',
+                                                     'result_code': '12345'}))
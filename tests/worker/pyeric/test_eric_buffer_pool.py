@@ -0,0 +1,80 @@
+import unittest
+from itertools import count
+from unittest.mock import MagicMock
+
+import pytest
+
+from erica.worker.pyeric.eric_buffer_pool import EricBufferPool
+from erica.worker.pyeric.eric_errors import EricNullReturnedError
+
+
+class TestEricBufferPool(unittest.TestCase):
+
+    def setUp(self):
+        self.eric_wrapper = MagicMock()
+        buffer_handles = count(1)
+        self.eric_wrapper.create_buffer.side_effect = lambda: next(buffer_handles)
+        self.buffer_pool = EricBufferPool(self.eric_wrapper, max_idle_buffers=2)
+
+    def test_if_buffers_requested_then_create_new_buffers(self):
+        with self.buffer_pool.buffers(2) as buffers:
+            self.assertEqual([1, 2], buffers)
+            self.assertEqual(2, self.buffer_pool.number_in_use)
+
+    def test_if_buffers_returned_then_reuse_them(self):
+        with self.buffer_pool.buffers(2) as first_buffers:
+            pass
+        with self.buffer_pool.buffers(2) as second_buffers:
+            pass
+
+        self.assertEqual(sorted(first_buffers), sorted(second_buffers))
+        self.assertEqual(2, self.eric_wrapper.create_buffer.call_count)
+        self.eric_wrapper.close_buffer.assert_not_called()
+
+    def test_if_buffer_returned_then_number_in_use_is_zero(self):
+        with self.buffer_pool.buffer():
+            pass
+
+        self.assertEqual(0, self.buffer_pool.number_in_use)
+        self.assertEqual(1, self.buffer_pool.number_idle)
+
+    def test_if_exception_raised_then_return_buffers_anyway(self):
+        with pytest.raises(ValueError):
+            with self.buffer_pool.buffers(2):
+                raise ValueError()
+
+        self.assertEqual(0, self.buffer_pool.number_in_use)
+        self.assertEqual(2, self.buffer_pool.number_idle)
+
+    def test_if_more_buffers_returned_than_max_idle_then_free_the_rest(self):
+        with self.buffer_pool.buffers(3):
+            pass
+
+        self.assertEqual(2, self.buffer_pool.number_idle)
+        self.eric_wrapper.close_buffer.assert_called_once()
+
+    def test_if_buffer_returned_then_do_not_read_it(self):
+        with self.buffer_pool.buffer():
+            pass
+
+        self.eric_wrapper.read_buffer.assert_not_called()
+        self.eric_wrapper.close_buffer.assert_not_called()
+
+    def test_if_buffer_creation_fails_then_return_already_created_buffers(self):
+        self.eric_wrapper.create_buffer.side_effect = [1, EricNullReturnedError()]
+
+        with pytest.raises(EricNullReturnedError):
+            with self.buffer_pool.buffers(2):
+                pass
+
+        self.assertEqual(0, self.buffer_pool.number_in_use)
+        self.assertEqual(1, self.buffer_pool.number_idle)
+
+    def test_if_closed_then_free_idle_buffers(self):
+        with self.buffer_pool.buffers(2):
+            pass
+
+        self.buffer_pool.close()
+
+        self.assertEqual(2, self.eric_wrapper.close_buffer.call_count)
+        self.assertEqual(0, self.buffer_pool.number_idle)
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 from erica.worker.pyeric.eric_errors import EricGlobalError, EricProcessNotSuccessful, EricGlobalValidationError, \
     EricGlobalInitialisationError, EricTransferError, EricCryptError, EricIOError, EricPrintError, \
@@ -249,6 +250,28 @@ class TestCheckResCode(unittest.TestCase):
         server_response = b""
         self.assertRaises(EricWrongTaxNumberError, check_result, 610001002, eric_response, server_response)
 
+    def test_if_transfer_error_with_server_err_msg_then_parse_error_codes_once_and_attach_them(self):
+        server_err_msg = {'TH_RES_CODE': '0', 'TH_ERR_MSG': 'OK', 'NDH_ERR_XML': '<?xml version="1.0" encoding="UTF-8"?><EricGetErrormessagesFromXMLAnswer xmlns="http://www.elster.de/EricXML/1.0/EricGetErrormessagesFromXMLAnswer">\t<Fehler>\t\t<Code>01</Code>\t</Fehler>   <Fehler>\t\t<Code>02</Code>\t</Fehler></EricGetErrormessagesFromXMLAnswer>'}
+
+        with patch('erica.worker.pyeric.eric_errors.get_error_codes_from_server_err_msg',
+                   wraps=get_error_codes_from_server_err_msg) as get_error_codes:
+            with self.assertRaises(EricTransferError) as context:
+                check_result(610101292, b"", b"", server_err_msg)
+            self.assertEqual(['01', '02'], context.exception.server_error_codes)
+
+        get_error_codes.assert_called_once()
+
+    def test_if_res_code_and_response_antrag_not_found_then_attach_server_err_msg(self):
+        server_response = b"Es ist kein Antrag auf Erteilung einer Berechtigung zum Datenabruf " \
+                          b"bzw. keine Berechtigung zum Widerruf vorhanden."
+        server_err_msg = {'TH_RES_CODE': '0', 'TH_ERR_MSG': 'OK', 'NDH_ERR_XML': ''}
+
+        with self.assertRaises(EricAntragNotFoundError) as context:
+            check_result(610101292, b"", server_response, server_err_msg)
+
+        self.assertEqual(server_err_msg, context.exception.server_err_msg)
+        self.assertEqual([], context.exception.server_error_codes)
+
 
 class TestCheckHandle(unittest.TestCase):
 
@@ -296,6 +319,12 @@ class TestCheckXml(unittest.TestCase):
         except EricProcessNotSuccessful:
             self.fail("CheckXml raised EricProcessNotSuccessful unexpected.")
 
+    def test_if_valid_xml_then_return_it_parsed_without_namespaces(self):
+        parsed_xml = check_xml(b'<still xmlns="http://namespace"><Valid_xml /></still>')
+
+        self.assertEqual('still', parsed_xml.root.tag)
+        self.assertIsNotNone(parsed_xml.find('Valid_xml'))
+
 
 class TestGetErrorCodesFromServerErrMsg:
 
@@ -0,0 +1,365 @@
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from erica.worker.pyeric.eric_errors import EricGlobalInitialisationError, EricGlobalValidationError
+from erica.worker.pyeric.eric_pool import EricInstancePool, EricPoolExhaustedError, EricPoolClosedError, \
+    get_eric_pool, shutdown_eric_pool, SharedEricInstance, get_shared_eric_instance, shutdown_shared_eric_instance
+
+
+def create_pool(size=2, checkout_timeout=None):
+    factory = MagicMock(side_effect=lambda log_path: MagicMock(log_path=log_path))
+    return EricInstancePool(size, checkout_timeout=checkout_timeout, factory=factory), factory
+
+
+class TestEricInstancePoolStart(unittest.TestCase):
+
+    def test_if_started_then_create_all_instances(self):
+        pool, factory = create_pool(size=3)
+
+        pool.start()
+
+        self.assertEqual(3, factory.call_count)
+        pool.shutdown()
+
+    def test_if_started_twice_then_create_instances_only_once(self):
+        pool, factory = create_pool(size=2)
+
+        pool.start()
+        pool.start()
+
+        self.assertEqual(2, factory.call_count)
+        pool.shutdown()
+
+    def test_if_started_then_every_instance_gets_its_own_existing_log_path(self):
+        pool, factory = create_pool(size=2)
+
+        pool.start()
+
+        log_paths = [call.args[0] for call in factory.call_args_list]
+        self.assertEqual(2, len(set(log_paths)))
+        self.assertTrue(all(os.path.isdir(log_path) for log_path in log_paths))
+        pool.shutdown()
+
+    def test_if_size_zero_then_raise_value_error(self):
+        with pytest.raises(ValueError):
+            EricInstancePool(0, factory=MagicMock())
+
+    def test_if_warm_up_given_then_warm_up_every_instance_before_it_is_used(self):
+        warm_up = MagicMock()
+        pool = EricInstancePool(2, factory=MagicMock(side_effect=lambda log_path: MagicMock()), warm_up=warm_up)
+
+        pool.start()
+        with pool.checkout() as eric_wrapper:
+            warm_up.assert_any_call(eric_wrapper)
+
+        self.assertEqual(2, warm_up.call_count)
+        pool.shutdown()
+
+    def test_if_not_started_then_not_ready(self):
+        pool, _ = create_pool(size=2)
+
+        with pool.checkout():
+            pass
+
+        self.assertFalse(pool.is_ready)
+        pool.shutdown()
+
+    def test_if_started_then_ready(self):
+        pool, _ = create_pool(size=2)
+
+        pool.start()
+
+        self.assertTrue(pool.is_ready)
+        pool.shutdown()
+
+
+class TestEricInstancePoolCheckout(unittest.TestCase):
+
+    def test_if_not_started_then_create_instance_lazily(self):
+        pool, factory = create_pool(size=2)
+
+        with pool.checkout() as eric_wrapper:
+            self.assertIsNotNone(eric_wrapper)
+
+        self.assertEqual(1, factory.call_count)
+        pool.shutdown()
+
+    def test_if_instance_returned_then_reuse_it(self):
+        pool, factory = create_pool(size=2)
+
+        with pool.checkout() as first_wrapper:
+            pass
+        with pool.checkout() as second_wrapper:
+            pass
+
+        self.assertIs(first_wrapper, second_wrapper)
+        self.assertEqual(1, factory.call_count)
+        pool.shutdown()
+
+    def test_if_nested_checkout_in_same_thread_then_return_same_instance(self):
+        pool, factory = create_pool(size=1, checkout_timeout=0.1)
+
+        with pool.checkout() as outer_wrapper:
+            with pool.checkout() as inner_wrapper:
+                self.assertIs(outer_wrapper, inner_wrapper)
+
+        pool.shutdown()
+
+    def test_if_all_instances_checked_out_then_raise_exhausted_error_after_timeout(self):
+        pool, _ = create_pool(size=1, checkout_timeout=0.05)
+        checked_out = threading.Event()
+        release = threading.Event()
+
+        def hold_instance():
+            with pool.checkout():
+                checked_out.set()
+                release.wait()
+
+        holder = threading.Thread(target=hold_instance)
+        holder.start()
+        checked_out.wait()
+        try:
+            with pytest.raises(EricPoolExhaustedError):
+                with pool.checkout():
+                    pass
+        finally:
+            release.set()
+            holder.join()
+        pool.shutdown()
+
+    def test_if_instance_returned_then_waiting_thread_gets_it(self):
+        pool, factory = create_pool(size=1, checkout_timeout=5)
+        results = []
+
+        def wait_for_instance():
+            with pool.checkout() as eric_wrapper:
+                results.append(eric_wrapper)
+
+        with pool.checkout() as first_wrapper:
+            waiting = threading.Thread(target=wait_for_instance)
+            waiting.start()
+            waiting.join(0.05)
+        waiting.join()
+
+        self.assertEqual([first_wrapper], results)
+        self.assertEqual(1, factory.call_count)
+        pool.shutdown()
+
+    def test_if_unhealthy_error_raised_then_replace_instance(self):
+        pool, factory = create_pool(size=1)
+
+        with pytest.raises(EricGlobalInitialisationError):
+            with pool.checkout() as broken_wrapper:
+                raise EricGlobalInitialisationError()
+        with pool.checkout() as new_wrapper:
+            pass
+
+        self.assertIsNot(broken_wrapper, new_wrapper)
+        broken_wrapper.shutdown.assert_called_once()
+        self.assertEqual(2, factory.call_count)
+        pool.shutdown()
+
+    def test_if_other_eric_error_raised_then_keep_instance(self):
+        pool, factory = create_pool(size=1)
+
+        with pytest.raises(EricGlobalValidationError):
+            with pool.checkout() as first_wrapper:
+                raise EricGlobalValidationError()
+        with pool.checkout() as second_wrapper:
+            pass
+
+        self.assertIs(first_wrapper, second_wrapper)
+        first_wrapper.shutdown.assert_not_called()
+        pool.shutdown()
+
+    def test_if_instance_creation_fails_then_free_slot_again(self):
+        factory = MagicMock(side_effect=[EricGlobalInitialisationError(), MagicMock()])
+        pool = EricInstancePool(1, checkout_timeout=0.05, factory=factory)
+
+        with pytest.raises(EricGlobalInitialisationError):
+            with pool.checkout():
+                pass
+        with pool.checkout() as eric_wrapper:
+            self.assertIsNotNone(eric_wrapper)
+
+        pool.shutdown()
+
+
+class TestEricInstancePoolShutdown(unittest.TestCase):
+
+    def test_if_shutdown_then_shutdown_all_idle_instances(self):
+        pool, _ = create_pool(size=2)
+        pool.start()
+        wrappers = []
+        with pool.checkout() as first_wrapper:
+            wrappers.append(first_wrapper)
+            with patch.object(pool, '_held', threading.local()):
+                with pool.checkout() as second_wrapper:
+                    wrappers.append(second_wrapper)
+
+        pool.shutdown()
+
+        for eric_wrapper in wrappers:
+            eric_wrapper.shutdown.assert_called_once()
+
+    def test_if_shutdown_while_checked_out_then_shutdown_instance_on_return(self):
+        pool, _ = create_pool(size=1)
+
+        with pool.checkout() as eric_wrapper:
+            pool.shutdown()
+            eric_wrapper.shutdown.assert_not_called()
+
+        eric_wrapper.shutdown.assert_called_once()
+
+    def test_if_shutdown_then_checkout_raises_closed_error(self):
+        pool, _ = create_pool(size=1)
+        pool.shutdown()
+
+        with pytest.raises(EricPoolClosedError):
+            with pool.checkout():
+                pass
+
+    def test_if_shutdown_then_remove_log_dir(self):
+        pool, factory = create_pool(size=1)
+        pool.start()
+        log_path = factory.call_args.args[0]
+
+        pool.shutdown()
+
+        self.assertFalse(os.path.exists(log_path))
+
+
+class TestGetEricPool(unittest.TestCase):
+
+    def test_if_called_twice_then_return_same_pool(self):
+        try:
+            self.assertIs(get_eric_pool(), get_eric_pool())
+        finally:
+            shutdown_eric_pool()
+
+    def test_if_warm_up_enabled_then_create_pool_with_warm_up(self):
+        with patch('erica.worker.pyeric.eric_pool.get_settings') as get_settings:
+            get_settings.return_value.eric_pool_size = 1
+            get_settings.return_value.eric_warm_up = True
+            try:
+                self.assertIsNotNone(get_eric_pool()._warm_up)
+            finally:
+                shutdown_eric_pool()
+
+    def test_if_shutdown_then_return_new_pool(self):
+        first_pool = get_eric_pool()
+        shutdown_eric_pool()
+        try:
+            self.assertIsNot(first_pool, get_eric_pool())
+        finally:
+            shutdown_eric_pool()
+
+
+class TestSharedEricInstance(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = MagicMock(side_effect=lambda log_path: MagicMock(log_path=log_path))
+        self.shared_instance = SharedEricInstance(factory=self.factory)
+
+    def tearDown(self):
+        self.shared_instance.shutdown()
+
+    def test_if_not_acquired_then_do_not_create_instance(self):
+        self.assertFalse(self.shared_instance.is_initialised)
+        self.factory.assert_not_called()
+
+    def test_if_acquired_twice_then_create_instance_only_once(self):
+        with self.shared_instance.acquire() as first_wrapper:
+            pass
+        with self.shared_instance.acquire() as second_wrapper:
+            pass
+
+        self.assertIs(first_wrapper, second_wrapper)
+        self.factory.assert_called_once()
+        first_wrapper.shutdown.assert_not_called()
+
+    def test_if_acquired_then_count_references(self):
+        with self.shared_instance.acquire():
+            with self.shared_instance.acquire():
+                self.assertEqual(2, self.shared_instance.reference_count)
+            self.assertEqual(1, self.shared_instance.reference_count)
+
+        self.assertEqual(0, self.shared_instance.reference_count)
+
+    def test_if_acquired_by_other_thread_then_wait_until_released(self):
+        events = []
+
+        def acquire_in_thread():
+            with self.shared_instance.acquire():
+                events.append('other thread')
+
+        with self.shared_instance.acquire():
+            other_thread = threading.Thread(target=acquire_in_thread)
+            other_thread.start()
+            other_thread.join(0.05)
+            events.append('this thread')
+        other_thread.join()
+
+        self.assertEqual(['this thread', 'other thread'], events)
+
+    def test_if_shutdown_then_shutdown_instance_and_remove_log_dir(self):
+        with self.shared_instance.acquire() as eric_wrapper:
+            pass
+
+        self.shared_instance.shutdown()
+
+        eric_wrapper.shutdown.assert_called_once()
+        self.assertFalse(os.path.exists(eric_wrapper.log_path))
+        self.assertFalse(self.shared_instance.is_initialised)
+
+    def test_if_acquired_after_shutdown_then_create_new_instance(self):
+        with self.shared_instance.acquire() as first_wrapper:
+            pass
+        self.shared_instance.shutdown()
+
+        with self.shared_instance.acquire() as second_wrapper:
+            pass
+
+        self.assertIsNot(first_wrapper, second_wrapper)
+
+    def test_if_unhealthy_error_raised_then_recreate_instance(self):
+        with pytest.raises(EricGlobalInitialisationError):
+            with self.shared_instance.acquire() as broken_wrapper:
+                raise EricGlobalInitialisationError()
+        with self.shared_instance.acquire() as new_wrapper:
+            pass
+
+        broken_wrapper.shutdown.assert_called_once()
+        self.assertIsNot(broken_wrapper, new_wrapper)
+
+    def test_if_other_error_raised_then_keep_instance(self):
+        with pytest.raises(EricGlobalValidationError):
+            with self.shared_instance.acquire() as first_wrapper:
+                raise EricGlobalValidationError()
+        with self.shared_instance.acquire() as second_wrapper:
+            pass
+
+        self.assertIs(first_wrapper, second_wrapper)
+
+
+class TestGetSharedEricInstance(unittest.TestCase):
+
+    def test_if_called_twice_then_return_same_instance(self):
+        try:
+            self.assertIs(get_shared_eric_instance(), get_shared_eric_instance())
+        finally:
+            shutdown_shared_eric_instance()
+
+    def test_if_created_then_register_shutdown_at_exit(self):
+        with patch('erica.worker.pyeric.eric_pool.atexit') as atexit:
+            try:
+                get_shared_eric_instance()
+            finally:
+                shutdown_shared_eric_instance()
+
+        atexit.register.assert_called_once_with(shutdown_shared_eric_instance)
+        atexit.unregister.assert_called_once_with(shutdown_shared_eric_instance)
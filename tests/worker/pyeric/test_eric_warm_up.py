@@ -0,0 +1,56 @@
+import logging
+import unittest
+from unittest.mock import patch, MagicMock
+
+from erica.worker.pyeric.eric import EricWrapper
+from erica.worker.pyeric.eric_errors import EricGlobalValidationError, EricIOError
+from erica.worker.pyeric.eric_warm_up import warm_up_eric_wrapper, get_warm_up_samples
+from erica.worker.pyeric.simulated_eric import SimulatedEricLibrary
+
+
+class TestWarmUpEricWrapper(unittest.TestCase):
+
+    def setUp(self):
+        with patch('erica.worker.pyeric.eric.load_eric_library', MagicMock(return_value=SimulatedEricLibrary())):
+            self.eric_wrapper = EricWrapper()
+        self.eric_wrapper.initialise()
+
+    def tearDown(self):
+        self.eric_wrapper.shutdown()
+
+    def test_if_warmed_up_then_validate_sample_for_every_data_type_version(self):
+        with patch.object(self.eric_wrapper, 'validate', wraps=self.eric_wrapper.validate) as validate:
+            warm_up_eric_wrapper(self.eric_wrapper)
+
+        validated_data_type_versions = [call.args[1] for call in validate.call_args_list]
+        self.assertEqual([sample.data_type_version for sample in get_warm_up_samples()], validated_data_type_versions)
+        self.assertIn('ESt_2021', validated_data_type_versions)
+        self.assertIn('Grundsteuerwert_2', validated_data_type_versions)
+
+    def test_if_warmed_up_then_validate_samples_with_transfer_header(self):
+        with patch.object(self.eric_wrapper, 'validate') as validate:
+            warm_up_eric_wrapper(self.eric_wrapper)
+
+        self.assertTrue(all('<TransferHeader' in call.args[0] for call in validate.call_args_list))
+
+    def test_if_warmed_up_then_log_duration_per_data_type_version(self):
+        with self.assertLogs('eric', level=logging.INFO) as logs:
+            warm_up_eric_wrapper(self.eric_wrapper)
+
+        for sample in get_warm_up_samples():
+            self.assertTrue(any(f"Warmed up ERiC for {sample.data_type_version} in" in line for line in logs.output))
+
+    def test_if_sample_invalid_then_count_as_warmed_up(self):
+        with patch.object(self.eric_wrapper, 'validate', side_effect=EricGlobalValidationError(610001002)), \
+                self.assertLogs('eric', level=logging.INFO) as logs:
+            warm_up_eric_wrapper(self.eric_wrapper)
+
+        self.assertFalse(any('WARNING' in line for line in logs.output))
+
+    def test_if_validation_fails_then_log_warning_and_continue(self):
+        with patch.object(self.eric_wrapper, 'validate', side_effect=EricIOError(610301001)) as validate, \
+                self.assertLogs('eric', level=logging.WARNING) as logs:
+            warm_up_eric_wrapper(self.eric_wrapper)
+
+        self.assertEqual(len(get_warm_up_samples()), validate.call_count)
+        self.assertEqual(len(get_warm_up_samples()), len(logs.output))
@@ -0,0 +1,56 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from erica.worker.pyeric.pdf_capture import capture_pdf, PDF_CAPTURE_MEMFD, PDF_CAPTURE_TMPFS, \
+    PDF_CAPTURE_DISK
+
+_PDF = b"%PDF-1.4\n" + os.urandom(1024) + b"\n%%EOF\n"
+
+
+def _write_like_eric(path, content):
+    with open(path, 'wb') as pdf_file:
+        pdf_file.write(content)
+
+
+class TestCapturePdf:
+
+    @pytest.mark.parametrize('mode', [PDF_CAPTURE_MEMFD, PDF_CAPTURE_TMPFS, PDF_CAPTURE_DISK])
+    def test_if_pdf_written_to_path_then_read_returns_pdf(self, mode):
+        with capture_pdf(mode) as pdf_capture:
+            _write_like_eric(pdf_capture.path, _PDF)
+
+            assert pdf_capture.read() == _PDF
+
+    @pytest.mark.parametrize('mode', [PDF_CAPTURE_MEMFD, PDF_CAPTURE_TMPFS, PDF_CAPTURE_DISK])
+    def test_if_nothing_written_then_read_returns_empty_bytes(self, mode):
+        with capture_pdf(mode) as pdf_capture:
+            assert pdf_capture.read() == b""
+
+    @pytest.mark.skipif(not hasattr(os, 'memfd_create'), reason="memfd is only available on Linux")
+    def test_if_memfd_mode_then_path_is_no_file_on_disk(self):
+        with capture_pdf(PDF_CAPTURE_MEMFD) as pdf_capture:
+            assert pdf_capture.path.startswith('/proc/self/fd/')
+
+    @pytest.mark.parametrize('mode', [PDF_CAPTURE_TMPFS, PDF_CAPTURE_DISK])
+    def test_if_file_based_mode_then_remove_file_afterwards(self, mode):
+        with capture_pdf(mode) as pdf_capture:
+            _write_like_eric(pdf_capture.path, _PDF)
+
+        assert not os.path.exists(pdf_capture.path)
+
+    def test_if_memfd_not_available_then_fall_back_to_file(self):
+        with patch('erica.worker.pyeric.pdf_capture._memfd_available', return_value=False):
+            with capture_pdf(PDF_CAPTURE_MEMFD) as pdf_capture:
+                _write_like_eric(pdf_capture.path, _PDF)
+
+                assert not pdf_capture.path.startswith('/proc/self/fd/')
+                assert pdf_capture.read() == _PDF
+
+    def test_if_no_mode_given_then_use_mode_from_settings(self):
+        with patch('erica.worker.pyeric.pdf_capture.get_settings') as get_settings:
+            get_settings.return_value.pdf_capture_mode = PDF_CAPTURE_DISK
+            with capture_pdf() as pdf_capture:
+                assert not pdf_capture.path.startswith('/proc/self/fd/')
+
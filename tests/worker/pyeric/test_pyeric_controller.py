@@ -15,7 +15,8 @@ from erica.worker.pyeric.pyeric_controller import PyericProcessController, EstPy
     AbrufcodeRequestPyericProcessController, \
     UnlockCodeRevocationPyericProcessController, BelegIdRequestPyericProcessController, DecryptBelegePyericController, \
     BelegRequestPyericProcessController, GetTaxOfficesPyericController, CheckTaxNumberPyericController, \
-    GrundsteuerPyericProcessController
+    GrundsteuerPyericProcessController, GrundsteuerPrintPyericProcessController, EstPrintPyericProcessController, \
+    _get_number_of_eric_threads
 
 
 class TestPyericControllerInit(unittest.TestCase):
@@ -134,7 +135,44 @@ class TestGrundsteuerPyericProcessControllerRunPyEric(unittest.TestCase):
 
         pyeric_controller.run_eric(mock_eric_wrapper)
 
-        mock_eric_wrapper.validate_and_send.assert_called_once_with(xml, "Grundsteuerwert_2")
+        mock_eric_wrapper.validate_and_send.assert_called_once_with(xml, "Grundsteuerwert_2", print_pdf=True)
+
+    def test_if_pdf_rendering_deferred_then_call_validate_and_send_without_pdf(self):
+        xml = "<xml></xml>"
+        pyeric_controller = GrundsteuerPyericProcessController(xml)
+        mock_eric_wrapper = MagicMock()
+
+        with patch('erica.worker.pyeric.pyeric_controller.get_settings') as get_settings:
+            get_settings.return_value.defer_pdf_rendering = True
+            pyeric_controller.run_eric(mock_eric_wrapper)
+
+        mock_eric_wrapper.validate_and_send.assert_called_once_with(xml, "Grundsteuerwert_2", print_pdf=False)
+
+
+class TestGrundsteuerPrintPyericProcessControllerRunPyEric(unittest.TestCase):
+
+    def test_if_pyeric_initialised_then_call_validate_and_print_with_correct_verfahren(self):
+        xml = "<xml></xml>"
+        pyeric_controller = GrundsteuerPrintPyericProcessController(xml)
+        mock_eric_wrapper = MagicMock()
+
+        pyeric_controller.run_eric(mock_eric_wrapper)
+
+        mock_eric_wrapper.validate_and_print.assert_called_once_with(xml, "Grundsteuerwert_2")
+        mock_eric_wrapper.validate_and_send.assert_not_called()
+
+
+class TestEstPrintPyericProcessControllerRunPyEric(unittest.TestCase):
+
+    def test_if_pyeric_initialised_then_call_validate_and_print_with_correct_verfahren(self):
+        xml = "<xml></xml>"
+        year = TEST_EST_VERANLAGUNGSJAHR
+        pyeric_controller = EstPrintPyericProcessController(xml, year)
+        mock_eric_wrapper = MagicMock()
+
+        pyeric_controller.run_eric(mock_eric_wrapper)
+
+        mock_eric_wrapper.validate_and_print.assert_called_once_with(xml, "ESt_" + str(year))
 
 
 class TestUnlockCodeRequestPyericControllerRunPyEric(unittest.TestCase):
@@ -203,21 +241,47 @@ class TestBelegIdRequestPyericControllerRunPyEric(unittest.TestCase):
             transfer_handle=transfer_handle)
 
 
-class TestDecryptBelegePyericControllerRunEric(unittest.TestCase):
+class TestDecryptBelegePyericControllerGetDecryptedBelege(unittest.TestCase):
     def setUp(self):
-        self.encrypted_belege = ['beleg_1', 'beleg_2']
-        self.mocked_decrypt_data = MagicMock(side_effect=lambda _: _)
-        self.mocked_eric_wrapper = MagicMock(decrypt_data=self.mocked_decrypt_data)
+        self.encrypted_belege = ['beleg_1', 'beleg_2', 'beleg_3']
+        self.mocked_eric_wrapper = MagicMock(decrypt_data=MagicMock(side_effect=lambda beleg: 'decrypted_' + beleg))
+
+    def test_if_belege_given_then_return_decrypted_belege_in_same_order(self):
+        with patch("erica.worker.pyeric.pyeric_controller.get_eric_wrapper") as mock_get_eric_wrapper:
+            mock_get_eric_wrapper.return_value.__enter__.return_value = self.mocked_eric_wrapper
+            returned_belege = list(DecryptBelegePyericController().get_decrypted_belege(self.encrypted_belege))
+
+        self.assertEqual(['decrypted_beleg_1', 'decrypted_beleg_2', 'decrypted_beleg_3'], returned_belege)
 
-    def test_calls_eric_decrypt_belege(self):
-        self.mocked_decrypt_data.reset_mock()
-        DecryptBelegePyericController().run_eric(self.mocked_eric_wrapper, self.encrypted_belege)
-        self.mocked_decrypt_data.assert_has_calls([call('beleg_1'), call('beleg_2')])
+    def test_if_belege_given_as_generator_then_decrypt_each_beleg_once(self):
+        with patch("erica.worker.pyeric.pyeric_controller.get_eric_wrapper") as mock_get_eric_wrapper:
+            mock_get_eric_wrapper.return_value.__enter__.return_value = self.mocked_eric_wrapper
+            list(DecryptBelegePyericController().get_decrypted_belege(beleg for beleg in self.encrypted_belege))
 
-    def test_returns_list_of_decrypted_belege_for_each_encrypted_beleg(self):
-        self.mocked_decrypt_data.reset_mock()
-        returned_belege = DecryptBelegePyericController().run_eric(self.mocked_eric_wrapper, self.encrypted_belege)
-        self.assertEqual(self.encrypted_belege, returned_belege)
+        self.assertEqual(3, self.mocked_eric_wrapper.decrypt_data.call_count)
+        self.assertEqual(3, mock_get_eric_wrapper.call_count)
+
+    def test_if_decryption_fails_then_raise_error(self):
+        self.mocked_eric_wrapper.decrypt_data.side_effect = EricIOError(-1)
+        with patch("erica.worker.pyeric.pyeric_controller.get_eric_wrapper") as mock_get_eric_wrapper:
+            mock_get_eric_wrapper.return_value.__enter__.return_value = self.mocked_eric_wrapper
+
+            with pytest.raises(EricIOError):
+                list(DecryptBelegePyericController().get_decrypted_belege(self.encrypted_belege))
+
+    def test_if_run_with_huey_then_use_as_many_threads_as_eric_instances(self):
+        with patch('erica.worker.pyeric.pyeric_controller.get_settings') as get_settings:
+            get_settings.return_value.run_with_huey = True
+            get_settings.return_value.eric_pool_size = 3
+
+            self.assertEqual(3, _get_number_of_eric_threads())
+
+    def test_if_not_run_with_huey_then_use_one_thread(self):
+        with patch('erica.worker.pyeric.pyeric_controller.get_settings') as get_settings:
+            get_settings.return_value.run_with_huey = False
+            get_settings.return_value.eric_pool_size = 3
+
+            self.assertEqual(1, _get_number_of_eric_threads())
 
 
 class TestCheckTaxNumberPyericController:
@@ -304,6 +368,49 @@ class TestGetTaxOfficesRequestController(unittest.TestCase):
         self.assertEqual(valid_bufa_numbers.sort(), all_bufas.sort())
 
 
+class TestGetTaxOfficesPyericControllerWithCheckout(unittest.TestCase):
+    def setUp(self):
+        self.mocked_eric_wrapper = MagicMock()
+        self.mocked_eric_wrapper.get_state_id_list.return_value = 'state_ids'
+        self.mocked_eric_wrapper.get_tax_offices.side_effect = lambda state_id: state_id
+        self.mocked_eric_wrapper.get_version.return_value = \
+            b'<EricVersion><Bibliothek><Name>libericapi.so</Name><Version>36.2.6.0</Version></Bibliothek>' \
+            b'<Bibliothek><Name>libcommonData.so</Name><Version>36.2.6.0</Version></Bibliothek></EricVersion>'
+        self.checkout = MagicMock()
+        self.checkout.return_value.__enter__.return_value = self.mocked_eric_wrapper
+        self.state_ids = [{'name': 'Bayern (Zuständigkeit LfSt - München)', 'id': '91'},
+                          {'name': 'Berlin', 'id': '11'},
+                          {'name': 'Bayern (Zuständigkeit LfSt - Nürnberg)', 'id': '92'}]
+
+    def test_if_state_has_several_ids_then_join_their_tax_offices_in_order(self):
+        with patch('erica.worker.pyeric.pyeric_controller.get_state_ids', return_value=self.state_ids), \
+                patch('erica.worker.pyeric.pyeric_controller.get_tax_offices',
+                      side_effect=lambda state_id: [{'name': 'Finanzamt ' + state_id, 'bufa_nr': state_id + '01'}]):
+            result = GetTaxOfficesPyericController(self.checkout, number_of_threads=3).get_eric_response()
+
+        self.assertEqual({'tax_offices': [
+            {'state_abbreviation': 'by', 'name': 'Bayern',
+             'tax_offices': [{'name': 'Finanzamt 91', 'bufa_nr': '9101'}, {'name': 'Finanzamt 92', 'bufa_nr': '9201'}]},
+            {'state_abbreviation': 'be', 'name': 'Berlin',
+             'tax_offices': [{'name': 'Finanzamt 11', 'bufa_nr': '1101'}]}]}, result)
+
+    def test_if_checkout_given_then_request_every_state_id_with_it(self):
+        with patch('erica.worker.pyeric.pyeric_controller.get_state_ids', return_value=self.state_ids), \
+                patch('erica.worker.pyeric.pyeric_controller.get_tax_offices', return_value=[]), \
+                patch('erica.worker.pyeric.pyeric_controller.get_eric_wrapper') as get_eric_wrapper:
+            GetTaxOfficesPyericController(self.checkout, number_of_threads=3).get_eric_response()
+
+        get_eric_wrapper.assert_not_called()
+        self.assertEqual(4, self.checkout.call_count)
+        self.assertCountEqual([call('91'), call('11'), call('92')],
+                              self.mocked_eric_wrapper.get_tax_offices.call_args_list)
+
+    def test_if_get_eric_version_then_return_library_version(self):
+        result = GetTaxOfficesPyericController(self.checkout).get_eric_version()
+
+        self.assertEqual('36.2.6.0', result)
+
+
 class TestBelegIdRequestPyericControllerRunEric(unittest.TestCase):
     def setUp(self):
         self.encrypted_belege = ['beleg_1', 'beleg_2']
@@ -0,0 +1,28 @@
+import unittest
+from unittest.mock import patch
+
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import NamespaceFreeXml
+from erica.worker.pyeric.pyeric_response import PyericResponse
+
+
+class TestGetParsedServerResponse(unittest.TestCase):
+
+    def test_if_called_twice_then_parse_server_response_once(self):
+        pyeric_response = PyericResponse('', '<Elster xmlns="http://namespace"><AntragsID>42</AntragsID></Elster>')
+
+        with patch('erica.worker.pyeric.pyeric_response.NamespaceFreeXml', wraps=NamespaceFreeXml) as parse:
+            first_result = pyeric_response.get_parsed_server_response()
+            second_result = pyeric_response.get_parsed_server_response()
+
+        parse.assert_called_once()
+        self.assertIs(first_result, second_result)
+        self.assertEqual('42', first_result.find('AntragsID').text)
+
+    def test_if_parsed_server_response_given_then_do_not_parse_again(self):
+        parsed_server_response = NamespaceFreeXml('<Elster />')
+        pyeric_response = PyericResponse('', '<Elster />', parsed_server_response=parsed_server_response)
+
+        with patch('erica.worker.pyeric.pyeric_response.NamespaceFreeXml') as parse:
+            self.assertIs(parsed_server_response, pyeric_response.get_parsed_server_response())
+
+        parse.assert_not_called()
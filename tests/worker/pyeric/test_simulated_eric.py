@@ -0,0 +1,171 @@
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from erica.worker.elster_xml.elster_xml_generator import get_belege_xml
+from erica.worker.elster_xml.xml_parsing.elster_specifics_xml_parsing import get_antrag_id_from_xml, \
+    get_transferticket_from_xml, get_state_ids, get_tax_offices, get_relevant_beleg_ids, get_address_from_xml
+from erica.worker.elster_xml.xml_parsing.erica_xml_parsing import get_elements_text_from_xml
+from erica.worker.pyeric.eric import EricWrapper, load_eric_library
+from erica.worker.pyeric.eric_errors import EricTransferError, EricGlobalValidationError
+from erica.worker.pyeric.simulated_eric import SimulatedEricLibrary, SimulatedEricProfile, create_simulated_pdf, \
+    get_simulated_eric_profile, SIMULATED_ERIC_PROFILES
+from utils import read_text_from_sample
+
+
+def _create_simulated_eric_wrapper(profile=SimulatedEricProfile()):
+    with patch('erica.worker.pyeric.eric.load_eric_library', MagicMock(return_value=SimulatedEricLibrary(profile))):
+        eric_wrapper = EricWrapper()
+    eric_wrapper.initialise()
+    return eric_wrapper
+
+
+class TestLoadEricLibrary(unittest.TestCase):
+
+    def test_if_backend_simulated_then_load_simulated_library_with_profile_from_settings(self):
+        with patch('erica.worker.pyeric.eric.get_settings') as get_settings, \
+                patch('erica.worker.pyeric.simulated_eric.get_settings', get_settings):
+            get_settings.return_value.eric_backend = 'simulated'
+            get_settings.return_value.simulated_eric_profile = 'instant'
+            library = load_eric_library()
+
+        self.assertIsInstance(library, SimulatedEricLibrary)
+        self.assertEqual(SIMULATED_ERIC_PROFILES['instant'], library.profile)
+
+    def test_if_profile_unknown_then_raise_value_error(self):
+        with pytest.raises(ValueError):
+            get_simulated_eric_profile('unknown')
+
+
+class TestSimulatedEricWrapper(unittest.TestCase):
+
+    def setUp(self):
+        self.eric_wrapper = _create_simulated_eric_wrapper()
+
+    def tearDown(self):
+        self.eric_wrapper.shutdown()
+
+    def test_if_validated_then_return_empty_responses(self):
+        response = self.eric_wrapper.validate(read_text_from_sample('sample_vast_request.xml'), 'SpezRechtAntrag')
+
+        self.assertEqual(0, response.result_code)
+        self.assertEqual(b'', response.server_response)
+
+    def test_if_validated_and_sent_then_return_pdf_and_transferticket(self):
+        response = self.eric_wrapper.validate_and_send(read_text_from_sample('grundsteuer_sample_xml.xml'),
+                                                      'Grundsteuerwert_2')
+
+        self.assertTrue(response.pdf.startswith(b'%PDF-1.4'))
+        self.assertEqual(32, len(get_transferticket_from_xml(response.server_response.decode())))
+
+    def test_if_sent_without_pdf_then_return_only_transferticket(self):
+        response = self.eric_wrapper.validate_and_send(read_text_from_sample('grundsteuer_sample_xml.xml'),
+                                                      'Grundsteuerwert_2', print_pdf=False)
+
+        self.assertIsNone(response.pdf)
+        self.assertEqual(32, len(get_transferticket_from_xml(response.server_response.decode())))
+
+    def test_if_printed_then_return_pdf_without_sending(self):
+        response = self.eric_wrapper.validate_and_print(read_text_from_sample('grundsteuer_sample_xml.xml'),
+                                                       'Grundsteuerwert_2')
+
+        self.assertTrue(response.pdf.startswith(b'%PDF-1.4'))
+        self.assertEqual(b'', response.server_response)
+
+    def test_if_unlock_code_requested_then_return_antrag_id(self):
+        response = self.eric_wrapper.process_verfahren(read_text_from_sample('sample_vast_request.xml'),
+                                                       'SpezRechtAntrag')
+
+        self.assertIsNotNone(get_antrag_id_from_xml(response.server_response.decode()))
+
+    def test_if_belege_requested_then_return_ids_encrypted_and_decrypted_belege(self):
+        beleg_id_response = self.eric_wrapper.process_verfahren(
+            read_text_from_sample('sample_beleg_ids_request.xml'), 'ElsterVaStDaten')
+        beleg_ids = get_relevant_beleg_ids(beleg_id_response.server_response.decode(), ['VaSt_Pers1'])
+        beleg_response = self.eric_wrapper.process_verfahren(
+            read_text_from_sample('sample_beleg_request.xml'), 'ElsterVaStDaten')
+        encrypted_belege = get_elements_text_from_xml(beleg_response.server_response.decode(), 'Datenpaket')
+        decrypted_belege = [self.eric_wrapper.decrypt_data(beleg) for beleg in encrypted_belege]
+
+        self.assertEqual(1, len(beleg_ids))
+        self.assertEqual(1, len(encrypted_belege))
+        self.assertIsNotNone(get_address_from_xml(get_belege_xml(decrypted_belege)))
+
+    def test_if_transfer_header_created_then_insert_it_into_elster_element(self):
+        xml = '<Elster xmlns="http://www.elster.de/elsterxml/schema/v11"><DatenTeil/></Elster>'
+
+        xml_with_th = self.eric_wrapper.create_th(xml, datenart='SpezRechtAntrag', testmerker='370000001').decode()
+
+        self.assertIn('<TransferHeader version="11"><Verfahren>ElsterErklaerung</Verfahren>'
+                      '<DatenArt>SpezRechtAntrag</DatenArt>', xml_with_th)
+        self.assertTrue(xml_with_th.endswith('</TransferHeader><DatenTeil/></Elster>'))
+
+    def test_if_tax_number_has_correct_format_then_return_true(self):
+        self.assertTrue(self.eric_wrapper.check_tax_number('9198011310010'))
+
+    def test_if_tax_number_has_incorrect_format_then_return_false(self):
+        self.assertFalse(self.eric_wrapper.check_tax_number('91980113100'))
+
+    def test_if_tax_offices_requested_then_return_offices_for_every_state(self):
+        state_ids = get_state_ids(self.eric_wrapper.get_state_id_list())
+        tax_offices = get_tax_offices(self.eric_wrapper.get_tax_offices('28'))
+
+        self.assertEqual(17, len(state_ids))
+        self.assertEqual(['2801', '2802', '2803'], [tax_office['bufa_nr'] for tax_office in tax_offices])
+
+    def test_if_electronic_aktenzeichen_requested_then_return_thirteen_digits(self):
+        self.assertEqual('2808112345670', self.eric_wrapper.get_electronic_aktenzeichen('08112/345/67', 'BW'))
+
+    def test_if_cert_properties_requested_then_simulate_stick(self):
+        self.assertIn('<TokenTyp>Stick</TokenTyp>', self.eric_wrapper.get_cert_properties())
+
+
+class TestSimulatedEricShutdown(unittest.TestCase):
+
+    def test_if_shut_down_then_all_buffers_and_cert_handles_are_released(self):
+        eric_wrapper = _create_simulated_eric_wrapper()
+        eric_wrapper.process_verfahren(read_text_from_sample('sample_vast_request.xml'), 'SpezRechtAntrag')
+
+        eric_wrapper.shutdown()
+
+        self.assertEqual({}, eric_wrapper.eric._buffers)
+        self.assertEqual(set(), eric_wrapper.eric._cert_handles)
+
+
+class TestSimulatedEricProfiles(unittest.TestCase):
+
+    def test_if_error_rate_is_one_then_every_send_fails_with_given_error(self):
+        eric_wrapper = _create_simulated_eric_wrapper(SimulatedEricProfile(error_rate=1, error_codes=(610101283,)))
+
+        with pytest.raises(EricTransferError) as error:
+            eric_wrapper.process_verfahren(read_text_from_sample('sample_vast_request.xml'), 'SpezRechtAntrag')
+        eric_wrapper.shutdown()
+
+        self.assertEqual(610101283, error.value.res_code)
+
+    def test_if_validation_error_injected_then_return_validation_problems(self):
+        eric_wrapper = _create_simulated_eric_wrapper(SimulatedEricProfile(error_rate=1, error_codes=(610001002,)))
+
+        with pytest.raises(EricGlobalValidationError) as error:
+            eric_wrapper.process_verfahren(read_text_from_sample('sample_vast_request.xml'), 'SpezRechtAntrag')
+        eric_wrapper.shutdown()
+
+        self.assertEqual(1, len(error.value.generate_error_response()['validation_problems']))
+
+    def test_if_send_latency_set_then_sending_takes_at_least_that_long(self):
+        eric_wrapper = _create_simulated_eric_wrapper(SimulatedEricProfile(send_latency_in_ms=50, jitter_in_ms=10))
+
+        start = time.monotonic()
+        eric_wrapper.process_verfahren(read_text_from_sample('sample_vast_request.xml'), 'SpezRechtAntrag')
+        duration = time.monotonic() - start
+        eric_wrapper.shutdown()
+
+        self.assertGreaterEqual(duration, 0.05)
+
+    def test_if_pdf_size_set_then_pdf_has_about_that_size(self):
+        pdf = create_simulated_pdf(100)
+
+        self.assertTrue(pdf.endswith(b'%%EOF\n'))
+        self.assertAlmostEqual(100 * 1024, len(pdf), delta=1024)
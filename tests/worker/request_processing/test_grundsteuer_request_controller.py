@@ -1,4 +1,3 @@
-import base64
 import json
 from unittest.mock import patch, MagicMock
 from xml.etree import ElementTree
@@ -100,10 +99,32 @@ class TestGenerateJson:
     def test_result_includes_all_relevant_aspects(self, valid_grundsteuer_request_controller):
         valid_grundsteuer_request_controller.include_elster_responses = True
         example_pyeric_response = PyericResponse("eric response", "server response", "pdf content".encode())
-        with patch('erica.worker.request_processing.requests_controller.get_transferticket_from_xml',
-                   MagicMock(return_value='transferticket')):
+        with patch('erica.worker.pyeric.pyeric_response.NamespaceFreeXml') as parsed_server_response:
+            parsed_server_response.return_value.extract.return_value = {'transferticket': 'transferticket'}
             result = valid_grundsteuer_request_controller.generate_json(example_pyeric_response)
-            assert result['pdf'] == base64.b64encode(b"pdf content").decode('utf-8')
+            assert result['pdf'] == b"pdf content"
             assert result['transferticket'] == 'transferticket'
             assert result['eric_response'] == 'eric response'
             assert result['server_response'] == 'server response'
+
+    def test_if_pdf_not_created_then_result_includes_no_pdf(self, valid_grundsteuer_request_controller):
+        example_pyeric_response = PyericResponse("eric response", "server response")
+        with patch('erica.worker.pyeric.pyeric_response.NamespaceFreeXml') as parsed_server_response:
+            parsed_server_response.return_value.extract.return_value = {'transferticket': 'transferticket'}
+            result = valid_grundsteuer_request_controller.generate_json(example_pyeric_response)
+            assert 'pdf' not in result
+            assert result['transferticket'] == 'transferticket'
+
+
+class TestRenderPdf:
+    def test_if_pdf_rendered_then_print_full_xml_and_return_pdf(self, valid_grundsteuer_request_controller):
+        mock_print_controller = MagicMock()
+        mock_print_controller.return_value.get_eric_response.return_value = PyericResponse("", "", b"pdf content")
+        valid_grundsteuer_request_controller._PRINT_PYERIC_CONTROLLER = mock_print_controller
+
+        with patch.object(valid_grundsteuer_request_controller, 'generate_full_xml',
+                          MagicMock(return_value='<xml></xml>')):
+            pdf = valid_grundsteuer_request_controller.render_pdf()
+
+        assert pdf == b"pdf content"
+        mock_print_controller.assert_called_once_with('<xml></xml>')
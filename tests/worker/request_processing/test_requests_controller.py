@@ -1,4 +1,4 @@
-import base64
+import re
 import unittest
 from datetime import date
 from unittest.mock import patch, MagicMock, call
@@ -208,7 +208,7 @@ class TestEstRequestGenerateJson(unittest.TestCase):
     def setUp(self):
         self.expected_transferticket = 'J-KLAPAUCIUS'
         self.pdf_bytes = b"Our lives begin the day we become silent about things that matter"
-        self.expected_pdf = base64.b64encode(self.pdf_bytes).decode('utf-8')
+        self.expected_pdf = self.pdf_bytes
         self.expected_eric_response = "We are now faced with the fact that tomorrow is today."
         response_with_correct_transferticket = replace_text_in_xml(
             read_text_from_sample('sample_est_response_server.xml'),
@@ -363,7 +363,8 @@ class TestUnlockCodeRequestGenerateJson(unittest.TestCase):
         response_with_correct_transferticket = replace_text_in_xml(
             read_text_from_sample('sample_vast_request_response.xml'),
             'TransferTicket', self.expected_transferticket)
-        self.expected_server_response = response_with_correct_transferticket
+        self.expected_server_response = replace_text_in_xml(response_with_correct_transferticket, 'AntragsID',
+                                                            self.expected_request_id)
 
     def test_if_id_given_and_include_true_then_return_json_with_correct_info(self):
         expected_output = {
@@ -377,10 +378,8 @@ class TestUnlockCodeRequestGenerateJson(unittest.TestCase):
             idnr=self.expected_idnr,
             dob=date(1985, 1, 1)), include_elster_responses=True)
 
-        with patch('erica.worker.request_processing.requests_controller.get_antrag_id_from_xml',
-                   MagicMock(return_value=self.expected_request_id)):
-            pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
-            actual_response = unlock_code_request.generate_json(pyeric_response)
+        pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
+        actual_response = unlock_code_request.generate_json(pyeric_response)
 
         self.assertEqual(expected_output, actual_response)
 
@@ -394,12 +393,21 @@ class TestUnlockCodeRequestGenerateJson(unittest.TestCase):
             idnr=self.expected_idnr,
             dob=date(1985, 1, 1)), include_elster_responses=False)
 
-        with patch('erica.worker.request_processing.requests_controller.get_antrag_id_from_xml',
-                   MagicMock(return_value=self.expected_request_id)):
-            pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
-            actual_response = unlock_code_request.generate_json(pyeric_response)
+        pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
+        actual_response = unlock_code_request.generate_json(pyeric_response)
 
-            self.assertEqual(expected_output, actual_response)
+        self.assertEqual(expected_output, actual_response)
+
+    def test_if_antrags_id_missing_then_raise_value_error(self):
+        unlock_code_request = UnlockCodeRequestController(UnlockCodeRequestData(
+            idnr=self.expected_idnr,
+            dob=date(1985, 1, 1)), include_elster_responses=False)
+        server_response_without_antrags_id = re.sub('<AntragsID>[^<]*</AntragsID>', '',
+                                                    self.expected_server_response)
+
+        pyeric_response = PyericResponse(self.expected_eric_response, server_response_without_antrags_id)
+
+        self.assertRaises(ValueError, unlock_code_request.generate_json, pyeric_response)
 
     def test_if_eric_process_successful_then_return_correct_elster_request_id(self):
         unlock_code_request = UnlockCodeRequestController(UnlockCodeRequestData(
@@ -545,7 +553,8 @@ class TestUnlockCodeActivationGenerateJson(unittest.TestCase):
         response_with_correct_transferticket = replace_text_in_xml(
             read_text_from_sample('sample_vast_activation_response.xml'),
             'TransferTicket', self.expected_transferticket)
-        self.expected_server_response = response_with_correct_transferticket
+        self.expected_server_response = replace_text_in_xml(response_with_correct_transferticket, 'AntragsID',
+                                                            self.expected_request_id)
 
     def test_if_id_given_and_include_true_then_return_json_with_correct_info(self):
         expected_output = {
@@ -561,9 +570,7 @@ class TestUnlockCodeActivationGenerateJson(unittest.TestCase):
             elster_request_id='42'), include_elster_responses=True)
 
         pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
-        with patch('erica.worker.request_processing.requests_controller.get_antrag_id_from_xml',
-                   MagicMock(return_value=self.expected_request_id)):
-            actual_response = unlock_code_request.generate_json(pyeric_response)
+        actual_response = unlock_code_request.generate_json(pyeric_response)
 
         self.assertEqual(expected_output, actual_response)
 
@@ -578,9 +585,7 @@ class TestUnlockCodeActivationGenerateJson(unittest.TestCase):
             unlock_code='1985-T67D-K89O',
             elster_request_id='42'), include_elster_responses=False)
         pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
-        with patch('erica.worker.request_processing.requests_controller.get_antrag_id_from_xml',
-                   MagicMock(return_value=self.expected_request_id)):
-            actual_response = unlock_code_request.generate_json(pyeric_response)
+        actual_response = unlock_code_request.generate_json(pyeric_response)
 
         self.assertEqual(expected_output, actual_response)
 
@@ -711,7 +716,8 @@ class TestUnlockCodeRevocationGenerateJson(unittest.TestCase):
         response_with_correct_transferticket = replace_text_in_xml(
             read_text_from_sample('sample_vast_revocation_response.xml'),
             'TransferTicket', self.expected_transferticket)
-        self.expected_server_response = response_with_correct_transferticket
+        self.expected_server_response = replace_text_in_xml(response_with_correct_transferticket, 'AntragsID',
+                                                            self.expected_request_id)
 
     def test_if_id_given_and_include_true_then_return_json_with_correct_info(self):
         expected_output = {
@@ -725,9 +731,7 @@ class TestUnlockCodeRevocationGenerateJson(unittest.TestCase):
             elster_request_id='lookanotherrequestid'), include_elster_responses=True)
 
         pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
-        with patch('erica.worker.request_processing.requests_controller.get_antrag_id_from_xml',
-                   MagicMock(return_value=self.expected_request_id)):
-            actual_response = unlock_code_request.generate_json(pyeric_response)
+        actual_response = unlock_code_request.generate_json(pyeric_response)
 
         self.assertEqual(expected_output, actual_response)
 
@@ -741,9 +745,7 @@ class TestUnlockCodeRevocationGenerateJson(unittest.TestCase):
             elster_request_id='lookanotherrequestid'), include_elster_responses=False)
 
         pyeric_response = PyericResponse(self.expected_eric_response, self.expected_server_response)
-        with patch('erica.worker.request_processing.requests_controller.get_antrag_id_from_xml',
-                   MagicMock(return_value=self.expected_request_id)):
-            actual_response = unlock_code_request.generate_json(pyeric_response)
+        actual_response = unlock_code_request.generate_json(pyeric_response)
 
         self.assertEqual(expected_output, actual_response)
 
@@ -799,6 +801,34 @@ class TestCheckTaxNumberRequestControllerProcess:
         assert result == {'is_valid': False}
 
 
+class TestCheckTaxNumberRequestControllerGetLocalResult:
+
+    def test_if_tax_number_has_wrong_length_then_return_json_with_is_valid_false(self):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="1981131001")
+
+        assert CheckTaxNumberRequestController.get_local_result(input_data) == {'is_valid': False}
+
+    def test_if_tax_number_has_wrong_check_digit_then_return_json_with_is_valid_false(self):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="19811310011")
+
+        assert CheckTaxNumberRequestController.get_local_result(input_data) == {'is_valid': False}
+
+    def test_if_tax_number_may_be_valid_then_return_none(self):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="19811310010")
+
+        assert CheckTaxNumberRequestController.get_local_result(input_data) is None
+
+    def test_if_tax_number_known_invalid_then_process_without_eric(self):
+        input_data = CheckTaxNumberPayload(state_abbreviation="by", tax_number="1981131001")
+
+        with patch('erica.worker.request_processing.requests_controller.CheckTaxNumberPyericController') \
+                as pyeric_controller:
+            result = CheckTaxNumberRequestController(input_data).process()
+
+        assert result == {'is_valid': False}
+        pyeric_controller.get_eric_response.assert_not_called()
+
+
 class TestGetBelegeRequestController(unittest.TestCase):
     def setUp(self):
         self.idnr = '04452397687'
@@ -852,7 +882,7 @@ class TestGetBelegeRequestController(unittest.TestCase):
                     MagicMock(return_value=self.request_xml)), \
                 patch(
                     'erica.worker.request_processing.requests_controller.BelegRequestPyericProcessController.get_eric_response'), \
-                patch('erica.worker.request_processing.requests_controller.get_elements_text_from_xml'):
+                patch('erica.worker.request_processing.requests_controller.iter_elements_text_from_xml'):
             GetBelegeRequestController(self.input_data)._request_encrypted_belege(self.sample_beleg_ids)
             pyeric_controller_mock.assert_called_once_with(self.request_xml)
 
@@ -862,7 +892,7 @@ class TestGetBelegeRequestController(unittest.TestCase):
                 MagicMock(return_value=self.request_xml)), \
                 patch(
                     'erica.worker.request_processing.requests_controller.BelegRequestPyericProcessController.get_eric_response') as fun_get_eric_response, \
-                patch('erica.worker.request_processing.requests_controller.get_elements_text_from_xml'):
+                patch('erica.worker.request_processing.requests_controller.iter_elements_text_from_xml'):
             GetBelegeRequestController(self.input_data)._request_encrypted_belege(self.sample_beleg_ids)
             fun_get_eric_response.assert_called_once()
 
@@ -880,7 +910,7 @@ class TestGetBelegeRequestController(unittest.TestCase):
                     MagicMock(return_value=mocked_pyeric_response)):
             request_controller = GetBelegeRequestController(self.input_data)
             returned_encrypted_belege = request_controller._request_encrypted_belege(self.sample_beleg_ids)
-            self.assertEqual([sample_encrypted_beleg], returned_encrypted_belege)
+            self.assertEqual([sample_encrypted_beleg], list(returned_encrypted_belege))
 
     def test_request_decrypted_belege_calls_get_decrypted_belege_of_correct_pyeric_controller(self):
         with patch(
@@ -1,4 +1,9 @@
-from erica.worker.huey import eric_wrapper_init, get_initialised_eric_wrapper, shutdown_eric_wrapper
+from unittest.mock import patch
+
+from prometheus_client import REGISTRY
+
+from erica.worker.huey import eric_wrapper_init, get_initialised_eric_wrapper, shutdown_eric_wrapper, \
+    report_worker_ready, report_worker_not_ready
 
 
 class TestEricWrapperInitialize:
@@ -6,6 +11,41 @@ class TestEricWrapperInitialize:
     def test_if_eric_wrapper_initialized_get_init_eric_wrapper_returns_not_none(self):
         eric_wrapper_init()
         try:
-            assert get_initialised_eric_wrapper() is not None
+            with get_initialised_eric_wrapper() as eric_wrapper:
+                assert eric_wrapper is not None
         finally:
             shutdown_eric_wrapper()
+
+
+class TestReportWorkerReady:
+
+    def test_if_pool_ready_after_start_then_report_ready(self):
+        with patch('erica.worker.huey.get_eric_pool') as get_eric_pool, \
+                patch('erica.worker.huey.shutdown_eric_pool'):
+            get_eric_pool.return_value.is_ready = True
+
+            eric_wrapper_init()
+            assert REGISTRY.get_sample_value('erica_worker_ready') == 1
+
+            shutdown_eric_wrapper()
+            assert REGISTRY.get_sample_value('erica_worker_ready') == 0
+
+    def test_if_pool_not_ready_after_start_then_do_not_report_ready(self):
+        with patch('erica.worker.huey.get_eric_pool') as get_eric_pool, \
+                patch('erica.worker.huey.report_worker_ready') as report_ready:
+            get_eric_pool.return_value.is_ready = False
+
+            eric_wrapper_init()
+
+        report_ready.assert_not_called()
+
+    def test_if_readiness_file_configured_then_create_it_when_ready_and_remove_it_on_shutdown(self, tmp_path):
+        readiness_file = tmp_path / 'ready'
+        with patch('erica.worker.huey.get_settings') as get_settings:
+            get_settings.return_value.worker_readiness_file = str(readiness_file)
+
+            report_worker_ready()
+            assert readiness_file.exists()
+
+            report_worker_not_ready()
+            assert not readiness_file.exists()
@@ -0,0 +1,56 @@
+from unittest.mock import patch
+
+from erica.worker.tax_office_directory import TaxOfficeDirectory, refresh_tax_office_directory, \
+    get_stored_tax_office_directory, store_tax_office_directory
+from erica.worker.huey import huey
+
+_TAX_OFFICES = {'tax_offices': [{'state_abbreviation': 'be', 'name': 'Berlin',
+                                 'tax_offices': [{'name': 'Finanzamt Berlin', 'bufa_nr': '1101'}]}]}
+
+
+class TestRefreshTaxOfficeDirectory:
+
+    def setup_method(self):
+        huey.storage.flush_all()
+
+    def teardown_method(self):
+        huey.storage.flush_all()
+
+    def test_if_no_directory_stored_then_store_directory_with_eric_version(self):
+        with patch('erica.worker.tax_office_directory.GetTaxOfficesPyericController') as controller:
+            controller.return_value.get_eric_version.return_value = '36.2.6.0'
+            controller.return_value.get_eric_response.return_value = _TAX_OFFICES
+
+            refresh_tax_office_directory()
+
+        assert get_stored_tax_office_directory() == TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES)
+
+    def test_if_directory_for_same_eric_version_stored_then_do_not_request_tax_offices(self):
+        store_tax_office_directory(TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES))
+        with patch('erica.worker.tax_office_directory.GetTaxOfficesPyericController') as controller:
+            controller.return_value.get_eric_version.return_value = '36.2.6.0'
+
+            result = refresh_tax_office_directory()
+
+        controller.return_value.get_eric_response.assert_not_called()
+        assert result == TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES)
+
+    def test_if_directory_for_other_eric_version_stored_then_replace_it(self):
+        store_tax_office_directory(TaxOfficeDirectory('35.0.0.0', {'tax_offices': []}))
+        with patch('erica.worker.tax_office_directory.GetTaxOfficesPyericController') as controller:
+            controller.return_value.get_eric_version.return_value = '36.2.6.0'
+            controller.return_value.get_eric_response.return_value = _TAX_OFFICES
+
+            refresh_tax_office_directory()
+
+        assert get_stored_tax_office_directory() == TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES)
+
+    def test_if_forced_then_request_tax_offices_for_same_eric_version(self):
+        store_tax_office_directory(TaxOfficeDirectory('36.2.6.0', {'tax_offices': []}))
+        with patch('erica.worker.tax_office_directory.GetTaxOfficesPyericController') as controller:
+            controller.return_value.get_eric_version.return_value = '36.2.6.0'
+            controller.return_value.get_eric_response.return_value = _TAX_OFFICES
+
+            refresh_tax_office_directory(force=True)
+
+        assert get_stored_tax_office_directory() == TaxOfficeDirectory('36.2.6.0', _TAX_OFFICES)
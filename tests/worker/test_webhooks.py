@@ -0,0 +1,111 @@
+import hashlib
+import hmac
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from erica.api.dto.response_dto import JobState
+from erica.api.dto.tax_declaration_dto import EstResponseDto
+from erica.domain.model.erica_request import EricaRequest, RequestType, Status
+from erica.worker.webhooks import get_callback_url, post_webhook, sign_webhook, get_retry_delay
+
+
+class _Receiver(BaseHTTPRequestHandler):
+    """Stands in for a client that takes webhooks. It records the requests and answers with the configured status."""
+    received = []
+    status_code = 204
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.received.append((dict(self.headers), body))
+        self.send_response(self.status_code)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def receiver():
+    _Receiver.received = []
+    _Receiver.status_code = 204
+    server = HTTPServer(('127.0.0.1', 0), _Receiver)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/erica', _Receiver
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def webhook_settings():
+    settings = MagicMock(webhook_secret='secret', webhook_timeout_in_sec=5, webhook_retry_delay_in_sec=10,
+                         webhook_callback_urls={'steuerlotse': 'https://steuerlotse.example/erica'})
+    with patch('erica.worker.webhooks.get_settings', return_value=settings):
+        yield settings
+
+
+def _entity(request_type=RequestType.send_est, callback_url=None, creator_id='steuerlotse'):
+    return EricaRequest(type=request_type, status=Status.success, payload={}, request_id=uuid.uuid4(),
+                        creator_id=creator_id, callback_url=callback_url)
+
+
+class TestGetCallbackUrl:
+
+    def test_if_callback_url_given_with_request_then_return_it(self, webhook_settings):
+        assert get_callback_url(_entity(callback_url='https://other.example/hook')) == 'https://other.example/hook'
+
+    def test_if_no_callback_url_given_with_request_then_return_url_of_client(self, webhook_settings):
+        assert get_callback_url(_entity()) == 'https://steuerlotse.example/erica'
+
+    def test_if_no_callback_url_registered_for_client_then_return_none(self, webhook_settings):
+        assert get_callback_url(_entity(creator_id='other')) is None
+
+    def test_if_request_type_without_webhooks_then_return_none(self, webhook_settings):
+        assert get_callback_url(_entity(request_type=RequestType.check_tax_number,
+                                        callback_url='https://other.example/hook')) is None
+
+
+class TestPostWebhook:
+
+    def test_if_posted_then_receiver_gets_signed_response(self, receiver, webhook_settings):
+        callback_url, received = receiver
+        request_id = uuid.uuid4()
+
+        post_webhook(callback_url, request_id, EstResponseDto(process_status=JobState.FAILURE, error_code='1',
+                                                              error_message='error'))
+
+        headers, body = received.received[0]
+        assert json.loads(body) == {'processStatus': 'Failure', 'result': None, 'errorCode': '1',
+                                    'errorMessage': 'error'}
+        assert headers['X-Erica-Request-Id'] == str(request_id)
+        expected_signature = hmac.new(b'secret', f"{headers['X-Erica-Timestamp']}.".encode() + body,
+                                      hashlib.sha256).hexdigest()
+        assert headers['X-Erica-Signature'] == f'sha256={expected_signature}'
+
+    def test_if_receiver_fails_then_raise_error(self, receiver, webhook_settings):
+        callback_url, received = receiver
+        received.status_code = 500
+
+        with pytest.raises(requests.HTTPError):
+            post_webhook(callback_url, uuid.uuid4(), EstResponseDto(process_status=JobState.SUCCESS))
+
+
+class TestSignWebhook:
+
+    def test_if_body_changed_then_signature_changes(self):
+        assert sign_webhook(b'{}', 1, 'secret') != sign_webhook(b'{ }', 1, 'secret')
+
+    def test_if_timestamp_changed_then_signature_changes(self):
+        assert sign_webhook(b'{}', 1, 'secret') != sign_webhook(b'{}', 2, 'secret')
+
+
+class TestGetRetryDelay:
+
+    def test_if_attempts_increase_then_delay_doubles_up_to_an_hour(self, webhook_settings):
+        assert [get_retry_delay(attempt) for attempt in (1, 2, 3, 10)] == [10, 20, 40, 3600]